@@ -0,0 +1,100 @@
+"""
+Сравнение режимов моделирования конфликтов ресурсов:
+"pairwise" (попарные ограничения) и "nooverlap" (интервалы + AddNoOverlap).
+
+Для каждого режима строится и решается модель, выводятся размер модели
+после build_model (переменные, ограничения CP-SAT, из них интервалов),
+размер итоговой модели, время построения, время решения и статус.
+
+Запуск из корня репозитория:
+    python benchmarks/constraint_mode_benchmark.py xlsx_initial/schedule_planning.xlsx
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reader import ScheduleReader
+from scheduler_base import ScheduleOptimizer
+from sequential_scheduling import clear_analysis_cache
+from sequential_scheduling_checker import reset_window_checks_cache
+
+
+def load_classes(args):
+    """Загружает занятия из Excel."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ScheduleReader(args.input_file).read_excel()
+
+
+def model_size(proto):
+    """Возвращает (переменные, ограничения, интервалы) модели CP-SAT."""
+    intervals = sum(1 for ct in proto.constraints if ct.WhichOneof('constraint') == 'interval')
+    return len(proto.variables), len(proto.constraints), intervals
+
+
+def run_mode(args, mode):
+    """
+    Строит и решает модель в заданном режиме.
+
+    Returns:
+        dict: Метрики прогона
+    """
+    classes = load_classes(args)
+    workdir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir, contextlib.redirect_stdout(io.StringIO()):
+        # solve() пишет отчеты реестра в текущий каталог - уводим их во временный
+        os.chdir(tmpdir)
+        try:
+            clear_analysis_cache()
+            reset_window_checks_cache()
+            optimizer = ScheduleOptimizer(classes, time_interval=args.time_interval, constraint_mode=mode)
+
+            start = time.perf_counter()
+            optimizer.build_model()
+            build_time = time.perf_counter() - start
+            built = model_size(optimizer.model.Proto())
+
+            start = time.perf_counter()
+            optimizer.solve(time_limit_seconds=args.time_limit)
+            solve_time = time.perf_counter() - start
+        finally:
+            os.chdir(workdir)
+
+    return {
+        'mode': mode,
+        'built': built,
+        'final': model_size(optimizer.model.Proto()),
+        'build_time': build_time,
+        'solve_time': solve_time,
+        'status': getattr(optimizer, 'solver_status', 'UNKNOWN'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairwise vs NoOverlap model benchmark")
+    parser.add_argument('input_file', nargs='?', default='xlsx_initial/schedule_planning.xlsx')
+    parser.add_argument('--time-limit', type=int, default=60)
+    parser.add_argument('--time-interval', type=int, default=15)
+    args = parser.parse_args()
+    args.input_file = os.path.abspath(args.input_file)
+
+    print(f"{'mode':>10} {'built vars/cts/intervals':>25} {'final vars/cts/intervals':>25} "
+          f"{'build, s':>9} {'solve, s':>9} {'status':>14}")
+    for mode in ScheduleOptimizer.CONSTRAINT_MODES:
+        result = run_mode(args, mode)
+        built = "/".join(str(v) for v in result['built'])
+        final = "/".join(str(v) for v in result['final'])
+        print(f"{result['mode']:>10} {built:>25} {final:>25} "
+              f"{result['build_time']:>9.3f} {result['solve_time']:>9.3f} {result['status']:>14}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
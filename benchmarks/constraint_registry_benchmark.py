@@ -0,0 +1,211 @@
+"""
+Микробенчмарк ConstraintRegistry: регистрация, выборки по индексам,
+статистика и отчеты на большом числе ограничений.
+
+В реестр добавляется N ограничений (по умолчанию 100 000) с реальными
+выражениями CP-SAT, распределением типов и источников, похожим на модель
+расписания, и стандартным набором переменных на класс. Замеряется время
+каждой фазы и память реестра (tracemalloc, байт на ограничение).
+
+С --baseline REV та же нагрузка прогоняется на constraint_registry.py из
+указанной ревизии git (например, HEAD~1) для сравнения.
+
+Запуск из корня репозитория:
+    python benchmarks/constraint_registry_benchmark.py --sizes 100000
+    python benchmarks/constraint_registry_benchmark.py --sizes 20000 --baseline HEAD~1
+"""
+
+import argparse
+import gc
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ortools.sat.python import cp_model
+
+import constraint_registry
+from constraint_registry import ConstraintType
+from schedule_logging import SILENT, configure
+
+# (тип, модуль, функция, парное ли ограничение, вес)
+WORKLOAD = [
+    (ConstraintType.RESOURCE_CONFLICT, "resource_constraints", "add_resource_conflict_constraints", True, 50),
+    (ConstraintType.SEQUENTIAL, "sequential_scheduling", "add_sequential_constraints", True, 15),
+    (ConstraintType.CHAIN_ORDERING, "chain_constraints", "add_chain_ordering_constraints", True, 10),
+    (ConstraintType.SEPARATION, "separation_constraints", "add_time_separation_constraints", True, 10),
+    (ConstraintType.TIME_WINDOW, "model_variables", "create_variables", False, 8),
+    (ConstraintType.FIXED_TIME, "model_variables", "create_variables", False, 4),
+    (ConstraintType.ROOM_ASSIGNMENT, "room_assignment", "add_room_presence", False, 3),
+]
+
+
+def load_registry_module(revision):
+    """
+    Загружает constraint_registry.py из ревизии git как отдельный модуль.
+
+    Args:
+        revision: Ревизия git (например, HEAD~1)
+
+    Returns:
+        module: Модуль с ConstraintRegistry из этой ревизии
+    """
+    source = subprocess.run(
+        ["git", "show", f"{revision}:constraint_registry.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType(f"constraint_registry_{revision}")
+    module.__file__ = f"{revision}:constraint_registry.py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def generate_workload(num_constraints, seed=42):
+    """
+    Генерирует описание нагрузки: тип, источник и индексы классов.
+
+    Args:
+        num_constraints: Количество ограничений
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        tuple: (список записей нагрузки, число классов)
+    """
+    rng = random.Random(seed)
+    num_classes = max(10, num_constraints // 25)
+    weights = [entry[4] for entry in WORKLOAD]
+    records = []
+    for _ in range(num_constraints):
+        type_name, module, function, paired, _ = rng.choices(WORKLOAD, weights)[0]
+        class_i = rng.randrange(num_classes)
+        class_j = None
+        if paired:
+            # Ограничения концентрируются на соседних классах, как в реальных цепочках
+            class_j = (class_i + rng.randrange(1, 40)) % num_classes
+        records.append((type_name, module, function, class_i, class_j))
+    return records, num_classes
+
+
+def class_variables(class_i, class_j):
+    """Стандартный набор переменных, как в ScheduleOptimizer.add_constraint."""
+    variables = [f"start_vars[{class_i}]", f"day_vars[{class_i}]",
+                 f"room_vars[{class_i}]", f"assigned_vars[{class_i}]"]
+    if class_j is not None:
+        variables.extend([f"start_vars[{class_j}]", f"day_vars[{class_j}]",
+                          f"room_vars[{class_j}]", f"assigned_vars[{class_j}]"])
+    return variables
+
+
+def register(registry_cls, records, num_classes, trace_memory=False):
+    """
+    Регистрирует ограничения нагрузки в новом реестре.
+
+    Args:
+        registry_cls: Класс реестра
+        records: Записи нагрузки
+        num_classes: Число классов
+        trace_memory: Замерять память через tracemalloc (время при этом не показательно)
+
+    Returns:
+        tuple: (registry, секунды, байт на ограничение или None)
+    """
+    model = cp_model.CpModel()
+    start_vars = [model.NewIntVar(0, 48, f"start_{idx}") for idx in range(num_classes)]
+
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    registry = registry_cls()
+    for type_name, module, function, class_i, class_j in records:
+        if class_j is None:
+            expr = start_vars[class_i] >= 0
+        else:
+            expr = start_vars[class_i] <= start_vars[class_j]
+        registry.add_constraint(
+            constraint_expr=expr,
+            constraint_type=type_name,
+            origin_module=module,
+            origin_function=function,
+            class_i=class_i,
+            class_j=class_j,
+            variables_used=class_variables(class_i, class_j),
+        )
+    elapsed = time.perf_counter() - start
+    bytes_per = None
+    if trace_memory:
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        bytes_per = retained / max(1, len(records))
+    return registry, elapsed, bytes_per
+
+
+def time_lookups(registry, module, records, samples=2000, seed=7):
+    """Время выборок по типу, модулю и парам классов."""
+    rng = random.Random(seed)
+    pairs = [(r[3], r[4]) for r in rng.sample(records, min(samples, len(records))) if r[4] is not None]
+    start = time.perf_counter()
+    for type_name in module.ConstraintType:
+        registry.get_constraints_by_type(type_name)
+    for _, origin_module, _, _, _ in WORKLOAD:
+        registry.get_constraints_by_origin(origin_module)
+    for class_i, class_j in pairs:
+        registry.get_constraints_by_class_pair(class_i, class_j)
+    return time.perf_counter() - start
+
+
+def time_reports(registry):
+    """Время статистики и обоих файловых отчетов."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        registry.get_statistics()
+        registry.export_to_file(os.path.join(tmp, "full.txt"), only_conflicts=False)
+        registry.export_to_file(os.path.join(tmp, "infeasible.txt"), only_conflicts=True)
+        return time.perf_counter() - start
+
+
+def run(label, module, records, num_classes):
+    """Прогоняет все фазы для одного модуля реестра и печатает строку."""
+    # Нагрузка использует типы из текущего модуля; для ревизии сопоставляем по значению
+    mapped = [(module.ConstraintType(r[0].value),) + r[1:] for r in records]
+    _, _, bytes_per = register(module.ConstraintRegistry, mapped, num_classes, trace_memory=True)
+    registry, add_time, _ = register(module.ConstraintRegistry, mapped, num_classes)
+    lookup_time = time_lookups(registry, module, mapped)
+    report_time = time_reports(registry)
+    print(f"{label:>10} {len(records):>9} {add_time:>8.3f} {lookup_time:>10.3f} "
+          f"{report_time:>10.3f} {bytes_per:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ConstraintRegistry microbenchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=None,
+                        help="git revision of constraint_registry.py to compare against")
+    args = parser.parse_args()
+
+    configure(level=SILENT)
+    baseline = load_registry_module(args.baseline) if args.baseline else None
+
+    print(f"{'registry':>10} {'size':>9} {'add, s':>8} {'lookup, s':>10} "
+          f"{'reports, s':>10} {'B/constr':>10}")
+    for size in args.sizes:
+        records, num_classes = generate_workload(size, args.seed)
+        run("current", constraint_registry, records, num_classes)
+        if baseline is not None:
+            run(args.baseline, baseline, records, num_classes)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
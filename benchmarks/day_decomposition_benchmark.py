@@ -0,0 +1,132 @@
+"""
+Бенчмарк декомпозиции: общая модель против отдельных моделей дней
+(ScheduleOptimizer(decompose_by_day=True)) и компонент связности графа
+конфликтов (decompose_components=True), решаемых в параллельных процессах.
+
+Синтетический набор занятий распределяется по дням Mo-Fr, время каждого
+занятия задано окном (решатель выбирает начало внутри окна). С --clusters K
+преподаватели, группы и аудитории делятся на K непересекающихся наборов,
+так что внутри дня появляются независимые компоненты. Для каждого режима
+замеряется полное время solve(), статус и значение целевой функции (для
+декомпозиции - сумма по частям) и проверяется, что решения совпадают по дням
+и в решении нет конфликтов преподавателей, групп и аудиторий.
+
+Запуск из корня репозитория:
+    python benchmarks/day_decomposition_benchmark.py --sizes 100 200 --time-limit 30
+    python benchmarks/day_decomposition_benchmark.py --sizes 300 --clusters 4 --workers 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler_base import ScheduleOptimizer
+from schedule_logging import SILENT, configure
+from pair_index_benchmark import generate_classes
+
+
+MODES = (
+    ("single", {}),
+    ("by-day", {"decompose_by_day": True}),
+    ("components", {"decompose_components": True}),
+)
+
+
+def make_classes(num_classes, window_hours, seed, clusters=1):
+    """
+    Синтетические занятия; время каждого занятия - окно шириной не меньше
+    window_hours, ресурсы разбиты на clusters непересекающихся наборов.
+    """
+    rng = random.Random(seed)
+    classes = generate_classes(num_classes, seed)
+    for c in classes:
+        start_minutes = 8 * 60 + rng.randrange(0, 4) * 60
+        end_minutes = min(20 * 60, start_minutes + c.duration + window_hours * 60)
+        c.start_time = f"{start_minutes // 60:02d}:00"
+        c.end_time = f"{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+        if clusters > 1:
+            cluster = rng.randrange(clusters)
+            c.teacher = f"{c.teacher}K{cluster}"
+            c.group = f"{c.group}K{cluster}"
+            c.main_room = f"{c.main_room}K{cluster}"
+            c.alternative_rooms = [f"{room}K{cluster}" for room in c.alternative_rooms]
+    return classes
+
+
+def find_overlaps(solution):
+    """Количество пар занятий с общим ресурсом, пересекающихся по времени."""
+    by_resource = {}
+    for idx, entry in enumerate(solution):
+        for key in (("teacher", entry["teacher"]), ("group", entry["group"]), ("room", entry["room"])):
+            by_resource.setdefault(key + (entry["day"],), []).append(idx)
+
+    overlaps = 0
+    for indices in by_resource.values():
+        spans = sorted((solution[idx]["start_time"], solution[idx]["end_time"]) for idx in indices)
+        for (_, end), (start, _) in zip(spans, spans[1:]):
+            if start < end:
+                overlaps += 1
+    return overlaps
+
+
+def run(classes, args, options):
+    """
+    Решает задачу в одном режиме.
+
+    Returns:
+        tuple: (секунды, статус, целевая функция, решение)
+    """
+    optimizer = ScheduleOptimizer(classes, max_workers=args.workers, **options)
+    start = time.perf_counter()
+    optimizer.solve(time_limit_seconds=args.time_limit)
+    elapsed = time.perf_counter() - start
+
+    objective = optimizer.objective_value if optimizer.solution is not None else None
+    return elapsed, optimizer.solver_status, objective, optimizer.solution
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Day decomposition benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--window-hours", type=int, default=6,
+                        help="minimum width of each class time window beyond its duration")
+    parser.add_argument("--time-limit", type=int, default=30)
+    parser.add_argument("--clusters", type=int, default=1,
+                        help="number of disjoint teacher/group/room sets")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    configure(level=SILENT)
+    print(f"{'classes':>8} {'mode':>10} {'solve, s':>9} {'status':>10} {'objective':>10} {'overlaps':>9}")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # solve() пишет отчеты реестра в текущий каталог
+        os.chdir(tmp)
+        try:
+            for size in args.sizes:
+                days = None
+                for mode, options in MODES:
+                    classes = make_classes(size, args.window_hours, args.seed, args.clusters)
+                    elapsed, status, objective, solution = run(classes, args, options)
+                    overlaps = "-" if solution is None else find_overlaps(solution)
+                    print(f"{size:>8} {mode:>10} {elapsed:>9.2f} {status:>10} "
+                          f"{objective if objective is not None else '-':>10} {overlaps:>9}")
+                    if solution is not None:
+                        solution_days = [entry["day"] for entry in solution]
+                        if days is not None and days != solution_days:
+                            print(f"{'':>8} warning: day assignment differs between modes")
+                        days = solution_days
+        finally:
+            os.chdir(cwd)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
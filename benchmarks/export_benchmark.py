@@ -0,0 +1,177 @@
+"""
+Бенчмарк выгрузки расписания в Excel (output_utils.export_to_excel) на
+синтетических решениях.
+
+Решение строится так же, как в solution_decoding_benchmark: модель только из
+переменных занятий и литералов аудиторий, без ограничений ресурсов. Замеряются
+построение листов (schedule_sheets) и выгрузка в каждом формате --formats
+(output_utils.EXPORT_FORMATS) с записью файла: время, размер файла и пиковая
+память (tracemalloc, отдельный прогон). Parquet пропускается, если не
+установлены pyarrow или fastparquet.
+
+С --baseline REV выгрузка выполняется также export_to_excel из output_utils.py
+указанной ревизии git (например, HEAD~1), и файлы сравниваются: набор листов
+и их содержимое. Листы групп раньше отбирались по подстроке в колонке group
+(группа 1A попадала и на лист 11A); для них выводится число таких лишних
+строк в старой выгрузке.
+
+Запуск из корня репозитория:
+    python benchmarks/export_benchmark.py --sizes 1000 5000
+    python benchmarks/export_benchmark.py --sizes 10000 --formats csv jsonl parquet index
+    python benchmarks/export_benchmark.py --sizes 2000 --baseline HEAD~1
+"""
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import openpyxl
+
+import output_utils
+from schedule_logging import SILENT, configure
+from solution_decoding_benchmark import generate_classes, solve_variables_only
+
+
+def load_output_module(revision):
+    """
+    Загружает output_utils.py из ревизии git как отдельный модуль.
+
+    Args:
+        revision: Ревизия git (например, HEAD~1)
+
+    Returns:
+        module: Модуль с export_to_excel из этой ревизии
+    """
+    source = subprocess.run(
+        ["git", "show", f"{revision}:output_utils.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType(f"output_utils_{revision}")
+    module.__file__ = f"{revision}:output_utils.py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def parquet_available():
+    """Установлен ли движок Parquet для pandas."""
+    try:
+        output_utils.check_export_formats(["parquet"])
+    except ValueError:
+        return False
+    return True
+
+
+def read_sheets(path):
+    """Содержимое книги: {имя листа: список строк значений}."""
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return {sheet.title: [tuple(row) for row in sheet.iter_rows(values_only=True)]
+                for sheet in workbook.worksheets}
+    finally:
+        workbook.close()
+
+
+def timed_export(export, optimizer, path):
+    """Время одной выгрузки, с."""
+    gc.collect()
+    started = time.perf_counter()
+    export(optimizer, filename=path)
+    return time.perf_counter() - started
+
+
+def peak_memory(export, optimizer, path):
+    """Пиковая память выгрузки (tracemalloc), МБ."""
+    gc.collect()
+    tracemalloc.start()
+    export(optimizer, filename=path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def compare(new_sheets, old_sheets):
+    """
+    Сравнивает новую и старую выгрузку.
+
+    Returns:
+        tuple: (одинаковый набор листов, листы не групп совпадают,
+        лишних строк в старых листах групп)
+    """
+    same_names = list(new_sheets) == list(old_sheets)
+    same_rows = all(new_sheets[name] == old_sheets.get(name)
+                    for name in new_sheets if not name.startswith("G_"))
+    extra = 0
+    for name, rows in new_sheets.items():
+        if name.startswith("G_"):
+            old_rows = old_sheets.get(name, [])
+            extra += len(old_rows) - len(rows)
+            # Все строки новой выгрузки есть в старой, в том же порядке
+            kept = set(rows)
+            same_rows = same_rows and [row for row in old_rows if row in kept] == rows
+    return same_names, same_rows, extra
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel export benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--formats", nargs="+", choices=list(output_utils.EXPORT_FORMATS),
+                        default=list(output_utils.EXPORT_FORMATS))
+    parser.add_argument("--baseline", default=None,
+                        help="git revision whose export_to_excel is timed for comparison (e.g. HEAD~1)")
+    args = parser.parse_args()
+
+    configure(level=SILENT)
+    baseline = load_output_module(args.baseline) if args.baseline else None
+
+    formats = [fmt for fmt in args.formats if fmt != "parquet" or parquet_available()]
+    if formats != args.formats:
+        print("parquet skipped: pyarrow or fastparquet is not installed")
+
+    print(f"{'classes':>8} {'sheets':>7} {'export':>10} {'sheets, s':>10} {'total, s':>9} "
+          f"{'size, MB':>9} {'peak, MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            optimizer, solver = solve_variables_only(generate_classes(size, seed=args.seed))
+            optimizer.solution = optimizer.decode_solution(solver)
+
+            gc.collect()
+            started = time.perf_counter()
+            sheets = sum(1 for _ in output_utils.schedule_sheets(optimizer))
+            split_seconds = time.perf_counter() - started
+
+            # (метка, функция выгрузки, суффикс файла)
+            runs = [(fmt,) + output_utils.EXPORT_FORMATS[fmt][::-1] for fmt in formats]
+            if baseline is not None:
+                runs.append((args.baseline, baseline.export_to_excel, ".xlsx"))
+            contents = {}
+            for label, export, suffix in runs:
+                path = os.path.join(tmp, f"export_{label}_{size}{suffix}")
+                seconds = timed_export(export, optimizer, path)
+                peak = peak_memory(export, optimizer, path)
+                megabytes = os.path.getsize(path) / 1024 / 1024
+                if suffix == ".xlsx":
+                    contents[label] = read_sheets(path)
+                split = f"{split_seconds:.3f}" if label == "xlsx" else "-"
+                print(f"{size:>8} {sheets:>7} {label:>10} {split:>10} {seconds:>9.3f} "
+                      f"{megabytes:>9.2f} {peak:>9.1f}")
+
+            if baseline is not None and "xlsx" in contents:
+                same_names, same_rows, extra = compare(contents["xlsx"], contents[args.baseline])
+                print(f"{'':>8} same sheet set: {'yes' if same_names else 'NO'}, "
+                      f"same rows: {'yes' if same_rows else 'NO'}, "
+                      f"substring-only group rows dropped: {extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Бенчмарк индекса пар-кандидатов (pair_index) против полного перебора пар
+в add_resource_conflict_constraints.
+
+Для каждого размера генерируется синтетический набор занятий, модель
+строится дважды (use_pair_index=True/False), замеряется время построения
+ограничений ресурсов и проверяется, что итоговые модели CP-SAT и списки
+добавленных ограничений совпадают.
+
+Запуск из корня репозитория:
+    python benchmarks/pair_index_benchmark.py --sizes 200 400 800
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ortools.sat.python import cp_model
+
+from reader import ScheduleClass
+from scheduler_base import ScheduleOptimizer
+from model_variables import create_variables
+from resource_constraints import add_resource_conflict_constraints
+from sequential_scheduling import clear_analysis_cache
+from sequential_scheduling_checker import reset_window_checks_cache
+
+DAYS = ["Mo", "Di", "Mi", "Do", "Fr"]
+
+
+def generate_classes(num_classes, seed=42):
+    """
+    Генерирует синтетический список занятий без связей.
+
+    Args:
+        num_classes: Количество занятий
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        list: Список ScheduleClass
+    """
+    rng = random.Random(seed)
+    num_teachers = max(2, num_classes // 6)
+    num_groups = max(2, num_classes // 8)
+    num_rooms = max(2, num_classes // 5)
+
+    classes = []
+    for _ in range(num_classes):
+        duration = rng.choice([45, 60, 90])
+        start_minutes = 8 * 60 + rng.randrange(0, (20 * 60 - duration - 8 * 60) // 15) * 15
+        start_time = f"{start_minutes // 60:02d}:{start_minutes % 60:02d}"
+        end_time = None
+        if rng.random() < 0.3:
+            end_minutes = min(20 * 60, start_minutes + duration + rng.choice([30, 60, 120]))
+            end_time = f"{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+
+        main_room = f"R{rng.randrange(num_rooms)}"
+        alternative_rooms = []
+        if rng.random() < 0.2:
+            alternative_rooms.append(f"R{rng.randrange(num_rooms)}")
+
+        classes.append(ScheduleClass(
+            subject=f"S{rng.randrange(20)}",
+            group=f"{rng.randrange(1, num_groups + 1)}A",
+            teacher=f"T{rng.randrange(num_teachers)}",
+            main_room=main_room,
+            alternative_rooms=alternative_rooms,
+            building="B",
+            duration=duration,
+            day=rng.choice(DAYS),
+            start_time=start_time,
+            end_time=end_time,
+        ))
+    return classes
+
+
+def build_resource_constraints(classes, use_pair_index):
+    """
+    Строит переменные и ограничения ресурсов, возвращает оптимизатор и время.
+
+    Args:
+        classes: Список ScheduleClass
+        use_pair_index: Режим построения пар
+
+    Returns:
+        tuple: (optimizer, seconds)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        clear_analysis_cache()
+        reset_window_checks_cache()
+        optimizer = ScheduleOptimizer(classes)
+        optimizer.model = cp_model.CpModel()
+        create_variables(optimizer)
+        start = time.perf_counter()
+        add_resource_conflict_constraints(optimizer, use_pair_index=use_pair_index)
+        elapsed = time.perf_counter() - start
+    return optimizer, elapsed
+
+
+def added_signature(optimizer):
+    """Список добавленных ограничений без временных меток."""
+    return [(info.constraint_id, info.constraint_type, info.class_i, info.class_j, info.description)
+            for info in optimizer.constraint_registry.added]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pair index vs all-pairs benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 400, 800])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'classes':>8} {'all pairs, s':>14} {'pair index, s':>14} {'speedup':>8} {'identical':>10}")
+    for size in args.sizes:
+        classes = generate_classes(size, args.seed)
+        full_opt, full_time = build_resource_constraints(classes, use_pair_index=False)
+        index_opt, index_time = build_resource_constraints(classes, use_pair_index=True)
+
+        identical = (
+            added_signature(full_opt) == added_signature(index_opt)
+            and full_opt.model.Proto() == index_opt.model.Proto()
+        )
+        speedup = full_time / index_time if index_time > 0 else float('inf')
+        print(f"{size:>8} {full_time:>14.3f} {index_time:>14.3f} {speedup:>7.1f}x {str(identical):>10}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Бенчмарк чтения входного Excel-файла (ScheduleReader.read_excel) на
+увеличенной копии xlsx_initial/schedule_planning.xlsx: разбор файла, а также
+холодный (разбор и запись файла-спутника) и теплый (чтение занятий из
+файла-спутника) запуск с кешем разобранного файла.
+
+Секции листа "Plannung" исходного файла повторяются --copies раз (значения
+столбцов A-D, по 14 строк на секцию), остальные листы сохраняются. Для
+каждого чтения замеряются время (лучшее из --repeat) и пиковая память
+(tracemalloc, отдельный прогон).
+
+С --baseline REV тот же файл читается также reader.py из указанной ревизии
+git (например, HEAD~1). Проверяется, что все чтения дают одинаковые списки
+ScheduleClass (поля, номер секции, столбец и связи цепочек).
+
+Запуск из корня репозитория:
+    python benchmarks/reader_benchmark.py --copies 1000
+    python benchmarks/reader_benchmark.py --copies 300 --baseline HEAD~1
+"""
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import openpyxl
+
+import reader
+from schedule_logging import SILENT, configure
+
+SECTION_ROWS = 14
+SOURCE = os.path.join(ROOT, "xlsx_initial", "schedule_planning.xlsx")
+
+
+def load_reader_module(revision):
+    """
+    Загружает reader.py из ревизии git как отдельный модуль.
+
+    Args:
+        revision: Ревизия git (например, HEAD~1)
+
+    Returns:
+        module: Модуль с ScheduleReader из этой ревизии
+    """
+    source = subprocess.run(
+        ["git", "show", f"{revision}:reader.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType(f"reader_{revision}")
+    module.__file__ = f"{revision}:reader.py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def enlarge_workbook(source, target, copies):
+    """
+    Записывает копию книги, где секции листа "Plannung" повторены copies раз.
+
+    Returns:
+        int: Число строк листа "Plannung" в новой книге
+    """
+    workbook = openpyxl.load_workbook(source)
+    sheet = next(workbook[name] for name in workbook.sheetnames if name.lower() == "plannung")
+    block_rows = -(-(sheet.max_row - 1) // SECTION_ROWS) * SECTION_ROWS
+    block = [[sheet.cell(row=2 + offset, column=col).value for col in range(1, 5)]
+             for offset in range(block_rows)]
+
+    for copy in range(1, copies):
+        base = 2 + copy * block_rows
+        for offset, values in enumerate(block):
+            for col, value in enumerate(values, start=1):
+                if value is not None:
+                    sheet.cell(row=base + offset, column=col, value=value)
+    workbook.save(target)
+    return sheet.max_row
+
+
+def class_signature(classes):
+    """Поля занятий и связи цепочек (индексы) для сравнения двух чтений."""
+    index = {id(c): idx for idx, c in enumerate(classes)}
+    signature = []
+    for c in classes:
+        signature.append((
+            c.subject, c.group, c.teacher, c.main_room, tuple(c.alternative_rooms), c.building,
+            c.duration, c.day, c.start_time, c.end_time, c.pause_before, c.pause_after,
+            c.section_index, c.column,
+            index.get(id(c.previous_class)), index.get(id(c.next_class)),
+            tuple(index.get(id(other)) for other in c.linked_classes),
+        ))
+    return signature
+
+
+def time_read(make_reader, repeat, before=None):
+    """
+    Лучшее время чтения из repeat запусков и результат последнего.
+
+    Args:
+        make_reader: Функция без аргументов, создающая ScheduleReader
+        repeat: Число запусков
+        before: Вызывается перед каждым запуском (вне замера)
+    """
+    best = float("inf")
+    classes = None
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        gc.collect()
+        started = time.perf_counter()
+        classes = make_reader().read_excel()
+        best = min(best, time.perf_counter() - started)
+    return best, classes
+
+
+def peak_memory(make_reader, before=None):
+    """Пиковая память чтения (tracemalloc), МБ."""
+    if before is not None:
+        before()
+    gc.collect()
+    tracemalloc.start()
+    make_reader().read_excel()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def remove_cache_file(path):
+    """Удаляет файл-спутник кеша разобранного файла."""
+    cache_path = reader.ScheduleReader(path).cache_path
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ScheduleReader.read_excel benchmark")
+    parser.add_argument("--copies", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=None,
+                        help="git revision whose reader.py is timed for comparison (e.g. HEAD~1)")
+    args = parser.parse_args()
+
+    configure(level=SILENT)
+    baseline = load_reader_module(args.baseline) if args.baseline else None
+
+    print(f"{'copies':>7} {'rows':>7} {'classes':>8} {'reader':>10} {'read, s':>9} {'peak, MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.copies:
+            path = os.path.join(tmp, f"schedule_planning_x{copies}.xlsx")
+            rows = enlarge_workbook(SOURCE, path, copies)
+            clear = lambda: remove_cache_file(path)
+            # (метка, создание читателя, действие перед запуском)
+            runs = [
+                ("parse", lambda: reader.ScheduleReader(path, use_cache=False), None),
+                ("cold", lambda: reader.ScheduleReader(path), clear),
+                ("warm", lambda: reader.ScheduleReader(path), None),
+            ]
+            if baseline is not None:
+                runs.append((args.baseline, lambda: baseline.ScheduleReader(path), None))
+
+            signatures = {}
+            for label, make_reader, before in runs:
+                seconds, classes = time_read(make_reader, args.repeat, before)
+                peak = peak_memory(make_reader, before)
+                signatures[label] = class_signature(classes)
+                print(f"{copies:>7} {rows:>7} {len(classes):>8} {label:>10} {seconds:>9.3f} {peak:>9.1f}")
+            clear()
+            same = all(signature == signatures["parse"] for signature in signatures.values())
+            print(f"{'':>7} identical ScheduleClass lists: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
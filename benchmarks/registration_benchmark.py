@@ -0,0 +1,135 @@
+"""
+Бенчмарк ScheduleOptimizer.add_constraint: подробная регистрация против
+fast_registration на большой синтетической модели.
+
+Для синтетического набора занятий создаются переменные модели, затем
+добавляется M попарных ограничений (model.Add, как в модулях ограничений)
+в режимах:
+    raw       - только model.Add, без обертки (нижняя граница)
+    detailed  - обертка с описанием и variables_used от вызывающего кода
+    inferred  - обертка без классов и variables_used: переменные извлекаются
+                из str(constraint_expr) регулярным выражением
+    fast      - fast_registration=True, в реестр попадают только тип, источник и классы
+Накладные расходы обертки считаются как разница с raw. Отдельно замеряется
+полный отчет реестра (constraint_registry_full.txt), где в режиме fast
+описания и переменные выводятся при записи.
+
+Запуск из корня репозитория:
+    python benchmarks/registration_benchmark.py --classes 2000 --constraints 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ortools.sat.python import cp_model
+
+from constraint_registry import ConstraintType
+from model_variables import create_variables
+from scheduler_base import ScheduleOptimizer
+from schedule_logging import SILENT, configure
+from pair_index_benchmark import generate_classes
+
+MODES = ("raw", "detailed", "inferred", "fast")
+
+
+def build_optimizer(classes, fast_registration):
+    """Создает оптимизатор с моделью и переменными."""
+    optimizer = ScheduleOptimizer(classes, fast_registration=fast_registration)
+    optimizer.model = cp_model.CpModel()
+    create_variables(optimizer)
+    return optimizer
+
+
+def pick_pairs(optimizer, num_constraints, seed=7):
+    """Выбирает пары занятий, у которых время начала - переменная модели."""
+    rng = random.Random(seed)
+    free = [idx for idx, var in optimizer.start_vars.items() if not isinstance(var, int)]
+    return [tuple(rng.sample(free, 2)) for _ in range(num_constraints)]
+
+
+def register_pairs(optimizer, pairs, mode):
+    """
+    Добавляет попарные ограничения через add_constraint.
+
+    Args:
+        optimizer: ScheduleOptimizer с созданными переменными
+        pairs: Список пар индексов занятий
+        mode: Один из MODES
+
+    Returns:
+        float: Время в секундах
+    """
+    model = optimizer.model
+    start_vars = optimizer.start_vars
+    start = time.perf_counter()
+    for i, j in pairs:
+        constraint_expr = model.Add(start_vars[i] + 2 <= start_vars[j])
+        if mode == "raw":
+            continue
+        if mode == "inferred":
+            optimizer.add_constraint(
+                constraint_expr=constraint_expr,
+                constraint_type=ConstraintType.SEPARATION,
+                origin_module=__name__,
+                origin_function="register_pairs",
+            )
+        else:
+            optimizer.add_constraint(
+                constraint_expr=constraint_expr,
+                constraint_type=ConstraintType.SEPARATION,
+                origin_module=__name__,
+                origin_function="register_pairs",
+                class_i=i,
+                class_j=j,
+                description=f"Separation: class {i} ends before class {j} starts (gap 2 slots)",
+                variables_used=[f"start_vars[{i}]", f"start_vars[{j}]"],
+            )
+    return time.perf_counter() - start
+
+
+def time_full_report(optimizer):
+    """Время записи полного отчета реестра."""
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        optimizer.constraint_registry.export_to_file(
+            os.path.join(tmp, "full.txt"), only_conflicts=False, optimizer=optimizer)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="add_constraint registration benchmark")
+    parser.add_argument("--classes", type=int, default=2000)
+    parser.add_argument("--constraints", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    configure(level=SILENT)
+    classes = generate_classes(args.classes, args.seed)
+
+    print(f"{'mode':>10} {'constraints':>12} {'add, s':>8} {'us/constr':>10} "
+          f"{'wrapper us':>11} {'report, s':>10}")
+    raw_time = None
+    for mode in MODES:
+        optimizer = build_optimizer(classes, fast_registration=(mode == "fast"))
+        pairs = pick_pairs(optimizer, args.constraints)
+        elapsed = register_pairs(optimizer, pairs, mode)
+        if mode == "raw":
+            raw_time = elapsed
+            report = "-"
+        else:
+            report = f"{time_full_report(optimizer):.3f}"
+        overhead = (elapsed - raw_time) / len(pairs) * 1e6
+        print(f"{mode:>10} {len(pairs):>12} {elapsed:>8.3f} {elapsed / len(pairs) * 1e6:>10.2f} "
+              f"{overhead:>11.2f} {report:>10}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
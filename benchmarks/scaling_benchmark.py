@@ -0,0 +1,207 @@
+"""
+Бенчмарк масштабируемости всего конвейера на синтетических входных файлах
+(synthetic_schedule): для каждого размера генерируется книга "Plannung",
+затем замеряются чтение (ScheduleReader без кеша), этапы построения модели,
+размер модели, решение и пиковая память. Результаты выводятся таблицей и
+записываются в JSON-файл --out (после каждого размера, так что прерванный
+прогон сохраняет уже измеренные размеры).
+
+Времена этапов - замеры run_profile.RunProfile, как в main_sch --profile-out:
+  create_variables      - model_variables.create_variables;
+  resource_constraints  - ограничения ресурсов (--constraint-mode);
+  objective             - objective.add_objective_function;
+  cycle_detection       - conflict_detector: поиск и разрыв циклов ограничений;
+  timewindow            - timewindow_adapter.apply_timewindow_improvements;
+  solve                 - решатель CP-SAT с ограничением --time-limit;
+  decode                - декодирование решения.
+Размер модели (переменные, ограничения, байты CpModelProto) записывается
+после build_model (built) и после подготовки модели в solve() (final).
+
+Каждый размер выполняется в отдельном процессе: peak_rss_mb - пиковый
+resident set процесса (вместе с памятью решателя CP-SAT; нет на Windows).
+С --tracemalloc профиль снимает память этапов (RunProfile(memory=True)):
+python_peak_mb - наибольший пик памяти Python-объектов за этап, в
+memory_phases - снимки этапов с местами выделения памяти и размером модели;
+времена этапов при этом выше.
+
+Запуск из корня репозитория:
+    python benchmarks/scaling_benchmark.py --sizes 100 300 1000 --time-limit 30
+    python benchmarks/scaling_benchmark.py --sizes 1000 3000 --constraint-mode nooverlap --out scaling_nooverlap.json
+    python benchmarks/scaling_benchmark.py --sizes 500 --window-share 0.8 --chain-share 0.4 --tracemalloc
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import ortools
+from ortools.sat.python import cp_model
+
+from reader import ScheduleReader
+from run_profile import RunProfile
+from scheduler_base import ScheduleOptimizer
+from schedule_logging import SILENT, configure
+from synthetic_schedule import GeneratorConfig, write_planning_workbook
+
+# Этапы построения и подготовки модели (сумма - times["build"])
+BUILD_PHASES = ("create_variables", "resource_constraints", "objective",
+                "cycle_detection", "timewindow")
+
+
+def model_size(model):
+    """Переменные, ограничения и размер сериализованной модели CP-SAT."""
+    proto = model.Proto()
+    return {"variables": len(proto.variables), "constraints": len(proto.constraints),
+            "bytes": proto.ByteSize()}
+
+
+def peak_rss_mb():
+    """Пиковый resident set текущего процесса, МБ (None без модуля resource)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux - КБ, macOS - байты
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def class_counts(classes):
+    """Число занятий по видам времени и в цепочках."""
+    return {
+        "fixed": sum(1 for c in classes if c.start_time and not c.end_time),
+        "window": sum(1 for c in classes if c.start_time and c.end_time),
+        "free": sum(1 for c in classes if not c.start_time),
+        "chained": sum(1 for c in classes if c.previous_class is not None or c.next_class is not None),
+        "teachers": len({c.teacher for c in classes}),
+        "groups": len({g for c in classes for g in c.groups}),
+        "rooms": len({r for c in classes for r in c.possible_rooms}),
+    }
+
+
+def run_size(size, args):
+    """
+    Прогон одного размера (в отдельном процессе).
+
+    Returns:
+        dict: Параметры генерации, состав занятий, времена этапов, размер
+        модели, результат решателя и память
+    """
+    configure(level=SILENT)
+    from sequential_scheduling import clear_analysis_cache
+    from sequential_scheduling_checker import reset_window_checks_cache
+    clear_analysis_cache()
+    reset_window_checks_cache()
+
+    config = GeneratorConfig(
+        classes=size, teachers=args.teachers, groups=args.groups, rooms=args.rooms,
+        days=args.days, fixed_share=args.fixed_share, window_share=args.window_share,
+        chain_share=args.chain_share, time_interval=args.time_interval, seed=args.seed)
+    profile = RunProfile(top=10, memory=args.tracemalloc)
+    workdir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "synthetic_planning.xlsx")
+        with profile.phase("generate"):
+            write_planning_workbook(path, config)
+        workbook_mb = os.path.getsize(path) / 1024 / 1024
+
+        with profile.phase("read"):
+            classes = ScheduleReader(path, use_cache=False).read_excel()
+
+        # solve() и анализ окон могут писать отчеты в текущий каталог
+        os.chdir(tmpdir)
+        try:
+            optimizer = ScheduleOptimizer(classes, time_interval=args.time_interval,
+                                          constraint_mode=args.constraint_mode, profile=profile)
+            optimizer.write_reports = False
+            optimizer.build_model()
+            built = model_size(optimizer.model)
+            optimizer.solve(time_limit_seconds=args.time_limit)
+            final = model_size(optimizer.model)
+        finally:
+            os.chdir(workdir)
+            profile.close()
+
+    times = {name: entry["seconds"] for name, entry in profile.phases.items()}
+    times["build"] = sum(times.get(phase, 0.0) for phase in BUILD_PHASES)
+    info = optimizer.solver_info
+    memory = profile.to_dict()["memory"]
+    return {
+        "classes": len(classes),
+        "generator": config.to_dict(),
+        "composition": class_counts(classes),
+        "workbook_mb": workbook_mb,
+        "times": times,
+        "model": {"built": built, "final": final},
+        "solver": {"status": optimizer.solver_status, "objective": info["objective"],
+                   "wall_time": info["wall_time"]},
+        "memory": {"peak_rss_mb": peak_rss_mb(),
+                   "python_peak_mb": memory["peak_mb"] if memory else None,
+                   "memory_phases": memory["phases"] if memory else None},
+    }
+
+
+def main():
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Pipeline scaling benchmark on synthetic inputs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--time-limit", type=int, default=30)
+    parser.add_argument("--time-interval", type=int, default=15)
+    parser.add_argument("--constraint-mode", choices=ScheduleOptimizer.CONSTRAINT_MODES, default="pairwise")
+    parser.add_argument("--teachers", type=int, default=None)
+    parser.add_argument("--groups", type=int, default=None)
+    parser.add_argument("--rooms", type=int, default=None)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--fixed-share", type=float, default=defaults.fixed_share)
+    parser.add_argument("--window-share", type=float, default=defaults.window_share)
+    parser.add_argument("--chain-share", type=float, default=defaults.chain_share)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="also snapshot Python memory per phase (peak, top allocation sites, model size)")
+    parser.add_argument("--out", default="scaling_results.json", help="JSON results file")
+    args = parser.parse_args()
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "ortools": ortools.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "args": vars(args),
+        "results": [],
+    }
+    print(f"{'classes':>8} {'read, s':>8} {'vars, s':>8} {'res, s':>8} {'obj, s':>8} {'cyc, s':>8} "
+          f"{'tw, s':>8} {'solve, s':>9} {'variables':>10} {'constraints':>12} {'MB':>7} "
+          f"{'rss, MB':>8} {'status':>10}")
+    for size in args.sizes:
+        # Свежий процесс на каждый размер: пиковая память не смешивается между размерами
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_size, size, args).result()
+        report["results"].append(result)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        times, model = result["times"], result["model"]["final"]
+        rss = result["memory"]["peak_rss_mb"]
+        rss = "-" if rss is None else f"{rss:.0f}"
+        print(f"{result['classes']:>8} {times['read']:>8.3f} {times['create_variables']:>8.3f} "
+              f"{times['resource_constraints']:>8.3f} {times['objective']:>8.3f} "
+              f"{times['cycle_detection']:>8.3f} {times['timewindow']:>8.3f} {times['solve']:>9.3f} "
+              f"{model['variables']:>10} {model['constraints']:>12} {model['bytes'] / 1024 / 1024:>7.2f} "
+              f"{rss:>8} {result['solver']['status']:>10}")
+    print(f"Results saved to {os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Бенчмарк разбора решения (ScheduleOptimizer.decode_solution) и сводки по
+решению (print_solution_summary) на синтетических наборах занятий.
+
+Для каждого размера строится модель только из переменных занятий
+(create_variables) и литералов присутствия в аудиториях
+(room_assignment.create_room_presence) - без ограничений ресурсов, поэтому
+решение находится сразу и замеряется только разбор. Замеряются:
+  first      - первый decode_solution модели (со сбором индексов переменных);
+  decode     - decode_solution (колоночный SolutionTable, пакетное чтение значений);
+  records    - decode и строковое представление (список словарей);
+  dataframe  - decode и SolutionTable.to_dataframe;
+  summary    - decode и счетчики сводки по колонкам (SolutionTable.counts);
+  pandas     - прежняя сводка: DataFrame из словарей, value_counts и разбор
+               строки времени начала на часы.
+
+С --baseline REV разбор выполняется также decode_solution из scheduler_base.py
+указанной ревизии git (например, HEAD~1), и проверяется, что назначения
+совпадают.
+
+Запуск из корня репозитория:
+    python benchmarks/solution_decoding_benchmark.py --sizes 10000
+    python benchmarks/solution_decoding_benchmark.py --sizes 1000 10000 --baseline HEAD~1
+"""
+
+import argparse
+import gc
+import os
+import random
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from reader import ScheduleClass
+from scheduler_base import ScheduleOptimizer
+from model_variables import create_variables
+from room_assignment import create_room_presence
+from schedule_logging import SILENT, configure
+
+DAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa"]
+
+
+def load_scheduler_module(revision):
+    """
+    Загружает scheduler_base.py из ревизии git как отдельный модуль.
+
+    Args:
+        revision: Ревизия git (например, HEAD~1)
+
+    Returns:
+        module: Модуль с ScheduleOptimizer из этой ревизии
+    """
+    source = subprocess.run(
+        ["git", "show", f"{revision}:scheduler_base.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType(f"scheduler_base_{revision}")
+    module.__file__ = f"{revision}:scheduler_base.py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def generate_classes(num_classes, seed=42):
+    """
+    Генерирует синтетический список занятий: фиксированное время, окна и
+    свободное время, часть без фиксированного дня и с альтернативными
+    аудиториями.
+
+    Args:
+        num_classes: Количество занятий
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        list: Список ScheduleClass
+    """
+    rng = random.Random(seed)
+    num_teachers = max(2, num_classes // 6)
+    num_groups = max(2, num_classes // 8)
+    num_rooms = max(2, num_classes // 5)
+
+    classes = []
+    for idx in range(num_classes):
+        duration = rng.choice([45, 60, 90])
+        start_time = end_time = None
+        kind = rng.random()
+        if kind < 0.7:
+            start_minutes = 8 * 60 + rng.randrange(0, (20 * 60 - duration - 8 * 60) // 15) * 15
+            start_time = f"{start_minutes // 60:02d}:{start_minutes % 60:02d}"
+            if kind < 0.25:
+                end_minutes = min(20 * 60, start_minutes + duration + rng.choice([30, 60, 120]))
+                end_time = f"{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+
+        alternative_rooms = []
+        if rng.random() < 0.3:
+            alternative_rooms.append(f"R{rng.randrange(num_rooms)}")
+
+        classes.append(ScheduleClass(
+            subject=f"S{rng.randrange(20)}",
+            group=f"{rng.randrange(1, num_groups + 1)}A",
+            # create_variables ставит занятие с окном после фиксированных занятий
+            # того же преподавателя в этот день; свой преподаватель сохраняет модель разрешимой
+            teacher=f"W{idx}" if end_time else f"T{rng.randrange(num_teachers)}",
+            main_room=f"R{rng.randrange(num_rooms)}",
+            alternative_rooms=alternative_rooms,
+            building="B",
+            duration=duration,
+            day=rng.choice(DAYS) if rng.random() < 0.8 else None,
+            start_time=start_time,
+            end_time=end_time,
+        ))
+    # Хотя бы одно занятие в каждый день: день без фиксированных занятий не попадает в day_indices
+    for day, c in zip(DAYS, classes):
+        c.day = day
+    return classes
+
+
+def solve_variables_only(classes):
+    """
+    Строит модель из переменных занятий и литералов аудиторий и решает ее.
+
+    Returns:
+        tuple: (ScheduleOptimizer, CpSolver с найденным решением)
+    """
+    optimizer = ScheduleOptimizer(classes)
+    optimizer.model = cp_model.CpModel()
+    create_variables(optimizer)
+    create_room_presence(optimizer)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(optimizer.model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise RuntimeError(f"Variables-only model not solved: {solver.StatusName(status)}")
+    return optimizer, solver
+
+
+def pandas_summary(solution):
+    """Сводка print_solution_summary до колоночного решения (DataFrame из словарей)."""
+    schedule_df = pd.DataFrame(list(solution))
+    day_counts = schedule_df["day"].value_counts().to_dict()
+    teacher_counts = schedule_df["teacher"].value_counts().to_dict()
+    room_counts = schedule_df["room"].value_counts().to_dict()
+    schedule_df["hour"] = schedule_df["start_time"].str.split(":").str[0].astype(int)
+    hour_counts = schedule_df["hour"].value_counts().to_dict()
+    return day_counts, teacher_counts, room_counts, hour_counts
+
+
+def table_summary(table):
+    """Сводка print_solution_summary по колонкам SolutionTable."""
+    return tuple(table.counts(column) for column in ("day", "teacher", "room", "hour"))
+
+
+def best_time(function, repeat):
+    """Лучшее время function() из repeat запусков и результат последнего."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solution decoding benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=None,
+                        help="git revision whose decode_solution is timed for comparison (e.g. HEAD~1)")
+    args = parser.parse_args()
+
+    configure(level=SILENT)
+    baseline = load_scheduler_module(args.baseline) if args.baseline else None
+
+    print(f"{'classes':>8} {'variables':>10} {'step':>12} {'seconds':>9}")
+    for size in args.sizes:
+        optimizer, solver = solve_variables_only(generate_classes(size, seed=args.seed))
+        variables = len(optimizer.model.Proto().variables)
+
+        def first_decode():
+            optimizer._decode_plan = None
+            return optimizer.decode_solution(solver)
+
+        # Каждый замер начинается с нового SolutionTable: представления кешируются
+        steps = [
+            ("first", first_decode),
+            ("decode", lambda: optimizer.decode_solution(solver)),
+            ("records", lambda: optimizer.decode_solution(solver).records()),
+            ("dataframe", lambda: optimizer.decode_solution(solver).to_dataframe()),
+            ("summary", lambda: table_summary(optimizer.decode_solution(solver))),
+        ]
+        results = {}
+        for label, function in steps:
+            seconds, results[label] = best_time(function, args.repeat)
+            print(f"{size:>8} {variables:>10} {label:>12} {seconds:>9.4f}")
+
+        records = results["records"]
+        seconds, expected_summary = best_time(lambda: pandas_summary(records), args.repeat)
+        print(f"{size:>8} {variables:>10} {'pandas':>12} {seconds:>9.4f}")
+        same = (results["dataframe"].to_dict("records") == records
+                and results["summary"] == expected_summary)
+
+        if baseline is not None:
+            seconds, expected = best_time(
+                lambda: baseline.ScheduleOptimizer.decode_solution(optimizer, solver), args.repeat)
+            print(f"{size:>8} {variables:>10} {args.baseline:>12} {seconds:>9.4f}")
+            same = same and records == expected
+        print(f"{'':>8} identical assignments and summary: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,13 @@
 """
 
 from time_utils import time_to_minutes, minutes_to_time
-from timewindow_utils import find_slot_for_time
-from linked_chain_utils import get_linked_chain_order
+from linked_chain_utils import get_chain_pair_order
 from effective_bounds_utils import (
-    set_effective_bounds, get_effective_bounds, update_bounds_from_constraint,
-    time_to_slot, slot_to_time
+    set_effective_bounds, get_effective_bounds, update_bounds_from_constraint
 )
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 
 class ConstraintManager:
@@ -52,7 +53,7 @@ class ConstraintManager:
             description: Описание ограничения для отладки
         """
         if pair_key and pair_key in self.applied_constraints:
-            print(f"  Skipping duplicate constraint {constraint_type} for {pair_key}")
+            log.debug("  Skipping duplicate constraint {} for {}", constraint_type, pair_key)
             return False
         
         # Добавляем ограничение
@@ -74,7 +75,7 @@ class ConstraintManager:
         }
         
         if description:
-            print(f"  Added {constraint_type} constraint: {description}")
+            log.debug("  Added {} constraint: {}", constraint_type, description)
         
         return True
     
@@ -96,16 +97,16 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
         optimizer: Экземпляр ScheduleOptimizer
         placement_plan: Объект PlacementPlan с планом размещения цепочки
     """
-    print("Adding chain sequence constraints...")
+    log.debug("Adding chain sequence constraints...")
     
     # Инициализируем linked_chains если еще не сделано
     if not hasattr(optimizer, 'linked_chains'):
-        print("  Initializing linked chains...")
+        log.debug("  Initializing linked chains...")
         from linked_chain_utils import build_linked_chains
         build_linked_chains(optimizer)
     
     if not placement_plan.is_valid:
-        print("  Chain plan is not valid, skipping")
+        log.debug("  Chain plan is not valid, skipping")
         return
     
     manager = ConstraintManager(optimizer)
@@ -117,7 +118,7 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
     else:
         chain_order = [p['class_idx'] for p in placements]
     
-    print(f"  Processing chain with {len(placements)} classes")
+    log.debug("  Processing chain with {} classes", len(placements))
     
     # Добавляем ограничения последовательности между соседними элементами цепочки
     for i in range(len(placements) - 1):
@@ -170,7 +171,7 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
     for placement in placements:
         class_idx = placement['class_idx']
         optimizer.chain_constraints_applied.add(class_idx)
-        print(f"  Marked class {class_idx} as having chain constraints applied")
+        log.debug("  Marked class {} as having chain constraints applied", class_idx)
     
     # Добавляем ограничения на временные окна для цепочки с учетом последовательности
     chain_start_time = None
@@ -181,9 +182,9 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
         class_idx = placement['class_idx']
         c = optimizer.classes[class_idx]
         if c.start_time and c.end_time:
-            if chain_start_time is None or time_to_minutes(c.start_time) < time_to_minutes(chain_start_time):
+            if chain_start_time is None or c.start_minutes < time_to_minutes(chain_start_time):
                 chain_start_time = c.start_time
-            if chain_end_time is None or time_to_minutes(c.end_time) > time_to_minutes(chain_end_time):
+            if chain_end_time is None or c.end_minutes > time_to_minutes(chain_end_time):
                 chain_end_time = c.end_time
     
     if chain_start_time and chain_end_time:
@@ -191,12 +192,11 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
         chain_start_slot = None
         chain_end_slot = None
         
-        for slot_idx, slot_time in enumerate(optimizer.time_slots):
-            if chain_start_slot is None and time_to_minutes(slot_time) >= time_to_minutes(chain_start_time):
-                chain_start_slot = slot_idx
-            if chain_end_slot is None and time_to_minutes(slot_time) >= time_to_minutes(chain_end_time):
-                chain_end_slot = slot_idx
-                break
+        # Первые слоты не раньше границ; конец цепочки после сетки - границ нет
+        grid = optimizer.time_grid
+        if time_to_minutes(chain_end_time) <= grid.end_minutes:
+            chain_start_slot = grid.time_to_slot(chain_start_time, 'ceil')
+            chain_end_slot = grid.time_to_slot(chain_end_time, 'ceil')
         
         if chain_start_slot is not None and chain_end_slot is not None:
             # Рассчитываем правильные границы для каждого класса в цепочке
@@ -225,7 +225,7 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
                 # Добавляем ограничения
                 if min_start_slot == max_start_slot:
                     # Строгое равенство - занятие должно начаться в конкретное время
-                    print(f"DEBUG: Setting FIXED start time for class {class_idx} at slot {min_start_slot}")
+                    log.debug("DEBUG: Setting FIXED start time for class {} at slot {}", class_idx, min_start_slot)
                     constraint_expr = optimizer.model.Add(optimizer.start_vars[class_idx] == min_start_slot)
                     
                     # Используем централизованное логирование
@@ -287,7 +287,7 @@ def add_chain_sequence_constraints(optimizer, placement_plan):
                     current_min_slot = min_start_slot + duration_slots + pause_after_slots + pause_before_slots
     
     stats = manager.get_stats()
-    print(f"  Added {stats['sequential']} sequential constraints, {stats['window_bounds']} window constraints")
+    log.debug("  Added {} sequential constraints, {} window constraints", stats['sequential'], stats['window_bounds'])
 
 
 def add_anchor_constraints(optimizer, placement_plan):
@@ -298,22 +298,22 @@ def add_anchor_constraints(optimizer, placement_plan):
         optimizer: Экземпляр ScheduleOptimizer
         placement_plan: Объект PlacementPlan с планом размещения относительно якорей
     """
-    print("Adding anchor constraints...")
+    log.debug("Adding anchor constraints...")
     
     # Инициализируем linked_chains если еще не сделано
     if not hasattr(optimizer, 'linked_chains'):
-        print("  Initializing linked chains...")
+        log.debug("  Initializing linked chains...")
         from linked_chain_utils import build_linked_chains
         build_linked_chains(optimizer)
     
     if not placement_plan.is_valid:
-        print("  Anchor plan is not valid, skipping")
+        log.debug("  Anchor plan is not valid, skipping")
         return
     
     manager = ConstraintManager(optimizer)
     placements = placement_plan.placements
     
-    print(f"  Processing {len(placements)} anchor-based placements")
+    log.debug("  Processing {} anchor-based placements", len(placements))
     
     for placement in placements:
         class_idx = placement['class_idx']
@@ -355,7 +355,7 @@ def add_anchor_constraints(optimizer, placement_plan):
                                      f"Free slot upper bound: class {class_idx} <= slot {max_start_slot}")
     
     stats = manager.get_stats()
-    print(f"  Added {stats['anchor']} anchor constraints")
+    log.debug("  Added {} anchor constraints", stats['anchor'])
 
 
 def add_flexible_constraints(optimizer, placement_plan):
@@ -366,11 +366,11 @@ def add_flexible_constraints(optimizer, placement_plan):
         optimizer: Экземпляр ScheduleOptimizer
         placement_plan: Объект PlacementPlan с планом гибкого размещения
     """
-    print("Adding flexible separation constraints...")
+    log.debug("Adding flexible separation constraints...")
     
     # Инициализируем linked_chains если еще не сделано
     if not hasattr(optimizer, 'linked_chains'):
-        print("  Initializing linked chains...")
+        log.debug("  Initializing linked chains...")
         from linked_chain_utils import build_linked_chains
         build_linked_chains(optimizer)
     
@@ -382,7 +382,7 @@ def add_flexible_constraints(optimizer, placement_plan):
     else:
         classes_list = []
     
-    print(f"  Processing {len(classes_list)} classes for flexible constraints")
+    log.debug("  Processing {} classes for flexible constraints", len(classes_list))
     
     # Добавляем ограничения между всеми парами классов
     for i in range(len(classes_list)):
@@ -397,7 +397,7 @@ def add_flexible_constraints(optimizer, placement_plan):
                 continue
             
             # Проверяем, являются ли классы частью связанной цепочки
-            in_same_chain, chain_order = get_linked_chain_order(optimizer, idx_i, idx_j)
+            in_same_chain, chain_order = get_chain_pair_order(optimizer, idx_i, idx_j)
             
             if in_same_chain and chain_order != 0:
                 # Для связанных классов добавляем одностороннее ограничение
@@ -407,7 +407,7 @@ def add_flexible_constraints(optimizer, placement_plan):
                 add_bidirectional_constraint(optimizer, idx_i, idx_j, c_i, c_j, manager)
     
     stats = manager.get_stats()
-    print(f"  Added {stats['separation']} separation constraints")
+    log.debug("  Added {} separation constraints", stats['separation'])
 
 
 def add_one_way_constraint(optimizer, idx_i, idx_j, c_i, c_j, order, manager):
@@ -492,7 +492,7 @@ def add_bidirectional_constraint(optimizer, idx_i, idx_j, c_i, c_j, manager):
     manager.applied_constraints[pair_key] = [constraint1, constraint2]
     manager.optimizer.applied_constraints[pair_key] = [constraint1, constraint2]
     
-    print(f"  Added bidirectional constraint: classes {idx_i} and {idx_j}")
+    log.debug("  Added bidirectional constraint: classes {} and {}", idx_i, idx_j)
 
 
 def add_window_bounds_constraints(optimizer, class_idx, manager=None):
@@ -513,12 +513,12 @@ def add_window_bounds_constraints(optimizer, class_idx, manager=None):
     
     # Проверяем, что это класс с временным окном
     if not (c.start_time and c.end_time):
-        print(f"  Class {class_idx} has no time window, skipping")
+        log.debug("  Class {} has no time window, skipping", class_idx)
         return
     
     # Проверяем, что переменная не зафиксирована
     if isinstance(optimizer.start_vars[class_idx], int):
-        print(f"  Class {class_idx} start time is fixed, updating effective bounds only")
+        log.debug("  Class {} start time is fixed, updating effective bounds only", class_idx)
         # Обновляем эффективные границы для фиксированного времени
         fixed_slot = optimizer.start_vars[class_idx]
         set_effective_bounds(optimizer, class_idx, fixed_slot, fixed_slot, 
@@ -529,8 +529,8 @@ def add_window_bounds_constraints(optimizer, class_idx, manager=None):
     window_end_time = c.end_time
     
     # Находим соответствующие временные слоты
-    window_start_slot = time_to_slot(optimizer, window_start_time)
-    window_end_slot = time_to_slot(optimizer, window_end_time)
+    window_start_slot = optimizer.class_start_slots[class_idx]
+    window_end_slot = optimizer.class_end_slots[class_idx]
     
     if window_start_slot is not None and window_end_slot is not None:
         # Рассчитываем максимальное время начала, чтобы уложиться в окно
@@ -569,10 +569,10 @@ def add_window_bounds_constraints(optimizer, class_idx, manager=None):
         manager.add_constraint('window_bounds', constraint2, None,
                              f"Window upper bound: class {class_idx} <= slot {max_start_slot}")
         
-        print(f"  Added window constraints for class {class_idx}: start between slots {window_start_slot} and {max_start_slot}")
-        print(f"  Effective bounds: {slot_to_time(optimizer, window_start_slot)} - {slot_to_time(optimizer, max_start_slot)}")
+        log.debug("  Added window constraints for class {}: start between slots {} and {}", class_idx, window_start_slot, max_start_slot)
+        log.debug("  Effective bounds: {} - {}", optimizer.time_grid.slot_to_time(window_start_slot), optimizer.time_grid.slot_to_time(max_start_slot))
     else:
-        print(f"  Could not determine time slots for class {class_idx} window {window_start_time}-{window_end_time}")
+        log.debug("  Could not determine time slots for class {} window {}-{}", class_idx, window_start_time, window_end_time)
 
 
 def apply_placement_constraints(optimizer, placement_plan):
@@ -583,7 +583,7 @@ def apply_placement_constraints(optimizer, placement_plan):
         optimizer: Экземпляр ScheduleOptimizer
         placement_plan: Объект PlacementPlan или словарь с планом
     """
-    print("Applying placement constraints...")
+    log.debug("Applying placement constraints...")
     
     if hasattr(placement_plan, 'plan_type'):
         # Объект PlacementPlan
@@ -595,10 +595,10 @@ def apply_placement_constraints(optimizer, placement_plan):
         success = placement_plan.get('success', False)
     
     if not success:
-        print(f"  Plan type '{plan_type}' is not valid, skipping")
+        log.debug("  Plan type '{}' is not valid, skipping", plan_type)
         return
     
-    print(f"  Applying constraints for plan type: {plan_type}")
+    log.debug("  Applying constraints for plan type: {}", plan_type)
     
     if plan_type == 'sequential':
         add_chain_sequence_constraints(optimizer, placement_plan)
@@ -609,7 +609,7 @@ def apply_placement_constraints(optimizer, placement_plan):
     elif plan_type == 'flexible':
         add_flexible_constraints(optimizer, placement_plan)
     else:
-        print(f"  Unknown plan type: {plan_type}")
+        log.debug("  Unknown plan type: {}", plan_type)
 
 
 def get_constraints_summary(optimizer):
@@ -2,9 +2,13 @@
 Вспомогательные утилиты для работы с цепочками занятий.
 
 Этот модуль содержит улучшенные функции для сборки полных цепочек
-из любого звена и управления кешем окон цепочек.
+из любого звена и инвалидации окон цепочек оптимизатора (optimizer.chain_index).
 """
 
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
+
 __all__ = ['collect_full_chain_from_any_member', 'invalidate_chain_window', 'find_chain_root']
 
 
@@ -25,7 +29,7 @@ def find_chain_root(schedule_class):
     while hasattr(current, 'previous_class') and current.previous_class:
         # Защита от циклических ссылок
         if id(current) in visited:
-            print(f"Warning: Circular reference detected in chain at {current.subject}")
+            log.warning("Warning: Circular reference detected in chain at {}", current.subject)
             break
         
         visited.add(id(current))
@@ -41,7 +45,7 @@ def _collect_full_chain_internal(root):
     result = []
     visited = set()
     
-    def dfs(current_class, parent=None):
+    def dfs(current_class):
         """Рекурсивный обход в глубину"""
         if id(current_class) in visited:
             return  # Избегаем циклических ссылок
@@ -49,17 +53,10 @@ def _collect_full_chain_internal(root):
         visited.add(id(current_class))
         result.append(current_class)
         
-        # Устанавливаем связь с родителем
-        current_class.previous = parent
-        
-        # Инициализируем список детей
-        current_class.next_list = []
-        
         # Обходим всех связанных детей
         if hasattr(current_class, 'linked_classes') and current_class.linked_classes:
             for linked_class in current_class.linked_classes:
-                current_class.next_list.append(linked_class)
-                dfs(linked_class, current_class)
+                dfs(linked_class)
     
     # Начинаем обход с корневого класса
     dfs(root)
@@ -92,86 +89,36 @@ def collect_full_chain_from_any_member(schedule_class):
         return _collect_full_chain_internal(root)
 
 
-def invalidate_chain_window(schedule_class):
+def invalidate_chain_window(optimizer, schedule_class):
     """
-    Инвалидирует кеш окна цепочки для цепочки, содержащей данное занятие.
+    Инвалидирует кешированные окна цепочек, содержащих данное занятие.
     
     Args:
+        optimizer: Экземпляр ScheduleOptimizer (окна хранятся в optimizer.chain_index)
         schedule_class: Любой элемент цепочки, окно которой нужно пересчитать
     """
-    # Импортируем функции для работы с кешем окон
-    try:
-        from linked_chain_utils import _chain_windows_cache
-        
-        # Получаем полную цепочку для определения всех индексов
-        try:
-            full_chain = collect_full_chain_from_any_member(schedule_class)
-            
-            # Если удается найти optimizer, то инвалидируем только конкретную цепочку
-            # Пока что используем простую стратегию - попробуем найти глобальный optimizer
-            import sys
-            optimizer = None
-            for name, obj in sys.modules.items():
-                if hasattr(obj, '__dict__'):
-                    for attr_name, attr_value in obj.__dict__.items():
-                        if hasattr(attr_value, 'classes') and hasattr(attr_value, '_chain_windows_cache'):
-                            # Нашли optimizer-подобный объект
-                            optimizer = attr_value
-                            break
-                    if optimizer:
-                        break
-            
-            if optimizer:
-                # Пытаемся найти индексы для точечной инвалидации
-                try:
-                    chain_indices = []
-                    for class_obj in full_chain:
-                        idx = optimizer.classes.index(class_obj)
-                        chain_indices.append(idx)
-                    
-                    # Инвалидируем только этот ключ кеша
-                    cache_key = tuple(sorted(chain_indices))
-                    if cache_key in _chain_windows_cache:
-                        del _chain_windows_cache[cache_key]
-                        print(f"Invalidated specific chain window cache for {len(chain_indices)} classes: {[c.subject for c in full_chain]}")
-                        return
-                        
-                except (ValueError, AttributeError):
-                    pass  # Fallback к полной очистке
-        
-        except Exception:
-            pass  # Fallback к полной очистке
-        
-        # Fallback: полная очистка кеша
-        from linked_chain_utils import clear_chain_windows_cache
-        clear_chain_windows_cache()
-        print(f"Chain window cache invalidated for class: {schedule_class.subject} (full cache clear)")
-        
-    except ImportError:
-        print("Warning: Could not import chain window cache functions")
+    idx = optimizer.object_index_map.get(schedule_class)
+    if idx is None:
+        return
+    for chain_id in optimizer.chain_index.chain_ids(idx):
+        optimizer.chain_index.invalidate(chain_id)
+        if log.is_enabled(DEBUG):
+            log.debug("Invalidated chain window {} for class: {}", chain_id, schedule_class.subject)
 
 
 def invalidate_chain_windows_by_indices(optimizer, chain_indices):
     """
-    Инвалидирует кеш окна для конкретной цепочки по индексам.
+    Инвалидирует кешированные окна цепочек, содержащих занятия с данными индексами.
     
     Args:
         optimizer: Экземпляр ScheduleOptimizer
         chain_indices: Список индексов занятий в цепочке
     """
-    try:
-        from linked_chain_utils import _chain_windows_cache
-        
-        # Создаем ключ для кеширования
-        cache_key = tuple(sorted(chain_indices))
-        
-        # Удаляем из кеша если присутствует
-        if cache_key in _chain_windows_cache:
-            del _chain_windows_cache[cache_key]
-            print(f"Invalidated chain window cache for indices: {chain_indices}")
-        
-    except ImportError:
-        print("Warning: Could not access chain window cache")
+    chain_index = optimizer.chain_index
+    for idx in chain_indices:
+        for chain_id in chain_index.chain_ids(idx):
+            chain_index.invalidate(chain_id)
+    log.debug("Invalidated chain window cache for indices: {}", chain_indices)
 
 
 def get_chain_members_from_any(schedule_class):
@@ -258,19 +205,19 @@ def validate_chain_integrity(schedule_class, verbose=False):
                     result['is_valid'] = False
         
         if verbose:
-            print(f"Chain validation for {schedule_class.subject}:")
-            print(f"  Valid: {result['is_valid']}")
-            print(f"  Length: {result['chain_length']}")
+            log.debug("Chain validation for {}:", schedule_class.subject)
+            log.debug("  Valid: {}", result['is_valid'])
+            log.debug("  Length: {}", result['chain_length'])
             if result['errors']:
-                print(f"  Errors: {result['errors']}")
+                log.debug("  Errors: {}", result['errors'])
             if result['warnings']:
-                print(f"  Warnings: {result['warnings']}")
+                log.warning("  Warnings: {}", result['warnings'])
                 
     except Exception as e:
         result['is_valid'] = False
         result['errors'].append(f"Validation exception: {str(e)}")
         
         if verbose:
-            print(f"Chain validation failed for {schedule_class.subject}: {e}")
+            log.debug("Chain validation failed for {}: {}", schedule_class.subject, e)
     
     return result
@@ -0,0 +1,152 @@
+"""
+Декомпозиция задачи расписания по компонентам связности графа конфликтов.
+
+Вершины графа - занятия, ребро соединяет два занятия одного дня, если у них
+общий преподаватель, общая группа или общая возможная аудитория (те же
+критерии, по которым add_resource_conflict_constraints и pair_index ищут
+пары), а также занятия одной связанной цепочки (optimizer.linked_chains,
+linked_classes). Занятия разных компонент не связаны ни одним ограничением,
+а термы целевой функции (objective.add_objective_function) строятся по
+преподавателю и дню, поэтому каждая компонента решается отдельной моделью,
+а сумма их оптимумов равна оптимуму общей модели.
+
+Компоненты решаются через day_decomposition.solve_partition: параллельно в
+процессах или (max_workers=1) по очереди, начиная с самых маленьких.
+"""
+
+from typing import Dict, List, Optional
+
+from day_decomposition import solve_partition
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['find_components', 'partition_by_component', 'solve_by_component']
+
+
+def _find(parent, idx):
+    """Корень множества с сжатием путей."""
+    root = idx
+    while parent[root] != root:
+        root = parent[root]
+    while parent[idx] != root:
+        parent[idx], idx = root, parent[idx]
+    return root
+
+
+def _union_all(parent, members):
+    """Объединяет все индексы members в одно множество."""
+    if len(members) < 2:
+        return
+    root = _find(parent, members[0])
+    for idx in members[1:]:
+        other = _find(parent, idx)
+        if other != root:
+            parent[other] = root
+
+
+def find_components(optimizer) -> List[List[int]]:
+    """
+    Находит компоненты связности графа конфликтов.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+
+    Returns:
+        List[List[int]]: Компоненты (отсортированные индексы занятий) в порядке
+        наименьшего индекса
+    """
+    if not hasattr(optimizer, 'linked_chains'):
+        from linked_chain_utils import build_linked_chains
+        build_linked_chains(optimizer)
+
+    classes = optimizer.classes
+    parent = list(range(len(classes)))
+
+    # Корзины (день, ресурс): все занятия корзины попадают в одну компоненту
+    buckets = {}
+    for idx, c in enumerate(classes):
+        if c.teacher:
+            buckets.setdefault((c.day, 'teacher', c.teacher_id), []).append(idx)
+        for group_id in c.group_ids:
+            buckets.setdefault((c.day, 'group', group_id), []).append(idx)
+        for room_id in c.room_ids:
+            buckets.setdefault((c.day, 'room', room_id), []).append(idx)
+    for members in buckets.values():
+        _union_all(parent, members)
+
+    # Связанные цепочки
+    for chain in optimizer.linked_chains:
+        _union_all(parent, list(chain))
+    for idx, c in enumerate(classes):
+        linked = list(getattr(c, 'linked_classes', None) or [])
+        for other in (getattr(c, 'previous_class', None), getattr(c, 'next_class', None)):
+            if other is not None:
+                linked.append(other)
+        for other in linked:
+            other_idx = optimizer.object_index_map.get(other)
+            if other_idx is not None:
+                _union_all(parent, [idx, other_idx])
+
+    components = {}
+    for idx in range(len(classes)):
+        components.setdefault(_find(parent, idx), []).append(idx)
+    return list(components.values())
+
+
+def partition_by_component(optimizer) -> Optional[Dict[str, List[int]]]:
+    """
+    Разбивает занятия на компоненты связности с метками вида "Mi#2".
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+
+    Returns:
+        Dict[str, List[int]]: {метка: индексы занятий}, или None, если у
+        какого-либо занятия день не задан (его день - переменная модели, и
+        компонента зависела бы от набора дней общей модели)
+    """
+    for idx, c in enumerate(optimizer.classes):
+        if not c.day:
+            log.info("  Component decomposition disabled: class {} ({}) has no fixed day", idx, c.subject)
+            return None
+
+    partition = {}
+    per_day = {}
+    for component in find_components(optimizer):
+        day = optimizer.classes[component[0]].day
+        per_day[day] = per_day.get(day, 0) + 1
+        partition[f"{day}#{per_day[day]}"] = component
+    return partition
+
+
+def solve_by_component(optimizer, time_limit_seconds=60, max_workers=None):
+    """
+    Решает каждую компоненту связности отдельной моделью и объединяет результаты.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer (модель еще не построена)
+        time_limit_seconds: Ограничение времени решения одной компоненты
+        max_workers: Число процессов; 1 - по очереди в текущем процессе,
+            начиная с самых маленьких компонент; None - по числу CPU
+
+    Returns:
+        bool или None: True/False - результат решения по компонентам,
+        None - декомпозиция невозможна или не нужна (одна компонента)
+    """
+    partition = partition_by_component(optimizer)
+    if partition is None:
+        return None
+
+    sizes = sorted(len(indices) for indices in partition.values())
+    log.info("  Conflict graph: {} components (largest {}, smallest {} classes)",
+             len(partition), sizes[-1] if sizes else 0, sizes[0] if sizes else 0,
+             event="conflict_components", components=len(partition),
+             largest=sizes[-1] if sizes else 0)
+    if len(partition) < 2:
+        log.info("  Component decomposition skipped: the conflict graph is connected")
+        return None
+
+    success = solve_partition(optimizer, partition, time_limit_seconds, max_workers, kind='component')
+    optimizer.component_results = optimizer.part_results
+    return success
@@ -2,12 +2,15 @@
 Модуль для обнаружения потенциальных конфликтов в расписании.
 """
 
-from time_utils import time_to_minutes, minutes_to_time
+from time_utils import minutes_to_time
 from sequential_scheduling import can_schedule_sequentially
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 def check_potential_conflicts(optimizer):
     """Check for obvious conflicts before building the model."""
-    print("\nChecking for potential scheduling conflicts...")
+    log.info("\nChecking for potential scheduling conflicts...")
     
     # Для каждого преподавателя проверяем конфликты в одно и то же время
     teachers_classes = {}
@@ -34,100 +37,98 @@ def check_potential_conflicts(optimizer):
                 for i, (idx_i, c_i) in enumerate(day_classes_list):
                     # Для занятий с фиксированным временем начала
                     if c_i.start_time and not c_i.end_time:
-                        start_i = time_to_minutes(c_i.start_time)
+                        start_i = c_i.start_minutes
                         end_i = start_i + c_i.duration + c_i.pause_after
                         
                         for j, (idx_j, c_j) in enumerate(day_classes_list):
                             if i != j:  # Не сравниваем занятие с самим собой
                                 # Если второе занятие тоже с фиксированным временем
                                 if c_j.start_time and not c_j.end_time:
-                                    start_j = time_to_minutes(c_j.start_time)
+                                    start_j = c_j.start_minutes
                                     end_j = start_j + c_j.duration + c_j.pause_after
                                     
                                     # Проверяем пересечение
                                     if (start_i < end_j and start_j < end_i):
                                         # Проверяем, не разные ли группы у этих занятий
-                                        shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+                                        shared_groups = set(c_i.group_set & c_j.group_set)
                                         
                                         if shared_groups:
-                                            print(f"\nCONFLICT DETECTED: Teacher {teacher} has overlapping classes with shared groups:")
-                                            print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} for groups {c_i.get_groups()} at {c_i.start_time} ({c_i.duration} min)")
-                                            print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} for groups {c_j.get_groups()} at {c_j.start_time} ({c_j.duration} min)")
-                                            print(f"  Time ranges: {minutes_to_time(start_i)}-{minutes_to_time(end_i)} and {minutes_to_time(start_j)}-{minutes_to_time(end_j)}")
-                                            print(f"  Shared groups: {shared_groups}")
-                                            print(f"  These classes cannot be scheduled together with current constraints.")
+                                            log.warning("\nCONFLICT DETECTED: Teacher {} has overlapping classes with shared groups:", teacher)
+                                            log.warning("  Class {}: {} - {} - {} for groups {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.get_groups(), c_i.start_time, c_i.duration)
+                                            log.warning("  Class {}: {} - {} - {} for groups {} at {} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.get_groups(), c_j.start_time, c_j.duration)
+                                            log.warning("  Time ranges: {}-{} and {}-{}", minutes_to_time(start_i), minutes_to_time(end_i), minutes_to_time(start_j), minutes_to_time(end_j))
+                                            log.warning("  Shared groups: {}", shared_groups)
+                                            log.warning("  These classes cannot be scheduled together with current constraints.")
                                         else:
                                             # Если группы разные, проверяем аудитории
-                                            shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
+                                            shared_rooms = set(c_i.room_set & c_j.room_set)
                                             
                                             if shared_rooms and len(c_i.possible_rooms) == 1 and len(c_j.possible_rooms) == 1:
-                                                print(f"\nCONFLICT DETECTED: Teacher {teacher} has overlapping classes in the same fixed room:")
-                                                print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} for groups {c_i.get_groups()} at {c_i.start_time} ({c_i.duration} min)")
-                                                print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} for groups {c_j.get_groups()} at {c_j.start_time} ({c_j.duration} min)")
-                                                print(f"  Both classes are fixed to room(s): {shared_rooms}")
-                                                print(f"  Time ranges: {minutes_to_time(start_i)}-{minutes_to_time(end_i)} and {minutes_to_time(start_j)}-{minutes_to_time(end_j)}")
+                                                log.warning("\nCONFLICT DETECTED: Teacher {} has overlapping classes in the same fixed room:", teacher)
+                                                log.warning("  Class {}: {} - {} - {} for groups {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.get_groups(), c_i.start_time, c_i.duration)
+                                                log.warning("  Class {}: {} - {} - {} for groups {} at {} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.get_groups(), c_j.start_time, c_j.duration)
+                                                log.warning("  Both classes are fixed to room(s): {}", shared_rooms)
+                                                log.warning("  Time ranges: {}-{} and {}-{}", minutes_to_time(start_i), minutes_to_time(end_i), minutes_to_time(start_j), minutes_to_time(end_j))
                                             else:
-                                                print(f"\nNOTE: Teacher {teacher} has overlapping classes but with different groups and different rooms possible:")
-                                                print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} for groups {c_i.get_groups()} at {c_i.start_time} ({c_i.duration} min)")
-                                                print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} for groups {c_j.get_groups()} at {c_j.start_time} ({c_j.duration} min)")
-                                                print(f"  Class {idx_i} rooms: {c_i.possible_rooms}")
-                                                print(f"  Class {idx_j} rooms: {c_j.possible_rooms}")
-                                                print(f"  This may be intentional (teacher teaching multiple groups in different rooms).")
+                                                log.debug("\nNOTE: Teacher {} has overlapping classes but with different groups and different rooms possible:", teacher)
+                                                log.debug("  Class {}: {} - {} - {} for groups {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.get_groups(), c_i.start_time, c_i.duration)
+                                                log.debug("  Class {}: {} - {} - {} for groups {} at {} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.get_groups(), c_j.start_time, c_j.duration)
+                                                log.debug("  Class {} rooms: {}", idx_i, c_i.possible_rooms)
+                                                log.debug("  Class {} rooms: {}", idx_j, c_j.possible_rooms)
+                                                log.debug("  This may be intentional (teacher teaching multiple groups in different rooms).")
                                 
                                 # Если второе занятие с временным окном
                                 elif c_j.start_time and c_j.end_time:
                                     # Проверяем, можно ли разместить оба занятия без конфликта
-                                    shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+                                    shared_groups = set(c_i.group_set & c_j.group_set)
                                     
                                     if shared_groups:
-                                        print(f"\nWARNING: Teacher {teacher} has fixed class and window class with shared groups:")
-                                        print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} for groups {c_i.get_groups()} at {c_i.start_time} ({c_i.duration} min)")
-                                        print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} for groups {c_j.get_groups()} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                        print(f"  Shared groups: {shared_groups}")
-                                        print(f"  These classes must not overlap due to shared groups: {shared_groups}")
+                                        log.warning("\nWARNING: Teacher {} has fixed class and window class with shared groups:", teacher)
+                                        log.warning("  Fixed class {}: {} - {} - {} for groups {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.get_groups(), c_i.start_time, c_i.duration)
+                                        log.warning("  Window class {}: {} - {} - {} for groups {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.get_groups(), c_j.start_time, c_j.end_time, c_j.duration)
+                                        log.warning("  Shared groups: {}", shared_groups)
+                                        log.warning("  These classes must not overlap due to shared groups: {}", shared_groups)
                                     else:
                                         # Используем функцию can_schedule_sequentially для правильной проверки
-                                        can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=True)
+                                        can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=True, cache=optimizer.analysis_cache)
                                         
                                         # New logging for chain & resource gap
                                         if info.get("reason") == "chain_and_resource_gap":
                                             start1, end1 = info["c1_interval"]
                                             start2, end2 = info["c2_interval"]
                                             gap = info["gap"]
-                                            print(f"SEQUENTIAL via chain & resource-gap: "
-                                                  f"{c_i.subject} {start1//60:02d}:{start1%60:02d}-{end1//60:02d}:{end1%60:02d}, "
-                                                  f"{c_j.subject} {start2//60:02d}:{start2%60:02d}-{end2//60:02d}:{end2%60:02d} "
-                                                  f"(gap {gap} min)")
+                                            log.debug("SEQUENTIAL via chain & resource-gap: {} {:02d}:{:02d}-{:02d}:{:02d}, {} {:02d}:{:02d}-{:02d}:{:02d} (gap {} min)",
+                                                      c_i.subject, start1//60, start1%60, end1//60, end1%60, c_j.subject, start2//60, start2%60, end2//60, end2%60, gap)
                                         
-                                        shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
+                                        shared_rooms = set(c_i.room_set & c_j.room_set)
                                         
                                         if shared_rooms and len(c_i.possible_rooms) == 1 and len(c_j.possible_rooms) == 1:
                                             if can_schedule:
-                                                print(f"\nSEQUENTIAL SCHEDULING: Teacher {teacher} can schedule both classes in shared room:")
-                                                print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                                                print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                                print(f"  Shared room: {shared_rooms}")
-                                                print(f"  Scheduling reason: {info['reason']}")
+                                                log.debug("\nSEQUENTIAL SCHEDULING: Teacher {} can schedule both classes in shared room:", teacher)
+                                                log.debug("  Fixed class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                                                log.debug("  Window class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                                log.debug("  Shared room: {}", shared_rooms)
+                                                log.debug("  Scheduling reason: {}", info['reason'])
                                             else:
-                                                print(f"\nPOTENTIAL CONFLICT: Teacher {teacher} may not have enough time for both classes in the same fixed room:")
-                                                print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                                                print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                                print(f"  Shared room: {shared_rooms}")
-                                                print(f"  Conflict reason: {info['reason']}")
+                                                log.warning("\nPOTENTIAL CONFLICT: Teacher {} may not have enough time for both classes in the same fixed room:", teacher)
+                                                log.warning("  Fixed class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                                                log.warning("  Window class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                                log.warning("  Shared room: {}", shared_rooms)
+                                                log.warning("  Conflict reason: {}", info['reason'])
                                                 if info.get('available_time') is not None and info.get('required_time') is not None:
-                                                    print(f"  Available time: {info['available_time']}")
-                                                    print(f"  Required time: {info['required_time']}")
-                                                print(f"  WARNING: There is not enough time to schedule both classes!")
+                                                    log.warning("  Available time: {}", info['available_time'])
+                                                    log.warning("  Required time: {}", info['required_time'])
+                                                log.warning("  WARNING: There is not enough time to schedule both classes!")
                                         else:
-                                            print(f"\nINFO: Teacher {teacher} has fixed class and window class with different groups and room options:")
-                                            print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                                            print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                            print(f"  Class {idx_i} rooms: {c_i.possible_rooms}")
-                                            print(f"  Class {idx_j} rooms: {c_j.possible_rooms}")
-                                            print(f"  These can be scheduled in parallel with different rooms.")
+                                            log.debug("\nINFO: Teacher {} has fixed class and window class with different groups and room options:", teacher)
+                                            log.debug("  Fixed class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                                            log.debug("  Window class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                            log.debug("  Class {} rooms: {}", idx_i, c_i.possible_rooms)
+                                            log.debug("  Class {} rooms: {}", idx_j, c_j.possible_rooms)
+                                            log.debug("  These can be scheduled in parallel with different rooms.")
     
     # Проверка конфликтов аудиторий
-    print("\nChecking for room conflicts...")
+    log.info("\nChecking for room conflicts...")
     room_classes = {}
     for idx, c in enumerate(optimizer.classes):
         for room in c.possible_rooms:
@@ -154,136 +155,132 @@ def check_potential_conflicts(optimizer):
                 
                 # Проверяем конфликты между фиксированными занятиями
                 for i, (idx_i, c_i) in enumerate(fixed_classes):
-                    start_i = time_to_minutes(c_i.start_time)
+                    start_i = c_i.start_minutes
                     end_i = start_i + c_i.duration + c_i.pause_after
                     
                     for j, (idx_j, c_j) in enumerate(fixed_classes[i+1:], i+1):
-                        start_j = time_to_minutes(c_j.start_time)
+                        start_j = c_j.start_minutes
                         end_j = start_j + c_j.duration + c_j.pause_after
                         
                         # Проверяем пересечение
                         if (start_i < end_j and start_j < end_i):
-                            print(f"\nCONFLICT DETECTED: Room {room} has overlapping fixed classes:")
-                            print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                            print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} at {c_j.start_time} ({c_j.duration} min)")
-                            print(f"  Time ranges: {minutes_to_time(start_i)}-{minutes_to_time(end_i)} and {minutes_to_time(start_j)}-{minutes_to_time(end_j)}")
-                            print(f"  These classes cannot be scheduled together in the same room.")
+                            log.warning("\nCONFLICT DETECTED: Room {} has overlapping fixed classes:", room)
+                            log.warning("  Class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                            log.warning("  Class {}: {} - {} - {} at {} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.duration)
+                            log.warning("  Time ranges: {}-{} and {}-{}", minutes_to_time(start_i), minutes_to_time(end_i), minutes_to_time(start_j), minutes_to_time(end_j))
+                            log.warning("  These classes cannot be scheduled together in the same room.")
                 
                 # Проверяем совместимость фиксированных занятий с занятиями с временным окном
                 for idx_i, c_i in fixed_classes:
                     for idx_j, c_j in window_classes:
                         # Используем функцию can_schedule_sequentially для правильной проверки
-                        can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=True)
+                        can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=True, cache=optimizer.analysis_cache)
                         
                         # New logging for chain & resource gap
                         if info.get("reason") == "chain_and_resource_gap":
                             start1, end1 = info["c1_interval"]
                             start2, end2 = info["c2_interval"]
                             gap = info["gap"]
-                            print(f"SEQUENTIAL via chain & resource-gap: "
-                                  f"{c_i.subject} {start1//60:02d}:{start1%60:02d}-{end1//60:02d}:{end1%60:02d}, "
-                                  f"{c_j.subject} {start2//60:02d}:{start2%60:02d}-{end2//60:02d}:{end2%60:02d} "
-                                  f"(gap {gap} min)")
+                            log.debug("SEQUENTIAL via chain & resource-gap: {} {:02d}:{:02d}-{:02d}:{:02d}, {} {:02d}:{:02d}-{:02d}:{:02d} (gap {} min)",
+                                      c_i.subject, start1//60, start1%60, end1//60, end1%60, c_j.subject, start2//60, start2%60, end2//60, end2%60, gap)
                         
                         if can_schedule:
-                            print(f"\nSEQUENTIAL SCHEDULING: Room {room} can fit window class with fixed class:")
-                            print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                            print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                            print(f"  Scheduling reason: {info['reason']}")
+                            log.debug("\nSEQUENTIAL SCHEDULING: Room {} can fit window class with fixed class:", room)
+                            log.debug("  Fixed class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                            log.debug("  Window class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                            log.debug("  Scheduling reason: {}", info['reason'])
                             if info.get('available_time') is not None and info.get('required_time') is not None:
-                                print(f"  Available time: {info['available_time']}")
-                                print(f"  Required time: {info['required_time']}")
+                                log.debug("  Available time: {}", info['available_time'])
+                                log.debug("  Required time: {}", info['required_time'])
                         else:
                             # Проверяем обратный порядок (window -> fixed)
-                            can_schedule_rev, info_rev = can_schedule_sequentially(c_j, c_i, idx_j, idx_i, verbose=True)
+                            can_schedule_rev, info_rev = can_schedule_sequentially(c_j, c_i, idx_j, idx_i, verbose=True, cache=optimizer.analysis_cache)
                             
                             # New logging for chain & resource gap (reverse order)
                             if info_rev.get("reason") == "chain_and_resource_gap":
                                 start1, end1 = info_rev["c1_interval"]
                                 start2, end2 = info_rev["c2_interval"]
                                 gap = info_rev["gap"]
-                                print(f"SEQUENTIAL via chain & resource-gap (reverse): "
-                                      f"{c_j.subject} {start1//60:02d}:{start1%60:02d}-{end1//60:02d}:{end1%60:02d}, "
-                                      f"{c_i.subject} {start2//60:02d}:{start2%60:02d}-{end2//60:02d}:{end2%60:02d} "
-                                      f"(gap {gap} min)")
+                                log.debug("SEQUENTIAL via chain & resource-gap (reverse): {} {:02d}:{:02d}-{:02d}:{:02d}, {} {:02d}:{:02d}-{:02d}:{:02d} (gap {} min)",
+                                          c_j.subject, start1//60, start1%60, end1//60, end1%60, c_i.subject, start2//60, start2%60, end2//60, end2%60, gap)
                             
                             if can_schedule_rev:
-                                print(f"\nSEQUENTIAL SCHEDULING (REVERSE ORDER): Room {room} can fit window before fixed class:")
-                                print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                                print(f"  Scheduling reason: {info_rev['reason']}")
+                                log.debug("\nSEQUENTIAL SCHEDULING (REVERSE ORDER): Room {} can fit window before fixed class:", room)
+                                log.debug("  Window class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                log.debug("  Fixed class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                                log.debug("  Scheduling reason: {}", info_rev['reason'])
                                 if info_rev.get('available_time') is not None and info_rev.get('required_time') is not None:
-                                    print(f"  Available time: {info_rev['available_time']} min, Required time: {info_rev['required_time']} min")
+                                    log.debug("  Available time: {} min, Required time: {} min", info_rev['available_time'], info_rev['required_time'])
                             else:
-                                print(f"\nPOTENTIAL CONFLICT: Room {room} - cannot fit window class around fixed class in either order:")
-                                print(f"  Fixed class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} at {c_i.start_time} ({c_i.duration} min)")
-                                print(f"  Window class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                print(f"  Fixed->Window conflict: {info['reason']}")
+                                log.warning("\nPOTENTIAL CONFLICT: Room {} - cannot fit window class around fixed class in either order:", room)
+                                log.warning("  Fixed class {}: {} - {} - {} at {} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.duration)
+                                log.warning("  Window class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                log.warning("  Fixed->Window conflict: {}", info['reason'])
                                 if info.get('available_time') is not None and info.get('required_time') is not None:
-                                    print(f"  Available time (fixed->window): {info['available_time']}")
-                                    print(f"  Required time: {info['required_time']}")
-                                print(f"  Window->Fixed conflict: {info_rev['reason']}")
+                                    log.warning("  Available time (fixed->window): {}", info['available_time'])
+                                    log.warning("  Required time: {}", info['required_time'])
+                                log.warning("  Window->Fixed conflict: {}", info_rev['reason'])
                                 if info_rev.get('available_time') is not None and info_rev.get('required_time') is not None:
-                                    print(f"  Available time (window->fixed): {info_rev['available_time']}")
-                                    print(f"  Required time: {info_rev['required_time']}")
-                                print(f"  No sufficient time slot found for sequential scheduling")
+                                    log.warning("  Available time (window->fixed): {}", info_rev['available_time'])
+                                    log.warning("  Required time: {}", info_rev['required_time'])
+                                log.warning("  No sufficient time slot found for sequential scheduling")
                 
                 # Проверяем совместимость занятий с временным окном между собой
                 for i, (idx_i, c_i) in enumerate(window_classes):
                     for j, (idx_j, c_j) in enumerate(window_classes[i+1:], i+1):
                         # Используем функцию can_schedule_sequentially для правильной проверки
-                        can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=True)
+                        can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=True, cache=optimizer.analysis_cache)
                         
                         if can_schedule:
-                            print(f"\nSEQUENTIAL SCHEDULING: Room {room} can fit both window classes sequentially:")
-                            print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} with window {c_i.start_time}-{c_i.end_time} ({c_i.duration} min)")
-                            print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                            print(f"  Scheduling reason: {info['reason']}")
+                            log.debug("\nSEQUENTIAL SCHEDULING: Room {} can fit both window classes sequentially:", room)
+                            log.debug("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.end_time, c_i.duration)
+                            log.debug("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                            log.debug("  Scheduling reason: {}", info['reason'])
                             if info.get('common_window'):
-                                print(f"  Common window: {info['common_window']}")
+                                log.debug("  Common window: {}", info['common_window'])
                             if info.get('available_time') is not None and info.get('required_time') is not None:
-                                print(f"  Available time: {info['available_time']}")
-                                print(f"  Required time: {info['required_time']}")
+                                log.debug("  Available time: {}", info['available_time'])
+                                log.debug("  Required time: {}", info['required_time'])
                         else:
                             # Проверяем, нужно ли попробовать обратный порядок для неперекрывающихся окон
                             if info.get('reason') == 'windows_separate_wrong_order':
-                                print(f"\nCHECKING REVERSE ORDER: Trying {c_j.subject} before {c_i.subject}...")
-                                can_schedule_rev, info_rev = can_schedule_sequentially(c_j, c_i, idx_j, idx_i, verbose=True)
+                                log.debug("\nCHECKING REVERSE ORDER: Trying {} before {}...", c_j.subject, c_i.subject)
+                                can_schedule_rev, info_rev = can_schedule_sequentially(c_j, c_i, idx_j, idx_i, verbose=True, cache=optimizer.analysis_cache)
                                 
                                 if can_schedule_rev:
-                                    print(f"\nSEQUENTIAL SCHEDULING (REVERSE ORDER): Room {room} can fit both window classes:")
-                                    print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                    print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} with window {c_i.start_time}-{c_i.end_time} ({c_i.duration} min)")
-                                    print(f"  Scheduling reason: {info_rev['reason']}")
+                                    log.debug("\nSEQUENTIAL SCHEDULING (REVERSE ORDER): Room {} can fit both window classes:", room)
+                                    log.debug("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                    log.debug("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.end_time, c_i.duration)
+                                    log.debug("  Scheduling reason: {}", info_rev['reason'])
                                     if info_rev.get('available_time') is not None and info_rev.get('required_time') is not None:
-                                        print(f"  Available time: {info_rev['available_time']}")
-                                        print(f"  Required time: {info_rev['required_time']}")
+                                        log.debug("  Available time: {}", info_rev['available_time'])
+                                        log.debug("  Required time: {}", info_rev['required_time'])
                                 else:
-                                    print(f"\nPOTENTIAL CONFLICT: Room {room} - classes cannot be scheduled sequentially in either order:")
-                                    print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} with window {c_i.start_time}-{c_i.end_time} ({c_i.duration} min)")
-                                    print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                    print(f"  Forward order conflict: {info['reason']}")
+                                    log.warning("\nPOTENTIAL CONFLICT: Room {} - classes cannot be scheduled sequentially in either order:", room)
+                                    log.warning("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.end_time, c_i.duration)
+                                    log.warning("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                    log.warning("  Forward order conflict: {}", info['reason'])
                                     if info.get('available_time') is not None:
-                                        print(f"  Available time: {info['available_time']}")
-                                        print(f"  Required time: {info.get('required_time', 'N/A')}")
-                                    print(f"  Reverse order conflict: {info_rev['reason']}")
+                                        log.warning("  Available time: {}", info['available_time'])
+                                        log.warning("  Required time: {}", info.get('required_time', 'N/A'))
+                                    log.warning("  Reverse order conflict: {}", info_rev['reason'])
                                     if info_rev.get('available_time') is not None:
-                                        print(f"  Available time (reverse): {info_rev['available_time']}")
-                                        print(f"  Required time: {info_rev.get('required_time', 'N/A')}")
-                                    print(f"  WARNING: These classes cannot be scheduled together in this room!")
+                                        log.warning("  Available time (reverse): {}", info_rev['available_time'])
+                                        log.warning("  Required time: {}", info_rev.get('required_time', 'N/A'))
+                                    log.warning("  WARNING: These classes cannot be scheduled together in this room!")
                             else:
-                                print(f"\nPOTENTIAL CONFLICT: Room {room} - classes cannot be scheduled sequentially:")
-                                print(f"  Class {idx_i}: {c_i.subject} - {c_i.group} - {c_i.teacher} with window {c_i.start_time}-{c_i.end_time} ({c_i.duration} min)")
-                                print(f"  Class {idx_j}: {c_j.subject} - {c_j.group} - {c_j.teacher} with window {c_j.start_time}-{c_j.end_time} ({c_j.duration} min)")
-                                print(f"  Conflict reason: {info['reason']}")
+                                log.warning("\nPOTENTIAL CONFLICT: Room {} - classes cannot be scheduled sequentially:", room)
+                                log.warning("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_i, c_i.subject, c_i.group, c_i.teacher, c_i.start_time, c_i.end_time, c_i.duration)
+                                log.warning("  Class {}: {} - {} - {} with window {}-{} ({} min)", idx_j, c_j.subject, c_j.group, c_j.teacher, c_j.start_time, c_j.end_time, c_j.duration)
+                                log.warning("  Conflict reason: {}", info['reason'])
                                 if info.get('common_window'):
-                                    print(f"  Common window: {info['common_window']}")
+                                    log.warning("  Common window: {}", info['common_window'])
                                 if info.get('available_time') is not None and info.get('required_time') is not None:
-                                    print(f"  Available time: {info['available_time']}")
-                                    print(f"  Required time: {info['required_time']}")
-                                print(f"  WARNING: These classes cannot be scheduled together in this room!")
+                                    log.warning("  Available time: {}", info['available_time'])
+                                    log.warning("  Required time: {}", info['required_time'])
+                                log.warning("  WARNING: These classes cannot be scheduled together in this room!")
     
-    print("\nConflict check completed.")
+    log.info("\nConflict check completed.")
 
 
 def detect_constraint_cycles(optimizer):
@@ -296,7 +293,7 @@ def detect_constraint_cycles(optimizer):
     Returns:
         list: Список обнаруженных циклов
     """
-    print("\nDetecting constraint cycles...")
+    log.info("\nDetecting constraint cycles...")
     
     # Строим граф зависимостей между классами
     dependency_graph = {}
@@ -368,9 +365,9 @@ def detect_constraint_cycles(optimizer):
     
     # Логируем результаты
     if cycles:
-        print(f"WARNING: Detected {len(cycles)} constraint cycles:")
+        log.warning("WARNING: Detected {} constraint cycles:", len(cycles))
         for i, cycle in enumerate(cycles):
-            print(f"  Cycle {i+1}: {' -> '.join(map(str, cycle))}")
+            log.warning("  Cycle {}: {}", i+1, ' -> '.join(map(str, cycle)))
             
             # Детальная информация о цикле
             for j in range(len(cycle) - 1):
@@ -382,12 +379,12 @@ def detect_constraint_cycles(optimizer):
                     for linked_info in c1.linked_to:
                         if isinstance(linked_info, dict) and 'class' in linked_info:
                             if linked_info['class'] == c2:
-                                print(f"    {idx1} -> {idx2}: Chain constraint ({c1.subject} -> {c2.subject})")
+                                log.warning("    {} -> {}: Chain constraint ({} -> {})", idx1, idx2, c1.subject, c2.subject)
                                 break
-                elif c1.teacher == c2.teacher and c1.day == c2.day:
-                    print(f"    {idx1} -> {idx2}: Teacher constraint (same teacher {c1.teacher} on {c1.day})")
+                elif c1.teacher_id == c2.teacher_id and c1.day == c2.day:
+                    log.warning("    {} -> {}: Teacher constraint (same teacher {} on {})", idx1, idx2, c1.teacher, c1.day)
     else:
-        print("No constraint cycles detected.")
+        log.info("No constraint cycles detected.")
     
     return cycles
 
@@ -403,10 +400,10 @@ def prevent_constraint_cycles(optimizer, cycles):
     if not cycles:
         return
     
-    print(f"\nPreventing {len(cycles)} constraint cycles...")
+    log.info("\nPreventing {} constraint cycles...", len(cycles))
     
     for i, cycle in enumerate(cycles):
-        print(f"  Processing cycle {i+1}: {' -> '.join(map(str, cycle))}")
+        log.debug("  Processing cycle {}: {}", i+1, ' -> '.join(map(str, cycle)))
         
         # Стратегия: разорвать цикл, удалив наименее критичное ограничение
         # Приоритет: цепочки важнее ограничений преподавателя
@@ -432,7 +429,7 @@ def prevent_constraint_cycles(optimizer, cycles):
                             break
             
             # Проверяем, является ли это ограничением преподавателя
-            if c1.teacher == c2.teacher and c1.day == c2.day:
+            if c1.teacher_id == c2.teacher_id and c1.day == c2.day:
                 score += 5  # Ограничения преподавателя менее критичны
             
             # Учитываем фиксированное время
@@ -447,7 +444,7 @@ def prevent_constraint_cycles(optimizer, cycles):
         
         if weakest_link:
             idx1, idx2 = weakest_link
-            print(f"    Breaking weakest link: {idx1} -> {idx2} (score: {weakest_score})")
+            log.debug("    Breaking weakest link: {} -> {} (score: {})", idx1, idx2, weakest_score)
             
             # Помечаем эту связь как исключение
             if not hasattr(optimizer, 'constraint_exceptions'):
@@ -455,5 +452,5 @@ def prevent_constraint_cycles(optimizer, cycles):
             optimizer.constraint_exceptions.add((idx1, idx2))
             optimizer.constraint_exceptions.add((idx2, idx1))  # Для симметрии
             
-            print(f"    Added constraint exception for classes {idx1} and {idx2}")
+            log.debug("    Added constraint exception for classes {} and {}", idx1, idx2)
     
\ No newline at end of file
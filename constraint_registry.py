@@ -1,12 +1,25 @@
 """
 Централизованный реестр ограничений для отслеживания всех добавленных в CP-SAT модель ограничений.
 Используется для диагностики INFEASIBLE проблем и анализа конфликтов.
+
+Реестр хранит ограничения в колоночном виде: целочисленный id, код типа,
+интернированный источник (модуль, функция) и индексы классов лежат в
+параллельных массивах, а индексы by_type/by_class_pair/by_origin содержат
+списки id. Сами CP-SAT ограничения не сохраняются, описания по умолчанию
+форматируются только при чтении (отчеты, отладочный лог).
 """
 
+import heapq
+import re
 import time
+from array import array
+from collections.abc import Sequence
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 
 class ConstraintType(Enum):
@@ -15,6 +28,7 @@ class ConstraintType(Enum):
     RESOURCE_CONFLICT = "resource_conflict"
     TIME_WINDOW = "time_window"
     ROOM_CONFLICT = "room_conflict"
+    ROOM_ASSIGNMENT = "room_assignment"
     TEACHER_CONFLICT = "teacher_conflict"
     GROUP_CONFLICT = "group_conflict"
     CHAIN_ORDERING = "chain_ordering"
@@ -26,9 +40,68 @@ class ConstraintType(Enum):
     OTHER = "other"
 
 
+# Коды типов для колоночного хранения (индекс в _TYPES)
+_TYPES = tuple(ConstraintType)
+_TYPE_CODES = {constraint_type: code for code, constraint_type in enumerate(_TYPES)}
+
+# Отсутствующий индекс класса в колонках class_i/class_j
+_NO_CLASS = -1
+# Имена вида start_vars[12] и идентификаторы вида resource_conflict_34 (для merge)
+_INDEXED_VARIABLE = re.compile(r"(\w+)\[(\d+)\]")
+_CONSTRAINT_ID = re.compile(r"^(\w+?)_(\d+)$")
+_CLASS_REFERENCE = re.compile(r"\b(class) (\d+)")
+
+
+def default_description(constraint_type: ConstraintType,
+                        class_i: Optional[int] = None, class_j: Optional[int] = None) -> str:
+    """
+    Формирует описание ограничения по умолчанию по его типу и классам.
+    
+    Args:
+        constraint_type: Тип ограничения
+        class_i, class_j: Индексы классов (если применимо)
+        
+    Returns:
+        str: Описание ограничения
+    """
+    if constraint_type == ConstraintType.CHAIN_ORDERING and class_i is not None and class_j is not None:
+        return f"Chain ordering: class {class_i} before class {class_j}"
+    if constraint_type == ConstraintType.SEPARATION and class_i is not None and class_j is not None:
+        return f"Time separation: classes {class_i} and {class_j}"
+    if constraint_type == ConstraintType.RESOURCE_CONFLICT and class_i is not None and class_j is not None:
+        return f"Resource conflict prevention: classes {class_i} and {class_j}"
+    if constraint_type == ConstraintType.TIME_WINDOW and class_i is not None:
+        return f"Time window constraint: class {class_i}"
+    if constraint_type == ConstraintType.FIXED_TIME and class_i is not None:
+        return f"Fixed time constraint: class {class_i}"
+    return f"{constraint_type.value} constraint"
+
+
+def class_variables(class_i: Optional[int] = None, class_j: Optional[int] = None) -> List[str]:
+    """
+    Возвращает стандартные переменные модели для классов ограничения.
+    
+    Args:
+        class_i, class_j: Индексы классов (если применимо)
+        
+    Returns:
+        List[str]: Имена переменных start/day/room/assigned для каждого класса
+    """
+    variables = []
+    for class_idx in (class_i, class_j):
+        if class_idx is not None:
+            variables.extend([
+                f"start_vars[{class_idx}]",
+                f"day_vars[{class_idx}]",
+                f"room_vars[{class_idx}]",
+                f"assigned_vars[{class_idx}]"
+            ])
+    return variables
+
+
 @dataclass
 class ConstraintInfo:
-    """Информация о добавленном ограничении."""
+    """Информация о добавленном ограничении (материализуется из реестра по запросу)."""
     constraint_id: str
     constraint_type: ConstraintType
     origin_module: str
@@ -37,7 +110,6 @@ class ConstraintInfo:
     class_j: Optional[int] = None
     description: str = ""
     timestamp: float = field(default_factory=time.time)
-    cp_sat_constraint: Any = None
     variables_used: List[str] = field(default_factory=list)
     
     def __post_init__(self):
@@ -67,21 +139,67 @@ class ConflictInfo:
     timestamp: float = field(default_factory=time.time)
 
 
+class _AddedView(Sequence):
+    """Последовательность ConstraintInfo поверх колонок реестра (только чтение)."""
+    
+    __slots__ = ('_registry',)
+    
+    def __init__(self, registry: 'ConstraintRegistry'):
+        self._registry = registry
+    
+    def __len__(self) -> int:
+        return self._registry.total_added
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._registry.get_constraint(row + 1)
+                    for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("constraint index out of range")
+        return self._registry.get_constraint(index + 1)
+
+
 class ConstraintRegistry:
-    """Централизованный реестр ограничений."""
+    """
+    Централизованный реестр ограничений.
+    
+    Ограничение идентифицируется целым id (1, 2, ...) в порядке добавления;
+    строковый идентификатор вида "<type>_<id>" строится по запросу через
+    constraint_id(). Индексы by_type, by_class_pair и by_origin хранят
+    списки целых id, поэтому выборки работают за O(k) от размера ответа.
+    """
     
     def __init__(self):
         """Инициализация реестра."""
-        self.added: List[ConstraintInfo] = []
+        # Колонки добавленных ограничений (строка = id - 1)
+        self._type_codes = array('b')
+        self._origin_codes = array('i')
+        self._class_i = array('i')
+        self._class_j = array('i')
+        self._timestamps = array('d')
+        # str, None (описание по умолчанию) или (шаблон, аргументы) для str.format
+        self._descriptions: List[Any] = []
+        # Переменные хранятся только для ограничений, где они известны
+        self._variables: Dict[int, Tuple[str, ...]] = {}
+        
+        # Интернированные источники (модуль, функция) и имена переменных
+        self._origins: List[Tuple[str, str]] = []
+        self._origin_lookup: Dict[Tuple[str, str], int] = {}
+        self._origin_module_ids: List[List[int]] = []  # код источника -> список id его модуля
+        self._variable_names: Dict[str, str] = {}
+        
+        self.added = _AddedView(self)
         self.skipped: List[SkippedConstraint] = []
         self.exceptions: List[Tuple[int, int, str]] = []  # (class_i, class_j, reason)
-        self.timeline: List[str] = []  # Порядок добавления constraint_id
         self.conflicts: List[ConflictInfo] = []
         
-        # Индексы для быстрого поиска
-        self.by_type: Dict[ConstraintType, List[str]] = {}
-        self.by_class_pair: Dict[Tuple[int, int], List[str]] = {}
-        self.by_origin: Dict[str, List[str]] = {}
+        # Индексы для быстрого поиска (списки id); по типу - список на код типа
+        self._type_ids: List[List[int]] = [[] for _ in _TYPES]
+        self._type_order: List[int] = []  # коды типов в порядке первого появления
+        self.by_class_pair: Dict[Tuple[int, int], List[int]] = {}
+        self.by_origin: Dict[str, List[int]] = {}
         
         # Счетчики
         self.constraint_counter = 0
@@ -91,46 +209,76 @@ class ConstraintRegistry:
     def add_constraint(self, constraint_expr, constraint_type: ConstraintType, 
                       origin_module: str, origin_function: str,
                       class_i: Optional[int] = None, class_j: Optional[int] = None,
-                      description: str = "", variables_used: List[str] = None) -> ConstraintInfo:
+                      description: Any = "", variables_used: List[str] = None) -> int:
         """
         Добавляет ограничение в реестр.
         
         Args:
-            constraint_expr: CP-SAT ограничение
+            constraint_expr: CP-SAT ограничение (в реестре не сохраняется)
             constraint_type: Тип ограничения
             origin_module: Модуль, из которого добавлено ограничение
             origin_function: Функция, из которой добавлено ограничение
             class_i, class_j: Индексы классов (если применимо)
-            description: Описание ограничения
+            description: Описание ограничения; пустое значение - описание по
+                умолчанию, кортеж (шаблон, *аргументы) - форматируется при чтении
             variables_used: Список использованных переменных
             
         Returns:
-            ConstraintInfo: Информация о добавленном ограничении
+            int: Целочисленный id ограничения
         """
         self.constraint_counter += 1
-        constraint_id = f"{constraint_type.value}_{self.constraint_counter}"
+        constraint_id = self.constraint_counter
+        type_code = _TYPE_CODES[constraint_type]
         
-        constraint_info = ConstraintInfo(
-            constraint_id=constraint_id,
-            constraint_type=constraint_type,
-            origin_module=origin_module,
-            origin_function=origin_function,
-            class_i=class_i,
-            class_j=class_j,
-            description=description,
-            cp_sat_constraint=constraint_expr,
-            variables_used=variables_used or []
-        )
+        origin = (origin_module, origin_function)
+        origin_code = self._origin_lookup.get(origin)
+        if origin_code is None:
+            origin_code = self._intern_origin(origin)
         
-        # Добавляем в основной список
-        self.added.append(constraint_info)
-        self.timeline.append(constraint_id)
+        self._type_codes.append(type_code)
+        self._origin_codes.append(origin_code)
+        self._timestamps.append(time.time())
+        self._descriptions.append(description or None)
+        if variables_used:
+            names = self._variable_names
+            self._variables[constraint_id] = tuple(names.setdefault(name, name) for name in variables_used)
         self.total_added += 1
         
-        # Обновляем индексы
-        self._update_indices(constraint_info)
+        # Индекс по типу
+        type_ids = self._type_ids[type_code]
+        if not type_ids:
+            self._type_order.append(type_code)
+        type_ids.append(constraint_id)
+        
+        # Индекс по модулю
+        self._origin_module_ids[origin_code].append(constraint_id)
+        
+        # Индекс по паре классов
+        if class_i is None:
+            self._class_i.append(_NO_CLASS)
+        else:
+            self._class_i.append(class_i)
+        if class_j is None:
+            self._class_j.append(_NO_CLASS)
+        else:
+            self._class_j.append(class_j)
+            if class_i is not None:
+                pair = (class_i, class_j) if class_i <= class_j else (class_j, class_i)
+                pair_ids = self.by_class_pair.get(pair)
+                if pair_ids is None:
+                    self.by_class_pair[pair] = [constraint_id]
+                else:
+                    pair_ids.append(constraint_id)
         
-        return constraint_info
+        return constraint_id
+    
+    def _intern_origin(self, origin: Tuple[str, str]) -> int:
+        """Регистрирует новый источник (модуль, функция) и возвращает его код."""
+        origin_code = len(self._origins)
+        self._origins.append(origin)
+        self._origin_lookup[origin] = origin_code
+        self._origin_module_ids.append(self.by_origin.setdefault(origin[0], []))
+        return origin_code
     
     def skip_constraint(self, constraint_type: ConstraintType, 
                        origin_module: str, origin_function: str,
@@ -188,41 +336,194 @@ class ConstraintRegistry:
         
         self.conflicts.append(conflict_info)
     
-    def _update_indices(self, constraint_info: ConstraintInfo):
-        """Обновляет индексы для быстрого поиска."""
-        # Индекс по типу
-        if constraint_info.constraint_type not in self.by_type:
-            self.by_type[constraint_info.constraint_type] = []
-        self.by_type[constraint_info.constraint_type].append(constraint_info.constraint_id)
+    def merge(self, other: 'ConstraintRegistry', class_map: List[int], label: str = ""):
+        """
+        Добавляет в реестр ограничения другого реестра (например, модели одного дня).
         
-        # Индекс по паре классов
-        if constraint_info.class_i is not None and constraint_info.class_j is not None:
-            pair = (min(constraint_info.class_i, constraint_info.class_j), 
-                   max(constraint_info.class_i, constraint_info.class_j))
-            if pair not in self.by_class_pair:
-                self.by_class_pair[pair] = []
-            self.by_class_pair[pair].append(constraint_info.constraint_id)
+        Индексы классов переводятся через class_map (локальный индекс -> индекс
+        в общем списке), id ограничений продолжают нумерацию этого реестра.
+        Сохраненные описания помечаются префиксом "[label] ", индексы в описаниях
+        ("class N"), именах переменных и идентификаторах конфликтов пересчитываются.
         
-        # Индекс по модулю
-        if constraint_info.origin_module not in self.by_origin:
-            self.by_origin[constraint_info.origin_module] = []
-        self.by_origin[constraint_info.origin_module].append(constraint_info.constraint_id)
+        Args:
+            other: Реестр подзадачи
+            class_map: Индексы классов подзадачи в общем списке классов
+            label: Метка подзадачи для описаний (например, день)
+        """
+        offset = self.constraint_counter
+        prefix = f"[{label}] " if label else ""
+        
+        def remap_class(class_idx):
+            return None if class_idx is None else class_map[class_idx]
+        
+        def remap_variable(match):
+            return f"{match.group(1)}[{class_map[int(match.group(2))]}]"
+        
+        def remap_reference(match):
+            return f"{match.group(1)} {class_map[int(match.group(2))]}"
+        
+        for local_id in range(1, other.total_added + 1):
+            constraint_id = self.constraint_counter + 1
+            origin_module, origin_function = other.origin(local_id)
+            class_i, class_j = other.classes(local_id)
+            description = other._descriptions[local_id - 1]
+            if description is not None:
+                description = prefix + _CLASS_REFERENCE.sub(remap_reference, other.description(local_id))
+            variables_used = other._variables.get(local_id)
+            if variables_used is not None:
+                variables_used = [_INDEXED_VARIABLE.sub(remap_variable, name) for name in variables_used]
+            self.add_constraint(
+                constraint_expr=None,
+                constraint_type=other.constraint_type(local_id),
+                origin_module=origin_module,
+                origin_function=origin_function,
+                class_i=remap_class(class_i),
+                class_j=remap_class(class_j),
+                description=description,
+                variables_used=variables_used
+            )
+            self._timestamps[constraint_id - 1] = other._timestamps[local_id - 1]
+        
+        for skipped in other.skipped:
+            self.skipped.append(SkippedConstraint(
+                constraint_type=skipped.constraint_type,
+                origin_module=skipped.origin_module,
+                origin_function=skipped.origin_function,
+                class_i=remap_class(skipped.class_i),
+                class_j=remap_class(skipped.class_j),
+                reason=skipped.reason,
+                timestamp=skipped.timestamp
+            ))
+        self.total_skipped += other.total_skipped
+        
+        for class_i, class_j, reason in other.exceptions:
+            self.exceptions.append((class_map[class_i], class_map[class_j], reason))
+        
+        def remap_constraint_id(match):
+            return f"{match.group(1)}_{int(match.group(2)) + offset}"
+        
+        for conflict in other.conflicts:
+            self.conflicts.append(ConflictInfo(
+                constraint_ids=[_CONSTRAINT_ID.sub(remap_constraint_id, str(cid))
+                                for cid in conflict.constraint_ids],
+                conflict_type=conflict.conflict_type,
+                description=prefix + _CLASS_REFERENCE.sub(remap_reference, conflict.description),
+                classes_involved=[class_map[class_idx] for class_idx in conflict.classes_involved],
+                timestamp=conflict.timestamp
+            ))
+    
+    # --- Доступ к колонкам по id ---
+    
+    def constraint_id(self, constraint_id: int) -> str:
+        """Возвращает строковый идентификатор ограничения вида "<type>_<id>"."""
+        return f"{_TYPES[self._type_codes[constraint_id - 1]].value}_{constraint_id}"
+    
+    def constraint_type(self, constraint_id: int) -> ConstraintType:
+        """Возвращает тип ограничения."""
+        return _TYPES[self._type_codes[constraint_id - 1]]
+    
+    def origin(self, constraint_id: int) -> Tuple[str, str]:
+        """Возвращает источник ограничения (модуль, функция)."""
+        return self._origins[self._origin_codes[constraint_id - 1]]
+    
+    def classes(self, constraint_id: int) -> Tuple[Optional[int], Optional[int]]:
+        """Возвращает индексы классов ограничения (None, если класс не задан)."""
+        row = constraint_id - 1
+        class_i = self._class_i[row]
+        class_j = self._class_j[row]
+        return (None if class_i == _NO_CLASS else class_i,
+                None if class_j == _NO_CLASS else class_j)
+    
+    def description(self, constraint_id: int) -> str:
+        """Возвращает описание ограничения, форматируя его при необходимости."""
+        description = self._descriptions[constraint_id - 1]
+        if description is None:
+            class_i, class_j = self.classes(constraint_id)
+            return default_description(self.constraint_type(constraint_id), class_i, class_j)
+        if isinstance(description, tuple):
+            return description[0].format(*description[1:])
+        return description
+    
+    def variables(self, constraint_id: int) -> Tuple[str, ...]:
+        """
+        Возвращает переменные, использованные в ограничении.
+        
+        Если переменные не были переданы при регистрации, они выводятся из
+        индексов классов (class_variables).
+        """
+        variables_used = self._variables.get(constraint_id)
+        if variables_used is None:
+            return tuple(class_variables(*self.classes(constraint_id)))
+        return variables_used
+    
+    def get_constraint(self, constraint_id: int) -> ConstraintInfo:
+        """
+        Материализует запись ограничения из колонок реестра.
+        
+        Args:
+            constraint_id: Целочисленный id ограничения
+            
+        Returns:
+            ConstraintInfo: Информация об ограничении
+        """
+        origin_module, origin_function = self.origin(constraint_id)
+        class_i, class_j = self.classes(constraint_id)
+        return ConstraintInfo(
+            constraint_id=self.constraint_id(constraint_id),
+            constraint_type=self.constraint_type(constraint_id),
+            origin_module=origin_module,
+            origin_function=origin_function,
+            class_i=class_i,
+            class_j=class_j,
+            description=self.description(constraint_id),
+            timestamp=self._timestamps[constraint_id - 1],
+            variables_used=list(self.variables(constraint_id))
+        )
+    
+    @property
+    def by_type(self) -> Dict[ConstraintType, List[int]]:
+        """Индекс по типу: списки id в порядке первого появления типа."""
+        return {_TYPES[type_code]: self._type_ids[type_code] for type_code in self._type_order}
+    
+    @property
+    def timeline(self) -> List[str]:
+        """Порядок добавления constraint_id (строится по запросу)."""
+        return [self.constraint_id(constraint_id)
+                for constraint_id in range(1, self.total_added + 1)]
     
     def get_constraints_by_type(self, constraint_type: ConstraintType) -> List[ConstraintInfo]:
         """Возвращает все ограничения заданного типа."""
-        constraint_ids = self.by_type.get(constraint_type, [])
-        return [c for c in self.added if c.constraint_id in constraint_ids]
+        return [self.get_constraint(constraint_id)
+                for constraint_id in self.by_type.get(constraint_type, ())]
     
     def get_constraints_by_class_pair(self, class_i: int, class_j: int) -> List[ConstraintInfo]:
         """Возвращает все ограничения для пары классов."""
         pair = (min(class_i, class_j), max(class_i, class_j))
-        constraint_ids = self.by_class_pair.get(pair, [])
-        return [c for c in self.added if c.constraint_id in constraint_ids]
+        return [self.get_constraint(constraint_id)
+                for constraint_id in self.by_class_pair.get(pair, ())]
     
     def get_constraints_by_origin(self, origin_module: str) -> List[ConstraintInfo]:
         """Возвращает все ограничения из заданного модуля."""
-        constraint_ids = self.by_origin.get(origin_module, [])
-        return [c for c in self.added if c.constraint_id in constraint_ids]
+        return [self.get_constraint(constraint_id)
+                for constraint_id in self.by_origin.get(origin_module, ())]
+    
+    def type_values(self, constraint_ids: List[int]) -> List[str]:
+        """Возвращает значения типов для списка id (для сводок по парам классов)."""
+        type_codes = self._type_codes
+        return [_TYPES[type_codes[constraint_id - 1]].value for constraint_id in constraint_ids]
+    
+    def most_constrained_pairs(self, limit: int) -> List[Tuple[Tuple[int, int], List[int]]]:
+        """
+        Возвращает пары классов с наибольшим числом ограничений.
+        
+        Args:
+            limit: Максимальное количество пар
+            
+        Returns:
+            List[Tuple[Tuple[int, int], List[int]]]: Пары и id их ограничений,
+            по убыванию количества (при равенстве - в порядке появления)
+        """
+        return heapq.nlargest(limit, self.by_class_pair.items(), key=lambda item: len(item[1]))
     
     def get_statistics(self) -> Dict[str, Any]:
         """Возвращает статистику по ограничениям."""
@@ -252,119 +553,135 @@ class ConstraintRegistry:
         Args:
             optimizer: Экземпляр ScheduleOptimizer для доступа к данным о классах
         """
-        print("\n" + "="*60)
-        print("INFEASIBLE ANALYSIS REPORT")
-        print("="*60)
+        log.info("\n" + "="*60)
+        log.info("INFEASIBLE ANALYSIS REPORT")
+        log.info("="*60)
         
         # Общая статистика
         stats = self.get_statistics()
-        print(f"\n📊 CONSTRAINT STATISTICS:")
-        print(f"  Total added: {stats['total_added']}")
-        print(f"  Total skipped: {stats['total_skipped']}")
-        print(f"  Total exceptions: {stats['total_exceptions']}")
-        print(f"  Total conflicts: {stats['total_conflicts']}")
+        log.info("\n📊 CONSTRAINT STATISTICS:")
+        log.info("  Total added: {}", stats['total_added'])
+        log.info("  Total skipped: {}", stats['total_skipped'])
+        log.info("  Total exceptions: {}", stats['total_exceptions'])
+        log.info("  Total conflicts: {}", stats['total_conflicts'])
         
         # Статистика по типам
-        print(f"\n📋 BY TYPE:")
+        log.info("\n📋 BY TYPE:")
         for constraint_type, count in stats['by_type'].items():
-            print(f"  {constraint_type}: {count}")
+            log.info("  {}: {}", constraint_type, count)
         
         # Статистика по модулям
-        print(f"\n📁 BY MODULE:")
+        log.info("\n📁 BY MODULE:")
         for origin, count in stats['by_origin'].items():
-            print(f"  {origin}: {count}")
+            log.info("  {}: {}", origin, count)
         
         # Обнаруженные конфликты
         if self.conflicts:
-            print(f"\n⚠️  DETECTED CONFLICTS ({len(self.conflicts)}):")
+            log.warning("\n⚠️  DETECTED CONFLICTS ({}):", len(self.conflicts))
             for i, conflict in enumerate(self.conflicts, 1):
-                print(f"  {i}. {conflict.conflict_type}: {conflict.description}")
-                print(f"     Constraints: {', '.join(conflict.constraint_ids)}")
-                print(f"     Classes: {conflict.classes_involved}")
+                log.warning("  {}. {}: {}", i, conflict.conflict_type, conflict.description)
+                log.warning("     Constraints: {}", ', '.join(conflict.constraint_ids))
+                log.warning("     Classes: {}", conflict.classes_involved)
         
         # Исключения
         if self.exceptions:
-            print(f"\n🚫 CONSTRAINT EXCEPTIONS ({len(self.exceptions)}):")
+            log.info("\n🚫 CONSTRAINT EXCEPTIONS ({}):", len(self.exceptions))
             for i, (class_i, class_j, reason) in enumerate(self.exceptions, 1):
-                print(f"  {i}. Classes {class_i} ↔ {class_j}: {reason}")
+                log.info("  {}. Classes {} ↔ {}: {}", i, class_i, class_j, reason)
         
         # Анализ потенциальных проблем
         self._analyze_potential_issues(optimizer)
         
-        print("\n" + "="*60)
+        log.info("\n" + "="*60)
     
     def _analyze_potential_issues(self, optimizer=None):
         """Анализирует потенциальные проблемы в ограничениях."""
-        print(f"\n🔍 POTENTIAL ISSUES ANALYSIS:")
+        log.info("\n🔍 POTENTIAL ISSUES ANALYSIS:")
         
         # Проверка на избыточные ограничения
-        class_pairs = {}
-        for constraint in self.added:
-            if constraint.class_i is not None and constraint.class_j is not None:
-                pair = (min(constraint.class_i, constraint.class_j), 
-                       max(constraint.class_i, constraint.class_j))
-                if pair not in class_pairs:
-                    class_pairs[pair] = []
-                class_pairs[pair].append(constraint)
-        
-        redundant_pairs = [(pair, constraints) for pair, constraints in class_pairs.items() 
-                          if len(constraints) > 3]
+        redundant_pairs = [(pair, constraint_ids) for pair, constraint_ids in self.by_class_pair.items()
+                          if len(constraint_ids) > 3]
         
         if redundant_pairs:
-            print(f"  ❌ Potentially redundant constraints for {len(redundant_pairs)} class pairs:")
-            for pair, constraints in redundant_pairs[:5]:  # Показываем первые 5
-                types = [c.constraint_type.value for c in constraints]
-                print(f"    Classes {pair[0]} ↔ {pair[1]}: {len(constraints)} constraints ({', '.join(set(types))})")
+            log.warning("  ❌ Potentially redundant constraints for {} class pairs:", len(redundant_pairs))
+            for pair, constraint_ids in redundant_pairs[:5]:  # Показываем первые 5
+                types = self.type_values(constraint_ids)
+                log.warning("    Classes {} ↔ {}: {} constraints ({})", pair[0], pair[1], len(constraint_ids), ', '.join(set(types)))
         
         # Проверка на противоречивые ограничения
-        sequential_constraints = self.get_constraints_by_type(ConstraintType.SEQUENTIAL)
-        if len(sequential_constraints) > 0:
-            print(f"  ⚡ Sequential constraints: {len(sequential_constraints)}")
-            
-            # Поиск потенциальных циклов
-            dependencies = {}
-            for constraint in sequential_constraints:
-                if constraint.class_i is not None and constraint.class_j is not None:
-                    if constraint.class_i not in dependencies:
-                        dependencies[constraint.class_i] = []
-                    dependencies[constraint.class_i].append(constraint.class_j)
+        sequential_ids = self.by_type.get(ConstraintType.SEQUENTIAL, [])
+        if len(sequential_ids) > 0:
+            log.info("  ⚡ Sequential constraints: {}", len(sequential_ids))
             
             # Простая проверка на циклы длиной 2
-            cycles = []
-            for class_i, deps in dependencies.items():
-                for class_j in deps:
-                    if class_j in dependencies and class_i in dependencies[class_j]:
-                        cycles.append((class_i, class_j))
+            cycles = self._find_two_cycles(sequential_ids)
             
             if cycles:
-                print(f"    ⚠️  Potential 2-cycles detected: {len(cycles)}")
+                log.warning("    ⚠️  Potential 2-cycles detected: {}", len(cycles))
                 for cycle in cycles[:3]:  # Показываем первые 3
-                    print(f"      Classes {cycle[0]} ↔ {cycle[1]}")
+                    log.warning("      Classes {} ↔ {}", cycle[0], cycle[1])
         
         # Проверка на фиксированные времена
-        fixed_time_constraints = self.get_constraints_by_type(ConstraintType.FIXED_TIME)
-        if len(fixed_time_constraints) > 0:
-            print(f"  ⏰ Fixed time constraints: {len(fixed_time_constraints)}")
+        fixed_time_ids = self.by_type.get(ConstraintType.FIXED_TIME, [])
+        if len(fixed_time_ids) > 0:
+            log.info("  ⏰ Fixed time constraints: {}", len(fixed_time_ids))
             
             # Группировка по времени
             if optimizer:
-                time_groups = {}
-                for constraint in fixed_time_constraints:
-                    if constraint.class_i is not None and constraint.class_i < len(optimizer.classes):
-                        class_obj = optimizer.classes[constraint.class_i]
-                        if hasattr(class_obj, 'start_time') and class_obj.start_time:
-                            time_key = f"{class_obj.day}_{class_obj.start_time}"
-                            if time_key not in time_groups:
-                                time_groups[time_key] = []
-                            time_groups[time_key].append(constraint.class_i)
+                time_groups = self._group_fixed_times(fixed_time_ids, optimizer)
                 
-                overlapping_times = [(time_key, classes) for time_key, classes in time_groups.items() 
+                overlapping_times = [(time_key, classes) for time_key, classes in time_groups.items()
                                    if len(classes) > 1]
                 
                 if overlapping_times:
-                    print(f"    ⚠️  Overlapping fixed times: {len(overlapping_times)}")
+                    log.warning("    ⚠️  Overlapping fixed times: {}", len(overlapping_times))
                     for time_key, classes in overlapping_times[:3]:  # Показываем первые 3
-                        print(f"      {time_key}: classes {classes}")
+                        log.warning("      {}: classes {}", time_key, classes)
+    
+    def _find_two_cycles(self, constraint_ids: List[int]) -> List[Tuple[int, int]]:
+        """
+        Ищет циклы длиной 2 среди упорядочивающих ограничений.
+        
+        Args:
+            constraint_ids: Список id ограничений порядка (class_i перед class_j)
+        
+        Returns:
+            List[Tuple[int, int]]: Пары классов, упорядоченные в обе стороны
+        """
+        dependencies = {}
+        for constraint_id in constraint_ids:
+            class_i, class_j = self.classes(constraint_id)
+            if class_i is not None and class_j is not None:
+                dependencies.setdefault(class_i, []).append(class_j)
+        
+        edges = {(class_i, class_j) for class_i, deps in dependencies.items() for class_j in deps}
+        cycles = []
+        for class_i, deps in dependencies.items():
+            for class_j in deps:
+                if (class_j, class_i) in edges:
+                    cycles.append((class_i, class_j))
+        return cycles
+    
+    def _group_fixed_times(self, constraint_ids: List[int], optimizer) -> Dict[str, List[int]]:
+        """
+        Группирует классы с фиксированным временем по ключу "день_время".
+        
+        Args:
+            constraint_ids: Список id ограничений FIXED_TIME
+            optimizer: Экземпляр ScheduleOptimizer для доступа к данным о классах
+        
+        Returns:
+            Dict[str, List[int]]: Классы для каждого ключа времени
+        """
+        time_groups = {}
+        for constraint_id in constraint_ids:
+            class_i = self.classes(constraint_id)[0]
+            if class_i is not None and class_i < len(optimizer.classes):
+                class_obj = optimizer.classes[class_i]
+                if hasattr(class_obj, 'start_time') and class_obj.start_time:
+                    day = getattr(class_obj, 'day', 'Unknown')
+                    time_groups.setdefault(f"{day}_{class_obj.start_time}", []).append(class_i)
+        return time_groups
     
     def export_to_file(self, filename: str, only_conflicts: bool = False, optimizer=None):
         """
@@ -428,48 +745,36 @@ class ConstraintRegistry:
                 f.write("🔍 DETAILED CONSTRAINT ANALYSIS:\n")
                 f.write("-" * 50 + "\n")
                 
-                # Группируем ограничения по парам классов
-                class_pairs = {}
-                for constraint in self.added:
-                    if constraint.class_i is not None and constraint.class_j is not None:
-                        pair = (min(constraint.class_i, constraint.class_j), 
-                               max(constraint.class_i, constraint.class_j))
-                        if pair not in class_pairs:
-                            class_pairs[pair] = []
-                        class_pairs[pair].append(constraint)
-                
                 # Показываем наиболее проблемные пары
-                most_constrained = sorted(class_pairs.items(), 
-                                        key=lambda x: len(x[1]), 
-                                        reverse=True)[:10]
+                most_constrained = self.most_constrained_pairs(10)
                 
-                for pair, constraints in most_constrained:
-                    if len(constraints) > 1:  # Только пары с множественными ограничениями
+                for pair, constraint_ids in most_constrained:
+                    if len(constraint_ids) > 1:  # Только пары с множественными ограничениями
                         f.write(f"Class Pair: {pair[0]} ↔ {pair[1]}\n")
                         class_i_name = self.get_class_name(pair[0], optimizer)
                         class_j_name = self.get_class_name(pair[1], optimizer)
                         f.write(f"👨‍🏫 Class {pair[0]}: {class_i_name}\n")
                         f.write(f"👨‍🏫 Class {pair[1]}: {class_j_name}\n")
-                        f.write(f"📊 Total constraints: {len(constraints)}\n")
+                        f.write(f"📊 Total constraints: {len(constraint_ids)}\n")
                         
                         # Группируем по типам
                         by_type = {}
-                        for constraint in constraints:
-                            if constraint.constraint_type not in by_type:
-                                by_type[constraint.constraint_type] = []
-                            by_type[constraint.constraint_type].append(constraint)
+                        for type_value in self.type_values(constraint_ids):
+                            by_type[type_value] = by_type.get(type_value, 0) + 1
                         
                         f.write(f"📋 By type:\n")
-                        for constraint_type, type_constraints in by_type.items():
-                            f.write(f"  - {constraint_type.value}: {len(type_constraints)}\n")
+                        for type_value, count in by_type.items():
+                            f.write(f"  - {type_value}: {count}\n")
                         
                         f.write(f"🔗 Detailed constraints:\n")
-                        for j, constraint in enumerate(constraints, 1):
-                            f.write(f"  {j}. {constraint.constraint_type.value}\n")
-                            f.write(f"     📍 {constraint.origin_module}:{constraint.origin_function}\n")
-                            f.write(f"     📄 {constraint.description or '—'}\n")
-                            if constraint.variables_used:
-                                f.write(f"     🔢 Variables: {', '.join(constraint.variables_used)}\n")
+                        for j, constraint_id in enumerate(constraint_ids, 1):
+                            origin_module, origin_function = self.origin(constraint_id)
+                            variables_used = self.variables(constraint_id)
+                            f.write(f"  {j}. {self.constraint_type(constraint_id).value}\n")
+                            f.write(f"     📍 {origin_module}:{origin_function}\n")
+                            f.write(f"     📄 {self.description(constraint_id) or '—'}\n")
+                            if variables_used:
+                                f.write(f"     🔢 Variables: {', '.join(variables_used)}\n")
                         f.write("\n")
                 
             else:
@@ -487,9 +792,9 @@ class ConstraintRegistry:
                 # Все добавленные ограничения с улучшенным форматированием
                 f.write("🔗 ADDED CONSTRAINTS:\n")
                 f.write("-" * 50 + "\n")
-                for i, constraint in enumerate(self.added, 1):
+                for i in range(1, self.total_added + 1):
                     f.write(f"Constraint #{i}:\n")
-                    formatted_constraint = self.format_constraint_for_report(constraint, optimizer)
+                    formatted_constraint = self.format_constraint_for_report(self.get_constraint(i), optimizer)
                     f.write(formatted_constraint)
                     f.write("\n" + "-" * 30 + "\n")
                 
@@ -555,50 +860,30 @@ class ConstraintRegistry:
         f.write("-" * 50 + "\n")
         
         # Проверка на избыточные ограничения
-        class_pairs = {}
-        for constraint in self.added:
-            if constraint.class_i is not None and constraint.class_j is not None:
-                pair = (min(constraint.class_i, constraint.class_j), 
-                       max(constraint.class_i, constraint.class_j))
-                if pair not in class_pairs:
-                    class_pairs[pair] = []
-                class_pairs[pair].append(constraint)
-        
-        redundant_pairs = [(pair, constraints) for pair, constraints in class_pairs.items() 
-                          if len(constraints) > 3]
+        class_pairs = self.by_class_pair
+        redundant_pairs = [(pair, constraint_ids) for pair, constraint_ids in class_pairs.items() 
+                          if len(constraint_ids) > 3]
         
         if redundant_pairs:
             f.write(f"❌ Potentially redundant constraints for {len(redundant_pairs)} class pairs:\n")
-            for pair, constraints in redundant_pairs[:10]:  # Показываем первые 10
+            for pair, constraint_ids in redundant_pairs[:10]:  # Показываем первые 10
                 class_i_name = self.get_class_name(pair[0], optimizer)
                 class_j_name = self.get_class_name(pair[1], optimizer)
-                types = [c.constraint_type.value for c in constraints]
-                f.write(f"  - Classes {pair[0]} ↔ {pair[1]}: {len(constraints)} constraints\n")
+                types = self.type_values(constraint_ids)
+                f.write(f"  - Classes {pair[0]} ↔ {pair[1]}: {len(constraint_ids)} constraints\n")
                 f.write(f"    👨‍🏫 {class_i_name} ↔ {class_j_name}\n")
                 f.write(f"    📋 Types: {', '.join(set(types))}\n")
             f.write("\n")
         
         # Проверка на противоречивые ограничения
-        sequential_constraints = self.get_constraints_by_type(ConstraintType.SEQUENTIAL)
-        chain_constraints = self.get_constraints_by_type(ConstraintType.CHAIN_ORDERING)
+        sequential_ids = self.by_type.get(ConstraintType.SEQUENTIAL, [])
+        chain_ids = self.by_type.get(ConstraintType.CHAIN_ORDERING, [])
         
-        if len(sequential_constraints) > 0 or len(chain_constraints) > 0:
-            f.write(f"⚡ Ordering constraints: {len(sequential_constraints)} sequential, {len(chain_constraints)} chain\n")
-            
-            # Поиск потенциальных циклов
-            dependencies = {}
-            for constraint in sequential_constraints + chain_constraints:
-                if constraint.class_i is not None and constraint.class_j is not None:
-                    if constraint.class_i not in dependencies:
-                        dependencies[constraint.class_i] = []
-                    dependencies[constraint.class_i].append(constraint.class_j)
+        if len(sequential_ids) > 0 or len(chain_ids) > 0:
+            f.write(f"⚡ Ordering constraints: {len(sequential_ids)} sequential, {len(chain_ids)} chain\n")
             
             # Простая проверка на циклы длиной 2
-            cycles = []
-            for class_i, deps in dependencies.items():
-                for class_j in deps:
-                    if class_j in dependencies and class_i in dependencies[class_j]:
-                        cycles.append((class_i, class_j))
+            cycles = self._find_two_cycles(sequential_ids + chain_ids)
             
             if cycles:
                 f.write(f"  ⚠️  Potential 2-cycles detected: {len(cycles)}\n")
@@ -610,22 +895,13 @@ class ConstraintRegistry:
             f.write("\n")
         
         # Проверка на фиксированные времена
-        fixed_time_constraints = self.get_constraints_by_type(ConstraintType.FIXED_TIME)
-        if len(fixed_time_constraints) > 0:
-            f.write(f"⏰ Fixed time constraints: {len(fixed_time_constraints)}\n")
+        fixed_time_ids = self.by_type.get(ConstraintType.FIXED_TIME, [])
+        if len(fixed_time_ids) > 0:
+            f.write(f"⏰ Fixed time constraints: {len(fixed_time_ids)}\n")
             
             # Группировка по времени
             if optimizer:
-                time_groups = {}
-                for constraint in fixed_time_constraints:
-                    if constraint.class_i is not None and constraint.class_i < len(optimizer.classes):
-                        class_obj = optimizer.classes[constraint.class_i]
-                        if hasattr(class_obj, 'start_time') and class_obj.start_time:
-                            day = getattr(class_obj, 'day', 'Unknown')
-                            time_key = f"{day}_{class_obj.start_time}"
-                            if time_key not in time_groups:
-                                time_groups[time_key] = []
-                            time_groups[time_key].append(constraint.class_i)
+                time_groups = self._group_fixed_times(fixed_time_ids, optimizer)
                 
                 overlapping_times = [(time_key, classes) for time_key, classes in time_groups.items() 
                                    if len(classes) > 1]
@@ -641,15 +917,13 @@ class ConstraintRegistry:
         
         # Топ-проблемные пары классов
         if class_pairs:
-            most_constrained = sorted(class_pairs.items(), 
-                                    key=lambda x: len(x[1]), 
-                                    reverse=True)[:5]
+            most_constrained = self.most_constrained_pairs(5)
             f.write("🔥 Most constrained class pairs:\n")
-            for pair, constraints in most_constrained:
+            for pair, constraint_ids in most_constrained:
                 class_i_name = self.get_class_name(pair[0], optimizer)
                 class_j_name = self.get_class_name(pair[1], optimizer)
-                types = [c.constraint_type.value for c in constraints]
-                f.write(f"  - Classes {pair[0]} ↔ {pair[1]}: {len(constraints)} constraints\n")
+                types = self.type_values(constraint_ids)
+                f.write(f"  - Classes {pair[0]} ↔ {pair[1]}: {len(constraint_ids)} constraints\n")
                 f.write(f"    👨‍🏫 {class_i_name} ↔ {class_j_name}\n")
                 f.write(f"    📋 Types: {', '.join(set(types))}\n")
             f.write("\n")
@@ -670,11 +944,9 @@ class ConstraintRegistry:
         # Анализ переменных
         f.write("🔢 Variable usage analysis:\n")
         variable_usage = {}
-        for constraint in self.added:
-            for var in constraint.variables_used:
-                if var not in variable_usage:
-                    variable_usage[var] = 0
-                variable_usage[var] += 1
+        for constraint_id in range(1, self.total_added + 1):
+            for var in self.variables(constraint_id):
+                variable_usage[var] = variable_usage.get(var, 0) + 1
         
         if variable_usage:
             most_used_vars = sorted(variable_usage.items(), key=lambda x: x[1], reverse=True)[:10]
@@ -776,51 +1048,40 @@ def export_constraint_registry(registry: ConstraintRegistry, optimizer=None, onl
     """
     filename = "constraint_registry_infeasible.txt" if only_conflicts else "constraint_registry_full.txt"
     
-    print(f"\n📋 Exporting constraint registry to {filename}...")
+    log.info("\n📋 Exporting constraint registry to {}...", filename)
     registry.export_to_file(filename, only_conflicts=only_conflicts, optimizer=optimizer)
     
     if only_conflicts:
-        print("\n🔍 INFEASIBLE ANALYSIS:")
-        print("="*50)
+        log.info("\n🔍 INFEASIBLE ANALYSIS:")
+        log.info("="*50)
         
         # Печать краткого отчета о конфликтах
         stats = registry.get_statistics()
-        print(f"Total constraints: {stats['total_added']}")
-        print(f"Detected conflicts: {stats['total_conflicts']}")
-        print(f"Constraint exceptions: {stats['total_exceptions']}")
+        log.info("Total constraints: {}", stats['total_added'])
+        log.info("Detected conflicts: {}", stats['total_conflicts'])
+        log.info("Constraint exceptions: {}", stats['total_exceptions'])
         
         # Показать наиболее проблемные ограничения
         if registry.conflicts:
-            print(f"\n⚠️  DETECTED CONFLICTS:")
+            log.warning("\n⚠️  DETECTED CONFLICTS:")
             for i, conflict in enumerate(registry.conflicts[:5], 1):
                 classes_str = ", ".join([registry.get_class_name(c, optimizer) for c in conflict.classes_involved])
-                print(f"  {i}. {conflict.conflict_type}: {classes_str}")
+                log.warning("  {}. {}: {}", i, conflict.conflict_type, classes_str)
         
         # Показать наиболее ограниченные пары классов
-        class_pairs = {}
-        for constraint in registry.added:
-            if constraint.class_i is not None and constraint.class_j is not None:
-                pair = (min(constraint.class_i, constraint.class_j), 
-                       max(constraint.class_i, constraint.class_j))
-                if pair not in class_pairs:
-                    class_pairs[pair] = []
-                class_pairs[pair].append(constraint)
-        
-        if class_pairs:
-            most_constrained = sorted(class_pairs.items(), 
-                                    key=lambda x: len(x[1]), 
-                                    reverse=True)[:3]
-            print(f"\n🔥 Most constrained pairs:")
-            for pair, constraints in most_constrained:
+        if registry.by_class_pair:
+            most_constrained = registry.most_constrained_pairs(3)
+            log.info("\n🔥 Most constrained pairs:")
+            for pair, constraint_ids in most_constrained:
                 class_i_name = registry.get_class_name(pair[0], optimizer)
                 class_j_name = registry.get_class_name(pair[1], optimizer)
-                types = [c.constraint_type.value for c in constraints]
-                print(f"  {class_i_name} ↔ {class_j_name}: {len(constraints)} constraints ({', '.join(set(types))})")
+                types = registry.type_values(constraint_ids)
+                log.info("  {} ↔ {}: {} constraints ({})", class_i_name, class_j_name, len(constraint_ids), ', '.join(set(types)))
         
-        print(f"\nDetailed report saved to: {filename}")
-        print("="*50)
+        log.info("\nDetailed report saved to: {}", filename)
+        log.info("="*50)
     
-    print(f"✅ Constraint registry exported to {filename}")
+    log.info("✅ Constraint registry exported to {}", filename)
 
 
 def print_infeasible_summary(registry: ConstraintRegistry, optimizer=None):
@@ -831,63 +1092,55 @@ def print_infeasible_summary(registry: ConstraintRegistry, optimizer=None):
         registry: Экземпляр ConstraintRegistry
         optimizer: Экземпляр ScheduleOptimizer для доступа к данным о классах
     """
-    print("\n" + "="*60)
-    print("❌ INFEASIBLE: Potential conflicting constraints")
-    print("="*60)
+    log.info("\n" + "="*60)
+    log.error("❌ INFEASIBLE: Potential conflicting constraints")
+    log.info("="*60)
     
     stats = registry.get_statistics()
-    print(f"📊 Total constraints: {stats['total_added']}")
+    log.info("📊 Total constraints: {}", stats['total_added'])
     
     # Показать конфликты
     if registry.conflicts:
-        print(f"\n⚠️  Detected conflicts ({len(registry.conflicts)}):")
+        log.warning("\n⚠️  Detected conflicts ({}):", len(registry.conflicts))
         for i, conflict in enumerate(registry.conflicts, 1):
             classes_str = ", ".join([registry.get_class_name(c, optimizer) for c in conflict.classes_involved])
-            print(f"  {i}. {conflict.conflict_type}: {classes_str}")
-            print(f"     {conflict.description}")
+            log.warning("  {}. {}: {}", i, conflict.conflict_type, classes_str)
+            log.warning("     {}", conflict.description)
     
     # Показать наиболее проблемные пары
-    class_pairs = {}
-    for constraint in registry.added:
-        if constraint.class_i is not None and constraint.class_j is not None:
-            pair = (min(constraint.class_i, constraint.class_j), 
-                   max(constraint.class_i, constraint.class_j))
-            if pair not in class_pairs:
-                class_pairs[pair] = []
-            class_pairs[pair].append(constraint)
-    
-    redundant_pairs = [(pair, constraints) for pair, constraints in class_pairs.items() 
-                      if len(constraints) > 3]
+    redundant_pairs = [(pair, constraint_ids) for pair, constraint_ids in registry.by_class_pair.items() 
+                      if len(constraint_ids) > 3]
     
     if redundant_pairs:
-        print(f"\n🔥 Potentially over-constrained pairs ({len(redundant_pairs)}):")
-        for pair, constraints in redundant_pairs[:5]:
+        log.info("\n🔥 Potentially over-constrained pairs ({}):", len(redundant_pairs))
+        for pair, constraint_ids in redundant_pairs[:5]:
             class_i_name = registry.get_class_name(pair[0], optimizer)
             class_j_name = registry.get_class_name(pair[1], optimizer)
-            types = [c.constraint_type.value for c in constraints]
-            print(f"  - {class_i_name} ↔ {class_j_name}")
-            print(f"    {len(constraints)} constraints: {', '.join(set(types))}")
+            types = registry.type_values(constraint_ids)
+            log.info("  - {} ↔ {}", class_i_name, class_j_name)
+            log.info("    {} constraints: {}", len(constraint_ids), ', '.join(set(types)))
             
             # Показать детали первых нескольких ограничений
-            for j, constraint in enumerate(constraints[:3], 1):
-                print(f"    {j}. {constraint.constraint_type.value}: {constraint.description}")
+            for j, constraint_id in enumerate(constraint_ids[:3], 1):
+                log.info("    {}. {}: {}", j, registry.constraint_type(constraint_id).value,
+                         registry.description(constraint_id))
     
     # Показать исключения
     if registry.exceptions:
-        print(f"\n🚫 Constraint exceptions ({len(registry.exceptions)}):")
+        log.info("\n🚫 Constraint exceptions ({}):", len(registry.exceptions))
         for class_i, class_j, reason in registry.exceptions[:5]:
             class_i_name = registry.get_class_name(class_i, optimizer)
             class_j_name = registry.get_class_name(class_j, optimizer)
-            print(f"  - {class_i_name} ↔ {class_j_name}: {reason}")
+            log.info("  - {} ↔ {}: {}", class_i_name, class_j_name, reason)
     
-    print(f"\n💡 Troubleshooting suggestions:")
-    print(f"  1. Review classes with many constraints")
-    print(f"  2. Check for conflicting time windows")
-    print(f"  3. Relax some constraint exceptions")
-    print(f"  4. Consider increasing time slots or resources")
-    print(f"  5. Verify that linked class sequences are feasible")
+    log.info("\n💡 Troubleshooting suggestions:")
+    log.info("  1. Review classes with many constraints")
+    log.info("  2. Check for conflicting time windows")
+    log.info("  3. Relax some constraint exceptions")
+    log.info("  4. Consider increasing time slots or resources")
+    log.info("  5. Verify that linked class sequences are feasible")
     
-    print("\n" + "="*60)
+    log.info("\n" + "="*60)
 
 def generate_log_err_summary(registry: ConstraintRegistry, optimizer=None):
     """
@@ -911,26 +1164,16 @@ def generate_log_err_summary(registry: ConstraintRegistry, optimizer=None):
             f.write(f"Conflicts: {stats['total_conflicts']}\n\n")
             
             # Топ-5 проблемных пар классов
-            class_pairs = {}
-            for constraint in registry.added:
-                if constraint.class_i is not None and constraint.class_j is not None:
-                    pair = (min(constraint.class_i, constraint.class_j), 
-                           max(constraint.class_i, constraint.class_j))
-                    if pair not in class_pairs:
-                        class_pairs[pair] = []
-                    class_pairs[pair].append(constraint)
-            
+            class_pairs = registry.by_class_pair
             if class_pairs:
-                most_constrained = sorted(class_pairs.items(), 
-                                        key=lambda x: len(x[1]), 
-                                        reverse=True)[:5]
+                most_constrained = registry.most_constrained_pairs(5)
                 f.write(f"🔥 TOP 5 MOST CONSTRAINED PAIRS:\n")
-                for i, (pair, constraints) in enumerate(most_constrained, 1):
+                for i, (pair, constraint_ids) in enumerate(most_constrained, 1):
                     class_i_name = registry.get_class_name(pair[0], optimizer)
                     class_j_name = registry.get_class_name(pair[1], optimizer)
-                    types = [c.constraint_type.value for c in constraints]
+                    types = registry.type_values(constraint_ids)
                     f.write(f"{i}. {class_i_name} ↔ {class_j_name}\n")
-                    f.write(f"   {len(constraints)} constraints: {', '.join(set(types))}\n")
+                    f.write(f"   {len(constraint_ids)} constraints: {', '.join(set(types))}\n")
                 f.write("\n")
             
             # Конфликты
@@ -972,16 +1215,16 @@ def generate_log_err_summary(registry: ConstraintRegistry, optimizer=None):
             if stats['total_exceptions'] > 0:
                 f.write(f"  - Review {stats['total_exceptions']} constraint exceptions\n")
             if class_pairs:
-                over_constrained = [(pair, constraints) for pair, constraints in class_pairs.items() 
-                                  if len(constraints) > 5]
+                over_constrained = [(pair, constraint_ids) for pair, constraint_ids in class_pairs.items() 
+                                  if len(constraint_ids) > 5]
                 if over_constrained:
                     f.write(f"  - {len(over_constrained)} class pairs are heavily constrained\n")
             f.write(f"  - See constraint_registry_full.txt for detailed analysis\n")
             
-        print("✅ Brief error summary saved to log_Err.txt")
+        log.info("✅ Brief error summary saved to log_Err.txt")
         
     except Exception as e:
-        print(f"❌ Error generating log_Err.txt: {e}")
+        log.error("❌ Error generating log_Err.txt: {}", e)
 
 
 # Функция для автоматической генерации всех отчетов
@@ -994,7 +1237,7 @@ def generate_all_reports(registry: ConstraintRegistry, optimizer=None, infeasibl
         optimizer: Экземпляр ScheduleOptimizer для доступа к данным о классах
         infeasible: True если проблема INFEASIBLE
     """
-    print("\n📋 Generating constraint reports...")
+    log.info("\n📋 Generating constraint reports...")
     
     # Полный отчет
     export_constraint_registry(registry, optimizer, only_conflicts=False)
@@ -1006,4 +1249,4 @@ def generate_all_reports(registry: ConstraintRegistry, optimizer=None, infeasibl
     # Краткий отчет
     generate_log_err_summary(registry, optimizer)
     
-    print("✅ All constraint reports generated successfully")
+    log.info("✅ All constraint reports generated successfully")
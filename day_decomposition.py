@@ -0,0 +1,360 @@
+"""
+Декомпозиция задачи расписания по дням.
+
+Если у всех занятий день фиксирован, а связанные занятия (цепочки B -> C -> D)
+лежат в том же дне, то все межклассовые ограничения между разными днями
+пропускаются ("Different days") и модель распадается на независимые блоки.
+Для каждого дня строится и решается отдельная модель CP-SAT в своем процессе
+(ProcessPoolExecutor), после чего решения и реестры ограничений собираются
+обратно в исходный ScheduleOptimizer. Целевая функция (переходы и окна по
+преподавателю и дню) аддитивна по дням, поэтому сумма дневных оптимумов
+совпадает с оптимумом общей модели.
+
+Если хотя бы у одного занятия день не задан (day_vars - переменная) или
+цепочка пересекает дни, solve_by_day возвращает None и решается общая модель.
+
+solve_partition решает произвольное разбиение на независимые части и
+используется также декомпозицией по компонентам связности
+(component_decomposition).
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+import schedule_logging
+from schedule_logging import get_logger
+from solver_config import ALL_CORES
+
+log = get_logger(__name__)
+
+__all__ = ['partition_by_day', 'solve_by_day', 'solve_partition', 'export_decomposition_report']
+
+# Порядок "тяжести" статусов при объединении результатов дней
+_STATUS_SEVERITY = {
+    'OPTIMAL': 0,
+    'FEASIBLE': 1,
+    'TIMEOUT': 2,
+    'MODEL_INVALID': 3,
+    'INFEASIBLE': 4,
+}
+
+
+def partition_by_day(classes) -> Optional[Dict[str, List[int]]]:
+    """
+    Разбивает занятия по дням.
+
+    Args:
+        classes: Список ScheduleClass
+
+    Returns:
+        Dict[str, List[int]]: {день: индексы занятий в исходном списке} в
+        порядке дней недели, или None, если декомпозиция невозможна
+        (день не задан или связанные занятия в разных днях)
+    """
+    by_day = {}
+    for idx, c in enumerate(classes):
+        if not c.day:
+            log.info("  Day decomposition disabled: class {} ({}) has no fixed day", idx, c.subject)
+            return None
+        linked = list(getattr(c, 'linked_classes', None) or [])
+        for other in (getattr(c, 'previous_class', None), getattr(c, 'next_class', None)):
+            if other is not None:
+                linked.append(other)
+        for other in linked:
+            if other.day != c.day:
+                log.info("  Day decomposition disabled: class {} ({}, {}) is linked to {} on {}",
+                         idx, c.subject, c.day, other.subject, other.day)
+                return None
+        by_day.setdefault(c.day, []).append(idx)
+
+    day_order = ["Mo", "Di", "Mi", "Do", "Fr", "Sa"]
+    order = {day: pos for pos, day in enumerate(day_order)}
+    return {day: by_day[day] for day in sorted(by_day, key=lambda day: order.get(day, len(order)))}
+
+
+def _solve_part(label, classes, options, time_limit_seconds, log_level):
+    """
+    Строит и решает модель одной части (обычно в дочернем процессе).
+
+    Args:
+        label: Метка части (день или компонента)
+        classes: Занятия этой части
+        options: Параметры ScheduleOptimizer (time_interval, constraint_mode, ...)
+        time_limit_seconds: Ограничение времени решения
+        log_level: Уровень консоли дочернего процесса
+
+    Returns:
+        dict: Статус, решение, значение целевой функции, время и реестр ограничений части
+    """
+    schedule_logging.configure(level=log_level)
+    from scheduler_base import ScheduleOptimizer
+
+    started = time.perf_counter()
+    use_pair_index = options.pop('use_pair_index', True)
+    optimizer = ScheduleOptimizer(classes, **options)
+    optimizer.use_pair_index = use_pair_index
+    optimizer.write_reports = False
+    success = optimizer.solve(time_limit_seconds=time_limit_seconds)
+
+    objective = optimizer.objective_value if success else None
+
+    return {
+        'label': label,
+        'success': success,
+        'status': getattr(optimizer, 'solver_status', 'UNKNOWN'),
+        'solution': optimizer.solution,
+        'objective': objective,
+        'wall_time': time.perf_counter() - started,
+        'registry': optimizer.constraint_registry,
+        'solver_info': optimizer.solver_info,
+    }
+
+
+def solve_by_day(optimizer, time_limit_seconds=60, max_workers=None):
+    """
+    Решает задачу по дням в параллельных процессах и объединяет результаты.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer (модель еще не построена)
+        time_limit_seconds: Ограничение времени решения одного дня
+        max_workers: Число процессов; None - min(число дней, число CPU)
+
+    Returns:
+        bool или None: True/False - результат решения по дням,
+        None - декомпозиция невозможна, нужна общая модель
+    """
+    partition = partition_by_day(optimizer.classes)
+    if partition is None:
+        return None
+    if len(partition) < 2:
+        log.info("  Day decomposition skipped: all classes are on one day")
+        return None
+
+    success = solve_partition(optimizer, partition, time_limit_seconds, max_workers, kind='day')
+    optimizer.day_results = optimizer.part_results
+    return success
+
+
+def solve_partition(optimizer, partition, time_limit_seconds=60, max_workers=None, kind='part'):
+    """
+    Решает независимые части задачи отдельными моделями и объединяет результаты.
+
+    Каждой части дается полный time_limit_seconds. При max_workers > 1 части
+    решаются в ProcessPoolExecutor (крупные отправляются первыми, чтобы
+    процессы были загружены равномерно), при max_workers == 1 - по очереди в
+    текущем процессе, начиная с самых маленьких.
+
+    После объединения заполняются optimizer.solution, optimizer.solver_status,
+    optimizer.part_results, optimizer.objective_value и реестр ограничений
+    (индексы занятий переводятся в индексы исходного списка), затем строятся
+    отчеты реестра.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer (модель еще не построена)
+        partition: {метка части: индексы занятий}, части не связаны ограничениями
+        time_limit_seconds: Ограничение времени решения одной части
+        max_workers: Число процессов; None - min(число частей, число CPU)
+        kind: Название частей для логов ('day', 'component')
+
+    Returns:
+        bool: True, если решение найдено для всех частей
+    """
+    if max_workers is None:
+        max_workers = min(len(partition), os.cpu_count() or 1)
+    solver_config = optimizer.solver_config
+    if max_workers > 1 and solver_config.num_search_workers == ALL_CORES:
+        # Ядра делятся между процессами, а не занимаются каждым из них целиком
+        solver_config = replace(solver_config,
+                                num_search_workers=max(1, (os.cpu_count() or 1) // max_workers))
+    options = {
+        'time_interval': optimizer.time_interval,
+        'time_grid': optimizer.time_grid,
+        'constraint_mode': optimizer.constraint_mode,
+        'fast_registration': optimizer.fast_registration,
+        'use_pair_index': optimizer.use_pair_index,
+        'solver_config': solver_config,
+        'solution_hints': optimizer.solution_hints,
+        'repair_hints': optimizer.repair_hints,
+        'model_cache': optimizer.model_cache,
+    }
+    sizes = sorted(partition, key=lambda label: len(partition[label]))
+
+    log.info("\n🧩 Solving {} {}s ({} workers, time limit {}s per {})...",
+             len(partition), kind, max_workers, time_limit_seconds, kind)
+    for label, indices in partition.items():
+        log.debug("  {}: {} classes", label, len(indices))
+
+    started = time.perf_counter()
+    if max_workers == 1:
+        results = {}
+        for label in sizes:
+            classes = [optimizer.classes[idx] for idx in partition[label]]
+            results[label] = _solve_part(label, classes, dict(options), time_limit_seconds,
+                                         schedule_logging.get_level())
+    else:
+        # spawn: дочерние процессы не наследуют буферы stdout и открытый JSON-лог
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = {
+                label: executor.submit(_solve_part, label,
+                                       [optimizer.classes[idx] for idx in partition[label]],
+                                       dict(options), time_limit_seconds, schedule_logging.get_level())
+                for label in reversed(sizes)
+            }
+            results = {label: future.result() for label, future in futures.items()}
+    wall_time = time.perf_counter() - started
+
+    return _merge_results(optimizer, partition, results, wall_time, kind)
+
+
+def _merge_results(optimizer, partition, results, wall_time, kind):
+    """
+    Объединяет результаты частей в optimizer и строит отчеты.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        partition: {метка части: индексы занятий}
+        results: {метка части: результат _solve_part}
+        wall_time: Общее время решения всех частей
+        kind: Название частей для логов
+
+    Returns:
+        bool: True, если решение найдено для всех частей
+    """
+    from constraint_registry import generate_all_reports
+    from solution_table import SolutionTable
+
+    solved_parts = []
+    optimizer.part_results = []
+    status = 'OPTIMAL'
+    objective_total = 0
+
+    log.info("\n📊 PER-{} RESULTS:", kind.upper())
+    for label, indices in partition.items():
+        result = results[label]
+        optimizer.constraint_registry.merge(result['registry'], indices, label=label)
+        optimizer.part_results.append({
+            'label': label,
+            'classes': len(indices),
+            'status': result['status'],
+            'objective': result['objective'],
+            'wall_time': result['wall_time'],
+            'solver_info': result['solver_info'],
+        })
+        log.info("  {}: {} ({} classes, objective {}, {:.2f}s)", label, result['status'],
+                 len(indices), result['objective'], result['wall_time'],
+                 event="part_result", kind=kind, label=label, status=result['status'],
+                 objective=result['objective'], wall_time=result['wall_time'])
+
+        if _STATUS_SEVERITY.get(result['status'], 2) > _STATUS_SEVERITY[status]:
+            status = result['status'] if result['status'] in _STATUS_SEVERITY else 'TIMEOUT'
+        if result['success']:
+            objective_total += result['objective'] or 0
+            solved_parts.append((indices, result['solution']))
+
+    optimizer.solver_status = status
+    optimizer.solver = None
+    optimizer.solver_info = {
+        'preset': optimizer.solver_config.preset,
+        'config': optimizer.solver_config.to_dict(),
+        'num_workers': next((part['solver_info']['num_workers'] for part in optimizer.part_results
+                             if part['solver_info']), None),
+        'status': status,
+        'objective': objective_total if status in ('OPTIMAL', 'FEASIBLE') else None,
+        'wall_time': wall_time,
+        'decomposition': kind,
+        'parts': len(partition),
+        'hints': _merge_hint_stats(optimizer),
+    }
+    log.info("  Total: {} in {:.2f}s wall time", status, wall_time)
+    if optimizer.write_reports:
+        export_decomposition_report(optimizer, partition, kind, wall_time)
+
+    if status in ('OPTIMAL', 'FEASIBLE'):
+        # Целевая функция аддитивна по частям (термы по преподавателю и дню)
+        optimizer.objective_value = objective_total
+        log.info("✅ Solution found: {} (objective {})", status, objective_total,
+                 event="merged_objective", kind=kind, objective=objective_total)
+        optimizer.solution = SolutionTable.combine(optimizer, solved_parts)
+        if optimizer.write_reports:
+            generate_all_reports(optimizer.constraint_registry, optimizer=optimizer, infeasible=False)
+        return True
+
+    optimizer.solution = None
+    optimizer.objective_value = None
+    if status == 'INFEASIBLE':
+        log.error("❌ No solution found: INFEASIBLE")
+        if optimizer.write_reports:
+            generate_all_reports(optimizer.constraint_registry, optimizer=optimizer, infeasible=True)
+    elif status == 'MODEL_INVALID':
+        log.error("❌ Model is invalid")
+    else:
+        log.warning("❓ Solver returned status: {}", status)
+    return False
+
+
+def _merge_hint_stats(optimizer):
+    """
+    Суммирует статистику подсказок по частям.
+
+    Каждая часть получает все строки прошлого расписания, поэтому
+    неиспользованные строки считаются от общего числа сопоставленных.
+    """
+    if not optimizer.solution_hints:
+        return None
+    merged = None
+    for part in optimizer.part_results:
+        stats = (part['solver_info'] or {}).get('hints')
+        if not stats:
+            continue
+        if merged is None:
+            merged = {key: (dict(value) if isinstance(value, dict) else value) for key, value in stats.items()}
+            continue
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                for reason, count in value.items():
+                    merged[key][reason] = merged[key].get(reason, 0) + count
+            else:
+                merged[key] += value
+    if merged is not None:
+        merged['unused_rows'] = len(optimizer.solution_hints) - merged['matched']
+    optimizer.hint_stats = merged
+    return merged
+
+
+def export_decomposition_report(optimizer, partition, kind, wall_time,
+                                filename='decomposition_report.txt'):
+    """
+    Записывает сводный отчет по частям: статус, целевая функция и время каждой
+    части, итоговое значение целевой функции (сумма по частям).
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer с заполненным part_results
+        partition: {метка части: индексы занятий}
+        kind: Название частей ('day', 'component')
+        wall_time: Общее время решения всех частей
+        filename: Имя файла отчета
+    """
+    objective_total = 0
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f"DECOMPOSITION REPORT ({kind}s)\n")
+        f.write("=" * 80 + "\n")
+        f.write(f"Classes: {len(optimizer.classes)}, {kind}s: {len(partition)}\n")
+        f.write(f"Status: {optimizer.solver_status}, wall time: {wall_time:.2f}s\n")
+        f.write(f"Solver preset: {optimizer.solver_config.describe()}\n\n")
+        f.write(f"{'part':<12} {'classes':>8} {'status':>12} {'objective':>10} {'time, s':>8}  teachers\n")
+        for result in optimizer.part_results:
+            indices = partition[result['label']]
+            teachers = sorted(set(optimizer.classes[idx].teacher for idx in indices
+                                  if optimizer.classes[idx].teacher))
+            objective = '-' if result['objective'] is None else f"{result['objective']:g}"
+            if result['objective'] is not None:
+                objective_total += result['objective']
+            f.write(f"{result['label']:<12} {result['classes']:>8} {result['status']:>12} "
+                    f"{objective:>10} {result['wall_time']:>8.2f}  {', '.join(teachers)}\n")
+        f.write(f"\nMerged objective (sum over solved {kind}s): {objective_total:g}\n")
+    log.info("✅ Decomposition report saved to {}", filename)
@@ -5,8 +5,10 @@
 актуальных границ начала занятий после применения всех ограничений.
 """
 
-from time_utils import time_to_minutes, minutes_to_time
 from typing import Dict, Optional, Tuple, Any
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
 
 
 class EffectiveBounds:
@@ -67,7 +69,7 @@ def initialize_effective_bounds(optimizer):
     """
     if not hasattr(optimizer, 'effective_bounds'):
         optimizer.effective_bounds = {}
-        print("Initialized effective_bounds system")
+        log.debug("Initialized effective_bounds system")
     
     if not hasattr(optimizer, 'bounds_metadata'):
         optimizer.bounds_metadata = {
@@ -93,8 +95,8 @@ def set_effective_bounds(optimizer, class_idx: int, min_slot: int, max_slot: int
     initialize_effective_bounds(optimizer)
     
     # Конвертируем слоты в время
-    min_time = slot_to_time(optimizer, min_slot)
-    max_time = slot_to_time(optimizer, max_slot)
+    min_time = optimizer.time_grid.slot_to_time(min_slot)
+    max_time = optimizer.time_grid.slot_to_time(max_slot)
     
     # Создаем или обновляем границы
     if class_idx in optimizer.effective_bounds:
@@ -102,16 +104,16 @@ def set_effective_bounds(optimizer, class_idx: int, min_slot: int, max_slot: int
         # Сужаем границы, если новые более строгие
         bounds.min_slot = max(bounds.min_slot, min_slot)
         bounds.max_slot = min(bounds.max_slot, max_slot)
-        bounds.min_time = slot_to_time(optimizer, bounds.min_slot)
-        bounds.max_time = slot_to_time(optimizer, bounds.max_slot)
+        bounds.min_time = optimizer.time_grid.slot_to_time(bounds.min_slot)
+        bounds.max_time = optimizer.time_grid.slot_to_time(bounds.max_slot)
         bounds.add_constraint_info(source, description)
-        print(f"  Updated effective bounds for class {class_idx}: {bounds}")
+        log.debug("  Updated effective bounds for class {}: {}", class_idx, bounds)
     else:
         bounds = EffectiveBounds(min_slot, max_slot, min_time, max_time, source)
         if description:
             bounds.add_constraint_info(source, description)
         optimizer.effective_bounds[class_idx] = bounds
-        print(f"  Set effective bounds for class {class_idx}: {bounds}")
+        log.debug("  Set effective bounds for class {}: {}", class_idx, bounds)
     
     # Обновляем метаданные
     optimizer.bounds_metadata['update_count'] += 1
@@ -162,11 +164,11 @@ def extract_bounds_from_original_data(optimizer, class_obj, class_idx: int) -> E
     Returns:
         EffectiveBounds: Границы, извлеченные из исходных данных
     """
-    print(f"  Extracting bounds from original data for class {class_idx}")
+    log.debug("  Extracting bounds from original data for class {}", class_idx)
     
     # Случай 1: Фиксированное время (только start_time)
     if class_obj.start_time and not class_obj.end_time:
-        slot = time_to_slot(optimizer, class_obj.start_time)
+        slot = optimizer.class_start_slots[class_idx]
         return EffectiveBounds(
             min_slot=slot,
             max_slot=slot,
@@ -178,75 +180,35 @@ def extract_bounds_from_original_data(optimizer, class_obj, class_idx: int) -> E
     
     # Случай 2: Временное окно (start_time и end_time)
     elif class_obj.start_time and class_obj.end_time:
-        min_slot = time_to_slot(optimizer, class_obj.start_time)
+        min_slot = optimizer.class_start_slots[class_idx]
         
         # Рассчитываем максимальный слот с учетом длительности
         duration_slots = class_obj.duration // optimizer.time_interval
-        end_slot = time_to_slot(optimizer, class_obj.end_time)
+        end_slot = optimizer.class_end_slots[class_idx]
         max_slot = max(min_slot, end_slot - duration_slots)
         
         return EffectiveBounds(
             min_slot=min_slot,
             max_slot=max_slot,
             min_time=class_obj.start_time,
-            max_time=slot_to_time(optimizer, max_slot),
+            max_time=optimizer.time_grid.slot_to_time(max_slot),
             source="time_window",
             confidence="high"
         )
     
     # Случай 3: Нет временных ограничений - используем полный диапазон дня
     else:
+        min_slot, max_slot = optimizer.time_grid.day_range(class_obj.day)
         return EffectiveBounds(
-            min_slot=0,
-            max_slot=len(optimizer.time_slots) - 1,
-            min_time=optimizer.time_slots[0] if optimizer.time_slots else "08:00",
-            max_time=optimizer.time_slots[-1] if optimizer.time_slots else "18:00",
+            min_slot=min_slot,
+            max_slot=max_slot,
+            min_time=optimizer.time_grid.slot_to_time(min_slot),
+            max_time=optimizer.time_grid.slot_to_time(max_slot),
             source="no_constraints",
             confidence="low"
         )
 
 
-def time_to_slot(optimizer, time_str: str) -> int:
-    """
-    Конвертирует время в слот.
-    
-    Args:
-        optimizer: Экземпляр ScheduleOptimizer
-        time_str: Время в формате HH:MM
-        
-    Returns:
-        int: Индекс слота времени
-    """
-    time_minutes = time_to_minutes(time_str)
-    
-    for slot_idx, slot_time in enumerate(optimizer.time_slots):
-        slot_minutes = time_to_minutes(slot_time)
-        if slot_minutes >= time_minutes:
-            return slot_idx
-    
-    # Если время превышает последний слот, возвращаем последний
-    return len(optimizer.time_slots) - 1
-
-
-def slot_to_time(optimizer, slot_idx: int) -> str:
-    """
-    Конвертирует слот в время.
-    
-    Args:
-        optimizer: Экземпляр ScheduleOptimizer
-        slot_idx: Индекс слота времени
-        
-    Returns:
-        str: Время в формате HH:MM
-    """
-    if 0 <= slot_idx < len(optimizer.time_slots):
-        return optimizer.time_slots[slot_idx]
-    elif slot_idx < 0:
-        return optimizer.time_slots[0]
-    else:
-        return optimizer.time_slots[-1]
-
-
 def classify_bounds(bounds: EffectiveBounds) -> str:
     """
     Классифицирует границы как 'fixed' или 'window'.
@@ -282,7 +244,7 @@ def update_bounds_from_constraint(optimizer, class_idx: int, constraint_type: st
     
     # Проверяем корректность границ
     if new_min_slot > new_max_slot:
-        print(f"WARNING: Invalid bounds for class {class_idx}: min_slot {new_min_slot} > max_slot {new_max_slot}")
+        log.warning("WARNING: Invalid bounds for class {}: min_slot {} > max_slot {}", class_idx, new_min_slot, new_max_slot)
         return
     
     set_effective_bounds(optimizer, class_idx, new_min_slot, new_max_slot, 
@@ -327,33 +289,33 @@ def print_bounds_report(optimizer):
     Args:
         optimizer: Экземпляр ScheduleOptimizer
     """
-    print("\n=== EFFECTIVE BOUNDS REPORT ===")
+    log.info("\n=== EFFECTIVE BOUNDS REPORT ===")
     
     summary = get_bounds_summary(optimizer)
     
-    print(f"Total classes: {summary['total_classes']}")
-    print(f"Classes with effective bounds: {summary['classes_with_bounds']}")
-    print(f"Update count: {summary['metadata']['update_count']}")
-    print(f"Last updated: {summary['metadata']['last_updated']}")
+    log.info("Total classes: {}", summary['total_classes'])
+    log.info("Classes with effective bounds: {}", summary['classes_with_bounds'])
+    log.info("Update count: {}", summary['metadata']['update_count'])
+    log.info("Last updated: {}", summary['metadata']['last_updated'])
     
-    print(f"\nBounds by source:")
+    log.info("\nBounds by source:")
     for source, count in summary['bounds_by_source'].items():
-        print(f"  {source}: {count}")
+        log.info("  {}: {}", source, count)
     
-    print(f"\nConfidence distribution:")
+    log.info("\nConfidence distribution:")
     for confidence, count in summary['confidence_distribution'].items():
-        print(f"  {confidence}: {count}")
+        log.info("  {}: {}", confidence, count)
     
     # Детальная информация по каждому классу
-    if hasattr(optimizer, 'effective_bounds') and optimizer.effective_bounds:
-        print(f"\nDetailed bounds per class:")
+    if hasattr(optimizer, 'effective_bounds') and optimizer.effective_bounds and log.is_enabled(DEBUG):
+        log.debug("\nDetailed bounds per class:")
         for class_idx in sorted(optimizer.effective_bounds.keys()):
             bounds = optimizer.effective_bounds[class_idx]
             class_obj = optimizer.classes[class_idx]
             
-            print(f"  Class {class_idx} ({class_obj.subject}): {bounds}")
+            log.debug("  Class {} ({}): {}", class_idx, class_obj.subject, bounds)
             if bounds.applied_constraints:
                 for constraint in bounds.applied_constraints:
-                    print(f"    - {constraint['type']}: {constraint['description']}")
+                    log.debug("    - {}: {}", constraint['type'], constraint['description'])
     
-    print("=" * 35)
+    log.info("=" * 35)
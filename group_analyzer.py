@@ -8,8 +8,11 @@
 на независимые группы вместо поиска общего временного окна.
 """
 
-from time_utils import time_to_minutes, minutes_to_time
+from time_utils import minutes_to_time
 from timewindow_utils import build_transitive_links
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
 
 
 class ClassGroup:
@@ -44,8 +47,8 @@ class ClassGroup:
         if not self.window_classes:
             return
         
-        window_starts = [time_to_minutes(c.start_time) for _, c in self.window_classes]
-        window_ends = [time_to_minutes(c.end_time) for _, c in self.window_classes]
+        window_starts = [c.start_minutes for _, c in self.window_classes]
+        window_ends = [c.end_minutes for _, c in self.window_classes]
         
         self.common_window_start = max(window_starts)
         self.common_window_end = min(window_ends)
@@ -132,7 +135,7 @@ def group_classes_by_criteria(optimizer):
                 'rooms': {room_name: {day: ClassGroup}}
             }
     """
-    print("Grouping classes by criteria...")
+    log.debug("Grouping classes by criteria...")
     
     # Словари для группировки
     student_groups = {}
@@ -141,7 +144,7 @@ def group_classes_by_criteria(optimizer):
     
     # Группировка по группам студентов
     for idx, c in enumerate(optimizer.classes):
-        for group_name in c.get_groups():
+        for group_name in c.groups:
             if group_name not in student_groups:
                 student_groups[group_name] = {}
             
@@ -197,7 +200,7 @@ def group_classes_by_criteria(optimizer):
             if len(classes_list) > 1:  # Только группы с несколькими занятиями
                 result['rooms'][room_name][day] = ClassGroup('room', room_name, day, classes_list)
     
-    print(f"Found {len(result['student_groups'])} student groups, {len(result['teachers'])} teachers, {len(result['rooms'])} rooms with multiple classes")
+    log.debug("Found {} student groups, {} teachers, {} rooms with multiple classes", len(result['student_groups']), len(result['teachers']), len(result['rooms']))
     
     return result
 
@@ -220,19 +223,19 @@ def time_windows_overlap(c1, c2):
         return True
     
     # Определяем временные интервалы для каждого занятия
-    start1 = time_to_minutes(c1.start_time)
+    start1 = c1.start_minutes
     if c1.end_time:
         # Занятие с временным окном
-        end1 = time_to_minutes(c1.end_time)
+        end1 = c1.end_minutes
     else:
         # Фиксированное занятие - считаем время выполнения включая паузы
         pause_after_1 = getattr(c1, 'pause_after', 0)
         end1 = start1 + c1.duration + pause_after_1
     
-    start2 = time_to_minutes(c2.start_time)
+    start2 = c2.start_minutes
     if c2.end_time:
         # Занятие с временным окном
-        end2 = time_to_minutes(c2.end_time)
+        end2 = c2.end_minutes
     else:
         # Фиксированное занятие - считаем время выполнения включая паузы
         pause_after_2 = getattr(c2, 'pause_after', 0)
@@ -242,8 +245,10 @@ def time_windows_overlap(c1, c2):
     overlap = start1 < end2 and start2 < end1
     
     # Отладочная информация
-    if hasattr(c1, 'subject') and hasattr(c2, 'subject'):
-        print(f"    Time overlap check: {c1.subject} [{minutes_to_time(start1)}-{minutes_to_time(end1)}] vs {c2.subject} [{minutes_to_time(start2)}-{minutes_to_time(end2)}] = {overlap}")
+    if hasattr(c1, 'subject') and hasattr(c2, 'subject') and log.is_enabled(DEBUG):
+        log.debug("    Time overlap check: {} [{}-{}] vs {} [{}-{}] = {}",
+                  c1.subject, minutes_to_time(start1), minutes_to_time(end1),
+                  c2.subject, minutes_to_time(start2), minutes_to_time(end2), overlap)
     
     return overlap
 
@@ -263,22 +268,22 @@ def find_independent_groups(class_group):
     Returns:
         list: Список независимых ClassGroup объектов
     """
-    print(f"Finding independent groups for {class_group.group_type} '{class_group.group_key}' on {class_group.day}")
+    log.debug("Finding independent groups for {} '{}' on {}", class_group.group_type, class_group.group_key, class_group.day)
     
     if class_group.group_type == 'student_group':
         # Для групп студентов включаем транзитивно связанные классы
         extended_classes = _include_transitive_links(class_group)
-        print(f"  Extended from {len(class_group.classes)} to {len(extended_classes)} classes including transitive links")
+        log.debug("  Extended from {} to {} classes including transitive links", len(class_group.classes), len(extended_classes))
     else:
         extended_classes = class_group.classes
         
         # Для преподавателей исключаем классы с общими группами студентов (уже обработаны)
         if class_group.group_type == 'teacher':
             extended_classes = _filter_shared_student_groups(extended_classes)
-            print(f"  Filtered to {len(extended_classes)} classes without shared student groups")
+            log.debug("  Filtered to {} classes without shared student groups", len(extended_classes))
     
     if len(extended_classes) < 2:
-        print(f"  Not enough classes ({len(extended_classes)}) for independent grouping")
+        log.debug("  Not enough classes ({}) for independent grouping", len(extended_classes))
         return []
     
     # Алгоритм разделения на независимые группы по пересечению временных окон
@@ -301,7 +306,7 @@ def find_independent_groups(class_group):
         if not found_group:
             independent_groups.append([(idx, c)])
     
-    print(f"  Split into {len(independent_groups)} independent time groups:")
+    log.debug("  Split into {} independent time groups:", len(independent_groups))
     
     # Создаем ClassGroup объекты для каждой независимой группы
     result_groups = []
@@ -311,14 +316,14 @@ def find_independent_groups(class_group):
             independent_group = ClassGroup(class_group.group_type, group_key, class_group.day, group_classes)
             result_groups.append(independent_group)
             
-            print(f"    Group {group_idx + 1}: {len(group_classes)} classes")
+            log.debug("    Group {}: {} classes", group_idx + 1, len(group_classes))
             for idx, c in group_classes:
                 time_info = f"{c.start_time}"
                 if c.end_time:
                     time_info += f"-{c.end_time}"
-                print(f"      Class {idx}: {getattr(c, 'subject', 'Unknown')} {time_info}")
+                log.debug("      Class {}: {} {}", idx, getattr(c, 'subject', 'Unknown'), time_info)
         else:
-            print(f"    Group {group_idx + 1}: Only 1 class, skipping")
+            log.debug("    Group {}: Only 1 class, skipping", group_idx + 1)
     
     return result_groups
 
@@ -357,7 +362,7 @@ def _filter_shared_student_groups(classes_list):
         
         for j, (idx_j, c_j) in enumerate(classes_list):
             if i != j:
-                shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+                shared_groups = c_i.group_set & c_j.group_set
                 if shared_groups:
                     has_shared_group = True
                     break
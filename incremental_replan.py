@@ -0,0 +1,334 @@
+"""
+Инкрементальное перепланирование: решается только окрестность измененных занятий.
+
+Вход - прошлое расписание (строки листа "Schedule", solution_hints.read_schedule_hints)
+и текущий список занятий. Изменения определяются сопоставлением строк
+занятиям (solution_hints.match_schedule_rows): по (subject, group, teacher, day),
+занятие без фиксированного дня - по (subject, group, teacher) в любой день:
+  - добавленные занятия и занятия с измененным ключом (нет строки);
+  - занятия, чья прошлая аудитория больше не входит в possible_rooms, прошлое
+    время не попадает в новое окно/фиксированное время, прошлого дня занятия
+    без фиксированного дня больше нет среди дней модели или изменилась
+    длительность;
+  - удаленные занятия (строка без занятия) освобождают место, поэтому
+    занятия того же преподавателя или группы в тот же день тоже решаются
+    заново.
+
+Окрестность N - измененные занятия вместе с их связанными цепочками. Граница
+B - занятия, которые могут конфликтовать с N (тот же день и общий
+преподаватель, группа или аудитория), вместе с их цепочками; они входят в
+модель, но фиксируются на прошлых слоте и аудитории. Остальные занятия
+переносятся из прошлого расписания без решения. Если модель N + B
+недопустима, окрестность расширяется (N = N + B) и решается снова, вплоть до
+всей задачи.
+
+Целевая функция в solver_info и objective_value - целевая функция модели
+окрестности, а не всего расписания.
+"""
+
+import time
+from typing import Dict, List, Set
+
+from constraint_registry import ConstraintType
+from schedule_logging import get_logger
+from solution_hints import match_schedule_rows
+
+log = get_logger(__name__)
+
+__all__ = ['find_changed_classes', 'expand_neighborhood', 'apply_fixed_assignments', 'solve_incremental']
+
+
+def _chain_members(optimizer) -> Dict[int, Set[int]]:
+    """Индексы занятий, связанных с каждым занятием цепочкой (включая само занятие)."""
+    if not hasattr(optimizer, 'linked_chains'):
+        from linked_chain_utils import build_linked_chains
+        build_linked_chains(optimizer)
+
+    neighbours = {idx: set() for idx in range(len(optimizer.classes))}
+    for chain in optimizer.linked_chains:
+        for idx in chain:
+            neighbours[idx].update(chain)
+    for idx, c in enumerate(optimizer.classes):
+        linked = list(getattr(c, 'linked_classes', None) or [])
+        for other in (getattr(c, 'previous_class', None), getattr(c, 'next_class', None)):
+            if other is not None:
+                linked.append(other)
+        for other in linked:
+            other_idx = optimizer.object_index_map.get(other)
+            if other_idx is not None:
+                neighbours[idx].add(other_idx)
+                neighbours[other_idx].add(idx)
+
+    members = {}
+    for idx in neighbours:
+        if idx in members:
+            continue
+        component = {idx}
+        stack = [idx]
+        while stack:
+            for other in neighbours[stack.pop()]:
+                if other not in component:
+                    component.add(other)
+                    stack.append(other)
+        for other in component:
+            members[other] = component
+    return members
+
+
+def _close_over_chains(indices, members):
+    """Дополняет набор занятий их цепочками."""
+    closed = set()
+    for idx in indices:
+        closed |= members[idx]
+    return closed
+
+
+def _baseline_changed(optimizer, c, row) -> bool:
+    """Прошлое назначение занятия недопустимо для его текущих данных."""
+    if row['start_time'] not in optimizer.time_slot_indices:
+        return True
+    if row['room'] not in c.possible_rooms:
+        return True
+    # Занятие без фиксированного дня сопоставлено строке в любой день
+    if not c.day and row['day'] not in optimizer.day_indices:
+        return True
+    duration = row.get('duration')
+    if duration:
+        try:
+            if int(float(duration)) != c.duration:
+                return True
+        except ValueError:
+            return True
+
+    start = optimizer._time_to_minutes(row['start_time'])
+    if c.start_time and not c.end_time:
+        return start != c.start_minutes
+    if c.start_time and c.end_time:
+        return (start < c.start_minutes
+                or start + c.duration > c.end_minutes)
+    return False
+
+
+def find_changed_classes(optimizer, rows: List[Dict[str, str]]):
+    """
+    Сопоставляет занятия прошлому расписанию и находит измененные.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        rows: Строки прошлого расписания
+
+    Returns:
+        tuple: ({индекс: строка} для сопоставленных занятий, множество
+        индексов измененных занятий, статистика изменений)
+    """
+    matches, _ = match_schedule_rows(optimizer.classes, rows)
+    added = {idx for idx in range(len(optimizer.classes)) if idx not in matches}
+    changed = {idx for idx, row in matches.items()
+               if _baseline_changed(optimizer, optimizer.classes[idx], row)}
+
+    # Строки без занятия - удаленные занятия; их преподаватель и группа в тот
+    # день получают свободное время, поэтому их занятия решаются заново
+    used = {id(row) for row in matches.values()}
+    removed = [row for row in rows if id(row) not in used]
+    freed = set()
+    for row in removed:
+        freed.add(('teacher', row['day'], row['teacher']))
+        freed.add(('group', row['day'], row['group']))
+    affected = set()
+    if freed:
+        for idx, row in matches.items():
+            c = optimizer.classes[idx]
+            keys = {('teacher', row['day'], c.teacher)} | {('group', row['day'], g) for g in c.groups}
+            if keys & freed:
+                affected.add(idx)
+
+    stats = {
+        'added': len(added),
+        'changed': len(changed),
+        'removed': len(removed),
+        'affected_by_removal': len(affected - added - changed),
+    }
+    return matches, added | changed | affected, stats
+
+
+def expand_neighborhood(optimizer, seeds, matches, members):
+    """
+    Строит окрестность и ее фиксированную границу.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        seeds: Индексы занятий, которые решаются заново
+        matches: {индекс: строка прошлого расписания}
+        members: Результат _chain_members
+
+    Returns:
+        tuple: (окрестность N, граница B) - множества индексов
+    """
+    neighborhood = _close_over_chains(seeds, members)
+
+    # Ресурсы окрестности; занятие без фиксированного дня может попасть в любой день
+    resources = set()
+    for idx in neighborhood:
+        c = optimizer.classes[idx]
+        day = c.day or '*'
+        if c.teacher:
+            resources.add((day, 'teacher', c.teacher))
+        resources.update((day, 'group', group) for group in c.groups if group)
+        resources.update((day, 'room', room) for room in c.possible_rooms if room)
+    days_any = {key[1:] for key in resources if key[0] == '*'}
+
+    boundary = set()
+    for idx, row in matches.items():
+        if idx in neighborhood:
+            continue
+        c = optimizer.classes[idx]
+        keys = {('teacher', c.teacher), ('room', row['room'])} | {('group', g) for g in c.groups}
+        if keys & days_any or any((row['day'],) + key in resources for key in keys):
+            boundary.add(idx)
+    boundary = _close_over_chains(boundary, members) - neighborhood
+    return neighborhood, boundary
+
+
+def apply_fixed_assignments(optimizer, fixed: Dict[int, Dict[str, str]]):
+    """
+    Фиксирует занятия построенной модели на прошлых дне, слоте и аудитории.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer с построенной моделью
+        fixed: {индекс занятия: строка прошлого расписания}
+    """
+    for idx, row in fixed.items():
+        slot = optimizer.time_slot_indices[row['start_time']]
+        room_idx = optimizer.rooms.index(row['room'])
+        variables = [(optimizer.start_vars[idx], slot, f"start_vars[{idx}]"),
+                     (optimizer.room_vars[idx], room_idx, f"room_vars[{idx}]")]
+        if row['day'] in optimizer.day_indices:
+            variables.append((optimizer.day_vars[idx], optimizer.day_indices[row['day']], f"day_vars[{idx}]"))
+
+        for var, value, name in variables:
+            if isinstance(var, int):
+                continue
+            optimizer.add_constraint(
+                constraint_expr=var == value,
+                constraint_type=ConstraintType.FIXED_TIME,
+                origin_module=__name__,
+                origin_function="apply_fixed_assignments",
+                class_i=idx,
+                description=f"Re-plan: class {idx} kept at {row['day']} {row['start_time']} in {row['room']}",
+                variables_used=[name]
+            )
+    log.info("  📌 Re-plan: {} classes fixed to the previous schedule", len(fixed))
+
+
+def _solve_round(optimizer, indices, fixed_local, hint_rows, time_limit_seconds):
+    """Решает модель окрестности и границы в текущем процессе."""
+    from scheduler_base import ScheduleOptimizer
+
+    sub = ScheduleOptimizer([optimizer.classes[idx] for idx in indices],
+                            time_interval=optimizer.time_interval,
+                            time_grid=optimizer.time_grid,
+                            constraint_mode=optimizer.constraint_mode,
+                            fast_registration=optimizer.fast_registration,
+                            solver_config=optimizer.solver_config,
+                            solution_hints=hint_rows,
+                            repair_hints=True)
+    sub.use_pair_index = optimizer.use_pair_index
+    sub.write_reports = False
+    sub.build_model()
+    apply_fixed_assignments(sub, fixed_local)
+    sub.solve(time_limit_seconds=time_limit_seconds)
+    return sub
+
+
+def solve_incremental(optimizer, time_limit_seconds=60):
+    """
+    Перепланирует расписание относительно optimizer.replan_baseline.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer (модель еще не построена)
+        time_limit_seconds: Ограничение времени решения одной окрестности
+
+    Returns:
+        bool: True, если расписание найдено
+    """
+    from constraint_registry import generate_all_reports
+    from solution_table import SolutionTable
+
+    started = time.time()
+    rows = optimizer.replan_baseline
+    matches, seeds, changes = find_changed_classes(optimizer, rows)
+    members = _chain_members(optimizer)
+    log.info("\n🔁 Re-plan from {} previous rows: {} added, {} changed, {} removed, "
+             "{} classes affected by removals", len(rows), changes['added'], changes['changed'],
+             changes['removed'], changes['affected_by_removal'], event="replan_changes", **changes)
+
+    rounds = []
+    neighborhood = _close_over_chains(seeds, members)
+    sub, indices = None, []
+    while True:
+        neighborhood, boundary = expand_neighborhood(optimizer, neighborhood, matches, members)
+        indices = sorted(neighborhood | boundary)
+        if not neighborhood:
+            log.info("  Nothing to re-plan: the previous schedule is kept")
+            break
+
+        log.info("  Re-plan round {}: {} classes re-solved, {} fixed around them",
+                 len(rounds) + 1, len(neighborhood), len(boundary))
+        local = {idx: pos for pos, idx in enumerate(indices)}
+        fixed_local = {local[idx]: matches[idx] for idx in boundary}
+        hint_rows = [matches[idx] for idx in indices if idx in matches]
+        sub = _solve_round(optimizer, indices, fixed_local, hint_rows, time_limit_seconds)
+        rounds.append({
+            'neighborhood': len(neighborhood),
+            'fixed': len(boundary),
+            'status': sub.solver_status,
+            'wall_time': sub.solver_info['wall_time'] if sub.solver_info else None,
+        })
+        log.info("  Round {}: {}", len(rounds), sub.solver_status, event="replan_round",
+                 round=len(rounds), **rounds[-1])
+
+        if sub.solver_status != 'INFEASIBLE' or not boundary:
+            break
+        # Фиксированная граница не оставляет места: расширяем окрестность
+        neighborhood = neighborhood | boundary
+
+    wall_time = time.time() - started
+    status = sub.solver_status if sub is not None else 'OPTIMAL'
+    kept = len(optimizer.classes) - len(indices)
+    optimizer.solver = None
+    optimizer.solver_status = status
+    optimizer.solver_info = {
+        'preset': optimizer.solver_config.preset,
+        'config': optimizer.solver_config.to_dict(),
+        'num_workers': sub.solver_info['num_workers'] if sub is not None and sub.solver_info else None,
+        'status': status,
+        'objective': sub.objective_value if sub is not None else 0,
+        'wall_time': wall_time,
+        'replan': dict(changes, kept=kept, rounds=rounds),
+        'hints': sub.hint_stats if sub is not None else None,
+    }
+    log.info("  Re-plan: {} in {:.2f}s, {} classes kept from the previous schedule", status, wall_time, kept,
+             event="replan_result", status=status, wall_time=wall_time, kept=kept, rounds=len(rounds))
+
+    if sub is not None:
+        optimizer.constraint_registry.merge(sub.constraint_registry, indices, label='replan')
+    if status not in ('OPTIMAL', 'FEASIBLE'):
+        optimizer.solution = None
+        optimizer.objective_value = None
+        if status == 'INFEASIBLE' and optimizer.write_reports:
+            generate_all_reports(optimizer.constraint_registry, optimizer=optimizer, infeasible=True)
+        return False
+
+    # Занятия вне окрестности остаются на местах из прошлого расписания
+    solved = set(indices) if sub is not None else set()
+    kept_indices = [idx for idx in sorted(matches) if idx not in solved]
+    parts = [(kept_indices, SolutionTable.from_records(optimizer, [matches[idx] for idx in kept_indices],
+                                                       classes=[optimizer.classes[idx] for idx in kept_indices]))]
+    if sub is not None:
+        parts.append((indices, sub.solution))
+    optimizer.solution = SolutionTable.combine(optimizer, parts)
+    optimizer.objective_value = optimizer.solver_info['objective']
+    log.info("✅ Solution found: {} (neighborhood objective {})", status, optimizer.objective_value)
+    if optimizer.write_reports:
+        generate_all_reports(optimizer.constraint_registry, optimizer=optimizer, infeasible=False)
+    return True
@@ -0,0 +1,207 @@
+"""
+Модуль ограничений ресурсов на основе интервальных переменных CP-SAT.
+
+Альтернатива попарным ограничениям из resource_constraints: для каждого
+занятия создается одна интервальная переменная (и опциональные интервалы
+для каждой возможной аудитории / дня на литералах присутствия из
+room_assignment), после чего на каждую пару
+(преподаватель, день), (группа, день) и (аудитория, день) добавляется одно
+ограничение AddNoOverlap. Размер модели растет линейно по числу занятий,
+а не квадратично по числу конфликтующих пар.
+
+Интервал занятия включает паузы: [start - pause_before, start + duration + pause_after).
+Два таких интервала не пересекаются тогда и только тогда, когда между
+занятиями выдержаны pause_after первого и pause_before второго - как в
+add_sequential_constraints.
+"""
+
+from constraint_registry import ConstraintType
+from conflict_detector import check_potential_conflicts
+from room_assignment import create_room_presence, get_room_options
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['create_interval_variables', 'add_nooverlap_resource_constraints']
+
+
+def _ceil_slots(minutes, time_interval):
+    """Переводит минуты в слоты с округлением вверх."""
+    return (minutes + time_interval - 1) // time_interval
+
+
+def _day_options(optimizer, idx):
+    """
+    Возвращает возможные дни занятия с литералами присутствия.
+
+    Returns:
+        dict: {day_index: literal или None}, None - день задан жестко
+    """
+    day_var = optimizer.day_vars[idx]
+    if isinstance(day_var, int):
+        return {day_var: None}
+
+    options = {}
+    for day_idx in optimizer.day_indices.values():
+        literal = optimizer.model.NewBoolVar(f"on_day_{idx}_{day_idx}")
+        optimizer.model.Add(day_var == day_idx).OnlyEnforceIf(literal)
+        optimizer.model.Add(day_var != day_idx).OnlyEnforceIf(literal.Not())
+        options[day_idx] = literal
+    return options
+
+
+def _presence_literal(optimizer, literals, name):
+    """
+    Объединяет литералы присутствия через AND.
+
+    Returns:
+        Литерал или None, если ни одного условия нет (интервал обязателен)
+    """
+    literals = [literal for literal in literals if literal is not None]
+    if not literals:
+        return None
+    if len(literals) == 1:
+        return literals[0]
+
+    both = optimizer.model.NewBoolVar(name)
+    optimizer.model.AddBoolAnd(literals).OnlyEnforceIf(both)
+    optimizer.model.AddBoolOr([literal.Not() for literal in literals]).OnlyEnforceIf(both.Not())
+    return both
+
+
+def _new_interval(optimizer, idx, presence, name):
+    """Создает (опциональный) интервал занятия idx с учетом пауз."""
+    c = optimizer.classes[idx]
+    start = optimizer.start_vars[idx]
+    pause_before = _ceil_slots(c.pause_before, optimizer.time_interval)
+    pause_after = _ceil_slots(c.pause_after, optimizer.time_interval)
+    duration = c.duration // optimizer.time_interval
+    size = pause_before + duration + pause_after
+
+    if presence is None:
+        return optimizer.model.NewIntervalVar(start - pause_before, size, start + duration + pause_after, name)
+    return optimizer.model.NewOptionalIntervalVar(
+        start - pause_before, size, start + duration + pause_after, presence, name)
+
+
+def create_interval_variables(optimizer):
+    """
+    Создает интервальные переменные для всех занятий.
+
+    Заполняет:
+        optimizer.interval_vars: {(idx, day_index): interval} - интервалы по дням
+        optimizer.room_interval_vars: {(idx, day_index, room_index): interval}
+
+    Для занятий с фиксированным днем и аудиторией оба словаря ссылаются
+    на один и тот же обязательный интервал.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+    """
+    optimizer.interval_vars = {}
+    optimizer.room_interval_vars = {}
+
+    for idx in range(len(optimizer.classes)):
+        day_options = _day_options(optimizer, idx)
+        room_options = get_room_options(optimizer, idx)
+
+        for day_idx, day_literal in day_options.items():
+            if day_literal is None:
+                name = f"interval_{idx}"
+            else:
+                name = f"interval_{idx}_d{day_idx}"
+            day_interval = _new_interval(optimizer, idx, day_literal, name)
+            optimizer.interval_vars[(idx, day_idx)] = day_interval
+
+            for room_idx, room_literal in room_options.items():
+                if room_literal is None:
+                    # Аудитория фиксирована - интервал аудитории совпадает с интервалом дня
+                    optimizer.room_interval_vars[(idx, day_idx, room_idx)] = day_interval
+                    continue
+                presence = _presence_literal(
+                    optimizer, [day_literal, room_literal], f"in_room_day_{idx}_{room_idx}_{day_idx}")
+                optimizer.room_interval_vars[(idx, day_idx, room_idx)] = _new_interval(
+                    optimizer, idx, presence, f"interval_{idx}_d{day_idx}_r{room_idx}")
+
+    log.info("  Created {} class intervals and {} room intervals",
+             len(optimizer.interval_vars), len(optimizer.room_interval_vars))
+
+
+def _add_nooverlap(optimizer, interval_names, intervals, constraint_type, description):
+    """Добавляет AddNoOverlap и регистрирует его в реестре ограничений."""
+    constraint = optimizer.model.AddNoOverlap(intervals)
+    optimizer.add_constraint(
+        constraint_expr=constraint,
+        constraint_type=constraint_type,
+        origin_module=__name__,
+        origin_function="add_nooverlap_resource_constraints",
+        description=description,
+        variables_used=interval_names
+    )
+
+
+def add_nooverlap_resource_constraints(optimizer):
+    """
+    Добавляет ограничения ресурсов через AddNoOverlap (режим "nooverlap").
+
+    Заменяет add_resource_conflict_constraints: вместо попарных булевых
+    переменных overlap/conflict/same_day одно ограничение на каждую пару
+    (преподаватель, день), (группа, день) и (аудитория, день).
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+    """
+    log.info("\n=== ADDING RESOURCE NO-OVERLAP CONSTRAINTS ===")
+
+    if not hasattr(optimizer, 'linked_chains'):
+        from linked_chain_utils import build_linked_chains
+        build_linked_chains(optimizer)
+        log.debug("  Initialized linked chains: {} chains found", len(optimizer.linked_chains))
+
+    # Предварительная проверка конфликтов (только диагностика)
+    check_potential_conflicts(optimizer)
+
+    create_room_presence(optimizer)
+    create_interval_variables(optimizer)
+
+    teacher_buckets = {}
+    group_buckets = {}
+    room_buckets = {}
+
+    for (idx, day_idx), interval in optimizer.interval_vars.items():
+        c = optimizer.classes[idx]
+        if c.teacher:
+            teacher_buckets.setdefault((c.teacher, day_idx), []).append((idx, interval))
+        for group in c.group_set:
+            group_buckets.setdefault((group, day_idx), []).append((idx, interval))
+
+    for (idx, day_idx, room_idx), interval in optimizer.room_interval_vars.items():
+        room_buckets.setdefault((room_idx, day_idx), []).append((idx, interval))
+
+    day_names = {day_idx: day for day, day_idx in optimizer.day_indices.items()}
+    added = 0
+
+    for buckets, constraint_type, label, resolve in (
+        (teacher_buckets, ConstraintType.TEACHER_CONFLICT, "teacher", lambda key: key),
+        (group_buckets, ConstraintType.GROUP_CONFLICT, "group", lambda key: key),
+        (room_buckets, ConstraintType.ROOM_CONFLICT, "room", lambda key: optimizer.rooms[key]),
+    ):
+        for (resource, day_idx), members in buckets.items():
+            if len(members) < 2:
+                continue
+            class_indices = [idx for idx, _ in members]
+            _add_nooverlap(
+                optimizer,
+                [interval.Name() for _, interval in members],
+                [interval for _, interval in members],
+                constraint_type,
+                f"NoOverlap {label} '{resolve(resource)}' on {day_names.get(day_idx, day_idx)}: classes {class_indices}"
+            )
+            added += 1
+
+    log.info("\n=== RESOURCE NO-OVERLAP CONSTRAINTS SUMMARY ===")
+    log.info("Teacher/day buckets: {}", len(teacher_buckets))
+    log.info("Group/day buckets: {}", len(group_buckets))
+    log.info("Room/day buckets: {}", len(room_buckets))
+    log.info("NoOverlap constraints added: {}", added)
+    log.info("="*50)
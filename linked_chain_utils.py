@@ -7,13 +7,88 @@
 
 from timewindow_utils import are_classes_transitively_linked
 from time_utils import time_to_minutes, minutes_to_time
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 __all__ = ['is_in_linked_chain', 'get_linked_chain_order', 'collect_full_chain', 'build_linked_chains',
            'find_chain_containing_classes', 'get_chain_window', 'are_classes_in_same_chain', 'pick_best_anchor',
-           'clear_chain_windows_cache']
+           'ChainIndex']
 
-# Кеш для окон цепочек
-_chain_windows_cache = {}
+
+class ChainIndex:
+    """
+    Индекс связанных цепочек оптимизатора (optimizer.chain_index).
+    
+    Цепочка идентифицируется номером в optimizer.linked_chains. Для каждого
+    занятия хранятся номера его цепочек, для цепочки - ее индексы занятий и
+    кешированное окно (get_chain_window). Поиск общей цепочки пары и
+    инвалидация окна цепочки выполняются за O(1). Индекс перестраивается
+    при каждом назначении optimizer.linked_chains (build_linked_chains,
+    model_cache).
+    
+    Окно цепочки - пересечение исходных границ ее занятий; занятия после
+    загрузки заморожены, поэтому окно вычисляется один раз и сбрасывается
+    только при перестроении индекса, clear_windows (clear_analysis_cache) или
+    явной инвалидации (chain_helpers.invalidate_chain_window,
+    invalidate_chain_windows_by_indices).
+    """
+    
+    def __init__(self, chains=()):
+        """
+        Args:
+            chains: Цепочки - списки индексов занятий (optimizer.linked_chains)
+        """
+        self.rebuild(chains)
+    
+    def rebuild(self, chains):
+        """Строит индекс заново по списку цепочек; кеш окон очищается."""
+        self.chains = list(chains)
+        self._members = [frozenset(chain) for chain in self.chains]
+        # Индекс занятия -> номера цепочек в порядке linked_chains
+        self._chain_ids = {}
+        for chain_id, chain in enumerate(self.chains):
+            for idx in chain:
+                ids = self._chain_ids.setdefault(idx, [])
+                if not ids or ids[-1] != chain_id:
+                    ids.append(chain_id)
+        self._windows = {}
+    
+    def chain_ids(self, idx):
+        """Номера цепочек, в которые входит занятие idx."""
+        return self._chain_ids.get(idx, ())
+    
+    def find(self, idx1, idx2):
+        """
+        Первая цепочка, в которую входят оба занятия.
+        
+        Returns:
+            int or None: Номер цепочки или None
+        """
+        for chain_id in self._chain_ids.get(idx1, ()):
+            if idx2 in self._members[chain_id]:
+                return chain_id
+        return None
+    
+    def members(self, chain_id):
+        """Индексы занятий цепочки (тот же список, что в optimizer.linked_chains)."""
+        return self.chains[chain_id]
+    
+    def window(self, optimizer, chain_id):
+        """Окно цепочки (get_chain_window), вычисляется один раз до инвалидации."""
+        if chain_id in self._windows:
+            return self._windows[chain_id]
+        window = get_chain_window(optimizer, self.chains[chain_id])
+        self._windows[chain_id] = window
+        return window
+    
+    def invalidate(self, chain_id):
+        """Сбрасывает кешированное окно цепочки."""
+        self._windows.pop(chain_id, None)
+    
+    def clear_windows(self):
+        """Сбрасывает окна всех цепочек."""
+        self._windows.clear()
 
 
 def build_linked_chains(optimizer):
@@ -48,6 +123,7 @@ def build_linked_chains(optimizer):
                 seen.add(chain_tuple)
 
     optimizer.linked_chains = chains
+    optimizer.chain_index.rebuild(chains)
 
 
 def is_in_linked_chain(optimizer, idx):
@@ -67,6 +143,24 @@ def is_in_linked_chain(optimizer, idx):
     return False
 
 
+def get_chain_pair_order(optimizer, idx_i, idx_j):
+    """
+    Определяет порядок двух занятий внутри связанной цепочки.
+    
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer (с построенными linked_chains)
+        idx_i, idx_j: Индексы занятий
+        
+    Returns:
+        tuple: (в одной ли цепочке, порядок): 1 - i раньше j, -1 - j раньше i,
+        0 - занятия не в одной цепочке
+    """
+    for chain in getattr(optimizer, "linked_chains", []):
+        if idx_i in chain and idx_j in chain:
+            return True, 1 if chain.index(idx_i) < chain.index(idx_j) else -1
+    return False, 0
+
+
 def get_linked_chain_order(root):
     """
     Return the full transitive order of class objects
@@ -86,9 +180,7 @@ def collect_full_chain(root):
     """
     Depth-first traversal of linked_classes, возвращает список
     занятий в порядке от root до самых «листовых» потомков.
-    При этом у каждого класса устанавливаются:
-      .previous = родитель (или None для root)
-      .next_list = список прямых детей
+    Занятия не изменяются (ScheduleClass неизменяем после загрузки).
     
     Args:
         root: Корневой класс для обхода цепочки
@@ -99,7 +191,7 @@ def collect_full_chain(root):
     result = []
     visited = set()
     
-    def dfs(current_class, parent=None):
+    def dfs(current_class):
         """Рекурсивный обход в глубину"""
         if id(current_class) in visited:
             return  # Избегаем циклических ссылок
@@ -107,17 +199,10 @@ def collect_full_chain(root):
         visited.add(id(current_class))
         result.append(current_class)
         
-        # Устанавливаем связь с родителем - это модификация структуры цепочки
-        current_class.previous = parent
-        
-        # Инициализируем список детей
-        current_class.next_list = []
-        
         # Обходим всех связанных детей
         if hasattr(current_class, 'linked_classes') and current_class.linked_classes:
             for linked_class in current_class.linked_classes:
-                current_class.next_list.append(linked_class)
-                dfs(linked_class, current_class)
+                dfs(linked_class)
     
     # Начинаем обход с корневого класса
     dfs(root)
@@ -136,14 +221,8 @@ def find_chain_containing_classes(optimizer, idx1, idx2):
     Returns:
         list or None: Список индексов цепочки, если оба занятия в одной цепочке, иначе None
     """
-    if not hasattr(optimizer, 'linked_chains'):
-        return None
-        
-    for chain in optimizer.linked_chains:
-        if idx1 in chain and idx2 in chain:
-            return chain
-    
-    return None
+    chain_id = optimizer.chain_index.find(idx1, idx2)
+    return None if chain_id is None else optimizer.chain_index.members(chain_id)
 
 
 def are_classes_in_same_chain(optimizer, idx1, idx2):
@@ -186,6 +265,7 @@ def get_chain_window(optimizer, chain_indices):
     """
     Вычисляет общее временное окно для цепочки занятий.
     Окно цепочки = пересечение оригинальных окон всех членов цепи.
+    Окна цепочек оптимизатора кешируются в optimizer.chain_index (ChainIndex.window).
     
     Args:
         optimizer: Экземпляр ScheduleOptimizer
@@ -195,13 +275,6 @@ def get_chain_window(optimizer, chain_indices):
         dict: {'min_time': str, 'max_time': str, 'min_minutes': int, 'max_minutes': int} 
               или None если нет пересечения
     """
-    global _chain_windows_cache
-    
-    # Создаем ключ для кеширования
-    cache_key = tuple(sorted(chain_indices))
-    if cache_key in _chain_windows_cache:
-        return _chain_windows_cache[cache_key]
-    
     min_times = []
     max_times = []
     
@@ -212,7 +285,6 @@ def get_chain_window(optimizer, chain_indices):
         if orig_min is None or orig_max is None:
             # Если хотя бы одно занятие не имеет временного окна,
             # окно цепочки не может быть определено
-            _chain_windows_cache[cache_key] = None
             return None
         
         min_times.append(time_to_minutes(orig_min))
@@ -226,7 +298,6 @@ def get_chain_window(optimizer, chain_indices):
     
     # Проверяем, что пересечение существует
     if chain_min_minutes >= chain_max_minutes:
-        _chain_windows_cache[cache_key] = None
         return None
     
     result = {
@@ -236,7 +307,6 @@ def get_chain_window(optimizer, chain_indices):
         'max_minutes': chain_max_minutes
     }
     
-    _chain_windows_cache[cache_key] = result
     return result
 
 
@@ -265,28 +335,24 @@ def pick_best_anchor(flex_class, chain_classes, direction="before", optimizer=No
     best_anchor = None
     best_score = float('inf')
     
-    print(f"\n=== SELECTING BEST ANCHOR ===")
-    print(f"Flex class: {flex_class.subject} (teacher: {flex_class.teacher})")
-    print(f"Chain has {len(chain_classes)} classes")
-    print(f"Direction: {direction}")
+    log.debug("\n=== SELECTING BEST ANCHOR ===")
+    log.debug("Flex class: {} (teacher: {})", flex_class.subject, flex_class.teacher)
+    log.debug("Chain has {} classes", len(chain_classes))
+    log.debug("Direction: {}", direction)
     
     for anchor in chain_classes:
         # Вычисляем компоненты оценки
         
         # T: общий учитель (0 если есть, 1 если нет)
         T = 0 if (flex_class.teacher and anchor.teacher and 
-                  flex_class.teacher == anchor.teacher) else 1
+                  flex_class.teacher_id == anchor.teacher_id) else 1
         
         # G: общие группы (0 если есть пересечение, 1 если нет)
-        flex_groups = set(flex_class.get_groups()) if hasattr(flex_class, 'get_groups') else set()
-        anchor_groups = set(anchor.get_groups()) if hasattr(anchor, 'get_groups') else set()
-        shared_groups = flex_groups & anchor_groups
+        shared_groups = flex_class.group_set & anchor.group_set
         G = 0 if shared_groups else 1
         
         # R: общие кабинеты (0 если есть пересечение, 1 если нет)
-        flex_rooms = set(flex_class.possible_rooms) if flex_class.possible_rooms else set()
-        anchor_rooms = set(anchor.possible_rooms) if anchor.possible_rooms else set()
-        shared_rooms = flex_rooms & anchor_rooms
+        shared_rooms = flex_class.room_set & anchor.room_set
         R = 0 if shared_rooms else 1
         
         # D: время ожидания
@@ -318,28 +384,21 @@ def pick_best_anchor(flex_class, chain_classes, direction="before", optimizer=No
                     idle = max(0, flex_start - (anchor_end + pause_after_anchor))
                     
             except Exception as e:
-                print(f"    Warning: Could not calculate idle time for anchor {anchor.subject}: {e}")
+                log.warning("    Warning: Could not calculate idle time for anchor {}: {}", anchor.subject, e)
                 idle = 0
         
         # Общая оценка (чем меньше, тем лучше)
         score = w_T * T + w_G * G + w_R * R + w_D * idle
         
-        print(f"  Candidate: {anchor.subject}")
-        print(f"    T={T} (teacher: {anchor.teacher}), G={G} (groups: {len(shared_groups)}), R={R} (rooms: {len(shared_rooms)}), idle={idle:.1f}min")
-        print(f"    Score: {w_T}*{T} + {w_G}*{G} + {w_R}*{R} + {w_D:.1f}*{idle:.1f} = {score:.2f}")
+        log.debug("  Candidate: {}", anchor.subject)
+        log.debug("    T={} (teacher: {}), G={} (groups: {}), R={} (rooms: {}), idle={:.1f}min", T, anchor.teacher, G, len(shared_groups), R, len(shared_rooms), idle)
+        log.debug("    Score: {}*{} + {}*{} + {}*{} + {:.1f}*{:.1f} = {:.2f}", w_T, T, w_G, G, w_R, R, w_D, idle, score)
         
         if score < best_score:
             best_score = score
             best_anchor = anchor
     
-    print(f"  ✓ Best anchor: {best_anchor.subject if best_anchor else 'None'} (score: {best_score:.2f})")
-    print("=" * 35)
+    log.debug("  ✓ Best anchor: {} (score: {:.2f})", best_anchor.subject if best_anchor else 'None', best_score)
+    log.debug("=" * 35)
     
     return best_anchor
-
-
-def clear_chain_windows_cache():
-    """Очищает кеш окон цепочек."""
-    global _chain_windows_cache
-    _chain_windows_cache = {}
-    print("Chain windows cache cleared")
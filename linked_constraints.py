@@ -1,4 +1,5 @@
 from constraint_registry import ConstraintType
+from schedule_logging import get_logger
 """
 Модуль для добавления ограничений для связанных занятий.
 
@@ -8,13 +9,15 @@ from constraint_registry import ConstraintType
 Функция build_linked_chains перенесена в linked_chain_utils.py
 """
 
+log = get_logger(__name__)
+
 def build_linked_chains(optimizer):
     """
     УСТАРЕВШАЯ функция - перенесена в linked_chain_utils.py
     
     ⚠️  ПРЕДУПРЕЖДЕНИЕ: Используйте linked_chain_utils.build_linked_chains()
     """
-    print("⚠️  WARNING: build_linked_chains is deprecated. Use linked_chain_utils.build_linked_chains() instead")
+    log.warning("⚠️  WARNING: build_linked_chains is deprecated. Use linked_chain_utils.build_linked_chains() instead")
     from linked_chain_utils import build_linked_chains as new_build_linked_chains
     return new_build_linked_chains(optimizer)
 
@@ -29,9 +32,9 @@ def add_linked_constraints(optimizer):
     - chain_constraints.py (основные ограничения)
     - linked_chain_utils.py (утилиты)
     """
-    print("⚠️  WARNING: add_linked_constraints() is DISABLED to prevent duplicate constraints!")
-    print("   All linked class constraints are now handled by chain_constraints.py")
-    print("   This function call is being ignored.")
+    log.warning("⚠️  WARNING: add_linked_constraints() is DISABLED to prevent duplicate constraints!")
+    log.warning("   All linked class constraints are now handled by chain_constraints.py")
+    log.warning("   This function call is being ignored.")
     
     # НЕ добавляем ограничения - возвращаемся сразу
     return
@@ -154,6 +157,6 @@ def add_linked_constraints(optimizer):
                     prev_class = linked_class
                     prev_idx = linked_idx
                 except ValueError as e:
-                    print(f"Warning: Error processing linked class: {str(e)}")
+                    log.warning("Warning: Error processing linked class: {}", str(e))
                     # Continue with next linked class
                     continue
\ No newline at end of file
@@ -8,8 +8,17 @@ from timewindow_adapter import apply_timewindow_improvements, add_objective_weig
 # Импорт модулей нашего приложения
 from reader import ScheduleReader
 from scheduler_base import ScheduleOptimizer
-from output_utils import get_schedule_dataframe, export_to_excel, get_teacher_schedule
+from output_utils import EXPORT_FORMATS, check_export_formats, export_schedule, output_paths
 from constraint_registry import export_constraint_registry, print_infeasible_summary
+from solver_config import ALL_CORES, PRESETS, build_solver_config
+from solution_hints import read_schedule_hints
+from model_cache import ModelCache
+from time_grid import DEFAULT_DAY_END, DEFAULT_DAY_START, TimeGrid, parse_day_bounds
+from run_profile import PHASES, PROFILERS, RunProfile, phase
+import schedule_logging
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 default_output_path = "optimized_schedule.xlsx"
 
@@ -19,26 +28,105 @@ def parse_arguments():
     
     parser.add_argument('input_file', help='Path to the Excel file with schedule planning data')
     parser.add_argument('--output', default=default_output_path,
-                    help='Path to the output Excel file (default: optimized_schedule.xlsx)')
+                    help='Path to the output file; each format replaces its extension (default: optimized_schedule.xlsx)')
+    parser.add_argument('--format', dest='formats', nargs='+', choices=list(EXPORT_FORMATS), default=['xlsx'],
+                    help='Output formats: xlsx (multi-sheet workbook), parquet, csv, jsonl (flat schedule), '
+                         'index (compact JSON with per-teacher/group/room rows of the flat schedule) (default: xlsx)')
     parser.add_argument('--time-limit', type=int, default=300, 
                     help='Time limit for optimization in seconds (default: 300)')
     parser.add_argument('--time-interval', type=int, default=15, 
                     help='Time interval for scheduling in minutes (default: 15)')
+    parser.add_argument('--day-start', default=DEFAULT_DAY_START,
+                    help=f'Earliest start of the school day, HH:MM (default: {DEFAULT_DAY_START})')
+    parser.add_argument('--day-end', default=DEFAULT_DAY_END,
+                    help=f'End of the school day (last time slot), HH:MM (default: {DEFAULT_DAY_END})')
+    parser.add_argument('--day-bounds', nargs='+', default=[], metavar='DAY=HH:MM-HH:MM',
+                    help='Different bounds for particular days, e.g. Sa=08:00-14:00')
+    parser.add_argument('--constraint-mode', choices=ScheduleOptimizer.CONSTRAINT_MODES, default='pairwise',
+                    help='Resource conflict modelling: pairwise constraints or NoOverlap intervals (default: pairwise)')
+    parser.add_argument('--fast-registration', action='store_true',
+                    help='Register constraints by type and class indices only; descriptions and variables are derived for reports')
+    parser.add_argument('--decompose-by-day', action='store_true',
+                    help='Solve each day as a separate model in parallel processes (falls back to one model if any class has no fixed day)')
+    parser.add_argument('--decompose-components', action='store_true',
+                    help='Solve each connected component of the conflict graph (shared teacher/group/room on a day, linked chains) as a separate model')
+    parser.add_argument('--workers', type=int, default=None,
+                    help='Worker processes for decomposed solving; 1 solves parts in-process, smallest first (default: min(parts, CPUs))')
+    parser.add_argument('--preset', choices=list(PRESETS), default=None,
+                    help='CP-SAT solver preset (default: "default", or the preset from --solver-config)')
+    parser.add_argument('--solver-config', default=None,
+                    help='JSON file with solver options (preset, num_search_workers, random_seed, ..., parameters)')
+    parser.add_argument('--search-workers', default=None,
+                    help='CP-SAT parallel search workers: a number or "all" for every CPU core')
+    parser.add_argument('--seed', type=int, default=None,
+                    help='CP-SAT random seed')
+    parser.add_argument('--linearization-level', type=int, choices=[0, 1, 2], default=None,
+                    help='CP-SAT linearization level')
+    parser.add_argument('--symmetry-level', type=int, choices=[0, 1, 2, 3, 4], default=None,
+                    help='CP-SAT symmetry detection level')
+    parser.add_argument('--log-search-progress', action='store_true',
+                    help='Log CP-SAT search progress (through the regular log output)')
+    parser.add_argument('--stream-solutions', default=None,
+                    help='Append every improving solution (time, objective, bound, schedule) to this JSON lines file')
+    parser.add_argument('--stop-gap', type=float, default=None,
+                    help='Stop the search once the relative gap between objective and bound is at most this value (e.g. 0.05)')
+    parser.add_argument('--hint-from', default=None,
+                    help='Previous optimized schedule (xlsx, csv, jsonl or parquet output) used as a warm-start hint')
+    parser.add_argument('--repair-hints', action='store_true',
+                    help='Repair hints that no longer fit (nearest allowed slot, main room) and let CP-SAT repair the hint')
+    parser.add_argument('--replan-from', default=None,
+                    help='Previous optimized schedule (xlsx, csv, jsonl or parquet output): re-solve only the neighborhood '
+                         'of changed classes and keep the rest of the schedule')
+    parser.add_argument('--no-input-cache', action='store_true',
+                    help='Always parse the input workbook instead of using its parsed-input cache file')
+    parser.add_argument('--model-cache', default=None,
+                    help='Directory of the built-model cache: reuse the CP-SAT model when classes and '
+                         'build parameters are unchanged (e.g. when tuning solver parameters)')
+    parser.add_argument('--model-cache-size', type=int, default=512,
+                    help='Model cache size limit in MB; least recently used models are evicted (default: 512)')
     parser.add_argument('--verbose', action='store_true',
                     help='Enable verbose output')
+    parser.add_argument('--log-level', choices=list(schedule_logging.LEVEL_NAMES), default='info',
+                    help='Console log level; "debug" restores the full per-pair trace, "silent" disables output (default: info)')
+    parser.add_argument('--log-json', default=None,
+                    help='Append structured log records (JSON lines) to this file')
+    parser.add_argument('--log-json-level', choices=list(schedule_logging.LEVEL_NAMES), default='debug',
+                    help='Log level for the JSON lines file (default: debug)')
+    parser.add_argument('--profile-out', default=None,
+                    help='Write per-phase timings (read, model building, solve, decode, reports, export) '
+                         'and run details to this JSON file')
+    parser.add_argument('--profile', choices=list(PROFILERS), default=None,
+                    help='Profile each phase with cProfile or pyinstrument; results go to --profile-out')
+    parser.add_argument('--profile-phases', nargs='+', choices=list(PHASES), default=None,
+                    help='Phases to profile with --profile (default: all)')
+    parser.add_argument('--profile-memory', action='store_true',
+                    help='Snapshot tracemalloc at each phase: current/peak memory, top allocation sites, '
+                         'CP-SAT model size; results go to --profile-out (slows the run down)')
+    parser.add_argument('--profile-top', type=int, default=25,
+                    help='Entries kept per phase: functions for cProfile, allocation sites for --profile-memory (default: 25)')
     
     return parser.parse_args()
 
 
+def parse_search_workers(value):
+    """Преобразует --search-workers: число потоков или "all"."""
+    if value is None or value == ALL_CORES:
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"--search-workers must be a number or '{ALL_CORES}', got '{value}'")
+
+
 def print_summary(reader, classes):
     """Print a summary of the input data."""
-    print(f"\n=== Input Data Summary ===")
-    print(f"Total number of classes: {len(classes)}")
-    print(f"Teachers: {len(reader.teachers)}")
-    print(f"Groups: {len(reader.groups)}")
-    print(f"Rooms: {len(reader.rooms)}")
-    print(f"Buildings: {len(reader.buildings)}")
-    print(f"Days: {sorted(reader.days)}")
+    log.info("\n=== Input Data Summary ===")
+    log.info("Total number of classes: {}", len(classes))
+    log.info("Teachers: {}", len(reader.teachers))
+    log.info("Groups: {}", len(reader.groups))
+    log.info("Rooms: {}", len(reader.rooms))
+    log.info("Buildings: {}", len(reader.buildings))
+    log.info("Days: {}", sorted(reader.days))
     
     # Count classes by day
     days_count = {}
@@ -46,9 +134,9 @@ def print_summary(reader, classes):
         if c.day:
             days_count[c.day] = days_count.get(c.day, 0) + 1
     
-    print("\nClasses by day:")
+    log.info("\nClasses by day:")
     for day in sorted(days_count.keys()):
-        print(f"  {day}: {days_count[day]} classes")
+        log.info("  {}: {} classes", day, days_count[day])
     
     # Count linked class chains
     linked_chains = 0
@@ -58,8 +146,8 @@ def print_summary(reader, classes):
             linked_chains += 1
             linked_classes += len(c.linked_classes)
     
-    print(f"\nLinked class chains: {linked_chains}")
-    print(f"Classes in linked chains: {linked_classes + linked_chains}")
+    log.info("\nLinked class chains: {}", linked_chains)
+    log.info("Classes in linked chains: {}", linked_classes + linked_chains)
     
     # Count classes with fixed times/rooms/time windows
     fixed_time = sum(1 for c in classes if c.start_time and not c.end_time)
@@ -67,128 +155,251 @@ def print_summary(reader, classes):
     any_time = sum(1 for c in classes if not c.start_time)
     fixed_room = sum(1 for c in classes if len(c.possible_rooms) == 1)
     
-    print(f"\nClasses with fixed start times: {fixed_time} ({fixed_time/len(classes)*100:.1f}%)")
-    print(f"Classes with time windows: {time_window} ({time_window/len(classes)*100:.1f}%)")
-    print(f"Classes with any start time: {any_time} ({any_time/len(classes)*100:.1f}%)")
-    print(f"Classes with fixed rooms: {fixed_room} ({fixed_room/len(classes)*100:.1f}%)")
+    log.info("\nClasses with fixed start times: {} ({:.1f}%)", fixed_time, fixed_time/len(classes)*100)
+    log.info("Classes with time windows: {} ({:.1f}%)", time_window, time_window/len(classes)*100)
+    log.info("Classes with any start time: {} ({:.1f}%)", any_time, any_time/len(classes)*100)
+    log.info("Classes with fixed rooms: {} ({:.1f}%)", fixed_room, fixed_room/len(classes)*100)
 
 
 def print_solution_summary(optimizer):
     """Print a summary of the optimization solution."""
     if not optimizer.solution:
-        print("\n=== No Solution Found ===")
+        log.info("\n=== No Solution Found ===")
         return
-        
-    schedule_df = get_schedule_dataframe(optimizer)
     
-    print(f"\n=== Solution Summary ===")
-    print(f"Total scheduled classes: {len(schedule_df)}")
+    # Счетчики по колонкам решения (SolutionTable), без DataFrame и разбора строк времени
+    solution = optimizer.solution
+    
+    log.info("\n=== Solution Summary ===")
+    log.info("Total scheduled classes: {}", len(solution))
     
     # Classes by day
-    day_counts = schedule_df["day"].value_counts().to_dict()
-    print("\nScheduled classes by day:")
+    day_counts = solution.counts("day")
+    log.info("\nScheduled classes by day:")
     for day in sorted(day_counts.keys()):
-        print(f"  {day}: {day_counts[day]} classes")
+        log.info("  {}: {} classes", day, day_counts[day])
     
     # Teacher load
-    teacher_counts = schedule_df["teacher"].value_counts().to_dict()
-    print("\nTeacher load (top 5):")
+    teacher_counts = solution.counts("teacher")
+    log.info("\nTeacher load (top 5):")
     for teacher, count in sorted(teacher_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-        print(f"  {teacher}: {count} classes")
+        log.info("  {}: {} classes", teacher, count)
     
     # Room utilization
-    room_counts = schedule_df["room"].value_counts().to_dict()
-    print("\nRoom utilization (top 5):")
+    room_counts = solution.counts("room")
+    log.info("\nRoom utilization (top 5):")
     for room, count in sorted(room_counts.items(), key=lambda x: x[1], reverse=True)[:5]:
-        print(f"  {room}: {count} classes")
+        log.info("  {}: {} classes", room, count)
     
     # Time distribution
-    schedule_df["hour"] = schedule_df["start_time"].str.split(":").str[0].astype(int)
-    hour_counts = schedule_df["hour"].value_counts().to_dict()
-    print("\nClass start time distribution:")
+    hour_counts = solution.counts("hour")
+    log.info("\nClass start time distribution:")
     for hour in sorted(hour_counts.keys()):
-        print(f"  {hour}:00 - {hour+1}:00: {hour_counts[hour]} classes")
+        log.info("  {}:00 - {}:00: {} classes", hour, hour+1, hour_counts[hour])
+
+
+def write_run_profile(profile, path, args, optimizer, elapsed_time):
+    """
+    Дополняет профиль прогона сведениями о решении и записывает его.
+    
+    Args:
+        profile: run_profile.RunProfile или None (ничего не делать)
+        path: JSON-файл отчета (--profile-out)
+        args: Аргументы командной строки
+        optimizer: ScheduleOptimizer после solve()
+        elapsed_time: Время optimizer.solve(), с
+    """
+    if profile is None:
+        return
+    info = optimizer.solver_info or {}
+    profile.info.update({
+        'input_file': args.input_file,
+        'classes': len(optimizer.classes),
+        'constraint_mode': args.constraint_mode,
+        'time_interval': args.time_interval,
+        'time_limit': args.time_limit,
+        'formats': args.formats,
+        'status': getattr(optimizer, 'solver_status', None),
+        'objective': info.get('objective'),
+        'solver_preset': info.get('preset'),
+        'solver_wall_time': info.get('wall_time'),
+        'solve_call_seconds': elapsed_time,
+    })
+    profile.log_summary()
+    profile.write(path)
+    profile.close()
 
 
 def main():
     """Main function to generate the optimized schedule."""
     # Parse command line arguments
     args = parse_arguments()
+    schedule_logging.configure(level=args.log_level, json_path=args.log_json,
+                               json_level=args.log_json_level)
     
     # Validate input file
     if not os.path.exists(args.input_file):
-        print(f"Error: Input file '{args.input_file}' does not exist.")
+        log.error("Error: Input file '{}' does not exist.", args.input_file)
         sys.exit(1)
     
+    try:
+        check_export_formats(args.formats)
+    except ValueError as e:
+        log.error("Invalid output format: {}", str(e))
+        return 1
+    
+    # Замер этапов прогона (run_profile); без --profile-out этапы не замеряются
+    profile = None
+    if (args.profile or args.profile_memory) and not args.profile_out:
+        log.error("--profile and --profile-memory require --profile-out")
+        return 1
+    if args.profile_out:
+        try:
+            profile = RunProfile(profiler=args.profile, profile_phases=args.profile_phases,
+                                 top=args.profile_top, memory=args.profile_memory)
+        except ValueError as e:
+            log.error("Invalid profiling settings: {}", str(e))
+            return 1
+    
     # Create output directory if needed
     output_dir = os.path.dirname(args.output)
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    print(f"Reading schedule data from '{args.input_file}'...")
+    log.info("Reading schedule data from '{}'...", args.input_file)
     
     # Read the Excel file
     try:
-        reader = ScheduleReader(args.input_file)
-        classes = reader.read_excel()
+        reader = ScheduleReader(args.input_file, use_cache=not args.no_input_cache)
+        with phase(profile, 'read'):
+            classes = reader.read_excel()
     except Exception as e:
-        print(f"Error reading Excel file: {str(e)}")
+        log.error("Error reading Excel file: {}", str(e))
         sys.exit(1)
     
     if args.verbose:
         print_summary(reader, classes)
 
-    print(f"\nCreating schedule optimization model...")
-    optimizer = ScheduleOptimizer(classes, time_interval=args.time_interval)
+    try:
+        solver_config = build_solver_config(
+            preset=args.preset,
+            config_file=args.solver_config,
+            num_search_workers=parse_search_workers(args.search_workers),
+            random_seed=args.seed,
+            linearization_level=args.linearization_level,
+            symmetry_level=args.symmetry_level,
+            log_search_progress=True if args.log_search_progress else None,
+        )
+    except (OSError, ValueError) as e:
+        log.error("Invalid solver configuration: {}", str(e))
+        return 1
+    
+    solution_hints = None
+    if args.hint_from:
+        try:
+            solution_hints = read_schedule_hints(args.hint_from)
+        except Exception as e:
+            log.error("Error reading hint file '{}': {}", args.hint_from, str(e))
+            return 1
+        log.info("Loaded {} schedule rows for warm start from '{}'", len(solution_hints), args.hint_from)
+    
+    replan_baseline = None
+    if args.replan_from:
+        try:
+            replan_baseline = read_schedule_hints(args.replan_from)
+        except Exception as e:
+            log.error("Error reading previous schedule '{}': {}", args.replan_from, str(e))
+            return 1
+        log.info("Loaded {} schedule rows to re-plan from '{}'", len(replan_baseline), args.replan_from)
+    
+    model_cache = None
+    if args.model_cache:
+        try:
+            model_cache = ModelCache(args.model_cache, max_bytes=args.model_cache_size * 1024 * 1024)
+        except ValueError as e:
+            log.error("Invalid model cache settings: {}", str(e))
+            return 1
     
-    print(f"Solving schedule optimization problem (time limit: {args.time_limit} seconds)...")
+    try:
+        time_grid = TimeGrid(args.time_interval, args.day_start, args.day_end,
+                             parse_day_bounds(args.day_bounds))
+    except ValueError as e:
+        log.error("Invalid time grid settings: {}", str(e))
+        return 1
+    
+    log.info("\nCreating schedule optimization model...")
+    optimizer = ScheduleOptimizer(classes, time_interval=args.time_interval, time_grid=time_grid,
+                                  constraint_mode=args.constraint_mode,
+                                  fast_registration=args.fast_registration,
+                                  decompose_by_day=args.decompose_by_day,
+                                  max_workers=args.workers,
+                                  decompose_components=args.decompose_components,
+                                  solver_config=solver_config,
+                                  solution_hints=solution_hints,
+                                  repair_hints=args.repair_hints,
+                                  replan_baseline=replan_baseline,
+                                  model_cache=model_cache,
+                                  profile=profile)
+    
+    log.info("Solving schedule optimization problem (time limit: {} seconds)...", args.time_limit)
     start_time = time.time()
     
     # Solve the model
-    solution_found = optimizer.solve(time_limit_seconds=args.time_limit)
+    solution_found = optimizer.solve(time_limit_seconds=args.time_limit,
+                                     stream_path=args.stream_solutions,
+                                     stop_gap=args.stop_gap)
     
     end_time = time.time()
     elapsed_time = end_time - start_time
     
     if solution_found:
-        print(f"\nSolution found in {elapsed_time:.2f} seconds!")
+        log.info("\nSolution found in {:.2f} seconds (solver preset: {})!", elapsed_time,
+                 optimizer.solver_config.preset)
         
         if args.verbose:
             print_solution_summary(optimizer)
         
         # Export the result
-        print(f"\nExporting schedule to '{args.output}'...")
-        export_to_excel(optimizer, filename=args.output)
-        print("Export completed successfully.")
+        paths = output_paths(args.output, args.formats)
+        log.info("\nExporting schedule to {}...", ", ".join(f"'{path}'" for path in paths.values()))
+        export_started = time.time()
+        with phase(profile, 'export'):
+            written = export_schedule(optimizer, args.output, args.formats)
+        log.info("Export completed successfully in {:.2f}s.", time.time() - export_started)
         
         # Export constraint registry for analysis
-        export_constraint_registry(optimizer.constraint_registry, optimizer, only_conflicts=False)
+        with phase(profile, 'reports'):
+            export_constraint_registry(optimizer.constraint_registry, optimizer, only_conflicts=False)
         
-        print(f"\nSchedule generation complete.")
-        print(f"Generated schedule saved to: {os.path.abspath(args.output)}")
+        log.info("\nSchedule generation complete.")
+        for path in written.values():
+            log.info("Generated schedule saved to: {}", os.path.abspath(path))
         
+        write_run_profile(profile, args.profile_out, args, optimizer, elapsed_time)
         return 0
     else:
-        print(f"\nNo solution found within the time limit ({elapsed_time:.2f} seconds).")
+        log.info("\nNo solution found within the time limit ({:.2f} seconds).", elapsed_time)
         
         # Check if the problem is INFEASIBLE
         if hasattr(optimizer, 'solver_status') and optimizer.solver_status == 'INFEASIBLE':
-            print("\n❌ PROBLEM IS INFEASIBLE - No valid solution exists with current constraints.")
+            log.error("\n❌ PROBLEM IS INFEASIBLE - No valid solution exists with current constraints.")
             
             # Отчеты уже сгенерированы в solver
-            print("\n💡 Possible solutions:")
-            print("  1. Relax some time constraints")
-            print("  2. Add more rooms or increase room capacity")
-            print("  3. Adjust teacher availability")
-            print("  4. Reduce required classes or increase time slots")
-            print("  5. Review constraint_registry_infeasible.txt for detailed analysis")
+            log.info("\n💡 Possible solutions:")
+            log.info("  1. Relax some time constraints")
+            log.info("  2. Add more rooms or increase room capacity")
+            log.info("  3. Adjust teacher availability")
+            log.info("  4. Reduce required classes or increase time slots")
+            log.info("  5. Review constraint_registry_infeasible.txt for detailed analysis")
             
         else:
-            print("The solver timed out. Try increasing the time limit or relaxing some constraints.")
+            log.warning("The solver timed out. Try increasing the time limit or relaxing some constraints.")
             
             # Export constraint registry for analysis even on timeout
-            export_constraint_registry(optimizer.constraint_registry, optimizer, only_conflicts=False)
+            with phase(profile, 'reports'):
+                export_constraint_registry(optimizer.constraint_registry, optimizer, only_conflicts=False)
         
+        write_run_profile(profile, args.profile_out, args, optimizer, elapsed_time)
         return 1
 
 
@@ -0,0 +1,267 @@
+"""
+Дисковый кеш построенной модели CP-SAT.
+
+Построение модели (build_model, обнаружение циклов и apply_timewindow_improvements)
+повторяет весь попарный анализ, даже если входные занятия и параметры
+построения не менялись - например, при подборе параметров решателя. Кеш
+сохраняет результат построения:
+  - CpModelProto (сериализованный);
+  - карты переменных start_vars, room_vars, day_vars, assigned_vars и
+    литералы room_presence (индексы переменных в proto или константы; только
+    у моделей режима nooverlap, в режиме pairwise - пустой словарь);
+  - реестр ограничений (колоночный, поэтому компактный) и флаги занятий,
+    выставляемые при построении.
+
+Ключ - SHA-256 от разобранных занятий (включая связи цепочек), параметров
+построения (time_interval и границы дня сетки, constraint_mode, fast_registration,
+use_pair_index), версии OR-Tools и исходного кода модулей построения
+(_MODEL_MODULES), поэтому изменение их кода не подхватит устаревшую модель.
+
+Записи - отдельные файлы <ключ>.pkl; размер каталога ограничен max_bytes, при
+превышении удаляются давно не использованные записи (LRU по времени
+изменения файла, которое обновляется при чтении).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import ortools
+from ortools.sat.python import cp_model
+
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['ModelCache', 'DEFAULT_MAX_BYTES']
+
+# Версия формата записи; увеличивается при изменении содержимого записи
+_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_VARIABLE_MAPS = ('start_vars', 'room_vars', 'day_vars', 'assigned_vars')
+
+# Модули построения модели (build_model, обнаружение циклов, apply_timewindow_improvements)
+# и reader (производные поля ScheduleClass, которые читает модель); их исходный
+# код входит в ключ. Изменение других модулей (gui, выгрузка, бенчмарки,
+# генератор) кеш не сбрасывает
+_MODEL_MODULES = (
+    'chain_constraints', 'chain_helpers', 'chain_scheduler', 'conflict_detector',
+    'constraint_registry', 'constraints', 'effective_bounds_utils', 'group_analyzer',
+    'interval_constraints', 'linked_chain_utils', 'linked_constraints', 'model_variables',
+    'objective', 'pair_index', 'reader', 'resource_constraints', 'room_assignment', 'scheduler_base',
+    'separation_constraints', 'sequential_scheduling', 'sequential_scheduling_checker',
+    'time_conflict_constraints', 'time_constraint_utils', 'time_grid', 'time_utils',
+    'timeline_manager', 'timewindow_adapter', 'timewindow_utils', 'window_scheduler',
+)
+
+
+@lru_cache(maxsize=None)
+def _code_fingerprint() -> str:
+    """Хеш исходного кода модулей построения модели (_MODEL_MODULES)."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in _MODEL_MODULES:
+        with open(os.path.join(directory, f"{name}.py"), 'rb') as f:
+            digest.update(name.encode('utf-8'))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _encode_var(var):
+    """Переменная модели -> индекс в proto; константа остается числом."""
+    return var if isinstance(var, int) else ('var', var.Index())
+
+
+def _decode_var(model, value, boolean=False):
+    """Обратное преобразование _encode_var для восстановленной модели."""
+    if isinstance(value, tuple):
+        if boolean:
+            return model.GetBoolVarFromProtoIndex(value[1])
+        return model.GetIntVarFromProtoIndex(value[1])
+    return value
+
+
+class ModelCache:
+    """
+    Каталог с построенными моделями ScheduleOptimizer.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory: Каталог кеша (создается при первой записи)
+            max_bytes: Ограничение суммарного размера записей
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"Model cache size must be positive, got {max_bytes}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, optimizer) -> str:
+        """
+        Ключ записи для занятий и параметров построения optimizer.
+
+        Args:
+            optimizer: Экземпляр ScheduleOptimizer
+
+        Returns:
+            str: Шестнадцатеричный SHA-256
+        """
+        index_of = optimizer.object_index_map.get
+        classes = []
+        for c in optimizer.classes:
+            classes.append([
+                c.subject, c.group, c.teacher, c.main_room, list(c.alternative_rooms), c.building,
+                c.duration, c.day, c.start_time, c.end_time, c.pause_before, c.pause_after,
+                c.section_index, c.column,
+                index_of(c.previous_class) if c.previous_class is not None else None,
+                index_of(c.next_class) if c.next_class is not None else None,
+                [index_of(other) for other in c.linked_classes],
+            ])
+        payload = {
+            'format': _FORMAT_VERSION,
+            'ortools': ortools.__version__,
+            'code': _code_fingerprint(),
+            'time_interval': optimizer.time_interval,
+            'time_grid': list(optimizer.time_grid.key()),
+            'constraint_mode': optimizer.constraint_mode,
+            'fast_registration': optimizer.fast_registration,
+            'use_pair_index': optimizer.use_pair_index,
+            'classes': classes,
+        }
+        text = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def load(self, optimizer, key: str) -> bool:
+        """
+        Восстанавливает построенную модель в optimizer.
+
+        Args:
+            optimizer: Экземпляр ScheduleOptimizer (модель еще не построена)
+            key: Ключ записи (ModelCache.key)
+
+        Returns:
+            bool: True, если запись найдена и модель восстановлена
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            log.info("  🗄️  Model cache miss ({})", key[:12], event="model_cache", hit=False, key=key)
+            return False
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            log.warning("  Model cache entry {} is unreadable and is ignored: {}", key[:12], e)
+            return False
+
+        model = cp_model.CpModel()
+        model.Proto().ParseFromString(entry['proto'])
+        model.rebuild_var_and_constant_map()
+
+        optimizer.model = model
+        for name in _VARIABLE_MAPS:
+            setattr(optimizer, name, {idx: _decode_var(model, value, boolean=(name == 'assigned_vars'))
+                                      for idx, value in entry[name].items()})
+        optimizer.room_presence = {
+            idx: {room: _decode_var(model, literal, boolean=True) if literal is not None else None
+                  for room, literal in options.items()}
+            for idx, options in entry['room_presence'].items()
+        }
+        optimizer.constraint_registry = entry['registry']
+        optimizer.linked_chains = entry['linked_chains']
+        optimizer.chain_index.rebuild(optimizer.linked_chains)
+        for c, (has_time_window, fixed_start_time) in zip(optimizer.classes, entry['class_flags']):
+            c.has_time_window = has_time_window
+            c.fixed_start_time = fixed_start_time
+        optimizer.timewindow_already_processed = True
+
+        # Время изменения файла - метка последнего использования для вытеснения
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        log.info("  🗄️  Model cache hit ({}): {} variables, {} constraints, built in {:.2f}s originally",
+                 key[:12], len(model.Proto().variables), len(model.Proto().constraints),
+                 entry['build_time'], event="model_cache", hit=True, key=key, build_time=entry['build_time'])
+        return True
+
+    def store(self, optimizer, key: str, build_time: float):
+        """
+        Записывает построенную модель optimizer и вытесняет старые записи.
+
+        Args:
+            optimizer: Экземпляр ScheduleOptimizer с построенной моделью
+            key: Ключ записи (ModelCache.key)
+            build_time: Время построения модели, с
+        """
+        entry: Dict[str, Any] = {
+            'proto': optimizer.model.Proto().SerializeToString(),
+            'room_presence': {
+                idx: {room: _encode_var(literal) if literal is not None else None
+                      for room, literal in options.items()}
+                for idx, options in getattr(optimizer, 'room_presence', {}).items()
+            },
+            'registry': optimizer.constraint_registry,
+            'linked_chains': getattr(optimizer, 'linked_chains', []),
+            'class_flags': [(c.has_time_window, c.fixed_start_time) for c in optimizer.classes],
+            'build_time': build_time,
+        }
+        for name in _VARIABLE_MAPS:
+            entry[name] = {idx: _encode_var(var) for idx, var in getattr(optimizer, name).items()}
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        # Запись через временный файл: параллельные процессы не увидят недописанную запись
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        log.info("  🗄️  Model cached ({}, {:.1f} MB)", key[:12], size / 1024 / 1024,
+                 event="model_cache_store", key=key, bytes=size)
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Удаляет давно не использованные записи, пока размер кеша больше max_bytes.
+
+        Args:
+            keep: Ключ записи, которую удалять нельзя (только что записанная)
+
+        Returns:
+            int: Число удаленных записей
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*.pkl')):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        keep_path = self._path(keep) if keep else None
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            log.info("  🗄️  Model cache: evicted {} entries ({:.1f} MB left)", removed, total / 1024 / 1024)
+        return removed
@@ -4,14 +4,21 @@ Module for creating optimization model variables.
 from ortools.sat.python import cp_model
 from datetime import datetime, timedelta
 from constraint_registry import ConstraintType
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
 
 def create_variables(optimizer):
     """Create variables for each class."""
     # Debug: вывод информации о слотах времени
-    print("Available time slots:")
-    for i, slot in enumerate(optimizer.time_slots):
-        if i % 4 == 0:  # Print every 4th slot for readability
-            print(f"  Slot {i}: {slot}")
+    verbose = log.is_enabled(DEBUG)
+    if verbose:
+        log.debug("Available time slots:")
+        for i, slot in enumerate(optimizer.time_slots):
+            if i % 4 == 0:  # Print every 4th slot for readability
+                log.debug("  Slot {}: {}", i, slot)
+    
+    grid = optimizer.time_grid
     
     # Create variables for each class
     for idx, c in enumerate(optimizer.classes):
@@ -29,36 +36,38 @@ def create_variables(optimizer):
             # Проверяем, есть ли время окончания (временное окно)
             if c.end_time:
                 # Для удобства переведем времена в минуты с начала дня
-                start_minutes = time_to_minutes(c.start_time)
-                end_minutes = time_to_minutes(c.end_time)
+                start_minutes = c.start_minutes
+                end_minutes = c.end_minutes
                 class_duration = c.duration
 
-                print(f"\nProcessing class {c.subject} with time window {c.start_time}-{c.end_time}:")
-                print(f"  Start minutes: {start_minutes}")
-                print(f"  End minutes: {end_minutes}")
-                print(f"  Class duration: {class_duration} min")
-                print(f"  Available time for class: {end_minutes - start_minutes} min")
+                if verbose:
+                    log.debug("\nProcessing class {} with time window {}-{}:", c.subject, c.start_time, c.end_time)
+                    log.debug("  Start minutes: {}", start_minutes)
+                    log.debug("  End minutes: {}", end_minutes)
+                    log.debug("  Class duration: {} min", class_duration)
+                    log.debug("  Available time for class: {} min", end_minutes - start_minutes)
                 
                 # Найдем слоты для начала и конца временного окна
-                start_slot = find_closest_slot(optimizer.time_slots, c.start_time)
-                end_slot = find_closest_slot(optimizer.time_slots, c.end_time)
+                start_slot = grid.time_to_slot(c.start_time, 'nearest')
+                end_slot = grid.time_to_slot(c.end_time, 'nearest')
                 
                 # Вычисляем допустимый диапазон времени начала занятия
                 max_start_minutes = end_minutes - class_duration
                 max_start_time = minutes_to_time(max_start_minutes)
-                max_start_slot = find_closest_slot(optimizer.time_slots, max_start_time)
+                max_start_slot = grid.minutes_to_slot(max_start_minutes, 'nearest')
                 
                 # Проверка валидности окна
                 if max_start_minutes < start_minutes:
-                    print(f"  WARNING: Class {c.subject} duration ({class_duration} min) doesn't fit in time window" + 
-                          f" {c.start_time}-{c.end_time} ({end_minutes - start_minutes} min available)")
+                    log.warning("  WARNING: Class {} duration ({} min) doesn't fit in time window"
+                                " {}-{} ({} min available)",
+                                c.subject, class_duration, c.start_time, c.end_time, end_minutes - start_minutes)
                     max_start_slot = start_slot
                 else:
-                    print(f"  Class fits in window. Latest possible start: {max_start_time} (slot {max_start_slot})")
+                    log.debug("  Class fits in window. Latest possible start: {} (slot {})", max_start_time, max_start_slot)
                 
                 # Отладочный вывод для диагностики
-                print(f"  Start slot range: {start_slot}-{max_start_slot}")
-                print(f"  Time slot values: {optimizer.time_slots[start_slot]}-{optimizer.time_slots[max_start_slot]}")
+                log.debug("  Start slot range: {}-{}", start_slot, max_start_slot)
+                log.debug("  Time slot values: {}-{}", optimizer.time_slots[start_slot], optimizer.time_slots[max_start_slot])
                 
                 # Создаем переменную с ограничением на возможное время начала
                 optimizer.start_vars[idx] = optimizer.model.NewIntVar(
@@ -88,18 +97,20 @@ def create_variables(optimizer):
                 # Отметим, что это занятие имеет временное окно, а не фиксированное время начала
                 c.has_time_window = True
                 c.fixed_start_time = False
-                print(f"Class {c.subject} has time window: {c.start_time}-{c.end_time}")
+                log.debug("Class {} has time window: {}-{}", c.subject, c.start_time, c.end_time)
 
                 #---Debug---
                 # Для классов с временными окнами:
-                print(f"DEBUG: Creating variable for window class {idx} '{c.subject}':")
-                print(f"  - Window: {c.start_time}-{c.end_time}")
-                print(f"  - Duration: {c.duration} min")
-                print(f"  - Slot range: {start_slot}-{max_start_slot} ({optimizer.time_slots[start_slot]}-{optimizer.time_slots[max_start_slot]})")
+                if verbose:
+                    log.debug("DEBUG: Creating variable for window class {} '{}':", idx, c.subject)
+                    log.debug("  - Window: {}-{}", c.start_time, c.end_time)
+                    log.debug("  - Duration: {} min", c.duration)
+                    log.debug("  - Slot range: {}-{} ({}-{})", start_slot, max_start_slot,
+                              optimizer.time_slots[start_slot], optimizer.time_slots[max_start_slot])
                 #-----------
             else:
                 # Если конец временного окна не указан, используем фиксированное время начала
-                start_slot = find_closest_slot(optimizer.time_slots, c.start_time)
+                start_slot = grid.time_to_slot(c.start_time, 'nearest')
                 optimizer.start_vars[idx] = start_slot
                 
                 # Добавляем логирование фиксированного времени
@@ -115,26 +126,26 @@ def create_variables(optimizer):
                 
                 c.has_time_window = False
                 c.fixed_start_time = True
-                print(f"Class {c.subject} has fixed start time: {c.start_time} (slot {start_slot})")
+                log.debug("Class {} has fixed start time: {} (slot {})", c.subject, c.start_time, start_slot)
         else:
-            # Нет указанного времени начала, создаем переменную с полным диапазоном
-            max_start = len(optimizer.time_slots) - 1
+            # Нет указанного времени начала, создаем переменную с полным диапазоном дня
             slots_needed = (c.duration + c.pause_before + c.pause_after) // optimizer.time_interval
-            if slots_needed > 0:
-                max_start = max(0, len(optimizer.time_slots) - slots_needed - 1)
-            
-            optimizer.start_vars[idx] = optimizer.model.NewIntVar(
-                0, max_start, f"start_{idx}")
+            if c.day or not grid.has_day_bounds:
+                min_start, max_start = _start_range(grid, c.day, slots_needed)
+                optimizer.start_vars[idx] = optimizer.model.NewIntVar(
+                    min_start, max_start, f"start_{idx}")
+            else:
+                _create_day_bounded_start(optimizer, idx, slots_needed)
             c.has_time_window = False
             c.fixed_start_time = False
-            print(f"Class {c.subject} has no time constraints")
+            log.debug("Class {} has no time constraints", c.subject)
 
         # Добавим склонность к более поздним временам для занятий с окнами
         if c.has_time_window:
             # Проверим, есть ли у этого преподавателя другие занятия в этот день
             teacher_classes_same_day = [
                 other_idx for other_idx, other_c in enumerate(optimizer.classes)
-                if other_c.teacher == c.teacher and other_c.day == c.day and other_idx != idx and other_idx < idx
+                if other_c.teacher_id == c.teacher_id and other_c.day == c.day and other_idx != idx and other_idx < idx
             ]
             
             if teacher_classes_same_day:
@@ -165,30 +176,52 @@ def create_variables(optimizer):
         optimizer.assigned_vars[idx] = optimizer.model.NewBoolVar(f"assigned_{idx}")
         optimizer.model.Add(optimizer.assigned_vars[idx] == 1)  # All classes must be assigned
 
-def time_to_minutes(time_str):
-    """Convert time string (HH:MM) to minutes since midnight."""
-    if not time_str:
-        return 0
-    hours, minutes = map(int, time_str.split(':'))
-    return hours * 60 + minutes
+def _start_range(grid, day, slots_needed):
+    """Start slot range for a class of slots_needed slots within the day bounds."""
+    first, last = grid.day_range(day)
+    if slots_needed > 0:
+        last = max(first, last - slots_needed)
+    return first, last
+
+def _create_day_bounded_start(optimizer, idx, slots_needed):
+    """
+    Create the start variable of a class without a fixed day when days have
+    different bounds: the allowed range follows day_vars[idx] (AddElement).
+    """
+    grid = optimizer.time_grid
+    model = optimizer.model
+    day_names = {day_idx: day for day, day_idx in optimizer.day_indices.items()}
+    ranges = [_start_range(grid, day_names.get(day_idx), slots_needed)
+              for day_idx in range(len(optimizer.day_indices))]
+    min_starts = [first for first, _ in ranges]
+    max_starts = [last for _, last in ranges]
+    
+    start = model.NewIntVar(min(min_starts), max(max_starts), f"start_{idx}")
+    optimizer.start_vars[idx] = start
+    day_min = model.NewIntVar(min(min_starts), max(min_starts), f"day_min_start_{idx}")
+    day_max = model.NewIntVar(min(max_starts), max(max_starts), f"day_max_start_{idx}")
+    
+    constraints = (
+        (model.AddElement(optimizer.day_vars[idx], min_starts, day_min),
+         f"Day bounds: class {idx} earliest start slot by day {min_starts}"),
+        (model.AddElement(optimizer.day_vars[idx], max_starts, day_max),
+         f"Day bounds: class {idx} latest start slot by day {max_starts}"),
+        (start >= day_min, f"Day bounds: class {idx} start >= earliest slot of its day"),
+        (start <= day_max, f"Day bounds: class {idx} start <= latest slot of its day"),
+    )
+    for constraint_expr, description in constraints:
+        optimizer.add_constraint(
+            constraint_expr=constraint_expr,
+            constraint_type=ConstraintType.TIME_WINDOW,
+            origin_module=__name__,
+            origin_function="create_variables",
+            class_i=idx,
+            description=description,
+            variables_used=[f"start_vars[{idx}]", f"day_vars[{idx}]"]
+        )
 
 def minutes_to_time(minutes):
     """Convert minutes since midnight to time string (HH:MM)."""
     hours = minutes // 60
     mins = minutes % 60
     return f"{hours:02d}:{mins:02d}"
-
-def find_closest_slot(time_slots, time_str):
-    """Find the index of the closest time slot for a given time string."""
-    target_minutes = time_to_minutes(time_str)
-    best_slot = 0
-    min_diff = float('inf')
-    
-    for i, slot in enumerate(time_slots):
-        slot_minutes = time_to_minutes(slot)
-        diff = abs(slot_minutes - target_minutes)
-        if diff < min_diff:
-            min_diff = diff
-            best_slot = i
-            
-    return best_slot
\ No newline at end of file
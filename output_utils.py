@@ -2,7 +2,22 @@
 Module for output utilities.
 """
 
+import importlib.util
+import json
+import os
+from collections import Counter
+
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# Заголовок листа в стиле DataFrame.to_excel
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(left=Side(style="thin"), right=Side(style="thin"),
+                        top=Side(style="thin"), bottom=Side(style="thin"))
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
 
 def get_schedule_dataframe(optimizer):
     """
@@ -13,7 +28,11 @@ def get_schedule_dataframe(optimizer):
     """
     if not optimizer.solution:
         return None
-        
+    
+    # SolutionTable строит DataFrame из колонок; список словарей - как раньше
+    to_dataframe = getattr(optimizer.solution, 'to_dataframe', None)
+    if to_dataframe is not None:
+        return to_dataframe()
     return pd.DataFrame(optimizer.solution)
 
 def get_teacher_schedule(optimizer, teacher):
@@ -29,7 +48,7 @@ def get_teacher_schedule(optimizer, teacher):
     if not optimizer.solution:
         return None
         
-    df = pd.DataFrame(optimizer.solution)
+    df = get_schedule_dataframe(optimizer)
     return df[df["teacher"] == teacher].sort_values(by=["day", "start_time"])
 
 def get_group_schedule(optimizer, group):
@@ -45,9 +64,10 @@ def get_group_schedule(optimizer, group):
     if not optimizer.solution:
         return None
         
-    df = pd.DataFrame(optimizer.solution)
-    # Filter for classes that have this group
-    return df[df["group"].str.contains(group, na=False)].sort_values(by=["day", "start_time"])
+    df = get_schedule_dataframe(optimizer)
+    # Filter for classes that have this group (exact membership, not a substring of the group string)
+    members = [group in c.group_set for c in optimizer.classes]
+    return df[members].sort_values(by=["day", "start_time"])
 
 def get_room_schedule(optimizer, room):
     """
@@ -62,13 +82,124 @@ def get_room_schedule(optimizer, room):
     if not optimizer.solution:
         return None
         
-    df = pd.DataFrame(optimizer.solution)
+    df = get_schedule_dataframe(optimizer)
     return df[df["room"] == room].sort_values(by=["day", "start_time"])
 
+def _sheet_name(prefix, key):
+    """Create a safe sheet name (max 31 chars)."""
+    return f"{prefix}_{key}"[:31]
+
+def _sheet_dimensions(optimizer):
+    """Per-entity sheets: (prefix, keys in output order, schedule column)."""
+    return (("T", optimizer.teachers, "teacher"),
+            ("G", optimizer.groups, "group"),
+            ("R", optimizer.rooms, "room"))
+
+def schedule_index(optimizer, df):
+    """
+    Row positions of every teacher, group and room in the schedule.
+    
+    The schedule is split with one groupby per dimension; a class belongs to
+    every group it lists (exact membership). Positions of each key are sorted
+    by day and start time: rows are ordered by their rank in one stable sort
+    of the whole schedule, which gives the same order as sorting each key's
+    rows separately.
+    
+    Args:
+        df: Schedule DataFrame (rows in optimizer.classes order)
+        
+    Returns:
+        {"teacher" | "group" | "room": {key: row positions in df}}, keys in
+        optimizer.teachers / groups / rooms order, keys without classes omitted
+    """
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[df.sort_values(by=["day", "start_time"], kind="stable").index.to_numpy()] = np.arange(len(df))
+    
+    # Строка занятия на каждую его группу; индекс - позиция строки в df
+    memberships = pd.Series([tuple(dict.fromkeys(c.groups)) for c in optimizer.classes]).explode().dropna()
+    positions = {
+        "teacher": df.groupby("teacher", sort=False).indices,
+        "group": {group: index.to_numpy()
+                  for group, index in memberships.groupby(memberships, sort=False).groups.items()},
+        "room": df.groupby("room", sort=False).indices,
+    }
+    index = {}
+    for _, keys, column in _sheet_dimensions(optimizer):
+        index[column] = {}
+        for key in keys:
+            rows = positions[column].get(key)
+            if rows is not None and len(rows):
+                index[column][key] = rows[np.argsort(rank[rows], kind="stable")]
+    return index
+
+def _sheet_rows(optimizer, df):
+    """
+    Sheets of the Excel export as row positions in df.
+    
+    Yields:
+        (sheet name, row positions in df) in export order
+    """
+    yield "Schedule", np.arange(len(df))
+    index = schedule_index(optimizer, df)
+    for prefix, _, column in _sheet_dimensions(optimizer):
+        for key, rows in index[column].items():
+            yield _sheet_name(prefix, key), rows
+
+def _run_info(optimizer):
+    """Run information: which solver preset produced this schedule (None if unknown)."""
+    solver_info = getattr(optimizer, 'solver_info', None)
+    if not solver_info:
+        return None
+    run_rows = [(key, value) for key, value in solver_info.items() if key != 'config']
+    run_rows.extend((f"config.{key}", value) for key, value in solver_info.get('config', {}).items())
+    return pd.DataFrame([(key, str(value)) for key, value in run_rows], columns=["key", "value"])
+
+def schedule_sheets(optimizer, df=None):
+    """
+    Build the sheets of the exported schedule (lazily, one at a time).
+    
+    Args:
+        df: Schedule DataFrame (built from optimizer.solution if omitted)
+        
+    Yields:
+        (sheet name, DataFrame) in export order: Schedule, T_<teacher>,
+        G_<group>, R_<room> and Run
+    """
+    if df is None:
+        df = get_schedule_dataframe(optimizer)
+    for name, rows in _sheet_rows(optimizer, df):
+        yield name, df.iloc[rows]
+    run_df = _run_info(optimizer)
+    if run_df is not None:
+        yield "Run", run_df
+
+def _write_rows(sheet, columns, rows):
+    """Write a header row and value rows to a write-only worksheet and close it."""
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(sheet, value=str(column))
+        cell.font = _HEADER_FONT
+        cell.border = _HEADER_BORDER
+        cell.alignment = _HEADER_ALIGNMENT
+        header.append(cell)
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    # Закрытый лист сброшен во временный файл и не держит буферы записи до save
+    sheet.close()
+
+def _row_values(df):
+    """DataFrame rows as tuples; NaN becomes an empty cell, as with DataFrame.to_excel."""
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
 def export_to_excel(optimizer, filename="schedule.xlsx"):
     """
     Export the schedule to an Excel file.
     
+    Sheets: Schedule, T_<teacher>, G_<group>, R_<room> and Run. The schedule
+    frame is built and converted to cell values once; each sheet is streamed
+    to a write-only openpyxl workbook as soon as its rows are known.
+    
     Args:
         filename: Path to the output Excel file
         
@@ -78,35 +209,155 @@ def export_to_excel(optimizer, filename="schedule.xlsx"):
     if not optimizer.solution:
         return False
     
-    # Используем контекстный менеджер для автоматического закрытия файла
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        # Main schedule
-        main_df = pd.DataFrame(optimizer.solution)
-        main_df.to_excel(writer, sheet_name="Schedule", index=False)
+    df = get_schedule_dataframe(optimizer)
+    values = _row_values(df)
+    
+    # Имена, совпавшие после обрезки до 31 символа: более поздний лист перезаписывает
+    # строки более раннего, как при записи через pd.ExcelWriter; такие листы
+    # дописываются в конце, остальные - сразу
+    names = Counter(_sheet_name(prefix, key) for prefix, keys, _ in _sheet_dimensions(optimizer) for key in keys)
+    pending = {}
+    
+    workbook = Workbook(write_only=True)
+    for name, rows in _sheet_rows(optimizer, df):
+        if name in pending:
+            sheet, earlier = pending[name]
+            pending[name] = (sheet, np.concatenate([rows, earlier[len(rows):]]))
+        elif names[name] > 1:
+            pending[name] = (workbook.create_sheet(title=name), rows)
+        else:
+            _write_rows(workbook.create_sheet(title=name), df.columns, (values[row] for row in rows))
+    for sheet, rows in pending.values():
+        _write_rows(sheet, df.columns, (values[row] for row in rows))
+    
+    run_df = _run_info(optimizer)
+    if run_df is not None:
+        _write_rows(workbook.create_sheet(title="Run"), run_df.columns, _row_values(run_df))
+    workbook.save(filename)
+    return True
+
+def export_to_csv(optimizer, filename="schedule.csv"):
+    """
+    Export the flat schedule (the Schedule sheet) to a CSV file (UTF-8).
+    
+    Returns:
+        True if export was successful, False otherwise
+    """
+    if not optimizer.solution:
+        return False
+    get_schedule_dataframe(optimizer).to_csv(filename, index=False)
+    return True
+
+def export_to_jsonl(optimizer, filename="schedule.jsonl"):
+    """
+    Export the flat schedule to a JSON lines file: one object per class.
+    
+    Returns:
+        True if export was successful, False otherwise
+    """
+    if not optimizer.solution:
+        return False
+    df = get_schedule_dataframe(optimizer)
+    with open(filename, 'w', encoding='utf-8') as f:
+        for record in df.astype(object).where(df.notna(), None).to_dict('records'):
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+    return True
+
+def export_to_parquet(optimizer, filename="schedule.parquet"):
+    """
+    Export the flat schedule to a Parquet file.
+    
+    Requires pyarrow or fastparquet (optional dependencies, see
+    check_export_formats).
+    
+    Returns:
+        True if export was successful, False otherwise
+    """
+    if not optimizer.solution:
+        return False
+    get_schedule_dataframe(optimizer).to_parquet(filename, index=False)
+    return True
+
+def export_index_json(optimizer, filename="schedule.index.json"):
+    """
+    Export a compact JSON index of the flat schedule.
+    
+    For every teacher, group and room: row numbers (0-based) of its classes
+    in the flat schedule (CSV, JSON lines, Parquet or the Schedule sheet),
+    sorted by day and start time - the rows of its Excel sheet.
+    
+    Returns:
+        True if export was successful, False otherwise
+    """
+    if not optimizer.solution:
+        return False
+    df = get_schedule_dataframe(optimizer)
+    index = schedule_index(optimizer, df)
+    data = {"rows": len(df)}
+    data.update((f"{column}s", {str(key): rows.tolist() for key, rows in keys.items()})
+                for column, keys in index.items())
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return True
+
+# Форматы выгрузки: суффикс файла и функция записи
+EXPORT_FORMATS = {
+    'xlsx': ('.xlsx', export_to_excel),
+    'parquet': ('.parquet', export_to_parquet),
+    'csv': ('.csv', export_to_csv),
+    'jsonl': ('.jsonl', export_to_jsonl),
+    'index': ('.index.json', export_index_json),
+}
+
+# Движки pandas.DataFrame.to_parquet
+_PARQUET_ENGINES = ('pyarrow', 'fastparquet')
+
+def check_export_formats(formats):
+    """
+    Check that the formats are known and their optional dependencies are installed.
+    
+    Args:
+        formats: Format names (EXPORT_FORMATS keys)
         
-        # Teacher schedules
-        for teacher in optimizer.teachers:
-            teacher_df = get_teacher_schedule(optimizer, teacher)
-            if teacher_df is not None and not teacher_df.empty:
-                # Create a safe sheet name (max 31 chars)
-                sheet_name = f"T_{teacher}"[:31]
-                teacher_df.to_excel(writer, sheet_name=sheet_name, index=False)
+    Raises:
+        ValueError: Unknown format or no Parquet engine
+    """
+    unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown output formats {unknown}, expected some of {list(EXPORT_FORMATS)}")
+    if 'parquet' in formats and not any(importlib.util.find_spec(engine) for engine in _PARQUET_ENGINES):
+        raise ValueError("Parquet output needs pyarrow or fastparquet (pip install pyarrow)")
+
+def output_paths(output, formats):
+    """
+    Output file of every format: the output path with the format's suffix.
+    
+    Args:
+        output: Output path; its format suffix (or other extension) is replaced
+        formats: Format names (EXPORT_FORMATS keys)
         
-        # Group schedules
-        for group in optimizer.groups:
-            group_df = get_group_schedule(optimizer, group)
-            if group_df is not None and not group_df.empty:
-                # Create a safe sheet name (max 31 chars)
-                sheet_name = f"G_{group}"[:31]
-                group_df.to_excel(writer, sheet_name=sheet_name, index=False)
+    Returns:
+        {format: path} in formats order
+    """
+    suffixes = sorted((suffix for suffix, _ in EXPORT_FORMATS.values()), key=len, reverse=True)
+    suffix = next((suffix for suffix in suffixes if output.lower().endswith(suffix)), None)
+    base = output[:-len(suffix)] if suffix else os.path.splitext(output)[0]
+    return {fmt: base + EXPORT_FORMATS[fmt][0] for fmt in dict.fromkeys(formats)}
+
+def export_schedule(optimizer, output, formats=('xlsx',)):
+    """
+    Export the schedule in every requested format.
+    
+    Args:
+        output: Output path; each format replaces its extension (output_paths)
+        formats: Format names (EXPORT_FORMATS keys)
         
-        # Room schedules
-        for room in optimizer.rooms:
-            room_df = get_room_schedule(optimizer, room)
-            if room_df is not None and not room_df.empty:
-                # Create a safe sheet name (max 31 chars)
-                sheet_name = f"R_{room}"[:31]
-                room_df.to_excel(writer, sheet_name=sheet_name, index=False)
-    
-    # Файл уже закрыт благодаря контекстному менеджеру
-    return True
\ No newline at end of file
+    Returns:
+        {format: path} of the written files (empty if there is no solution)
+    """
+    written = {}
+    for fmt, path in output_paths(output, formats).items():
+        if EXPORT_FORMATS[fmt][1](optimizer, filename=path):
+            written[fmt] = path
+    return written
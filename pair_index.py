@@ -0,0 +1,130 @@
+"""
+Индекс пар-кандидатов для проверки конфликтов ресурсов.
+
+Вместо перебора всех пар занятий (O(n²)) строит корзины по дню и общему
+ресурсу (преподаватель, группа, аудитория) и внутри корзин преподавателей
+и групп выполняет проход заметающей прямой (sweep line) по интервалам
+эффективных границ. В результате порождаются только те пары, которые
+цикл add_resource_conflict_constraints не отбросил бы без добавления
+ограничений.
+"""
+
+from time_utils import time_to_minutes
+from effective_bounds_utils import get_effective_bounds
+
+__all__ = ['build_candidate_pairs', 'get_class_interval', 'count_all_pairs']
+
+
+def get_class_interval(optimizer, idx, schedule_class):
+    """
+    Возвращает интервал возможного размещения занятия в минутах.
+
+    Интервал совпадает с тем, что использует times_overlap для занятий
+    вне общей цепочки: [min_time, max_time + duration).
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        idx: Индекс занятия
+        schedule_class: Объект ScheduleClass
+
+    Returns:
+        tuple: (start_minutes, end_minutes)
+    """
+    bounds = get_effective_bounds(optimizer, idx, schedule_class)
+    start = time_to_minutes(bounds.min_time)
+    end = time_to_minutes(bounds.max_time) + schedule_class.duration
+    return start, end
+
+
+def count_all_pairs(num_classes):
+    """Количество пар (i, j), i < j, которое перебирает полный цикл."""
+    return num_classes * (num_classes - 1) // 2
+
+
+def _sweep_overlapping_pairs(members, intervals, pairs):
+    """
+    Добавляет в pairs все пары членов корзины с пересекающимися интервалами.
+
+    Args:
+        members: Список индексов занятий одной корзины
+        intervals: Словарь {idx: (start, end)}
+        pairs: Множество пар (i, j), i < j, для пополнения
+    """
+    events = sorted(members, key=lambda idx: intervals[idx][0])
+    active = []
+
+    for idx in events:
+        start, end = intervals[idx]
+        # Убираем интервалы, закончившиеся не позже начала текущего
+        active = [other for other in active if intervals[other][1] > start]
+        for other in active:
+            # Пересечение строгое, как в times_overlap: start1 < end2 and start2 < end1
+            if intervals[other][0] < end and start < intervals[other][1]:
+                pairs.add((other, idx) if other < idx else (idx, other))
+        active.append(idx)
+
+
+def build_candidate_pairs(optimizer):
+    """
+    Строит отсортированный список пар-кандидатов для проверки конфликтов.
+
+    Пара попадает в список, если занятия в один день и
+      - имеют общую возможную аудиторию (такие пары цикл обрабатывает
+        всегда, без проверки пересечения времени), или
+      - имеют общего преподавателя или общую группу и их интервалы
+        эффективных границ пересекаются, или
+      - имеют общего преподавателя или группу и входят в одну цепочку
+        (для них times_overlap использует окно цепочки).
+
+    Порядок пар лексикографический, как в полном цикле, поэтому ограничения
+    добавляются в модель в той же последовательности.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+
+    Returns:
+        list: Отсортированный список пар (i, j), i < j
+    """
+    room_buckets = {}
+    sweep_buckets = {}
+    groups_by_idx = {}
+
+    for idx, c in enumerate(optimizer.classes):
+        groups_by_idx[idx] = c.group_set
+        for room_id in c.room_ids:
+            room_buckets.setdefault((c.day, room_id), []).append(idx)
+        if c.teacher:
+            sweep_buckets.setdefault((c.day, 'teacher', c.teacher_id), []).append(idx)
+        for group_id in c.group_ids:
+            sweep_buckets.setdefault((c.day, 'group', group_id), []).append(idx)
+
+    pairs = set()
+
+    # Общая аудитория: все пары корзины
+    for members in room_buckets.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.add((members[a], members[b]))
+
+    # Общий преподаватель или группа: только пересекающиеся интервалы
+    intervals = {}
+    for members in sweep_buckets.values():
+        if len(members) < 2:
+            continue
+        for idx in members:
+            if idx not in intervals:
+                intervals[idx] = get_class_interval(optimizer, idx, optimizer.classes[idx])
+        _sweep_overlapping_pairs(members, intervals, pairs)
+
+    # Пары внутри одной цепочки проверяются по окну цепочки, а не по границам
+    for chain in getattr(optimizer, 'linked_chains', []):
+        for a in range(len(chain)):
+            for b in range(a + 1, len(chain)):
+                i, j = min(chain[a], chain[b]), max(chain[a], chain[b])
+                c_i, c_j = optimizer.classes[i], optimizer.classes[j]
+                if c_i.day != c_j.day:
+                    continue
+                if (c_i.teacher and c_i.teacher_id == c_j.teacher_id) or (groups_by_idx[i] & groups_by_idx[j]):
+                    pairs.add((i, j))
+
+    return sorted(pairs)
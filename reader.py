@@ -1,12 +1,110 @@
+import hashlib
+import os
+import pickle
+import sys
 import pandas as pd
 import numpy as np
 import openpyxl
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Set, Any
 from pathlib import Path
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+# Интернированные идентификаторы ресурсов: {вид: {имя: id}}; общие для всех
+# занятий процесса, поэтому равенство id означает равенство имен
+_RESOURCE_IDS: Dict[str, Dict[str, int]] = {'teacher': {}, 'group': {}, 'room': {}}
+
+
+def intern_resource(kind: str, name: Optional[str]) -> Optional[int]:
+    """
+    Возвращает целый id имени ресурса (преподаватель, группа, аудитория).
+    
+    Args:
+        kind: 'teacher', 'group' или 'room'
+        name: Имя ресурса
+        
+    Returns:
+        Optional[int]: id (одинаковый для одинаковых имен) или None для пустого имени
+    """
+    if name is None:
+        return None
+    ids = _RESOURCE_IDS[kind]
+    resource_id = ids.get(name)
+    if resource_id is None:
+        resource_id = ids[name] = len(ids)
+    return resource_id
+
+
+def _intern_name(value):
+    """Строки интернируются (sys.intern), прочие значения остаются как есть."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _time_minutes(value, field_name, subject) -> int:
+    """Время "HH:MM" -> минуты от полуночи (0 для пустого, как time_utils.time_to_minutes)."""
+    if not value:
+        return 0
+    try:
+        hours, minutes = map(int, str(value).split(':')[:2])
+    except ValueError:
+        raise ValueError(f"Invalid {field_name} '{value}' for class {subject}") from None
+    return hours * 60 + minutes
+
+
+def _split_groups(group) -> Tuple[str, ...]:
+    """Group names from the group field (e.g. "2A+1A Kunst" -> ("2A", "1A"))."""
+    if not group:
+        return ()
+    
+    groups = []
+    for part in str(group).split():
+        # Look for patterns like "2A", "1A+3B", etc.
+        if any(c.isdigit() for c in part):
+            if "+" in part:
+                # Handle multiple groups
+                for group_part in part.split("+"):
+                    groups.append(group_part.strip())
+            else:
+                groups.append(part)
+                
+    return tuple(groups) if groups else (group,)
+
 
 class ScheduleClass:
-    """Class representing a scheduled lesson with all its properties."""
+    """
+    Class representing a scheduled lesson with all its properties.
+    
+    Компактное представление (__slots__): кроме исходных полей хранит
+    вычисленные один раз производные поля, которые используют попарные
+    проверки модулей ограничений:
+        groups, group_set, group_ids  - группы занятия (кортеж имен, frozenset,
+                                        id без повторов)
+        possible_rooms, room_set, room_ids - основная и альтернативные аудитории
+        teacher_id                    - id преподавателя (None, если не указан)
+        start_minutes, end_minutes    - время начала/конца в минутах (0, если не задано)
+        total_duration                - длительность с перерывами
+    Производные поля пересчитываются при изменении исходного поля. После
+    загрузки (freeze) исходные поля и связи менять нельзя; флаги построения
+    модели (has_time_window, fixed_start_time) остаются изменяемыми.
+    """
+    
+    # Исходные поля; их изменение пересчитывает производные
+    _SOURCE_FIELDS = frozenset((
+        'subject', 'group', 'teacher', 'main_room', 'alternative_rooms', 'building',
+        'duration', 'day', 'start_time', 'end_time', 'pause_before', 'pause_after',
+        'section_index', 'column',
+    ))
+    _LINK_FIELDS = frozenset(('next_class', 'previous_class', 'linked_classes'))
+    
+    __slots__ = tuple(sorted(_SOURCE_FIELDS)) + (
+        'next_class', 'previous_class', 'linked_classes',
+        'has_time_window', 'fixed_start_time',
+        'groups', 'group_set', 'group_ids', 'possible_rooms', 'room_set', 'room_ids',
+        'teacher_id', 'start_minutes', 'end_minutes', 'total_duration',
+        '_frozen',
+    )
     
     def __init__(self, 
                  subject: str, 
@@ -24,20 +122,22 @@ class ScheduleClass:
                  section_index: int = 0,
                  column: str = "B"):
         
-        self.subject = subject
-        self.group = group
-        self.teacher = teacher
-        self.main_room = main_room
-        self.alternative_rooms = [r for r in alternative_rooms if r]  # Filter out None values
-        self.building = building
-        self.duration = int(duration) if duration is not None else 0
-        self.day = day
-        self.start_time = start_time
-        self.end_time = end_time
-        self.pause_before = int(pause_before) if pause_before is not None else 0
-        self.pause_after = int(pause_after) if pause_after is not None else 0
-        self.section_index = section_index
-        self.column = column
+        init = object.__setattr__
+        init(self, '_frozen', False)
+        init(self, 'subject', _intern_name(subject))
+        init(self, 'group', _intern_name(group))
+        init(self, 'teacher', _intern_name(teacher))
+        init(self, 'main_room', _intern_name(main_room))
+        init(self, 'alternative_rooms', tuple(_intern_name(r) for r in alternative_rooms if r))  # Filter out None values
+        init(self, 'building', _intern_name(building))
+        init(self, 'duration', int(duration) if duration is not None else 0)
+        init(self, 'day', _intern_name(day))
+        init(self, 'start_time', start_time)
+        init(self, 'end_time', end_time)
+        init(self, 'pause_before', int(pause_before) if pause_before is not None else 0)
+        init(self, 'pause_after', int(pause_after) if pause_after is not None else 0)
+        init(self, 'section_index', section_index)
+        init(self, 'column', column)
         
         # Добавляем новые атрибуты для работы с временными окнами
         self.has_time_window = False  # Этот флаг будет установлен в model_variables.py
@@ -48,6 +148,65 @@ class ScheduleClass:
         self.previous_class = None
         self.linked_classes = []
         
+        self._derive()
+    
+    def _derive(self):
+        """Вычисляет производные поля из исходных."""
+        init = object.__setattr__
+        groups = tuple(_intern_name(g) for g in _split_groups(self.group))
+        rooms = tuple(r for r in (self.main_room,) + self.alternative_rooms if r)  # Filter out any None values
+        init(self, 'groups', groups)
+        init(self, 'group_set', frozenset(groups))
+        init(self, 'group_ids', tuple(dict.fromkeys(intern_resource('group', g) for g in groups)))
+        init(self, 'possible_rooms', rooms)
+        init(self, 'room_set', frozenset(rooms))
+        init(self, 'room_ids', tuple(dict.fromkeys(intern_resource('room', r) for r in rooms)))
+        init(self, 'teacher_id', intern_resource('teacher', self.teacher))
+        init(self, 'start_minutes', _time_minutes(self.start_time, 'start time', self.subject))
+        init(self, 'end_minutes', _time_minutes(self.end_time, 'end time', self.subject))
+        init(self, 'total_duration', self.duration + self.pause_before + self.pause_after)
+    
+    def __setattr__(self, name, value):
+        if name in self._SOURCE_FIELDS or name in self._LINK_FIELDS:
+            if self._frozen:
+                raise AttributeError(f"ScheduleClass is frozen after loading, cannot set '{name}'")
+            if name in self._SOURCE_FIELDS:
+                if name == 'alternative_rooms':
+                    value = tuple(_intern_name(r) for r in value if r)
+                elif name in ('duration', 'pause_before', 'pause_after'):
+                    value = int(value) if value is not None else 0
+                object.__setattr__(self, name, value)
+                self._derive()
+                return
+        elif name not in ('has_time_window', 'fixed_start_time'):
+            raise AttributeError(f"ScheduleClass has no field '{name}'")
+        object.__setattr__(self, name, value)
+    
+    def freeze(self):
+        """Запрещает изменение исходных полей и связей (после загрузки)."""
+        if not isinstance(self.linked_classes, tuple):
+            object.__setattr__(self, 'linked_classes', tuple(self.linked_classes))
+        object.__setattr__(self, '_frozen', True)
+    
+    @property
+    def frozen(self) -> bool:
+        """Занятие заморожено (freeze)."""
+        return self._frozen
+    
+    def __getstate__(self):
+        # Производные поля и id не переносятся: в другом процессе они
+        # вычисляются заново по его таблице интернирования
+        state = {name: getattr(self, name) for name in self._SOURCE_FIELDS | self._LINK_FIELDS}
+        state['has_time_window'] = self.has_time_window
+        state['fixed_start_time'] = self.fixed_start_time
+        state['_frozen'] = self._frozen
+        return state
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._derive()
+        
     def __str__(self):
         time_info = "No time"
         if self.start_time and self.end_time:
@@ -60,12 +219,6 @@ class ScheduleClass:
     def __repr__(self):
         return self.__str__()
     
-    @property
-    def possible_rooms(self) -> List[str]:
-        """Return the list of all possible rooms for this class."""
-        rooms = [self.main_room] + self.alternative_rooms
-        return [r for r in rooms if r]  # Filter out any None values
-    
     @property
     def has_fixed_time(self) -> bool:
         """Check if the class has a fixed start time."""
@@ -76,39 +229,66 @@ class ScheduleClass:
         """Check if the class must be in a specific room."""
         return len(self.alternative_rooms) == 0
     
-    @property
-    def total_duration(self) -> int:
-        """Calculate the total duration including pauses."""
-        return self.duration + self.pause_before + self.pause_after
-    
     def get_groups(self) -> List[str]:
-        """Extract all group names from the group field."""
-        # The group field may contain multiple groups like "2A+1A Kunst"
-        # Parse this to extract all group names
-        if not self.group:
-            return []
-            
-        parts = self.group.split()
-        groups = []
+        """Extract all group names from the group field (copy of the cached groups)."""
+        return list(self.groups)
+
+
+def _extract_time(cell_value):
+    """Значение ячейки времени -> "HH:MM" (прочие значения возвращаются как есть)."""
+    # If it's a datetime.time object
+    if hasattr(cell_value, 'hour') and hasattr(cell_value, 'minute'):
+        return f"{cell_value.hour:02d}:{cell_value.minute:02d}"
         
-        for part in parts:
-            # Look for patterns like "2A", "1A+3B", etc.
-            if any(c.isdigit() for c in part):
-                if "+" in part:
-                    # Handle multiple groups
-                    for group_part in part.split("+"):
-                        groups.append(group_part.strip())
-                else:
-                    groups.append(part)
-                    
-        return groups if groups else [self.group]
+    # If it's already a datetime, format it
+    if isinstance(cell_value, datetime):
+        return cell_value.strftime('%H:%M')
+        
+    # If it's a number, treat it as Excel time (fraction of day)
+    if isinstance(cell_value, (int, float)):
+        # Convert Excel time to hours and minutes
+        total_minutes = int(cell_value * 24 * 60)
+        hours = total_minutes // 60
+        minutes = total_minutes % 60
+        return f"{hours:02d}:{minutes:02d}"
+    
+    # For string values that look like time (HH:MM:SS)
+    if isinstance(cell_value, str) and ':' in cell_value:
+        parts = cell_value.split(':')
+        if len(parts) >= 2:
+            try:
+                hours = int(parts[0])
+                minutes = int(parts[1])
+                return f"{hours:02d}:{minutes:02d}"
+            except ValueError:
+                pass
+    
+    # For other values or None
+    return cell_value
 
 
 class ScheduleReader:
     """Class for reading and processing schedule data from Excel files."""
     
-    def __init__(self, file_path: str):
+    # Строк в секции планирования (предмет ... перерыв после) и столбцы занятий секции
+    SECTION_ROWS = 14
+    SECTION_COLUMNS = ('B', 'C', 'D')
+    
+    # Версия формата кеша разобранного файла (увеличивается при изменении разбора)
+    CACHE_FORMAT = 1
+    
+    def __init__(self, file_path: str, use_cache: bool = True):
+        """
+        Args:
+            file_path: Путь к Excel-файлу планирования
+            use_cache: Хранить разобранные занятия в файле-спутнике рядом с
+                Excel-файлом (.<имя>.parsed) и читать их оттуда, пока файл не изменился
+        """
         self.file_path = file_path
+        self.use_cache = use_cache
+        directory, name = os.path.split(os.path.abspath(file_path))
+        self.cache_path = os.path.join(directory, f".{name}.parsed")
+        self.cache_hit = False
         self.planning_sections = []
         self.teachers = set()
         self.groups = set()
@@ -117,149 +297,170 @@ class ScheduleReader:
         self.days = set()
         
     def read_excel(self) -> List[ScheduleClass]:
-        """Read and parse the Excel file to extract scheduling data."""
-        # Read the Excel file with both data_only and with formulas
-        workbook_data = openpyxl.load_workbook(self.file_path, data_only=True)
+        """
+        Read and parse the Excel file to extract scheduling data.
         
-        # Get the planning sheet
-        planning_sheet = None
-        for sheet_name in workbook_data.sheetnames:
-            if sheet_name.lower() == "plannung":
-                planning_sheet = workbook_data[sheet_name]
-                break
+        С use_cache занятия берутся из файла-спутника, если путь, размер,
+        время изменения (или, при их расхождении, хеш содержимого) совпадают
+        с записанными; иначе файл разбирается и спутник перезаписывается.
+        """
+        self.cache_hit = False
+        if not self.use_cache:
+            return self._parse_workbook()
         
-        if not planning_sheet:
-            raise ValueError("Could not find 'Plannung' sheet in the Excel file")
+        stat = os.stat(self.file_path)
+        classes = self._load_cache(stat)
+        if classes is not None:
+            self.cache_hit = True
+            self.planning_sections = classes
+            return classes
         
-        # Helper function to extract time values from cells
-        def extract_time(row, column):
-            # Try different methods to get the time
-            cell = planning_sheet.cell(row=row, column=column)
-            cell_value = cell.value
-            
-            # If it's a datetime.time object
-            if hasattr(cell_value, 'hour') and hasattr(cell_value, 'minute'):
-                return f"{cell_value.hour:02d}:{cell_value.minute:02d}"
-                
-            # If it's already a datetime, format it
-            if isinstance(cell_value, datetime):
-                return cell_value.strftime('%H:%M')
-                
-            # If it's a number, treat it as Excel time (fraction of day)
-            if isinstance(cell_value, (int, float)):
-                # Convert Excel time to hours and minutes
-                total_minutes = int(cell_value * 24 * 60)
-                hours = total_minutes // 60
-                minutes = total_minutes % 60
-                return f"{hours:02d}:{minutes:02d}"
-            
-            # For string values that look like time (HH:MM:SS)
-            if isinstance(cell_value, str) and ':' in cell_value:
-                parts = cell_value.split(':')
-                if len(parts) >= 2:
-                    try:
-                        hours = int(parts[0])
-                        minutes = int(parts[1])
-                        return f"{hours:02d}:{minutes:02d}"
-                    except ValueError:
-                        pass
+        classes = self._parse_workbook()
+        self._store_cache(classes, stat)
+        return classes
+    
+    def _file_digest(self) -> str:
+        """SHA-256 содержимого Excel-файла."""
+        digest = hashlib.sha256()
+        with open(self.file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _load_cache(self, stat) -> Optional[List[ScheduleClass]]:
+        """
+        Восстанавливает занятия из файла-спутника.
+        
+        Args:
+            stat: os.stat Excel-файла
             
-            # For other values or None
-            return cell_value
+        Returns:
+            List[ScheduleClass] или None, если спутника нет или он устарел
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+            log.warning("Ignoring unreadable parsed-input cache '{}': {}", self.cache_path, str(e))
+            return None
         
-        # Extract planning sections
-        planning_map = {}
-        row = 2  # Start from row 2
+        if entry.get('format') != self.CACHE_FORMAT or entry.get('path') != os.path.abspath(self.file_path):
+            return None
+        if (entry['size'], entry['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+            # Файл перезаписан или скопирован: решает хеш содержимого
+            if entry['size'] != stat.st_size or entry['sha256'] != self._file_digest():
+                return None
+            self._store_entry(dict(entry, mtime_ns=stat.st_mtime_ns))
+        
+        classes = []
+        for fields in entry['classes']:
+            (subject, group, teacher, main_room, alternative_rooms, building, duration, day,
+             start_time, end_time, pause_before, pause_after, section_index, column) = fields
+            classes.append(ScheduleClass(
+                subject=subject, group=group, teacher=teacher, main_room=main_room,
+                alternative_rooms=list(alternative_rooms), building=building, duration=duration,
+                day=day, start_time=start_time, end_time=end_time, pause_before=pause_before,
+                pause_after=pause_after, section_index=section_index, column=column
+            ))
+        for cls, (previous_idx, next_idx, linked) in zip(classes, entry['links']):
+            cls.previous_class = classes[previous_idx] if previous_idx is not None else None
+            cls.next_class = classes[next_idx] if next_idx is not None else None
+            cls.linked_classes = [classes[idx] for idx in linked]
+        for cls in classes:
+            cls.freeze()
         
-        while row <= planning_sheet.max_row:
-            # Check if this is the start of a section
-            cell_value = planning_sheet.cell(row=row, column=2).value  # Column B
+        for name in ('teachers', 'groups', 'rooms', 'buildings', 'days'):
+            setattr(self, name, set(entry[name]))
+        log.info("Loaded {} parsed classes from cache '{}'", len(classes), self.cache_path)
+        return classes
+    
+    def _store_cache(self, classes: List[ScheduleClass], stat):
+        """Записывает разобранные занятия и их связи в файл-спутник."""
+        index = {id(cls): idx for idx, cls in enumerate(classes)}
+        self._store_entry({
+            'format': self.CACHE_FORMAT,
+            'path': os.path.abspath(self.file_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': self._file_digest(),
+            'classes': [
+                (cls.subject, cls.group, cls.teacher, cls.main_room, tuple(cls.alternative_rooms),
+                 cls.building, cls.duration, cls.day, cls.start_time, cls.end_time,
+                 cls.pause_before, cls.pause_after, cls.section_index, cls.column)
+                for cls in classes
+            ],
+            'links': [
+                (index.get(id(cls.previous_class)), index.get(id(cls.next_class)),
+                 tuple(index[id(other)] for other in cls.linked_classes))
+                for cls in classes
+            ],
+            'teachers': self.teachers,
+            'groups': self.groups,
+            'rooms': self.rooms,
+            'buildings': self.buildings,
+            'days': self.days,
+        })
+    
+    def _store_entry(self, entry: Dict[str, Any]):
+        """Атомарно записывает файл-спутник; ошибка записи не мешает чтению."""
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            log.warning("Could not write parsed-input cache '{}': {}", self.cache_path, str(e))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def _parse_workbook(self) -> List[ScheduleClass]:
+        """
+        Разбирает Excel-файл.
+        
+        Книга открывается в режиме read_only, столбцы B-D листа "Plannung"
+        читаются потоково одним проходом iter_rows(values_only=True), и
+        каждая секция из 14 строк разбирается, как только прочитана.
+        """
+        workbook_data = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            # Get the planning sheet
+            planning_sheet = None
+            for sheet_name in workbook_data.sheetnames:
+                if sheet_name.lower() == "plannung":
+                    planning_sheet = workbook_data[sheet_name]
+                    break
             
-            if cell_value:  # Found a section
-                section_index = (row - 2) // 14
-                planning_map[section_index] = {}
-                
-                # Process columns B, C, D
-                for col_idx, col_letter in enumerate(['B', 'C', 'D'], start=2):
-                    subject = planning_sheet.cell(row=row, column=col_idx).value
-                    
-                    if not subject:
-                        continue  # Skip empty columns
-                    
-                    # Extract all data for this class
-                    group = planning_sheet.cell(row=row+1, column=col_idx).value
-                    teacher = planning_sheet.cell(row=row+2, column=col_idx).value
-                    main_room = planning_sheet.cell(row=row+3, column=col_idx).value
-                    alt_room1 = planning_sheet.cell(row=row+4, column=col_idx).value
-                    alt_room2 = planning_sheet.cell(row=row+5, column=col_idx).value
-                    alt_room3 = planning_sheet.cell(row=row+6, column=col_idx).value
-                    building = planning_sheet.cell(row=row+7, column=col_idx).value
-                    duration = planning_sheet.cell(row=row+8, column=col_idx).value
-                    day = planning_sheet.cell(row=row+9, column=col_idx).value
-                    
-                    # Use our custom function to extract time values
-                    start_time = extract_time(row+10, col_idx)  # Start time cell
-                    end_time = extract_time(row+11, col_idx)    # End time cell
-                    
-                    pause_before = planning_sheet.cell(row=row+12, column=col_idx).value
-                    pause_after = planning_sheet.cell(row=row+13, column=col_idx).value
-                    
-                    # Ensure numeric values for duration and pauses
-                    try:
-                        duration = int(float(duration)) if duration is not None else 0
-                    except (ValueError, TypeError):
-                        print(f"Warning: Invalid duration value '{duration}' for {subject}. Using 0.")
-                        duration = 0
-                        
-                    try:
-                        pause_before = int(float(pause_before)) if pause_before is not None else 0
-                    except (ValueError, TypeError):
-                        pause_before = 0
-                        
-                    try:
-                        pause_after = int(float(pause_after)) if pause_after is not None else 0
-                    except (ValueError, TypeError):
-                        pause_after = 0
-                    
-                    # Create ScheduleClass object
-                    class_data = ScheduleClass(
-                        subject=subject,
-                        group=group,
-                        teacher=teacher,
-                        main_room=main_room,
-                        alternative_rooms=[alt_room1, alt_room2, alt_room3],
-                        building=building,
-                        duration=duration,
-                        day=day,
-                        start_time=start_time,
-                        end_time=end_time,
-                        pause_before=pause_before,
-                        pause_after=pause_after,
-                        section_index=section_index,
-                        column=col_letter
-                    )
-                    
-                    # Update sets of teachers, groups, rooms, buildings, days
-                    self.teachers.add(teacher)
-                    self.buildings.add(building) if building else None
-                    self.days.add(day) if day else None
-                    
-                    if main_room:
-                        self.rooms.add(main_room)
-                    
-                    for room in [alt_room1, alt_room2, alt_room3]:
-                        if room:
-                            self.rooms.add(room)
-                    
-                    for group_name in class_data.get_groups():
-                        self.groups.add(group_name)
-                    
-                    planning_map[section_index][col_letter] = class_data
-                
-                # Skip to the next section
-                row += 14
-            else:
-                row += 1
+            if not planning_sheet:
+                raise ValueError("Could not find 'Plannung' sheet in the Excel file")
+            
+            # Extract planning sections
+            planning_map = {}
+            section_rows = []
+            section_start = None
+            rows = planning_sheet.iter_rows(min_row=2, min_col=2, max_col=4, values_only=True)
+            for row, values in enumerate(rows, start=2):  # Start from row 2
+                if section_start is None:
+                    # Секция начинается со строки с заполненным столбцом B
+                    if not values or not values[0]:
+                        continue
+                    section_start = row
+                section_rows.append(values)
+                if len(section_rows) == self.SECTION_ROWS:
+                    section_index = (section_start - 2) // self.SECTION_ROWS
+                    planning_map[section_index] = self._parse_section(section_rows, section_index)
+                    section_rows = []
+                    section_start = None
+            
+            # Последняя секция может быть обрезана концом листа: недостающие ячейки пустые
+            if section_start is not None:
+                section_index = (section_start - 2) // self.SECTION_ROWS
+                planning_map[section_index] = self._parse_section(section_rows, section_index)
+        finally:
+            workbook_data.close()
         
         # Connect linked classes
         for section_idx, section in planning_map.items():
@@ -273,25 +474,11 @@ class ScheduleReader:
                     main_class.next_class = section['C']
                     main_class.linked_classes.append(section['C'])
                     
-                    # Инвалидируем кеш окна цепочки после создания связи
-                    try:
-                        from chain_helpers import invalidate_chain_window
-                        invalidate_chain_window(main_class)
-                    except ImportError:
-                        pass  # chain_helpers может быть недоступен на этапе чтения
-                    
                     if 'D' in section:
                         # ИСПРАВЛЕНО: previous_class теперь ссылка на объект, а не строка
                         section['D'].previous_class = section['C']
                         section['C'].next_class = section['D']
                         main_class.linked_classes.append(section['D'])
-                        
-                        # Инвалидируем кеш окна цепочки после создания связи
-                        try:
-                            from chain_helpers import invalidate_chain_window
-                            invalidate_chain_window(section['C'])
-                        except ImportError:
-                            pass  # chain_helpers может быть недоступен на этапе чтения
         
         # Collect all classes including linked ones
         all_classes = []
@@ -301,23 +488,112 @@ class ScheduleReader:
                     all_classes.append(section[col])
         
         # Debugging output to check all classes
-        print(f"\nAll classes to be processed:")
+        log.debug("\nAll classes to be processed:")
         for i, cls in enumerate(all_classes):
-            print(f"  {i}: {cls}")
+            log.debug("  {}: {}", i, cls)
         
         # Check for linked classes
         for cls in all_classes:
             if cls.linked_classes:
-                print(f"\nClass {cls} has linked classes:")
+                log.debug("\nClass {} has linked classes:", cls)
                 for linked in cls.linked_classes:
-                    print(f"  - {linked}")
+                    log.debug("  - {}", linked)
                     # Verify linked class is in the all_classes list
                     if linked not in all_classes:
-                        print(f"    WARNING: This linked class is not in the all_classes list!")
+                        log.warning("    WARNING: This linked class is not in the all_classes list!")
+        
+        # Связи построены: дальше занятия не меняются (флаги окон - отдельно)
+        for cls in all_classes:
+            cls.freeze()
         
         self.planning_sections = all_classes
         return all_classes
     
+    def _parse_section(self, section_rows: List[tuple], section_index: int) -> Dict[str, ScheduleClass]:
+        """
+        Разбирает секцию планирования: до трех занятий в столбцах B, C, D.
+        
+        Args:
+            section_rows: Значения столбцов B-D строк секции (до 14 строк)
+            section_index: Номер секции на листе
+            
+        Returns:
+            Dict[str, ScheduleClass]: {буква столбца: занятие} для заполненных столбцов
+        """
+        section = {}
+        for col_pos, col_letter in enumerate(self.SECTION_COLUMNS):
+            column = [values[col_pos] if values and col_pos < len(values) else None
+                      for values in section_rows]
+            column += [None] * (self.SECTION_ROWS - len(column))
+            
+            subject = column[0]
+            if not subject:
+                continue  # Skip empty columns
+            
+            # Extract all data for this class
+            (group, teacher, main_room, alt_room1, alt_room2, alt_room3,
+             building, duration, day) = column[1:10]
+            
+            # Use our custom function to extract time values
+            start_time = _extract_time(column[10])  # Start time cell
+            end_time = _extract_time(column[11])    # End time cell
+            
+            pause_before = column[12]
+            pause_after = column[13]
+            
+            # Ensure numeric values for duration and pauses
+            try:
+                duration = int(float(duration)) if duration is not None else 0
+            except (ValueError, TypeError):
+                log.warning("Warning: Invalid duration value '{}' for {}. Using 0.", duration, subject)
+                duration = 0
+                
+            try:
+                pause_before = int(float(pause_before)) if pause_before is not None else 0
+            except (ValueError, TypeError):
+                pause_before = 0
+                
+            try:
+                pause_after = int(float(pause_after)) if pause_after is not None else 0
+            except (ValueError, TypeError):
+                pause_after = 0
+            
+            # Create ScheduleClass object
+            class_data = ScheduleClass(
+                subject=subject,
+                group=group,
+                teacher=teacher,
+                main_room=main_room,
+                alternative_rooms=[alt_room1, alt_room2, alt_room3],
+                building=building,
+                duration=duration,
+                day=day,
+                start_time=start_time,
+                end_time=end_time,
+                pause_before=pause_before,
+                pause_after=pause_after,
+                section_index=section_index,
+                column=col_letter
+            )
+            
+            # Update sets of teachers, groups, rooms, buildings, days
+            self.teachers.add(teacher)
+            self.buildings.add(building) if building else None
+            self.days.add(day) if day else None
+            
+            if main_room:
+                self.rooms.add(main_room)
+            
+            for room in [alt_room1, alt_room2, alt_room3]:
+                if room:
+                    self.rooms.add(room)
+            
+            for group_name in class_data.get_groups():
+                self.groups.add(group_name)
+            
+            section[col_letter] = class_data
+        return section
+    
     def _format_time(self, time_value: Any) -> Optional[str]:
         """Format Excel time values to HH:MM string format."""
         try:
@@ -345,21 +621,13 @@ class ScheduleReader:
             # Try to convert other types
             return str(time_value)
         except Exception as e:
-            print(f"Warning: Error formatting time value '{time_value}': {str(e)}")
+            log.warning("Warning: Error formatting time value '{}': {}", time_value, str(e))
             return None
     
     def get_time_slots(self, interval_minutes=15) -> List[str]:
-        """Generate time slots for scheduling at given intervals."""
-        # Standard school day from 8:00 to 20:00
-        time_slots = []
-        current_time = datetime.strptime("08:00", "%H:%M")
-        end_time = datetime.strptime("20:00", "%H:%M")
-        
-        while current_time <= end_time:
-            time_slots.append(current_time.strftime("%H:%M"))
-            current_time += timedelta(minutes=interval_minutes)
-            
-        return time_slots
+        """Generate time slots for scheduling at given intervals (default day bounds)."""
+        from time_grid import TimeGrid
+        return TimeGrid(interval_minutes).slots
     
     def get_day_indices(self) -> Dict[str, int]:
         """Map day abbreviations to indices (Mo=0, Di=1, etc.)."""
@@ -375,31 +643,31 @@ def main():
     try:
         classes = reader.read_excel()
         
-        print(f"Successfully read {len(classes)} classes from the Excel file.")
-        print(f"Teachers: {reader.teachers}")
-        print(f"Groups: {reader.groups}")
-        print(f"Rooms: {reader.rooms}")
-        print(f"Buildings: {reader.buildings}")
-        print(f"Days: {reader.days}")
+        log.info("Successfully read {} classes from the Excel file.", len(classes))
+        log.info("Teachers: {}", reader.teachers)
+        log.info("Groups: {}", reader.groups)
+        log.info("Rooms: {}", reader.rooms)
+        log.info("Buildings: {}", reader.buildings)
+        log.info("Days: {}", reader.days)
         
         # Print some sample classes
-        print("\nSample Classes:")
+        log.info("\nSample Classes:")
         for i, class_data in enumerate(classes[:5]):  # Print first 5 classes
-            print(f"\nClass {i+1}: {class_data}")
-            print(f"  Subject: {class_data.subject}")
-            print(f"  Teacher: {class_data.teacher}")
-            print(f"  Group: {class_data.group}")
-            print(f"  Duration: {class_data.duration} minutes")
-            print(f"  Day: {class_data.day}")
-            print(f"  Start Time (raw): {class_data.start_time} (type: {type(class_data.start_time).__name__})")
-            print(f"  End Time (raw): {class_data.end_time} (type: {type(class_data.end_time).__name__})")
-            print(f"  Possible Rooms: {class_data.possible_rooms}")
+            log.info("\nClass {}: {}", i+1, class_data)
+            log.info("  Subject: {}", class_data.subject)
+            log.info("  Teacher: {}", class_data.teacher)
+            log.info("  Group: {}", class_data.group)
+            log.info("  Duration: {} minutes", class_data.duration)
+            log.info("  Day: {}", class_data.day)
+            log.info("  Start Time (raw): {} (type: {})", class_data.start_time, type(class_data.start_time).__name__)
+            log.info("  End Time (raw): {} (type: {})", class_data.end_time, type(class_data.end_time).__name__)
+            log.info("  Possible Rooms: {}", class_data.possible_rooms)
             
             if class_data.linked_classes:
-                print(f"  Linked Classes: {[c.subject for c in class_data.linked_classes]}")
+                log.info("  Linked Classes: {}", [c.subject for c in class_data.linked_classes])
     
     except Exception as e:
-        print(f"Error reading Excel file: {e}")
+        log.error("Error reading Excel file: {}", e)
         import traceback
         traceback.print_exc()
 
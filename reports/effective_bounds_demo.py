@@ -33,8 +33,7 @@ def demo_effective_bounds(optimizer):
         
         # Симулируем установку фиксированного времени
         if class_0.start_time:
-            from effective_bounds_utils import time_to_slot
-            fixed_slot = time_to_slot(optimizer, class_0.start_time)
+            fixed_slot = optimizer.time_grid.time_to_slot(class_0.start_time)
             set_effective_bounds(optimizer, 0, fixed_slot, fixed_slot, 
                                "manual_demo", "Demo: Fixed time constraint")
     
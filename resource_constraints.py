@@ -8,8 +8,10 @@ from time_utils import time_to_minutes
 from sequential_scheduling import can_schedule_sequentially as can_schedule_sequentially_full, minutes_to_time 
 from constraint_registry import ConstraintType
 from effective_bounds_utils import get_effective_bounds, EffectiveBounds
-from linked_chain_utils import are_classes_in_same_chain, get_chain_window
-from chain_helpers import invalidate_chain_window
+from pair_index import build_candidate_pairs, count_all_pairs
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
 
 def times_overlap(optimizer, c1, c2, idx1=None, idx2=None):
     """
@@ -22,17 +24,10 @@ def times_overlap(optimizer, c1, c2, idx1=None, idx2=None):
         idx1, idx2: Индексы занятий (для получения эффективных границ)
     """
     # НОВОЕ: Проверяем, принадлежат ли занятия одной цепочке
-    if idx1 is not None and idx2 is not None and are_classes_in_same_chain(optimizer, idx1, idx2):
-        from linked_chain_utils import find_chain_containing_classes
-        
-        chain_indices = find_chain_containing_classes(optimizer, idx1, idx2)
-        
-        # Инвалидируем кеш окна цепочки перед получением окна
-        if chain_indices:
-            schedule_class = optimizer.classes[chain_indices[0]]
-            invalidate_chain_window(schedule_class)
-        
-        chain_window = get_chain_window(optimizer, chain_indices)
+    chain_id = optimizer.chain_index.find(idx1, idx2) if idx1 is not None and idx2 is not None else None
+    if chain_id is not None:
+        # Окно цепочки кешируется в chain_index (исходные границы занятий неизменны)
+        chain_window = optimizer.chain_index.window(optimizer, chain_id)
         
         if chain_window is not None:
             # Для занятий внутри одной цепочки используем окно цепочки
@@ -48,14 +43,15 @@ def times_overlap(optimizer, c1, c2, idx1=None, idx2=None):
             # Занятия пересекаются по времени, если они не могут поместиться последовательно в окне цепочки
             overlap = available_time < required_time
             
-            print(f"  Time overlap analysis using chain window:")
-            print(f"    Chain window: {chain_window['min_time']}-{chain_window['max_time']}")
-            print(f"    Available time: {available_time} min, Required time: {required_time} min")
-            print(f"    Overlap (cannot fit sequentially): {'YES' if overlap else 'NO'}")
+            if log.is_enabled(DEBUG):
+                log.debug("  Time overlap analysis using chain window:")
+                log.debug("    Chain window: {}-{}", chain_window['min_time'], chain_window['max_time'])
+                log.debug("    Available time: {} min, Required time: {} min", available_time, required_time)
+                log.debug("    Overlap (cannot fit sequentially): {}", 'YES' if overlap else 'NO')
             
             return overlap
         else:
-            print(f"  WARNING: Could not determine chain window for classes {idx1}, {idx2}")
+            log.warning("  WARNING: Could not determine chain window for classes {}, {}", idx1, idx2)
     
     # Получаем эффективные границы для более точного анализа (для занятий не в одной цепочке)
     if idx1 is not None and idx2 is not None:
@@ -70,10 +66,11 @@ def times_overlap(optimizer, c1, c2, idx1=None, idx2=None):
         
         overlap = (start1_min < end2_min) and (start2_min < end1_min)
         
-        print(f"  Time overlap analysis using effective bounds:")
-        print(f"    Class {idx1}: {bounds1.min_time}-{bounds1.max_time} + {c1.duration}min = {start1_min}-{end1_min}")
-        print(f"    Class {idx2}: {bounds2.min_time}-{bounds2.max_time} + {c2.duration}min = {start2_min}-{end2_min}")
-        print(f"    Overlap: {'YES' if overlap else 'NO'}")
+        if log.is_enabled(DEBUG):
+            log.debug("  Time overlap analysis using effective bounds:")
+            log.debug("    Class {}: {}-{} + {}min = {}-{}", idx1, bounds1.min_time, bounds1.max_time, c1.duration, start1_min, end1_min)
+            log.debug("    Class {}: {}-{} + {}min = {}-{}", idx2, bounds2.min_time, bounds2.max_time, c2.duration, start2_min, end2_min)
+            log.debug("    Overlap: {}", 'YES' if overlap else 'NO')
         
         return overlap
     
@@ -81,186 +78,203 @@ def times_overlap(optimizer, c1, c2, idx1=None, idx2=None):
     if not c1.start_time or not c2.start_time:
         # Одно из занятий не имеет фиксированного времени — считаем пересекающимся
         return True
-    start1 = time_to_minutes(c1.start_time)
+    start1 = c1.start_minutes
     end1 = start1 + c1.duration
-    start2 = time_to_minutes(c2.start_time)
+    start2 = c2.start_minutes
     end2 = start2 + c2.duration
     return (start1 < end2) and (start2 < end1)
 
 
-def add_resource_conflict_constraints(optimizer):
-    """Add constraints to prevent conflicts in resources (teachers, rooms, groups)."""
-    print("\n=== ADDING RESOURCE CONFLICT CONSTRAINTS ===")
+def add_resource_conflict_constraints(optimizer, use_pair_index=None):
+    """
+    Add constraints to prevent conflicts in resources (teachers, rooms, groups).
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        use_pair_index: Использовать индекс пар-кандидатов (pair_index) вместо
+            полного перебора пар. None - взять optimizer.use_pair_index.
+    """
+    log.info("\n=== ADDING RESOURCE CONFLICT CONSTRAINTS ===")
+    
+    if use_pair_index is None:
+        use_pair_index = getattr(optimizer, 'use_pair_index', True)
     
     # ИСПРАВЛЕНО: Гарантируем инициализацию linked_chains до проверок
     if not hasattr(optimizer, 'linked_chains'):
         from linked_chain_utils import build_linked_chains
         build_linked_chains(optimizer)
-        print(f"  Initialized linked chains: {len(optimizer.linked_chains)} chains found")
+        log.debug("  Initialized linked chains: {} chains found", len(optimizer.linked_chains))
     
     # Напечатать подробную информацию о занятиях для отладки
-    print("\nDetailed class information:")
-    for idx, c in enumerate(optimizer.classes):
-        time_info = f"{c.start_time}"
-        if c.end_time:
-            time_info += f"-{c.end_time}"
-        
-        room_info = ", ".join(c.possible_rooms)
-        print(f"Class {idx}: {c.subject} - {c.group} - {c.teacher} - {c.day} {time_info}")
-        print(f"  Duration: {c.duration} min, Pause before: {c.pause_before} min, Pause after: {c.pause_after} min")
-        print(f"  Room(s): {room_info}")
+    if log.is_enabled(DEBUG):
+        log.debug("\nDetailed class information:")
+        for idx, c in enumerate(optimizer.classes):
+            time_info = f"{c.start_time}"
+            if c.end_time:
+                time_info += f"-{c.end_time}"
+            
+            room_info = ", ".join(c.possible_rooms)
+            log.debug("Class {}: {} - {} - {} - {} {}", idx, c.subject, c.group, c.teacher, c.day, time_info)
+            log.debug("  Duration: {} min, Pause before: {} min, Pause after: {} min", c.duration, c.pause_before, c.pause_after)
+            log.debug("  Room(s): {}", room_info)
         
     # Предварительная проверка конфликтов
     check_potential_conflicts(optimizer)
 
-    # For each pair of classes
     num_classes = len(optimizer.classes)
-    total_pairs = 0
+    total_pairs = count_all_pairs(num_classes)
     processed_pairs = 0
     skipped_pairs = 0
     
-    for i in range(num_classes):
-        c_i = optimizer.classes[i]
-        
-        for j in range(i + 1, num_classes):
-            c_j = optimizer.classes[j]
-            total_pairs += 1
-
-            # Пропускаем сравнение, если занятия в разные дни
-            if c_i.day != c_j.day:
-                optimizer.skip_constraint(
-                    constraint_type=ConstraintType.RESOURCE_CONFLICT,
-                    origin_module=__name__,
-                    origin_function="add_resource_conflict_constraints",
-                    class_i=i,
-                    class_j=j,
-                    reason=f"Different days: {c_i.day} vs {c_j.day}"
-                )
-                skipped_pairs += 1
-                continue
-
-            # ВАЖНОЕ ИЗМЕНЕНИЕ: Всегда проверяем возможные конфликты по комнатам,
-            # даже если у классов разные учителя и группы
-            shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
-            if shared_rooms:
-                print(f"Checking room conflict between classes {i} and {j} in rooms {shared_rooms}")
-                # Добавляем ограничения, чтобы предотвратить конфликты по времени в одной комнате
-                _add_time_conflict_constraints(optimizer, i, j, c_i, c_j)
+    if use_pair_index:
+        # Обходим только пары, которые могут потребовать ограничений
+        candidate_pairs = build_candidate_pairs(optimizer)
+        for i, j in candidate_pairs:
+            if _process_class_pair(optimizer, i, j, optimizer.classes[i], optimizer.classes[j]):
                 processed_pairs += 1
-                continue  # Продолжаем со следующей парой классов
-
-            # Пропускаем сравнение, если занятия не пересекаются по времени
-            if not times_overlap(optimizer, c_i, c_j, i, j):
-                optimizer.skip_constraint(
-                    constraint_type=ConstraintType.RESOURCE_CONFLICT,
-                    origin_module=__name__,
-                    origin_function="add_resource_conflict_constraints",
-                    class_i=i,
-                    class_j=j,
-                    reason="No time overlap (effective bounds)"
-                )
-                skipped_pairs += 1
-                continue
-            
-            # Skip if classes are linked (already handled)
-            if hasattr(c_i, 'linked_classes') and c_j in c_i.linked_classes:
-                optimizer.skip_constraint(
-                    constraint_type=ConstraintType.RESOURCE_CONFLICT,
-                    origin_module=__name__,
-                    origin_function="add_resource_conflict_constraints",
-                    class_i=i,
-                    class_j=j,
-                    reason="Classes are linked"
-                )
-                skipped_pairs += 1
-                continue
-            if hasattr(c_j, 'linked_classes') and c_i in c_j.linked_classes:
-                optimizer.skip_constraint(
-                    constraint_type=ConstraintType.RESOURCE_CONFLICT,
-                    origin_module=__name__,
-                    origin_function="add_resource_conflict_constraints",
-                    class_i=i,
-                    class_j=j,
-                    reason="Classes are linked"
-                )
-                skipped_pairs += 1
-                continue
-            
-            # Skip if one class is the previous_class of the other
-            # ИСПРАВЛЕНО: previous_class теперь ссылка на объект, а не строка
-            if (hasattr(c_i, 'previous_class') and c_i.previous_class and c_i.previous_class == c_j) or \
-               (hasattr(c_j, 'previous_class') and c_j.previous_class and c_j.previous_class == c_i):
-                optimizer.skip_constraint(
-                    constraint_type=ConstraintType.RESOURCE_CONFLICT,
-                    origin_module=__name__,
-                    origin_function="add_resource_conflict_constraints",
-                    class_i=i,
-                    class_j=j,
-                    reason="One class is previous_class of the other"
-                )
+            else:
                 skipped_pairs += 1
-                continue
-            
-            # Check if both classes share resources (teacher, room, group)
-            resource_conflict = False
-            conflict_description = []
-            
-            # Проверка конфликта преподавателя
-            if c_i.teacher == c_j.teacher and c_i.teacher:
-                # Проверяем, есть ли общие группы
-                shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
-                if shared_groups:
-                    # Если есть общие группы, всегда считаем конфликтом
-                    resource_conflict = True
-                    conflict_description.append(f"teacher '{c_i.teacher}' and shared groups {shared_groups}")
+        pruned_pairs = total_pairs - len(candidate_pairs)
+    else:
+        # For each pair of classes
+        pruned_pairs = 0
+        for i in range(num_classes):
+            c_i = optimizer.classes[i]
+            for j in range(i + 1, num_classes):
+                if _process_class_pair(optimizer, i, j, c_i, optimizer.classes[j]):
+                    processed_pairs += 1
                 else:
-                    # Если группы разные, проверяем возможность последовательного планирования
-                    can_schedule, _ = can_schedule_sequentially_full(c_i, c_j, i, j, verbose=False, optimizer=optimizer)
-                    if not can_schedule:
-                        # Если последовательное планирование невозможно, отмечаем конфликт
-                        resource_conflict = True
-                        conflict_description.append(f"teacher '{c_i.teacher}' with different groups (cannot schedule sequentially)")
-            
-            # Проверка конфликта аудитории
-            shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
-            if shared_rooms:
-                # Проверяем возможность последовательного размещения
-                can_schedule, _ = can_schedule_sequentially_full(c_i, c_j, i, j, verbose=False, optimizer=optimizer)
-                if not can_schedule:
-                    resource_conflict = True
-                    conflict_description.append(f"rooms {shared_rooms}")
-            
-            # Проверка конфликта групп
-            shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
-            if shared_groups:
+                    skipped_pairs += 1
+    
+    log.info("\n=== RESOURCE CONFLICT CONSTRAINTS SUMMARY ===")
+    log.info("Total class pairs: {}", total_pairs)
+    if use_pair_index:
+        log.info("Candidate pairs (pair index): {}", total_pairs - pruned_pairs)
+        log.info("Pruned by pair index: {}", pruned_pairs)
+    log.info("Processed pairs: {}", processed_pairs)
+    log.info("Skipped pairs: {}", skipped_pairs)
+    if total_pairs:
+        log.info("Processing rate: {:.1f}%", processed_pairs/total_pairs*100)
+    log.info("="*50)
+
+
+def _process_class_pair(optimizer, i, j, c_i, c_j):
+    """
+    Проверяет одну пару занятий и при необходимости добавляет ограничения.
+    
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        i, j: Индексы занятий (i < j)
+        c_i, c_j: Экземпляры ScheduleClass
+        
+    Returns:
+        bool: True, если для пары добавлены ограничения, False если пара пропущена
+    """
+    # Пропускаем сравнение, если занятия в разные дни
+    if c_i.day != c_j.day:
+        optimizer.skip_constraint(
+            constraint_type=ConstraintType.RESOURCE_CONFLICT,
+            origin_module=__name__,
+            origin_function="add_resource_conflict_constraints",
+            class_i=i,
+            class_j=j,
+            reason=f"Different days: {c_i.day} vs {c_j.day}"
+        )
+        return False
+
+    # ВАЖНОЕ ИЗМЕНЕНИЕ: Всегда проверяем возможные конфликты по комнатам,
+    # даже если у классов разные учителя и группы
+    shared_rooms = set(c_i.room_set & c_j.room_set)
+    if shared_rooms:
+        log.debug("Checking room conflict between classes {} and {} in rooms {}", i, j, shared_rooms)
+        # Добавляем ограничения, чтобы предотвратить конфликты по времени в одной комнате
+        _add_time_conflict_constraints(optimizer, i, j, c_i, c_j)
+        return True
+
+    # Пропускаем сравнение, если занятия не пересекаются по времени
+    if not times_overlap(optimizer, c_i, c_j, i, j):
+        optimizer.skip_constraint(
+            constraint_type=ConstraintType.RESOURCE_CONFLICT,
+            origin_module=__name__,
+            origin_function="add_resource_conflict_constraints",
+            class_i=i,
+            class_j=j,
+            reason="No time overlap (effective bounds)"
+        )
+        return False
+    
+    # Skip if classes are linked (already handled)
+    if (hasattr(c_i, 'linked_classes') and c_j in c_i.linked_classes) or \
+       (hasattr(c_j, 'linked_classes') and c_i in c_j.linked_classes):
+        optimizer.skip_constraint(
+            constraint_type=ConstraintType.RESOURCE_CONFLICT,
+            origin_module=__name__,
+            origin_function="add_resource_conflict_constraints",
+            class_i=i,
+            class_j=j,
+            reason="Classes are linked"
+        )
+        return False
+    
+    # Skip if one class is the previous_class of the other
+    # ИСПРАВЛЕНО: previous_class теперь ссылка на объект, а не строка
+    if (hasattr(c_i, 'previous_class') and c_i.previous_class and c_i.previous_class == c_j) or \
+       (hasattr(c_j, 'previous_class') and c_j.previous_class and c_j.previous_class == c_i):
+        optimizer.skip_constraint(
+            constraint_type=ConstraintType.RESOURCE_CONFLICT,
+            origin_module=__name__,
+            origin_function="add_resource_conflict_constraints",
+            class_i=i,
+            class_j=j,
+            reason="One class is previous_class of the other"
+        )
+        return False
+    
+    # Check if both classes share resources (teacher, room, group)
+    resource_conflict = False
+    conflict_description = []
+    
+    # Проверка конфликта преподавателя
+    if c_i.teacher_id == c_j.teacher_id and c_i.teacher:
+        # Проверяем, есть ли общие группы
+        shared_groups = set(c_i.group_set & c_j.group_set)
+        if shared_groups:
+            # Если есть общие группы, всегда считаем конфликтом
+            resource_conflict = True
+            conflict_description.append(f"teacher '{c_i.teacher}' and shared groups {shared_groups}")
+        else:
+            # Если группы разные, проверяем возможность последовательного планирования
+            can_schedule, _ = can_schedule_sequentially_full(c_i, c_j, i, j, verbose=False, optimizer=optimizer)
+            if not can_schedule:
+                # Если последовательное планирование невозможно, отмечаем конфликт
                 resource_conflict = True
-                conflict_description.append(f"groups {shared_groups}")
-            
-            # Если обнаружен потенциальный конфликт, добавляем ограничения по времени
-            if resource_conflict:
-                conflict_str = ", ".join(conflict_description)
-                print(f"Detected potential conflict between '{c_i.subject}' and '{c_j.subject}' (shared {conflict_str})")
-                
-                _add_time_conflict_constraints(optimizer, i, j, c_i, c_j)
-                processed_pairs += 1
-            else:
-                optimizer.skip_constraint(
-                    constraint_type=ConstraintType.RESOURCE_CONFLICT,
-                    origin_module=__name__,
-                    origin_function="add_resource_conflict_constraints",
-                    class_i=i,
-                    class_j=j,
-                    reason="No resource conflicts detected"
-                )
-                skipped_pairs += 1
+                conflict_description.append(f"teacher '{c_i.teacher}' with different groups (cannot schedule sequentially)")
     
-    print(f"\n=== RESOURCE CONFLICT CONSTRAINTS SUMMARY ===")
-    print(f"Total class pairs: {total_pairs}")
-    print(f"Processed pairs: {processed_pairs}")
-    print(f"Skipped pairs: {skipped_pairs}")
-    print(f"Processing rate: {processed_pairs/total_pairs*100:.1f}%")
-    print("="*50)
-                
+    # Проверка конфликта групп
+    # (общие аудитории уже обработаны выше, до проверки пересечения времени)
+    shared_groups = set(c_i.group_set & c_j.group_set)
+    if shared_groups:
+        resource_conflict = True
+        conflict_description.append(f"groups {shared_groups}")
+    
+    # Если обнаружен потенциальный конфликт, добавляем ограничения по времени
+    if resource_conflict:
+        conflict_str = ", ".join(conflict_description)
+        log.debug("Detected potential conflict between '{}' and '{}' (shared {})", c_i.subject, c_j.subject, conflict_str)
+        
+        _add_time_conflict_constraints(optimizer, i, j, c_i, c_j)
+        return True
+    
+    optimizer.skip_constraint(
+        constraint_type=ConstraintType.RESOURCE_CONFLICT,
+        origin_module=__name__,
+        origin_function="add_resource_conflict_constraints",
+        class_i=i,
+        class_j=j,
+        reason="No resource conflicts detected"
+    )
+    return False
+
 def _add_room_conflict_constraints(optimizer, i, j, c_i, c_j):
     """
     Добавляет ограничения для предотвращения конфликтов аудиторий.
@@ -400,4 +414,4 @@ def _add_room_conflict_constraints(optimizer, i, j, c_i, c_j):
         variables_used=[f"room_conflict_{i}_{j}"]
     )
     
-    print(f"  Added room conflict constraints between classes {i} and {j}")
\ No newline at end of file
+    log.debug("  Added room conflict constraints between classes {} and {}", i, j)
\ No newline at end of file
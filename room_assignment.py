@@ -0,0 +1,113 @@
+"""
+Модуль выбора аудиторий через литералы присутствия (только constraint_mode='nooverlap').
+
+Литералы создаются только в режиме nooverlap: create_room_presence вызывается
+из interval_constraints.add_nooverlap_resource_constraints. В режиме pairwise
+(по умолчанию) аудитория занятия - переменная room_vars с доменом возможных
+аудиторий (model_variables.create_variables), конфликты аудиторий - попарные
+ограничения resource_constraints, а optimizer.room_presence не создается.
+
+В режиме nooverlap для каждой пары (занятие, возможная аудитория) создается булева переменная
+присутствия; ровно одна из них истинна (AddExactlyOne). Переменная room_vars
+занятия связывается с литералами одним линейным равенством, поэтому
+остальные модули (objective и др.) продолжают работать с room_vars.
+
+Опциональные интервалы по аудиториям строятся на этих литералах в
+interval_constraints, а выбранная аудитория декодируется из литералов
+при разборе решения (solution_table.SolutionTable.from_values, все занятия
+сразу; decode_room_index - для одного занятия).
+"""
+
+from constraint_registry import ConstraintType
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['create_room_presence', 'get_room_options', 'decode_room_index']
+
+
+def create_room_presence(optimizer):
+    """
+    Создает литералы присутствия занятий в аудиториях.
+
+    Заполняет optimizer.room_presence: {idx: {room_index: literal или None}},
+    None - аудитория фиксирована (room_vars[idx] - константа). Вызывается
+    только при построении модели в режиме nooverlap.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+    """
+    optimizer.room_presence = {}
+    room_positions = {room: pos for pos, room in enumerate(optimizer.rooms)}
+    flexible = 0
+    literals_total = 0
+
+    for idx, c in enumerate(optimizer.classes):
+        room_var = optimizer.room_vars[idx]
+        if isinstance(room_var, int):
+            optimizer.room_presence[idx] = {room_var: None}
+            continue
+
+        literals = {}
+        for room in c.possible_rooms:
+            room_idx = room_positions[room]
+            if room_idx not in literals:
+                literals[room_idx] = optimizer.model.NewBoolVar(f"in_room_{idx}_{room_idx}")
+
+        constraint = optimizer.model.AddExactlyOne(literals.values())
+        optimizer.add_constraint(
+            constraint_expr=constraint,
+            constraint_type=ConstraintType.ROOM_ASSIGNMENT,
+            origin_module=__name__,
+            origin_function="create_room_presence",
+            class_i=idx,
+            description=f"Exactly one room for class {idx}: {[optimizer.rooms[r] for r in literals]}",
+            variables_used=[f"in_room_{idx}_{room_idx}" for room_idx in literals]
+        )
+        # Связываем room_vars с литералами, чтобы целевая функция видела выбранную аудиторию
+        optimizer.model.Add(room_var == sum(room_idx * literal for room_idx, literal in literals.items()))
+
+        optimizer.room_presence[idx] = literals
+        flexible += 1
+        literals_total += len(literals)
+
+    log.info("  Room presence literals: {} for {} classes with alternative rooms", literals_total, flexible)
+
+
+def get_room_options(optimizer, idx):
+    """
+    Возвращает возможные аудитории занятия с литералами присутствия.
+
+    Returns:
+        dict: {room_index: literal или None}
+    """
+    if not hasattr(optimizer, 'room_presence'):
+        create_room_presence(optimizer)
+    return optimizer.room_presence[idx]
+
+
+def decode_room_index(optimizer, solver, idx):
+    """
+    Определяет выбранную решателем аудиторию занятия.
+
+    Использует литералы присутствия, если они есть (модель режима nooverlap),
+    иначе room_vars (режим pairwise: optimizer.room_presence нет или он пуст).
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer
+        solver: CpSolver (или callback) с найденным решением
+        idx: Индекс занятия
+
+    Returns:
+        int: Индекс аудитории в optimizer.rooms
+    """
+    options = getattr(optimizer, 'room_presence', {}).get(idx)
+    if options:
+        for room_idx, literal in options.items():
+            if literal is None or solver.BooleanValue(literal):
+                return room_idx
+
+    room_idx = optimizer.room_vars[idx]
+    if not isinstance(room_idx, int):
+        room_idx = solver.Value(room_idx)
+    return room_idx
@@ -0,0 +1,336 @@
+"""
+Замеры этапов конвейера построения расписания и отчет о прогоне.
+
+RunProfile накапливает время именованных этапов (чтение, создание
+переменных, ограничения ресурсов, поиск циклов, анализ окон, целевая
+функция, решение, декодирование, отчеты, выгрузка):
+
+    profile = RunProfile(profiler='cprofile')
+    with profile.phase('read'):
+        classes = reader.read_excel()
+    ...
+    profile.write('run_profile.json')
+
+Этап может выполняться несколько раз (например, отчеты реестра пишутся и в
+solve, и в main_sch) - время и число вызовов суммируются. Вложенные этапы
+учитываются отдельно, время внешнего этапа их включает; "other" в отчете -
+время прогона вне этапов верхнего уровня.
+
+Для этапов можно включить профилировщик (PROFILERS): cProfile - в отчет
+попадают функции с наибольшим накопленным временем, pyinstrument (если
+установлен) - текстовое дерево вызовов. Профилировщик работает только на
+этапах верхнего уровня, чтобы не запускать его дважды.
+
+С memory=True на каждом этапе верхнего уровня снимается tracemalloc:
+текущая и пиковая за этап память Python-объектов, прирост за этап и места
+(файл:строка) с наибольшим изменением выделенной памяти. К снимку
+добавляются размер модели CpModelProto отслеживаемого оптимизатора
+(переменные, ограничения, байты сериализации), число записей в реестре
+ограничений и счетчики кеша анализа пар. tracemalloc замедляет прогон в несколько
+раз, поэтому времена этапов в таком прогоне завышены.
+
+Модули конвейера получают RunProfile через optimizer.profile и оборачивают
+этапы в phase(profile, name): без профиля это пустой контекст.
+"""
+
+import contextlib
+import cProfile
+import importlib.util
+import json
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['PROFILERS', 'PHASES', 'check_profiler', 'RunProfile', 'phase']
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+# Этапы конвейера в порядке выполнения (порядок строк в отчете)
+PHASES = ('read', 'model_cache', 'create_variables', 'resource_constraints', 'objective',
+          'cycle_detection', 'timewindow', 'hints', 'solve', 'decode', 'reports', 'export')
+
+_MB = 1024 * 1024
+
+
+def check_profiler(profiler):
+    """
+    Проверяет имя профилировщика этапов.
+
+    Args:
+        profiler: Имя из PROFILERS или None
+
+    Raises:
+        ValueError: Неизвестное имя или не установлен pyinstrument
+    """
+    if profiler is None:
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profiler}', expected one of {PROFILERS}")
+    if profiler == 'pyinstrument' and importlib.util.find_spec('pyinstrument') is None:
+        raise ValueError("Profiler 'pyinstrument' requires the pyinstrument package")
+
+
+def phase(profile, name):
+    """
+    Контекст этапа name в profile; profile=None - пустой контекст.
+
+    Args:
+        profile: RunProfile или None
+        name: Имя этапа
+    """
+    if profile is None:
+        return contextlib.nullcontext()
+    return profile.phase(name)
+
+
+class RunProfile:
+    """Время этапов прогона, профили этапов и сведения о прогоне для JSON-отчета."""
+
+    def __init__(self, profiler=None, profile_phases=None, top=25, memory=False, memory_frames=1):
+        """
+        Args:
+            profiler: Профилировщик этапов ('cprofile', 'pyinstrument') или None -
+                только время
+            profile_phases: Имена этапов, которые профилируются; None - все
+            top: Сколько функций с наибольшим накопленным временем (cProfile)
+                и мест выделения памяти (memory) записывать для этапа
+            memory: Снимать память этапов через tracemalloc
+            memory_frames: Глубина стека, сохраняемая tracemalloc для выделения
+                (места выделения группируются по верхнему кадру)
+
+        Raises:
+            ValueError: Неизвестный или не установленный профилировщик
+        """
+        check_profiler(profiler)
+        self.profiler = profiler
+        self.profile_phases = set(profile_phases) if profile_phases else None
+        self.top = top
+        self.created = datetime.now().isoformat(timespec='seconds')
+        self.started = time.perf_counter()
+        # Имя этапа -> {'seconds', 'calls'}; в отчете этапы идут в порядке PHASES,
+        # прочие - в порядке первого запуска
+        self.phases = {}
+        # Имя этапа -> cProfile.Profile или pyinstrument.Profiler (накапливаются по вызовам)
+        self._profilers = {}
+        self._active = []
+        self._top_level_seconds = 0.0
+        # Сведения о прогоне (входной файл, число занятий, статус решателя, ...)
+        self.info = {}
+        # Снимки памяти этапов верхнего уровня в порядке выполнения
+        self.memory = memory
+        self.memory_phases = []
+        # Время снимков памяти (входит в other_seconds)
+        self._snapshot_seconds = 0.0
+        self._started_tracemalloc = False
+        # Оптимизатор, размер модели и реестра которого записывается в снимках
+        self.optimizer = None
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(memory_frames)
+            self._started_tracemalloc = True
+
+    def watch(self, optimizer):
+        """Записывать в снимках памяти размер модели и реестра optimizer."""
+        self.optimizer = optimizer
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Замеряет время блока как этап name (профилирует и снимает память, если включено)."""
+        # Снимок памяти снимается до запуска профилировщика, чтобы не попасть в профиль
+        snapshot = None
+        if self.memory and not self._active:
+            snapshot_started = time.perf_counter()
+            snapshot = tracemalloc.take_snapshot()
+            snapshot_current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            self._snapshot_seconds += time.perf_counter() - snapshot_started
+        profiler = None
+        if self.profiler and not self._active and (self.profile_phases is None or name in self.profile_phases):
+            profiler = self._profiler(name)
+            if self.profiler == 'cprofile':
+                profiler.enable()
+            else:
+                profiler.start()
+        self._active.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self._active.pop()
+            if profiler is not None and self.profiler == 'cprofile':
+                profiler.disable()
+            elif profiler is not None:
+                profiler.stop()
+            entry = self.phases.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+            if not self._active:
+                self._top_level_seconds += seconds
+            if snapshot is not None:
+                self._record_memory(name, snapshot, snapshot_current)
+            log.debug("  Phase {} took {:.3f}s", name, seconds, event="phase", phase=name, seconds=seconds)
+
+    def _record_memory(self, name, before, before_current):
+        """
+        Снимок памяти после этапа name.
+        
+        Args:
+            name: Имя этапа
+            before: Снимок tracemalloc до этапа
+            before_current: Память Python-объектов до этапа, байт
+        """
+        started = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        # Снимки не учитываются tracemalloc; временные объекты его модуля пропускаются
+        diff = [stat for stat in after.compare_to(before, 'lineno')
+                if stat.traceback[0].filename != tracemalloc.__file__][:self.top]
+        self.memory_phases.append({
+            'phase': name,
+            'current_mb': round(current / _MB, 3),
+            'peak_mb': round(peak / _MB, 3),
+            'delta_mb': round((current - before_current) / _MB, 3),
+            'top_allocations': [
+                {'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 'size_kb': round(stat.size / 1024, 1), 'size_diff_kb': round(stat.size_diff / 1024, 1),
+                 'count_diff': stat.count_diff}
+                for stat in diff
+            ],
+            'model': self._model_size(),
+            'objects': self._object_counts(),
+        })
+        self._snapshot_seconds += time.perf_counter() - started
+
+    def _model_size(self):
+        """Переменные, ограничения и байты CpModelProto отслеживаемого оптимизатора."""
+        model = getattr(self.optimizer, 'model', None)
+        if model is None:
+            return None
+        proto = model.Proto()
+        return {'variables': len(proto.variables), 'constraints': len(proto.constraints),
+                'bytes': proto.ByteSize()}
+
+    def _object_counts(self):
+        """Записи реестра ограничений и кеша анализа пар отслеживаемого оптимизатора."""
+        if self.optimizer is None:
+            return None
+        registry = self.optimizer.constraint_registry
+        return {
+            'registry_added': registry.total_added,
+            'registry_skipped': registry.total_skipped,
+            'analysis_cache': self.optimizer.analysis_cache.stats(),
+        }
+
+    def close(self):
+        """Останавливает tracemalloc, если его запустил этот профиль."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _profiler(self, name):
+        """Профилировщик этапа name (создается при первом запуске этапа)."""
+        profiler = self._profilers.get(name)
+        if profiler is None:
+            if self.profiler == 'cprofile':
+                profiler = cProfile.Profile()
+            else:
+                from pyinstrument import Profiler
+                profiler = Profiler()
+            self._profilers[name] = profiler
+        return profiler
+
+    def _top_functions(self, profiler):
+        """Функции с наибольшим накопленным временем из cProfile.Profile."""
+        stats = pstats.Stats(profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top]
+        return [
+            {'function': pstats.func_std_string(func), 'calls': calls, 'primitive_calls': primitive,
+             'tottime': round(tottime, 6), 'cumtime': round(cumtime, 6)}
+            for func, (primitive, calls, tottime, cumtime, _callers) in rows
+        ]
+
+    def total_seconds(self):
+        """Время с создания профиля, с."""
+        return time.perf_counter() - self.started
+
+    def to_dict(self):
+        """
+        Отчет о прогоне.
+
+        Returns:
+            dict: created, total_seconds, phases (name, seconds, calls, share -
+            доля от total_seconds), other_seconds, profiler, profiles (по
+            этапам: functions для cProfile, text для pyinstrument), memory (None
+            без memory=True, иначе peak_mb - наибольший пик этапов, snapshot_seconds -
+            время снимков (входит в other_seconds) и phases -
+            снимки этапов: current_mb, peak_mb, delta_mb, top_allocations,
+            model, objects) и run - info
+        """
+        total = self.total_seconds()
+        order = {name: idx for idx, name in enumerate(PHASES)}
+        names = sorted(self.phases, key=lambda name: order.get(name, len(order)))
+        phases = [
+            {'name': name, 'seconds': round(self.phases[name]['seconds'], 6),
+             'calls': self.phases[name]['calls'],
+             'share': round(self.phases[name]['seconds'] / total, 4) if total else 0.0}
+            for name in names
+        ]
+        profiles = {}
+        for name, profiler in self._profilers.items():
+            if self.profiler == 'cprofile':
+                profiles[name] = {'functions': self._top_functions(profiler)}
+            else:
+                profiles[name] = {'text': profiler.output_text(unicode=False, color=False)}
+        return {
+            'created': self.created,
+            'total_seconds': round(total, 6),
+            'phases': phases,
+            'other_seconds': round(max(total - self._top_level_seconds, 0.0), 6),
+            'profiler': self.profiler,
+            'profiles': profiles,
+            'memory': self._memory_report(),
+            'run': self.info,
+        }
+
+    def _memory_report(self):
+        """Раздел memory отчета."""
+        if not self.memory:
+            return None
+        return {
+            'frames': tracemalloc.get_traceback_limit(),
+            'peak_mb': max((entry['peak_mb'] for entry in self.memory_phases), default=0.0),
+            'snapshot_seconds': round(self._snapshot_seconds, 6),
+            'phases': self.memory_phases,
+        }
+
+    def write(self, path):
+        """Записывает отчет (to_dict) в JSON-файл path."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+        log.info("Run profile saved to '{}'", path)
+
+    def log_summary(self):
+        """Выводит время этапов в лог."""
+        report = self.to_dict()
+        log.info("\n=== Run Phases ===")
+        for entry in report['phases']:
+            log.info("  {:<22} {:>9.3f}s {:>6.1%}  ({} calls)", entry['name'], entry['seconds'],
+                     entry['share'], entry['calls'])
+        log.info("  {:<22} {:>9.3f}s", 'other', report['other_seconds'])
+        log.info("  {:<22} {:>9.3f}s", 'total', report['total_seconds'])
+        if not self.memory:
+            return
+        log.info("\n=== Run Memory (tracemalloc, MB; snapshots took {:.3f}s) ===", self._snapshot_seconds)
+        log.info("  {:<22} {:>9} {:>9} {:>9} {:>10} {:>12} {:>9}", 'phase', 'current', 'peak', 'delta',
+                 'variables', 'constraints', 'model')
+        for entry in self.memory_phases:
+            model = entry['model'] or {}
+            model_mb = f"{model['bytes'] / _MB:.3f}" if model else '-'
+            log.info("  {:<22} {:>9.3f} {:>9.3f} {:>9.3f} {:>10} {:>12} {:>9}", entry['phase'],
+                     entry['current_mb'], entry['peak_mb'], entry['delta_mb'],
+                     model.get('variables', '-'), model.get('constraints', '-'), model_mb)
@@ -0,0 +1,183 @@
+"""
+Уровневое логирование для конвейера построения и решения расписания.
+
+Все модули получают логгер через get_logger(__name__) и вызывают
+log.info / log.debug / ... вместо print. Сообщение форматируется
+(str.format с позиционными аргументами) только если его уровень включен
+хотя бы в одном приемнике, поэтому в тихом режиме отключенные вызовы
+сводятся к одному сравнению чисел.
+
+Приемники:
+    - консоль (stdout), текст сообщения выводится как раньше через print;
+    - JSON-lines файл: одна запись на сообщение с полями ts, level, logger,
+      msg и дополнительными именованными полями вызова (event, constraint_id, ...).
+
+Уровни консоли и JSON-файла настраиваются независимо через configure().
+Для дорогих блоков диагностики используйте проверку log.is_enabled(DEBUG).
+"""
+
+import atexit
+import json
+import time
+
+__all__ = [
+    'TRACE', 'DEBUG', 'INFO', 'WARNING', 'ERROR', 'SILENT', 'LEVEL_NAMES',
+    'parse_level', 'configure', 'get_level', 'get_logger', 'is_enabled', 'close', 'ScheduleLogger'
+]
+
+TRACE = 5
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+SILENT = 100
+
+LEVEL_NAMES = {
+    'trace': TRACE,
+    'debug': DEBUG,
+    'info': INFO,
+    'warning': WARNING,
+    'error': ERROR,
+    'silent': SILENT,
+}
+_LEVEL_LABELS = {value: name.upper() for name, value in LEVEL_NAMES.items()}
+
+_console_level = INFO
+_json_level = SILENT
+_json_file = None
+# Минимальный включенный уровень по всем приемникам - единственное, что
+# проверяется на горячем пути
+_threshold = INFO
+
+_loggers = {}
+
+
+def parse_level(level):
+    """
+    Преобразует имя уровня ('debug', 'INFO', ...) или число в числовой уровень.
+
+    Raises:
+        ValueError: Неизвестное имя уровня
+    """
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVEL_NAMES[str(level).lower()]
+    except KeyError:
+        raise ValueError(f"Unknown log level '{level}'. Expected one of: {', '.join(LEVEL_NAMES)}")
+
+
+def configure(level=None, json_path=None, json_level=DEBUG):
+    """
+    Настраивает приемники логирования.
+
+    Args:
+        level: Уровень консоли (имя или число); None - не менять
+        json_path: Путь к JSON-lines файлу; None - не менять текущий файл,
+            пустая строка - закрыть файл
+        json_level: Уровень JSON-приемника (имя или число)
+    """
+    global _console_level, _json_level, _json_file, _threshold
+
+    if level is not None:
+        _console_level = parse_level(level)
+
+    if json_path is not None:
+        close()
+        if json_path:
+            _json_file = open(json_path, 'a', encoding='utf-8')
+            _json_level = parse_level(json_level)
+
+    _threshold = min(_console_level, _json_level if _json_file else SILENT)
+
+
+def get_level():
+    """Возвращает текущий уровень консоли (например, для дочерних процессов)."""
+    return _console_level
+
+
+def close():
+    """Закрывает JSON-приемник, если он открыт."""
+    global _json_file, _json_level, _threshold
+    if _json_file is not None:
+        _json_file.close()
+        _json_file = None
+    _json_level = SILENT
+    _threshold = _console_level
+
+
+atexit.register(close)
+
+
+def is_enabled(level):
+    """Проверяет, будет ли сообщение уровня level куда-либо записано."""
+    return level >= _threshold
+
+
+def _emit(name, level, msg, args, fields):
+    """Форматирует сообщение и передает его включенным приемникам."""
+    text = msg.format(*args) if args else str(msg)
+
+    if level >= _console_level:
+        print(text)
+
+    if _json_file is not None and level >= _json_level:
+        record = {
+            'ts': round(time.time(), 6),
+            'level': _LEVEL_LABELS.get(level, str(level)),
+            'logger': name,
+            'msg': text.strip(),
+        }
+        record.update(fields)
+        _json_file.write(json.dumps(record, ensure_ascii=False, default=str))
+        _json_file.write('\n')
+
+
+class ScheduleLogger:
+    """
+    Логгер модуля.
+
+    Сообщения используют синтаксис str.format: log.debug("Class {}: {:.1f}", idx, value).
+    Именованные аргументы не участвуют в форматировании и попадают
+    только в JSON-запись как структурированные поля.
+    """
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def is_enabled(self, level):
+        return level >= _threshold
+
+    def log(self, level, msg, *args, **fields):
+        if level >= _threshold:
+            _emit(self.name, level, msg, args, fields)
+
+    def trace(self, msg, *args, **fields):
+        if TRACE >= _threshold:
+            _emit(self.name, TRACE, msg, args, fields)
+
+    def debug(self, msg, *args, **fields):
+        if DEBUG >= _threshold:
+            _emit(self.name, DEBUG, msg, args, fields)
+
+    def info(self, msg, *args, **fields):
+        if INFO >= _threshold:
+            _emit(self.name, INFO, msg, args, fields)
+
+    def warning(self, msg, *args, **fields):
+        if WARNING >= _threshold:
+            _emit(self.name, WARNING, msg, args, fields)
+
+    def error(self, msg, *args, **fields):
+        if ERROR >= _threshold:
+            _emit(self.name, ERROR, msg, args, fields)
+
+
+def get_logger(name):
+    """Возвращает (кешированный) логгер для модуля name."""
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = ScheduleLogger(name)
+    return logger
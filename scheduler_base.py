@@ -1,13 +1,30 @@
+import re
+import sys
+import time
 from ortools.sat.python import cp_model
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Set, Any
 
 # Импорт из локальных модулей
 from reader import ScheduleReader, ScheduleClass
 from sequential_scheduling_checker import enforce_window_chain_sequencing
-from constraint_registry import ConstraintRegistry, ConstraintType
+from sequential_scheduling import DEFAULT_ANALYSIS_CACHE_SIZE, PairAnalysisCache
+from linked_chain_utils import ChainIndex
+from constraint_registry import ConstraintRegistry, ConstraintType, class_variables
+from schedule_logging import DEBUG, get_logger
+from solver_config import SolverConfig
+from time_grid import TimeGrid
+from solution_table import SolutionTable
+from run_profile import phase
+
+log = get_logger(__name__)
+
+# Имена переменных, которые извлекаются из str(constraint_expr) в подробном режиме регистрации
+_VARIABLE_NAME_PATTERN = re.compile(
+    r'start_vars\[\d+\]|day_vars\[\d+\]|room_vars\[\d+\]|assigned_vars\[\d+\]'
+    r'|i_before_j_\d+_\d+|same_room_\d+_\d+|time_overlap_\d+_\d+|conflict_\d+_\d+'
+)
 
 class ScheduleOptimizer:
     """
@@ -15,16 +32,85 @@ class ScheduleOptimizer:
     based on the input constraints.
     """
     
-    def __init__(self, classes: List[ScheduleClass], time_interval: int = 15):
+    CONSTRAINT_MODES = ("pairwise", "nooverlap")
+    
+    def __init__(self, classes: List[ScheduleClass], time_interval: int = 15,
+                 constraint_mode: str = "pairwise", fast_registration: bool = False,
+                 decompose_by_day: bool = False, max_workers: Optional[int] = None,
+                 decompose_components: bool = False,
+                 solver_config: Optional[SolverConfig] = None,
+                 solution_hints: Optional[List[Dict[str, str]]] = None, repair_hints: bool = False,
+                 replan_baseline: Optional[List[Dict[str, str]]] = None,
+                 model_cache=None, time_grid: Optional[TimeGrid] = None, profile=None,
+                 analysis_cache_size: int = DEFAULT_ANALYSIS_CACHE_SIZE):
         """
         Initialize the scheduler with the given classes and time interval.
         
         Args:
             classes: List of ScheduleClass objects to schedule
             time_interval: Time interval in minutes for scheduling (default: 15)
+            constraint_mode: How resource conflicts are modelled:
+                "pairwise" - reified constraints per conflicting pair (resource_constraints),
+                "nooverlap" - one interval per class and AddNoOverlap per resource/day
+                (interval_constraints)
+            fast_registration: Быстрая регистрация ограничений: в реестр попадают
+                только тип, источник и индексы классов, а описания и имена переменных
+                выводятся из них при построении отчетов
+            decompose_by_day: Решать каждый день отдельной моделью в параллельных
+                процессах (day_decomposition); если у какого-либо занятия день не
+                фиксирован, решается общая модель
+            max_workers: Число процессов для decompose_by_day и decompose_components
+                (None - по числу частей и CPU, 1 - по очереди в текущем процессе)
+            decompose_components: Решать каждую компоненту связности графа конфликтов
+                (общий преподаватель/группа/аудитория в один день, цепочки) отдельной
+                моделью (component_decomposition)
+            solver_config: Параметры CP-SAT (solver_config.SolverConfig); None - пресет
+                "default" (только ограничение времени)
+            solution_hints: Строки прошлого расписания (solution_hints.read_schedule_hints)
+                для теплого старта через AddHint
+            repair_hints: Исправлять недопустимые подсказки и включить repair_hint решателя
+            replan_baseline: Строки прошлого расписания для инкрементального
+                перепланирования (incremental_replan): решается только окрестность
+                измененных занятий, остальные сохраняют прошлые слот и аудиторию
+            model_cache: model_cache.ModelCache - брать построенную модель из
+                дискового кеша и сохранять ее туда после построения
+            time_grid: Сетка слотов (time_grid.TimeGrid) с границами дня; None -
+                08:00-20:00 с шагом time_interval
+            profile: run_profile.RunProfile - замер времени (и памяти) этапов
+                построения и решения (create_variables, resource_constraints, ...,
+                decode, reports); в снимки памяти попадает размер модели этого оптимизатора
+            analysis_cache_size: Наибольшее число пар занятий в кеше анализа
+                последовательного размещения (sequential_scheduling.PairAnalysisCache)
         """
+        if constraint_mode not in self.CONSTRAINT_MODES:
+            raise ValueError(f"Unknown constraint mode '{constraint_mode}', expected one of {self.CONSTRAINT_MODES}")
+        if time_grid is not None and time_grid.interval != time_interval:
+            raise ValueError(f"Time grid interval {time_grid.interval} differs from time_interval {time_interval}")
+        
         self.classes = classes
         self.time_interval = time_interval
+        self.constraint_mode = constraint_mode
+        self.fast_registration = fast_registration
+        self.decompose_by_day = decompose_by_day
+        self.decompose_components = decompose_components
+        self.max_workers = max_workers
+        self.solver_config = solver_config or SolverConfig()
+        self.solver_info = None
+        self.objective_value = None
+        self.solution_hints = solution_hints
+        self.repair_hints = repair_hints
+        self.hint_stats = None
+        self.replan_baseline = replan_baseline
+        self.model_cache = model_cache
+        self.profile = profile
+        # Результаты can_schedule_sequentially по парам индексов этого оптимизатора
+        self.analysis_cache = PairAnalysisCache(analysis_cache_size)
+        # Цепочки занятий и их окна; перестраивается вместе с linked_chains
+        self.chain_index = ChainIndex()
+        if profile is not None:
+            profile.watch(self)
+        # Отчеты реестра (constraint_registry_*.txt); дневные подзадачи их не пишут
+        self.write_reports = True
         
         # Create a map of classes by subject+teacher+group+day+time for easy lookup
         self.class_map = {}
@@ -36,25 +122,25 @@ class ScheduleOptimizer:
         # Create direct object-to-index mapping for more reliable lookups
         self.object_index_map = {c: idx for idx, c in enumerate(classes)}
         
-        print(f"Created class_map with {len(self.class_map)} entries.")
-        print(f"Created object_index_map with {len(self.object_index_map)} entries.")
-        print(f"Classes list has {len(classes)} elements.")
+        log.debug("Created class_map with {} entries.", len(self.class_map))
+        log.debug("Created object_index_map with {} entries.", len(self.object_index_map))
+        log.debug("Classes list has {} elements.", len(classes))
         
         # Check for any remaining key collisions and warn about them
         if len(self.class_map) < len(classes):
-            print(f"WARNING: Key collision detected! class_map has {len(self.class_map)} entries but classes list has {len(classes)} elements.")
+            log.warning("WARNING: Key collision detected! class_map has {} entries but classes list has {} elements.", len(self.class_map), len(classes))
             collision_keys = {}
             for idx, c in enumerate(classes):
                 key = f"{c.subject}_{c.teacher}_{c.group}_{c.day}_{c.start_time}_{c.end_time}"
                 if key in collision_keys:
-                    print(f"  Collision: Key '{key}' used by classes {collision_keys[key]} and {idx}")
+                    log.warning("  Collision: Key '{}' used by classes {} and {}", key, collision_keys[key], idx)
                 else:
                     collision_keys[key] = idx
         
         # Extract all unique resources
         self.teachers = sorted(set(c.teacher for c in classes if c.teacher))
         self.rooms = sorted(set(room for c in classes for room in c.possible_rooms if room))
-        self.groups = sorted(set(group for c in classes for group in c.get_groups() if group))
+        self.groups = sorted(set(group for c in classes for group in c.groups if group))
         self.days = sorted(set(c.day for c in classes if c.day))
         
         # Map days to indices
@@ -62,8 +148,14 @@ class ScheduleOptimizer:
         self.day_indices = {day: idx for idx, day in enumerate(day_order) if day in self.days}
         
         # Generate time slots
-        self.time_slots = self._generate_time_slots()
-        self.time_slot_indices = {slot: idx for idx, slot in enumerate(self.time_slots)}
+        self.time_grid = time_grid or TimeGrid(time_interval)
+        self.time_slots = self.time_grid.slots
+        self.time_slot_indices = self.time_grid.slot_indices
+        
+        # Слоты начала и конца времени занятий (округление вверх, как у границ
+        # окон); для занятий без времени - слот 0
+        self.class_start_slots = self.time_grid.minutes_to_slots([c.start_minutes for c in classes]).tolist()
+        self.class_end_slots = self.time_grid.minutes_to_slots([c.end_minutes for c in classes]).tolist()
         
         # Initialize the model and variables
         self.model = None
@@ -75,22 +167,12 @@ class ScheduleOptimizer:
         # Initialize constraint registry for tracking all constraints
         self.constraint_registry = ConstraintRegistry()
         
+        # Индекс пар-кандидатов вместо полного перебора пар в resource_constraints
+        self.use_pair_index = True
+        
         # Results
         self.solution = None
     
-    def _generate_time_slots(self) -> List[str]:
-        """Generate time slots for the schedule."""
-        time_slots = []
-        start_time = datetime.strptime("08:00", "%H:%M")
-        end_time = datetime.strptime("20:00", "%H:%M")
-        
-        current = start_time
-        while current <= end_time:
-            time_slots.append(current.strftime("%H:%M"))
-            current += timedelta(minutes=self.time_interval)
-        
-        return time_slots
-    
     def _time_to_minutes(self, time_str: str) -> int:
         """Convert a time string (HH:MM) to minutes since start of day."""
         if not time_str:
@@ -101,15 +183,8 @@ class ScheduleOptimizer:
     
     def _get_time_slot_index(self, time_str: str) -> int:
         """Get the index of the time slot for a given time string."""
-        # Find the closest time slot without going past the requested time
-        time_minutes = self._time_to_minutes(time_str)
-        for i, slot in enumerate(self.time_slots):
-            slot_minutes = self._time_to_minutes(slot)
-            if slot_minutes >= time_minutes:
-                return i
-        
-        # If we're past the last slot, return the last one
-        return len(self.time_slots) - 1
+        # First slot not earlier than the requested time (the last one if we're past it)
+        return self.time_grid.time_to_slot(time_str, 'ceil')
     
     def _calculate_overlapping_intervals(self, start1: int, duration1: int, start2: int, duration2: int) -> int:
         """Calculate the overlap between two intervals."""
@@ -133,21 +208,21 @@ class ScheduleOptimizer:
             if (cls.subject == c.subject and cls.teacher == c.teacher and 
                 cls.group == c.group and cls.day == c.day and 
                 cls.start_time == c.start_time and cls.end_time == c.end_time):
-                print(f"WARNING: Found class by attribute comparison for {key}")
+                log.warning("WARNING: Found class by attribute comparison for {}", key)
                 return idx
         
         # If we can't find the class, print details and raise an error
-        print(f"ERROR: Could not find linked class in the classes list:")
-        print(f"  Subject: {c.subject}")
-        print(f"  Teacher: {c.teacher}")
-        print(f"  Group: {c.group}")
-        print(f"  Day: {c.day}")
-        print(f"  Start Time: {c.start_time}")
-        print(f"  End Time: {c.end_time}")
-        print(f"  Key: {key}")
-        print(f"Available classes:")
+        log.error("ERROR: Could not find linked class in the classes list:")
+        log.error("  Subject: {}", c.subject)
+        log.error("  Teacher: {}", c.teacher)
+        log.error("  Group: {}", c.group)
+        log.error("  Day: {}", c.day)
+        log.error("  Start Time: {}", c.start_time)
+        log.error("  End Time: {}", c.end_time)
+        log.error("  Key: {}", key)
+        log.error("Available classes:")
         for idx, cls in enumerate(self.classes):
-            print(f"  {idx}: {cls.subject} - {cls.teacher} - {cls.group} - {cls.day} - {cls.start_time} - {cls.end_time}")
+            log.error("  {}: {} - {} - {} - {} - {} - {}", idx, cls.subject, cls.teacher, cls.group, cls.day, cls.start_time, cls.end_time)
         
         raise ValueError(f"Could not find linked class {c} in the classes list")
     
@@ -164,24 +239,27 @@ class ScheduleOptimizer:
             origin_module: Модуль, из которого добавлено ограничение
             origin_function: Функция, из которой добавлено ограничение
             class_i, class_j: Индексы классов (если применимо)
-            description: Описание ограничения
-            variables_used: Список использованных переменных
+            description: Описание ограничения (не сохраняется при fast_registration)
+            variables_used: Список использованных переменных (не сохраняется при
+                fast_registration; None - извлечь из ограничения)
             
         Returns:
             ConstraintInfo: Информация о добавленном ограничении
         """
-        import inspect
-        
         # Автоматическое определение origin_module и origin_function если не указаны
         if origin_module == "auto" or origin_function == "auto":
-            frame = inspect.currentframe().f_back
+            frame = sys._getframe(1)
             if origin_module == "auto":
                 origin_module = frame.f_globals.get('__name__', 'unknown')
             if origin_function == "auto":
                 origin_function = frame.f_code.co_name
         
-        # Извлечение имен переменных для отслеживания
-        if variables_used is None:
+        if self.fast_registration:
+            # Только тип, источник и классы; описание и переменные реестр выведет сам
+            description = ""
+            variables_used = None
+        elif variables_used is None:
+            # Извлечение имен переменных для отслеживания
             variables_used = []
             
             # Попытка извлечь переменные из ограничения
@@ -191,64 +269,19 @@ class ScheduleOptimizer:
             # Дополнительная попытка для классов с известными индексами
             if class_i is not None or class_j is not None:
                 # Добавляем стандартные переменные для классов
-                if class_i is not None:
-                    variables_used.extend([
-                        f"start_vars[{class_i}]",
-                        f"day_vars[{class_i}]",
-                        f"room_vars[{class_i}]",
-                        f"assigned_vars[{class_i}]"
-                    ])
-                if class_j is not None:
-                    variables_used.extend([
-                        f"start_vars[{class_j}]",
-                        f"day_vars[{class_j}]",
-                        f"room_vars[{class_j}]",
-                        f"assigned_vars[{class_j}]"
-                    ])
+                variables_used.extend(class_variables(class_i, class_j))
                 
                 # Удаляем дубликаты
-                variables_used = list(set(variables_used))
+                variables_used = list(dict.fromkeys(variables_used))
             
             # Если все еще нет переменных, попытка автоматического определения
             if not variables_used:
-                constraint_str = str(constraint_expr)
                 # Ищем паттерны переменных в строке ограничения
-                import re
-                var_patterns = [
-                    r'start_vars\[\d+\]',
-                    r'day_vars\[\d+\]',
-                    r'room_vars\[\d+\]',
-                    r'assigned_vars\[\d+\]',
-                    r'i_before_j_\d+_\d+',
-                    r'same_room_\d+_\d+',
-                    r'time_overlap_\d+_\d+',
-                    r'conflict_\d+_\d+'
-                ]
-                
-                for pattern in var_patterns:
-                    matches = re.findall(pattern, constraint_str)
-                    variables_used.extend(matches)
-                
-                # Удаляем дубликаты
-                variables_used = list(set(variables_used))
-        
-        # Улучшаем описание на основе типа ограничения и доступных данных
-        if not description:
-            if constraint_type == ConstraintType.CHAIN_ORDERING and class_i is not None and class_j is not None:
-                description = f"Chain ordering: class {class_i} before class {class_j}"
-            elif constraint_type == ConstraintType.SEPARATION and class_i is not None and class_j is not None:
-                description = f"Time separation: classes {class_i} and {class_j}"
-            elif constraint_type == ConstraintType.RESOURCE_CONFLICT and class_i is not None and class_j is not None:
-                description = f"Resource conflict prevention: classes {class_i} and {class_j}"
-            elif constraint_type == ConstraintType.TIME_WINDOW and class_i is not None:
-                description = f"Time window constraint: class {class_i}"
-            elif constraint_type == ConstraintType.FIXED_TIME and class_i is not None:
-                description = f"Fixed time constraint: class {class_i}"
-            else:
-                description = f"{constraint_type.value} constraint"
+                variables_used = list(dict.fromkeys(_VARIABLE_NAME_PATTERN.findall(str(constraint_expr))))
         
         # Добавление в реестр
-        constraint_info = self.constraint_registry.add_constraint(
+        # Пустое описание реестр формирует сам при чтении (default_description)
+        constraint_id = self.constraint_registry.add_constraint(
             constraint_expr=constraint_expr,
             constraint_type=constraint_type,
             origin_module=origin_module,
@@ -267,7 +300,12 @@ class ScheduleOptimizer:
             # Это выражение, нужно добавить в модель
             actual_constraint = self.model.Add(constraint_expr)
         
-        print(f"  ✓ Added constraint {constraint_info.constraint_id}: {description}")
+        if log.is_enabled(DEBUG):
+            registry = self.constraint_registry
+            log.debug("  ✓ Added constraint {}: {}", registry.constraint_id(constraint_id),
+                      registry.description(constraint_id),
+                      event="constraint_added", constraint_id=registry.constraint_id(constraint_id),
+                      constraint_type=constraint_type.value, class_i=class_i, class_j=class_j)
         return actual_constraint  # Возвращаем фактическое ограничение CP-SAT
     
     def skip_constraint(self, constraint_type: ConstraintType, 
@@ -284,11 +322,9 @@ class ScheduleOptimizer:
             class_i, class_j: Индексы классов (если применимо)
             reason: Причина пропуска
         """
-        import inspect
-        
         # Автоматическое определение origin_module и origin_function если не указаны
         if origin_module == "auto" or origin_function == "auto":
-            frame = inspect.currentframe().f_back
+            frame = sys._getframe(1)
             if origin_module == "auto":
                 origin_module = frame.f_globals.get('__name__', 'unknown')
             if origin_function == "auto":
@@ -303,7 +339,9 @@ class ScheduleOptimizer:
             reason=reason
         )
         
-        print(f"  ⚠️  Skipped constraint {constraint_type.value}: {reason}")
+        log.debug("  ⚠️  Skipped constraint {}: {}", constraint_type.value, reason,
+                  event="constraint_skipped", constraint_type=constraint_type.value,
+                  class_i=class_i, class_j=class_j)
     
     def add_constraint_exception(self, class_i: int, class_j: int, reason: str):
         """
@@ -314,7 +352,8 @@ class ScheduleOptimizer:
             reason: Причина исключения
         """
         self.constraint_registry.add_exception(class_i, class_j, reason)
-        print(f"  🚫 Added constraint exception for classes {class_i} ↔ {class_j}: {reason}")
+        log.debug("  🚫 Added constraint exception for classes {} ↔ {}: {}", class_i, class_j, reason,
+                  event="constraint_exception", class_i=class_i, class_j=class_j)
     
     def detect_constraint_conflict(self, constraint_ids: List[str], conflict_type: str,
                                  description: str, classes_involved: List[int]):
@@ -333,7 +372,8 @@ class ScheduleOptimizer:
             description=description,
             classes_involved=classes_involved
         )
-        print(f"  ⚠️  Detected constraint conflict: {description}")
+        log.warning("  ⚠️  Detected constraint conflict: {}", description,
+                    event="constraint_conflict", conflict_type=conflict_type, classes=classes_involved)
 
     def build_model(self):
         """Build the constraint programming model."""
@@ -344,148 +384,230 @@ class ScheduleOptimizer:
         self.model = cp_model.CpModel()
         
         # Create variables for classes
-        create_variables(self)
+        with phase(self.profile, 'create_variables'):
+            create_variables(self)
         
         # ОТКЛЮЧЕНО: Add constraints for linked classes
         # Ограничения для цепочек теперь обрабатываются через chain_constraints.py
         # add_linked_constraints(self)
         
         # Add constraints to prevent resource conflicts
-        add_resource_conflict_constraints(self)
+        with phase(self.profile, 'resource_constraints'):
+            if self.constraint_mode == "nooverlap":
+                from interval_constraints import add_nooverlap_resource_constraints
+                add_nooverlap_resource_constraints(self)
+            else:
+                add_resource_conflict_constraints(self)
    
         # Add objective function
-        add_objective_function(self)
+        with phase(self.profile, 'objective'):
+            add_objective_function(self)
     
-    def solve(self, time_limit_seconds=60):
+    def decode_solution(self, values) -> SolutionTable:
+        """
+        Собирает расписание из значений переменных модели.
+        
+        Используется и в конце solve, и для промежуточных решений
+        (solution_stream), поэтому values - CpSolver после решения или
+        CpSolverSolutionCallback внутри on_solution_callback. Значения всех
+        переменных читаются одним пакетом (solution_table).
+        
+        Args:
+            values: CpSolver или CpSolverSolutionCallback с найденным решением
+            
+        Returns:
+            SolutionTable: Назначения занятий в порядке self.classes; ведет себя
+            как список словарей (subject, group, teacher, room, ...)
+        """
+        return SolutionTable.from_values(self, values)
+    
+    def solve(self, time_limit_seconds=60, stream_path=None, on_solution=None, stop_gap=None):
         """
         Solve the scheduling problem.
         
         Args:
             time_limit_seconds: Maximum solving time in seconds
+            stream_path: JSON-lines файл, куда дописывается каждое улучшающее
+                решение (solution_stream)
+            on_solution: Функция, получающая каждое улучшающее решение (запись
+                solution_stream); вернула True - поиск останавливается
+            stop_gap: Остановить поиск, когда относительный разрыв целевой
+                функции и нижней границы не больше stop_gap (например, 0.05)
             
         Returns:
             True if a solution was found, False otherwise
         """
         # Очищаем кеши перед новой оптимизацией
         from sequential_scheduling import clear_analysis_cache
-        clear_analysis_cache()
-        
+        clear_analysis_cache(self)
+        
+        streaming = stream_path is not None or on_solution is not None or stop_gap is not None
+        if self.model is None and self.replan_baseline is not None:
+            if streaming:
+                log.warning("Solution streaming is not supported for re-planning and is ignored")
+            from incremental_replan import solve_incremental
+            # Окрестность строится и решается своим оптимизатором: все это - этап solve
+            with phase(self.profile, 'solve'):
+                return solve_incremental(self, time_limit_seconds=time_limit_seconds)
+        
+        if streaming and self.model is None and (self.decompose_components or self.decompose_by_day):
+            log.warning("Solution streaming needs a single model; decomposition is disabled for this solve")
+        elif self.model is None and self.decompose_components:
+            from component_decomposition import solve_by_component
+            with phase(self.profile, 'solve'):
+                result = solve_by_component(self, time_limit_seconds=time_limit_seconds,
+                                            max_workers=self.max_workers)
+            if result is not None:
+                return result
+            log.info("  Falling back to a single model")
+        
+        if not streaming and self.model is None and self.decompose_by_day:
+            from day_decomposition import solve_by_day
+            with phase(self.profile, 'solve'):
+                result = solve_by_day(self, time_limit_seconds=time_limit_seconds,
+                                      max_workers=self.max_workers)
+            if result is not None:
+                return result
+            log.info("  Falling back to a single model for all days")
+        
+        # Построенная модель берется из дискового кеша, если он задан
+        cache_key = None
+        from_cache = False
+        build_started = time.time()
         if self.model is None:
-            self.build_model()
+            if self.model_cache is not None:
+                with phase(self.profile, 'model_cache'):
+                    cache_key = self.model_cache.key(self)
+                    from_cache = self.model_cache.load(self, cache_key)
+            if not from_cache:
+                self.build_model()
 
         # Добавить защиту от повторного применения улучшений временных окон
         if not hasattr(self, 'timewindow_already_processed'):
             # НОВОЕ: Обнаружение циклов перед применением ограничений
             try:
                 from conflict_detector import detect_constraint_cycles, prevent_constraint_cycles
-                cycles = detect_constraint_cycles(self)
-                if cycles:
-                    prevent_constraint_cycles(self, cycles)
+                with phase(self.profile, 'cycle_detection'):
+                    cycles = detect_constraint_cycles(self)
+                    if cycles:
+                        prevent_constraint_cycles(self, cycles)
             except ImportError:
-                print("Warning: conflict_detector module not found, skipping cycle detection")
+                log.warning("Warning: conflict_detector module not found, skipping cycle detection")
             
             try:
                 from timewindow_adapter import apply_timewindow_improvements
-                apply_timewindow_improvements(self)
+                with phase(self.profile, 'timewindow'):
+                    apply_timewindow_improvements(self)
                 self.timewindow_already_processed = True
-                print("DEBUG: Applied timewindow improvements")
+                log.debug("DEBUG: Applied timewindow improvements")
             except ImportError:
-                print("Warning: timewindow_adapter module not found, skipping timewindow improvements")
+                log.warning("Warning: timewindow_adapter module not found, skipping timewindow improvements")
         else:
-            print("DEBUG: Timewindow improvements already applied, skipping")
+            log.debug("DEBUG: Timewindow improvements already applied, skipping")
+        
+        if cache_key is not None and not from_cache:
+            with phase(self.profile, 'model_cache'):
+                self.model_cache.store(self, cache_key, build_time=time.time() - build_started)
+        
+        # Подсказки из прошлого расписания (теплый старт)
+        if self.solution_hints and self.hint_stats is None:
+            from solution_hints import apply_solution_hints
+            with phase(self.profile, 'hints'):
+                self.hint_stats = apply_solution_hints(self, self.solution_hints, repair=self.repair_hints)
         
         # Create the solver
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = time_limit_seconds
+        self.solver_config.apply(solver, time_limit_seconds)
+        if self.hint_stats is not None and self.repair_hints:
+            solver.parameters.repair_hint = True
         
         # Добавляем логирование состояния модели
-        print(f"\n📊 MODEL STATISTICS:")
-        print(f"  Variables: {len(self.assigned_vars)} assigned, {len(self.start_vars)} start, {len(self.room_vars)} room, {len(self.day_vars)} day")
-        print(f"  Constraints: {self.constraint_registry.total_added} added, {self.constraint_registry.total_skipped} skipped")
+        log.info("\n📊 MODEL STATISTICS:")
+        log.info("  Variables: {} assigned, {} start, {} room, {} day", len(self.assigned_vars), len(self.start_vars), len(self.room_vars), len(self.day_vars))
+        log.info("  Constraints: {} added, {} skipped", self.constraint_registry.total_added, self.constraint_registry.total_skipped)
         
         # Отчет о типах ограничений
         stats = self.constraint_registry.get_statistics()
-        print(f"  Constraint types: {', '.join([f'{k}: {v}' for k, v in stats['by_type'].items()])}")
+        log.info("  Constraint types: {}", ', '.join([f'{k}: {v}' for k, v in stats['by_type'].items()]))
+        cache_stats = self.analysis_cache.stats()
+        log.debug("  Pair analysis cache: {} pairs, {} hits, {} misses, {} evictions", cache_stats['entries'],
+                  cache_stats['hits'], cache_stats['misses'], cache_stats['evictions'],
+                  event="analysis_cache", **cache_stats)
         
         # Solve the problem
-        print(f"\n🚀 Starting CP-SAT solver (time limit: {time_limit_seconds}s)...")
-        status = solver.Solve(self.model)
+        log.info("\n🚀 Starting CP-SAT solver (time limit: {}s, preset: {})...", time_limit_seconds,
+                 self.solver_config.describe())
+        self.solution_history = []
+        if streaming:
+            from solution_stream import SolutionStream
+            with SolutionStream(self, output_path=stream_path, on_solution=on_solution,
+                                stop_gap=stop_gap) as stream, phase(self.profile, 'solve'):
+                status = solver.Solve(self.model, stream)
+            self.solution_history = stream.history
+        else:
+            with phase(self.profile, 'solve'):
+                status = solver.Solve(self.model)
+        
+        # Запоминаем, какой конфигурацией получен результат
+        has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        self.solver_info = {
+            'preset': self.solver_config.preset,
+            'config': self.solver_config.to_dict(),
+            'num_workers': solver.parameters.num_workers,
+            'status': solver.StatusName(status),
+            'objective': solver.ObjectiveValue() if has_solution else None,
+            'wall_time': solver.WallTime(),
+            'intermediate_solutions': len(self.solution_history),
+            'hints': self.hint_stats,
+        }
+        log.debug("  Solver result: {} with preset '{}' in {:.2f}s", self.solver_info['status'],
+                  self.solver_info['preset'], self.solver_info['wall_time'],
+                  event="solver_result", **self.solver_info)
         
         # Сохраняем статус решателя для анализа
         if status == cp_model.OPTIMAL:
             self.solver_status = 'OPTIMAL'
-            print("✅ Solution found: OPTIMAL")
+            log.info("✅ Solution found: OPTIMAL")
         elif status == cp_model.FEASIBLE:
             self.solver_status = 'FEASIBLE'
-            print("✅ Solution found: FEASIBLE")
+            log.info("✅ Solution found: FEASIBLE")
         elif status == cp_model.INFEASIBLE:
             self.solver_status = 'INFEASIBLE'
-            print("❌ No solution found: INFEASIBLE")
+            log.error("❌ No solution found: INFEASIBLE")
             
             # Генерируем все отчеты для анализа
-            from constraint_registry import generate_all_reports
-            generate_all_reports(self.constraint_registry, optimizer=self, infeasible=True)
+            if self.write_reports:
+                from constraint_registry import generate_all_reports
+                with phase(self.profile, 'reports'):
+                    generate_all_reports(self.constraint_registry, optimizer=self, infeasible=True)
             
             self.solution = None
             return False
         elif status == cp_model.MODEL_INVALID:
             self.solver_status = 'MODEL_INVALID'
-            print("❌ Model is invalid")
+            log.error("❌ Model is invalid")
             self.solution = None
             return False
         else:
             self.solver_status = 'TIMEOUT'
-            print(f"❓ Solver returned status: {status}")
+            log.warning("❓ Solver returned status: {}", status)
             self.solution = None
             return False
         
         # Если дошли до этой точки, значит есть решение (OPTIMAL или FEASIBLE)
         # Store the solution
-        solution = []
-        for idx, c in enumerate(self.classes):
-            # Get assigned values
-            day = self.day_vars[idx]
-            if not isinstance(day, int):
-                day = solver.Value(day)
-                    
-            start_slot = self.start_vars[idx]
-            if not isinstance(start_slot, int):
-                start_slot = solver.Value(start_slot)
-                    
-            room_idx = self.room_vars[idx]
-            if not isinstance(room_idx, int):
-                room_idx = solver.Value(room_idx)
-            
-            day_name = list(self.day_indices.keys())[list(self.day_indices.values()).index(day)]
-            room_name = self.rooms[room_idx]
-            start_time = self.time_slots[start_slot]
-            
-            # Calculate end time
-            time_obj = datetime.strptime(start_time, "%H:%M")
-            time_obj += timedelta(minutes=c.duration)
-            end_time = time_obj.strftime("%H:%M")
-            
-            # Store the assignment
-            solution.append({
-                "subject": c.subject,
-                "group": c.group,
-                "teacher": c.teacher,
-                "room": room_name,
-                "building": c.building,
-                "day": day_name,
-                "start_time": start_time,
-                "end_time": end_time,
-                "duration": c.duration,
-                "pause_before": c.pause_before,
-                "pause_after": c.pause_after
-            })
+        with phase(self.profile, 'decode'):
+            solution = self.decode_solution(solver)
         
         # Сохраняем решение
         self.solution = solution
         self.solver = solver  # Сохраняем solver для возможного использования позже
+        self.objective_value = solver.ObjectiveValue()
         
         # Генерируем полный отчет о ограничениях для анализа
-        from constraint_registry import generate_all_reports
-        generate_all_reports(self.constraint_registry, optimizer=self, infeasible=False)
+        if self.write_reports:
+            from constraint_registry import generate_all_reports
+            with phase(self.profile, 'reports'):
+                generate_all_reports(self.constraint_registry, optimizer=self, infeasible=False)
         
         return True
\ No newline at end of file
@@ -7,7 +7,7 @@
 """
 
 from time_utils import time_to_minutes, minutes_to_time
-from timewindow_utils import find_slot_for_time, build_transitive_links
+from timewindow_utils import build_transitive_links
 from linked_chain_utils import get_linked_chain_order, is_in_linked_chain
 from sequential_scheduling import can_schedule_sequentially
 from constraint_registry import ConstraintType
@@ -18,6 +18,9 @@ from timeline_manager import create_timeline
 from group_analyzer import group_classes_by_criteria, find_independent_groups, analyze_group_constraints
 from window_scheduler import create_placement_plan
 from chain_constraints import apply_placement_constraints
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
 
 __all__ = ['add_time_separation_constraints', 'analyze_related_classes']
 
@@ -32,28 +35,28 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
         optimizer._detailed_analysis_done = set()
     
     pair_key = (min(idx_i, idx_j), max(idx_i, idx_j))
-    verbose = pair_key not in optimizer._detailed_analysis_done
+    verbose = pair_key not in optimizer._detailed_analysis_done and log.is_enabled(DEBUG)
     
     if verbose:
         optimizer._detailed_analysis_done.add(pair_key)
-        print(f"\n=== ADD TIME SEPARATION CONSTRAINTS ===")
-        print(f"Class {idx_i}: {getattr(c_i, 'subject', 'Unknown')} - {getattr(c_i, 'group', 'Unknown')} (Teacher: {getattr(c_i, 'teacher', 'Unknown')})")
-        print(f"Class {idx_j}: {getattr(c_j, 'subject', 'Unknown')} - {getattr(c_j, 'group', 'Unknown')} (Teacher: {getattr(c_j, 'teacher', 'Unknown')})")
+        log.debug("\n=== ADD TIME SEPARATION CONSTRAINTS ===")
+        log.debug("Class {}: {} - {} (Teacher: {})", idx_i, getattr(c_i, 'subject', 'Unknown'), getattr(c_i, 'group', 'Unknown'), getattr(c_i, 'teacher', 'Unknown'))
+        log.debug("Class {}: {} - {} (Teacher: {})", idx_j, getattr(c_j, 'subject', 'Unknown'), getattr(c_j, 'group', 'Unknown'), getattr(c_j, 'teacher', 'Unknown'))
         
         # Анализ конфликтов ресурсов
-        same_teacher = c_i.teacher == c_j.teacher
-        shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
-        shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
+        same_teacher = c_i.teacher_id == c_j.teacher_id
+        shared_groups = set(c_i.group_set & c_j.group_set)
+        shared_rooms = set(c_i.room_set & c_j.room_set)
         
-        print(f"RESOURCE CONFLICT ANALYSIS:")
-        print(f"  Same teacher: {'YES' if same_teacher else 'NO'} ({c_i.teacher} vs {c_j.teacher})")
-        print(f"  Shared groups: {'YES' if shared_groups else 'NO'} ({shared_groups if shared_groups else 'none'})")
-        print(f"  Shared rooms: {'YES' if shared_rooms else 'NO'} ({shared_rooms if shared_rooms else 'none'})")
+        log.debug("RESOURCE CONFLICT ANALYSIS:")
+        log.debug("  Same teacher: {} ({} vs {})", 'YES' if same_teacher else 'NO', c_i.teacher, c_j.teacher)
+        log.debug("  Shared groups: {} ({})", 'YES' if shared_groups else 'NO', shared_groups if shared_groups else 'none')
+        log.debug("  Shared rooms: {} ({})", 'YES' if shared_rooms else 'NO', shared_rooms if shared_rooms else 'none')
     else:
-        print(f"[BRIEF] Classes {idx_i}+{idx_j}: {c_i.subject}+{c_j.subject}")
+        log.debug("[BRIEF] Classes {}+{}: {}+{}", idx_i, idx_j, c_i.subject, c_j.subject)
     
     # NEW: Handle chain_and_resource_gap case first
-    can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=verbose)
+    can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=verbose, cache=optimizer.analysis_cache)
     if can_schedule and info.get("reason") == "chain_and_resource_gap":
         # Extract the intervals from the info
         c1_interval = info.get("c1_interval")
@@ -70,15 +73,15 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
             c1_end_slot = c1_end // optimizer.time_interval
             c2_start_slot = c2_start // optimizer.time_interval
             
-            print(f"CHAIN_AND_RESOURCE_GAP CONSTRAINT:")
-            print(f"  c1_interval: {c1_start}-{c1_end} min ({minutes_to_time(c1_start)}-{minutes_to_time(c1_end)})")
-            print(f"  c2_interval: {c2_start}-{c2_end} min ({minutes_to_time(c2_start)}-{minutes_to_time(c2_end)})")
-            print(f"  Gap: {gap} min")
+            log.debug("CHAIN_AND_RESOURCE_GAP CONSTRAINT:")
+            log.debug("  c1_interval: {}-{} min ({}-{})", c1_start, c1_end, minutes_to_time(c1_start), minutes_to_time(c1_end))
+            log.debug("  c2_interval: {}-{} min ({}-{})", c2_start, c2_end, minutes_to_time(c2_start), minutes_to_time(c2_end))
+            log.debug("  Gap: {} min", gap)
             
             if c1_end <= c2_start:
                 # c_i должен быть перед c_j
-                print(f"  CONSTRAINT TYPE: Sequential (class {idx_i} → class {idx_j})")
-                print(f"  CP-SAT CONSTRAINT: start_var[{idx_i}] + {c_i.duration // optimizer.time_interval} ≤ start_var[{idx_j}]")
+                log.debug("  CONSTRAINT TYPE: Sequential (class {} → class {})", idx_i, idx_j)
+                log.debug("  CP-SAT CONSTRAINT: start_var[{}] + {} ≤ start_var[{}]", idx_i, c_i.duration // optimizer.time_interval, idx_j)
                 
                 # Добавляем ограничение: end(c_i) ≤ start(c_j)
                 constraint_expr = optimizer.model.Add(optimizer.start_vars[idx_i] + (c_i.duration // optimizer.time_interval) <= optimizer.start_vars[idx_j])
@@ -92,11 +95,11 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                     description=f"Sequential: class {idx_i} → class {idx_j}",
                     variables_used=[f"start_var[{idx_i}]", f"start_var[{idx_j}]"]
                 )
-                print(f"  ✓ Added constraint: end({idx_i}) ≤ start({idx_j})")
+                log.debug("  ✓ Added constraint: end({}) ≤ start({})", idx_i, idx_j)
             else:
                 # c_j должен быть перед c_i
-                print(f"  CONSTRAINT TYPE: Sequential (class {idx_j} → class {idx_i})")
-                print(f"  CP-SAT CONSTRAINT: start_var[{idx_j}] + {c_j.duration // optimizer.time_interval} ≤ start_var[{idx_i}]")
+                log.debug("  CONSTRAINT TYPE: Sequential (class {} → class {})", idx_j, idx_i)
+                log.debug("  CP-SAT CONSTRAINT: start_var[{}] + {} ≤ start_var[{}]", idx_j, c_j.duration // optimizer.time_interval, idx_i)
                 
                 # Добавляем ограничение: end(c_j) ≤ start(c_i)
                 constraint_expr = optimizer.model.Add(optimizer.start_vars[idx_j] + (c_j.duration // optimizer.time_interval) <= optimizer.start_vars[idx_i])
@@ -110,17 +113,17 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                     description=f"Sequential: class {idx_j} → class {idx_i}",
                     variables_used=[f"start_var[{idx_j}]", f"start_var[{idx_i}]"]
                 )
-                print(f"  ✓ Added constraint: end({idx_j}) ≤ start({idx_i})")
+                log.debug("  ✓ Added constraint: end({}) ≤ start({})", idx_j, idx_i)
             
             # Сохраняем примененные ограничения
             if not hasattr(optimizer, "applied_constraints"):
                 optimizer.applied_constraints = {}
             pair_key = (idx_i, idx_j)
             optimizer.applied_constraints[pair_key] = constraint_expr
-            print(f"  ✓ Constraint saved for pair ({idx_i}, {idx_j})")
+            log.debug("  ✓ Constraint saved for pair ({}, {})", idx_i, idx_j)
             return  # Important: skip other branches for this pair
         else:
-            print(f"WARNING: chain_and_resource_gap detected but intervals not available, fallback to default logic")
+            log.warning("WARNING: chain_and_resource_gap detected but intervals not available, fallback to default logic")
             # Fallback to simpler constraint
             duration_j_slots = c_j.duration // optimizer.time_interval
             pause_j = getattr(c_j, "pause_after", 0)
@@ -139,8 +142,7 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                 description=f"Fallback chain/resource-gap: end({idx_j})+{pause_j_slots}slots ≤ start({idx_i})",
                 variables_used=[f"start_var[{idx_j}]", f"start_var[{idx_i}]"]
             )
-            print(f"Added fallback chain/resource-gap constraint: "
-                  f"end({idx_j})+{pause_j_slots}slots ≤ start({idx_i})")
+            log.debug("Added fallback chain/resource-gap constraint: end({})+{}slots ≤ start({})", idx_j, pause_j_slots, idx_i)
             return  # Important: skip other branches for this pair
 
     # Проверка на существующие ограничения между этими классами
@@ -149,13 +151,13 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
     
     if hasattr(optimizer, "applied_constraints") and (pair_key in optimizer.applied_constraints or 
                                                      reversed_key in optimizer.applied_constraints):
-        print(f"  Skipping separation constraints for {idx_i} and {idx_j} - already constrained")
+        log.debug("  Skipping separation constraints for {} and {} - already constrained", idx_i, idx_j)
         return
 
     # НОВОЕ: Проверка исключений для предотвращения циклов
     if hasattr(optimizer, "constraint_exceptions") and (pair_key in optimizer.constraint_exceptions or 
                                                        reversed_key in optimizer.constraint_exceptions):
-        print(f"  Skipping separation constraints for {idx_i} and {idx_j} - cycle prevention exception")
+        log.debug("  Skipping separation constraints for {} and {} - cycle prevention exception", idx_i, idx_j)
         return
 
     # ДИАГНОСТИКА: Проверяем текущие временные окна классов
@@ -166,23 +168,23 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
     c_i_chain_classes = []
     c_j_chain_classes = []
     
-    print(f"CHAIN ANALYSIS:")
+    log.debug("CHAIN ANALYSIS:")
     
     # Check if c_i has linked classes (is a root)
     if hasattr(c_i, 'linked_classes') and c_i.linked_classes:
         c_i_chain_classes = get_linked_chain_order(c_i)
         chain_subjects = [getattr(cls, 'subject', 'Unknown') for cls in c_i_chain_classes]
-        print(f"  Class {idx_i} is root of chain: {' → '.join(chain_subjects)}")
+        log.debug("  Class {} is root of chain: {}", idx_i, ' → '.join(chain_subjects))
     else:
-        print(f"  Class {idx_i} is not a chain root")
+        log.debug("  Class {} is not a chain root", idx_i)
     
     # Check if c_j has linked classes (is a root)  
     if hasattr(c_j, 'linked_classes') and c_j.linked_classes:
         c_j_chain_classes = get_linked_chain_order(c_j)
         chain_subjects = [getattr(cls, 'subject', 'Unknown') for cls in c_j_chain_classes]
-        print(f"  Class {idx_j} is root of chain: {' → '.join(chain_subjects)}")
+        log.debug("  Class {} is root of chain: {}", idx_j, ' → '.join(chain_subjects))
     else:
-        print(f"  Class {idx_j} is not a chain root")
+        log.debug("  Class {} is not a chain root", idx_j)
     
     # Determine if they're in the same chain and their order
     in_same_chain = False
@@ -194,29 +196,29 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
         i_pos = c_j_chain_classes.index(c_i)
         j_pos = c_j_chain_classes.index(c_j) if c_j in c_j_chain_classes else 0
         chain_order = -1 if i_pos < j_pos else 1
-        print(f"  Classes are in SAME CHAIN (c_j's chain): {idx_i} at pos {i_pos}, {idx_j} at pos {j_pos}")
-        print(f"    Chain order: {chain_order} ({'i→j' if chain_order > 0 else 'j→i' if chain_order < 0 else 'transitive'})")
+        log.debug("  Classes are in SAME CHAIN (c_j's chain): {} at pos {}, {} at pos {}", idx_i, i_pos, idx_j, j_pos)
+        log.debug("    Chain order: {} ({})", chain_order, 'i→j' if chain_order > 0 else 'j→i' if chain_order < 0 else 'transitive')
     elif c_j in c_i_chain_classes:
         # c_j is part of c_i's chain
         in_same_chain = True
         i_pos = c_i_chain_classes.index(c_i) if c_i in c_i_chain_classes else 0
         j_pos = c_i_chain_classes.index(c_j)
         chain_order = 1 if i_pos < j_pos else -1
-        print(f"  Classes are in SAME CHAIN (c_i's chain): {idx_i} at pos {i_pos}, {idx_j} at pos {j_pos}")
-        print(f"    Chain order: {chain_order} ({'i→j' if chain_order > 0 else 'j→i' if chain_order < 0 else 'transitive'})")
+        log.debug("  Classes are in SAME CHAIN (c_i's chain): {} at pos {}, {} at pos {}", idx_i, i_pos, idx_j, j_pos)
+        log.debug("    Chain order: {} ({})", chain_order, 'i→j' if chain_order > 0 else 'j→i' if chain_order < 0 else 'transitive')
     else:
-        print(f"  Classes are in DIFFERENT CHAINS or independent")
+        log.debug("  Classes are in DIFFERENT CHAINS or independent")
     
     if in_same_chain:
-        print(f"SAME CHAIN CONSTRAINT:")
+        log.debug("SAME CHAIN CONSTRAINT:")
         # Если порядок определен точно (chain_order != 0)
         if chain_order > 0:  # i должен быть перед j
             duration_i_slots = c_i.duration // optimizer.time_interval
             min_pause = max(1, (getattr(c_i, 'pause_after', 0) + getattr(c_j, 'pause_before', 0)) // optimizer.time_interval)
             
-            print(f"  CONSTRAINT TYPE: One-way chain (class {idx_i} → class {idx_j})")
-            print(f"  Duration slots: {duration_i_slots}, pause slots: {min_pause}")
-            print(f"  CP-SAT CONSTRAINT: start_var[{idx_i}] + {duration_i_slots} + {min_pause} ≤ start_var[{idx_j}]")
+            log.debug("  CONSTRAINT TYPE: One-way chain (class {} → class {})", idx_i, idx_j)
+            log.debug("  Duration slots: {}, pause slots: {}", duration_i_slots, min_pause)
+            log.debug("  CP-SAT CONSTRAINT: start_var[{}] + {} + {} ≤ start_var[{}]", idx_i, duration_i_slots, min_pause, idx_j)
             
             constraint_expr = optimizer.model.Add(optimizer.start_vars[idx_i] + duration_i_slots + min_pause <= optimizer.start_vars[idx_j])
             constraint = optimizer.add_constraint(
@@ -246,15 +248,15 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
             if not hasattr(optimizer, "applied_constraints"):
                 optimizer.applied_constraints = {}
             optimizer.applied_constraints[pair_key] = constraint_expr
-            print(f"  ✓ Constraint saved for pair ({idx_i}, {idx_j})")
+            log.debug("  ✓ Constraint saved for pair ({}, {})", idx_i, idx_j)
             return
         elif chain_order < 0:  # j должен быть перед i
             duration_j_slots = c_j.duration // optimizer.time_interval
             min_pause = max(1, (getattr(c_j, 'pause_after', 0) + getattr(c_i, 'pause_before', 0)) // optimizer.time_interval)
             
-            print(f"  CONSTRAINT TYPE: One-way chain (class {idx_j} → class {idx_i})")
-            print(f"  Duration slots: {duration_j_slots}, pause slots: {min_pause}")
-            print(f"  CP-SAT CONSTRAINT: start_var[{idx_j}] + {duration_j_slots} + {min_pause} ≤ start_var[{idx_i}]")
+            log.debug("  CONSTRAINT TYPE: One-way chain (class {} → class {})", idx_j, idx_i)
+            log.debug("  Duration slots: {}, pause slots: {}", duration_j_slots, min_pause)
+            log.debug("  CP-SAT CONSTRAINT: start_var[{}] + {} + {} ≤ start_var[{}]", idx_j, duration_j_slots, min_pause, idx_i)
             
             constraint_expr = optimizer.model.Add(optimizer.start_vars[idx_j] + duration_j_slots + min_pause <= optimizer.start_vars[idx_i])
             constraint = optimizer.add_constraint(
@@ -267,17 +269,17 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                 description=f"One-way chain: class {idx_j} → class {idx_i}",
                 variables_used=[f"start_var[{idx_j}]", f"start_var[{idx_i}]"]
             )
-            print(f"  ✓ Added one-way chain constraint: class {idx_j} before class {idx_i}")
+            log.debug("  ✓ Added one-way chain constraint: class {} before class {}", idx_j, idx_i)
             
             # Сохраняем примененные ограничения
             if not hasattr(optimizer, "applied_constraints"):
                 optimizer.applied_constraints = {}
             optimizer.applied_constraints[reversed_key] = constraint_expr
-            print(f"  ✓ Constraint saved for pair ({idx_j}, {idx_i})")
+            log.debug("  ✓ Constraint saved for pair ({}, {})", idx_j, idx_i)
             return
         else:  # chain_order == 0 - классы связаны транзитивно, но порядок не определен
             # Для транзитивно связанных классов добавляем гибкие ограничения
-            print(f"  CONSTRAINT TYPE: Flexible transitivity (classes {idx_i} and {idx_j} are transitively linked)")
+            log.debug("  CONSTRAINT TYPE: Flexible transitivity (classes {} and {} are transitively linked)", idx_i, idx_j)
             
             # Добавляем одностороннее ограничение для последовательности связанных классов
             # Выбираем порядок на основе индексов (меньший индекс идет первым)
@@ -285,8 +287,8 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                 duration_i_slots = c_i.duration // optimizer.time_interval
                 min_pause = max(1, (getattr(c_i, 'pause_after', 0) + getattr(c_j, 'pause_before', 0)) // optimizer.time_interval)
                 
-                print(f"  Using index-based order: {idx_i} → {idx_j}")
-                print(f"  CP-SAT CONSTRAINT: start_var[{idx_i}] + {duration_i_slots} + {min_pause} ≤ start_var[{idx_j}]")
+                log.debug("  Using index-based order: {} → {}", idx_i, idx_j)
+                log.debug("  CP-SAT CONSTRAINT: start_var[{}] + {} + {} ≤ start_var[{}]", idx_i, duration_i_slots, min_pause, idx_j)
                 
                 constraint_expr = optimizer.model.Add(optimizer.start_vars[idx_i] + duration_i_slots + min_pause <= optimizer.start_vars[idx_j])
                 constraint = optimizer.add_constraint(
@@ -299,13 +301,13 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                     description=f"Flexible transitivity: class {idx_i} → class {idx_j}",
                     variables_used=[f"start_var[{idx_i}]", f"start_var[{idx_j}]"]
                 )
-                print(f"  ✓ Added flexible transitivity constraint: class {idx_i} before class {idx_j}")
+                log.debug("  ✓ Added flexible transitivity constraint: class {} before class {}", idx_i, idx_j)
             else:
                 duration_j_slots = c_j.duration // optimizer.time_interval
                 min_pause = max(1, (getattr(c_j, 'pause_after', 0) + getattr(c_i, 'pause_before', 0)) // optimizer.time_interval)
                 
-                print(f"  Using index-based order: {idx_j} → {idx_i}")
-                print(f"  CP-SAT CONSTRAINT: start_var[{idx_j}] + {duration_j_slots} + {min_pause} ≤ start_var[{idx_i}]")
+                log.debug("  Using index-based order: {} → {}", idx_j, idx_i)
+                log.debug("  CP-SAT CONSTRAINT: start_var[{}] + {} + {} ≤ start_var[{}]", idx_j, duration_j_slots, min_pause, idx_i)
                 
                 constraint_expr = optimizer.model.Add(optimizer.start_vars[idx_j] + duration_j_slots + min_pause <= optimizer.start_vars[idx_i])
                 constraint = optimizer.add_constraint(
@@ -318,22 +320,22 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
                     description=f"Flexible transitivity: class {idx_j} → class {idx_i}",
                     variables_used=[f"start_var[{idx_j}]", f"start_var[{idx_i}]"]
                 )
-                print(f"  ✓ Added flexible transitivity constraint: class {idx_j} before class {idx_i}")
+                log.debug("  ✓ Added flexible transitivity constraint: class {} before class {}", idx_j, idx_i)
             
             # Сохраняем примененные ограничения
             if not hasattr(optimizer, "applied_constraints"):
                 optimizer.applied_constraints = {}
             optimizer.applied_constraints[pair_key] = constraint_expr
-            print(f"  ✓ Constraint saved for pair ({idx_i}, {idx_j})")
+            log.debug("  ✓ Constraint saved for pair ({}, {})", idx_i, idx_j)
             return
     
     # СУЩЕСТВУЮЩИЙ КОД: для несвязанных классов или если порядок не определен
-    print(f"INDEPENDENT CLASSES CONSTRAINT:")
-    print(f"  Classes {idx_i} and {idx_j} not in same chain, adding bidirectional constraints")
+    log.debug("INDEPENDENT CLASSES CONSTRAINT:")
+    log.debug("  Classes {} and {} not in same chain, adding bidirectional constraints", idx_i, idx_j)
     
     # Создаем булеву переменную для определения порядка занятий
     i_before_j = optimizer.model.NewBoolVar(f"strict_i_before_j_{idx_i}_{idx_j}")
-    print(f"  Created boolean variable: {i_before_j.Name()}")
+    log.debug("  Created boolean variable: {}", i_before_j.Name())
     
     # Расчет длительности в слотах времени
     duration_i_slots = c_i.duration // optimizer.time_interval
@@ -343,8 +345,8 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
     min_pause_i_j = max(1, (getattr(c_i, 'pause_after', 0) + getattr(c_j, 'pause_before', 0)) // optimizer.time_interval)
     min_pause_j_i = max(1, (getattr(c_j, 'pause_after', 0) + getattr(c_i, 'pause_before', 0)) // optimizer.time_interval)
     
-    print(f"  Duration slots: i={duration_i_slots}, j={duration_j_slots}")
-    print(f"  Pause slots: i→j={min_pause_i_j}, j→i={min_pause_j_i}")
+    log.debug("  Duration slots: i={}, j={}", duration_i_slots, duration_j_slots)
+    log.debug("  Pause slots: i→j={}, j→i={}", min_pause_i_j, min_pause_j_i)
     
     # Если i перед j
     constraint1_expr = optimizer.model.Add(optimizer.start_vars[idx_i] + duration_i_slots + min_pause_i_j <= optimizer.start_vars[idx_j]).OnlyEnforceIf(i_before_j)
@@ -377,11 +379,11 @@ def add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j):
         optimizer.applied_constraints = {}
     
     optimizer.applied_constraints[pair_key] = [constraint1_expr, constraint2_expr]
-    print(f"  ✓ Constraints saved for pair ({idx_i}, {idx_j})")
+    log.debug("  ✓ Constraints saved for pair ({}, {})", idx_i, idx_j)
     
-    print(f"  CP-SAT CONSTRAINT 1 (if i before j): start_var[{idx_i}] + {duration_i_slots} + {min_pause_i_j} ≤ start_var[{idx_j}]")
-    print(f"  CP-SAT CONSTRAINT 2 (if j before i): start_var[{idx_j}] + {duration_j_slots} + {min_pause_j_i} ≤ start_var[{idx_i}]")
-    print(f"  ✓ Added strict time separation constraints between classes {idx_i} and {idx_j}")
+    log.debug("  CP-SAT CONSTRAINT 1 (if i before j): start_var[{}] + {} + {} ≤ start_var[{}]", idx_i, duration_i_slots, min_pause_i_j, idx_j)
+    log.debug("  CP-SAT CONSTRAINT 2 (if j before i): start_var[{}] + {} + {} ≤ start_var[{}]", idx_j, duration_j_slots, min_pause_j_i, idx_i)
+    log.debug("  ✓ Added strict time separation constraints between classes {} and {}", idx_i, idx_j)
 
 
 def analyze_related_classes(optimizer):
@@ -397,19 +399,19 @@ def analyze_related_classes(optimizer):
     Returns:
         set: Множество обработанных пар занятий
     """
-    print("\n=== ANALYZE RELATED CLASSES (REFACTORED) ===")
-    print("Using specialized modules for timeline, grouping, scheduling and constraints")
+    log.info("\n=== ANALYZE RELATED CLASSES (REFACTORED) ===")
+    log.info("Using specialized modules for timeline, grouping, scheduling and constraints")
     
     processed_pairs = set()
     
     # ШАГ 1: Группировка занятий по критериям (группы студентов, преподаватели, аудитории)
-    print("\nStep 1: Grouping classes by criteria...")
+    log.info("\nStep 1: Grouping classes by criteria...")
     grouped_classes = group_classes_by_criteria(optimizer)
     
     # Статистика группировки
     total_groups = sum(len(days_dict) for criteria_dict in grouped_classes.values() 
                       for days_dict in criteria_dict.values())
-    print(f"Created {total_groups} groups across all criteria")
+    log.info("Created {} groups across all criteria", total_groups)
     
     # ШАГ 2: Обработка каждого критерия группировки
     for criteria_type in ['student_groups', 'teachers']:  # ИСПРАВЛЕНИЕ: Убрали 'rooms'
@@ -417,38 +419,38 @@ def analyze_related_classes(optimizer):
         if not criteria_dict:
             continue
             
-        print(f"\nStep 2.{criteria_type}: Processing {len(criteria_dict)} {criteria_type}")
+        log.info("\nStep 2.{}: Processing {} {}", criteria_type, len(criteria_dict), criteria_type)
         
         for group_key, days_dict in criteria_dict.items():
             for day, class_group in days_dict.items():
-                print(f"  Processing {criteria_type} '{group_key}' on {day}")
+                log.debug("  Processing {} '{}' on {}", criteria_type, group_key, day)
                 
                 # ШАГ 3: Разделение на независимые группы (РЕШЕНИЕ "ПРОБЛЕМЫ АННЫ")
                 independent_groups = find_independent_groups(class_group)
                 
                 if not independent_groups:
-                    print(f"    No independent groups found, using simple separation")
+                    log.debug("    No independent groups found, using simple separation")
                     # ИСПРАВЛЕНИЕ: Добавляем проверку на минимальное количество классов
                     if len(class_group.classes) >= 2:
                         _add_simple_separation_constraints(optimizer, class_group.classes, processed_pairs)
                     else:
-                        print(f"    Only {len(class_group.classes)} class(es), skipping constraints")
+                        log.debug("    Only {} class(es), skipping constraints", len(class_group.classes))
                     continue
                 
                 # ШАГ 4: Обработка каждой независимой группы
                 for i, independent_group in enumerate(independent_groups):
-                    print(f"    Independent group {i+1}/{len(independent_groups)}: {len(independent_group.classes)} classes")
+                    log.debug("    Independent group {}/{}: {} classes", i+1, len(independent_groups), len(independent_group.classes))
                     
                     # ШАГ 5: Создание временной шкалы для группы
                     timeline = create_timeline(optimizer, independent_group.day, independent_group.classes)
-                    print(f"      Created timeline with {len(timeline.anchors)} anchors, {len(timeline.free_slots)} free slots")
+                    log.debug("      Created timeline with {} anchors, {} free slots", len(timeline.anchors), len(timeline.free_slots))
                     
                     # ШАГ 6: Анализ ограничений группы
                     constraints_info = analyze_group_constraints(optimizer, independent_group)
                     
                     # ШАГ 7: Создание плана размещения
                     placement_plan = create_placement_plan(optimizer, independent_group, timeline)
-                    print(f"      Created {placement_plan.plan_type} placement plan (valid: {placement_plan.is_valid})")
+                    log.debug("      Created {} placement plan (valid: {})", placement_plan.plan_type, placement_plan.is_valid)
                     
                     # ШАГ 8: Применение ограничений CP-SAT
                     if placement_plan.is_valid:
@@ -461,15 +463,15 @@ def analyze_related_classes(optimizer):
                                               max(placement['class_idx'], other_placement['class_idx']))
                                     processed_pairs.add(pair_key)
                     else:
-                        print(f"      WARNING: Invalid placement plan, using fallback separation")
+                        log.warning("      WARNING: Invalid placement plan, using fallback separation")
                         # ИСПРАВЛЕНИЕ: Добавляем проверку на минимальное количество классов
                         if len(independent_group.classes) >= 2:
                             _add_simple_separation_constraints(optimizer, independent_group.classes, processed_pairs)
                         else:
-                            print(f"      Only {len(independent_group.classes)} class(es), skipping fallback constraints")
+                            log.debug("      Only {} class(es), skipping fallback constraints", len(independent_group.classes))
     
-    print(f"\n=== ANALYSIS COMPLETE ===")
-    print(f"Total processed pairs: {len(processed_pairs)}")
+    log.info("\n=== ANALYSIS COMPLETE ===")
+    log.info("Total processed pairs: {}", len(processed_pairs))
     
     # Сохраняем информацию в оптимизаторе (совместимость с существующим кодом)
     if not hasattr(optimizer, 'prefer_late_start'):
@@ -489,10 +491,10 @@ def _add_simple_separation_constraints(optimizer, classes_list, processed_pairs)
         processed_pairs: Множество уже обработанных пар для обновления
     """
     if len(classes_list) < 2:
-        print(f"    Skipping separation constraints - less than 2 classes ({len(classes_list)})")
+        log.debug("    Skipping separation constraints - less than 2 classes ({})", len(classes_list))
         return
         
-    print(f"    Adding simple separation constraints for {len(classes_list)} classes")
+    log.debug("    Adding simple separation constraints for {} classes", len(classes_list))
     
     for i in range(len(classes_list)):
         idx_i, c_i = classes_list[i]
@@ -507,7 +509,7 @@ def _add_simple_separation_constraints(optimizer, classes_list, processed_pairs)
                     add_time_separation_constraints(optimizer, idx_i, idx_j, c_i, c_j)
                     processed_pairs.add(pair_key)
                 else:
-                    print(f"      Skipping constraint for classes {idx_i} and {idx_j} - no conflict potential")
+                    log.debug("      Skipping constraint for classes {} and {} - no conflict potential", idx_i, idx_j)
 
 
 def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
@@ -525,7 +527,7 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
     """
     # Классы на разных днях не нуждаются в ограничениях
     if c1.day != c2.day:
-        print(f"      Classes on different days ({c1.day} vs {c2.day}) - no constraint needed")
+        log.debug("      Classes on different days ({} vs {}) - no constraint needed", c1.day, c2.day)
         return False
     
     # Вспомогательная функция для создания переменных времени окончания
@@ -545,8 +547,8 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
                 # Переменная уже зафиксирована
                 end_var = start_var + duration_slots
                 # Для отображения в логах
-                start_minutes = start_var * optimizer.time_interval + 8 * 60  # 8:00 - начало дня
-                end_minutes = end_var * optimizer.time_interval + 8 * 60
+                start_minutes = optimizer.time_grid.slot_to_minutes(start_var)
+                end_minutes = optimizer.time_grid.slot_to_minutes(end_var)
             else:
                 # Переменная еще гибкая - создаем переменную конца
                 max_slot = len(optimizer.time_slots) - 1
@@ -575,10 +577,10 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
                         start_minutes = time_to_minutes(bounds.min_time)  # Начало окна для отображения
                         end_minutes = start_minutes + class_obj.duration
                 except Exception as e:
-                    print(f"Warning: Could not get effective bounds for class {idx}: {e}")
+                    log.warning("Warning: Could not get effective bounds for class {}: {}", idx, e)
                     # Fallback к оригинальной логике
                     if class_obj.start_time:
-                        start_minutes = time_to_minutes(class_obj.start_time)
+                        start_minutes = class_obj.start_minutes
                         end_minutes = start_minutes + class_obj.duration
                     else:
                         start_minutes = None
@@ -600,17 +602,17 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
                     
                 return None, None, start_minutes, end_minutes
             except Exception as e:
-                print(f"Warning: Could not get effective bounds for class {idx}: {e}")
+                log.warning("Warning: Could not get effective bounds for class {}: {}", idx, e)
                 # Последний fallback к оригинальным полям
                 if class_obj.start_time:
-                    start_minutes = time_to_minutes(class_obj.start_time)
+                    start_minutes = class_obj.start_minutes
                     end_minutes = start_minutes + class_obj.duration
                     return None, None, start_minutes, end_minutes
                 else:
                     return None, None, None, None
     
     # Классы с одним преподавателем нуждаются в ограничениях только если пересекаются по времени
-    if c1.teacher == c2.teacher:
+    if c1.teacher_id == c2.teacher_id:
         # Получаем переменные времени для обоих классов
         start_var1, end_var1, start_min1, end_min1 = _get_class_time_variables(optimizer, idx_c1, c1)
         start_var2, end_var2, start_min2, end_min2 = _get_class_time_variables(optimizer, idx_c2, c2)
@@ -618,11 +620,11 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
         # Если у нас есть статические времена, используем их для анализа
         if start_min1 is not None and start_min2 is not None:
             # Get interval information from can_schedule_sequentially
-            can_schedule, info = can_schedule_sequentially(c1, c2, idx_c1, idx_c2, verbose=False)
+            can_schedule, info = can_schedule_sequentially(c1, c2, idx_c1, idx_c2, verbose=False, cache=optimizer.analysis_cache)
             
             # НОВОЕ: Специальная обработка для chain_and_resource_gap
             if can_schedule and info.get("reason") == "chain_and_resource_gap":
-                print(f"      Same teacher with chain_and_resource_gap - constraint needed for proper sequencing")
+                log.debug("      Same teacher with chain_and_resource_gap - constraint needed for proper sequencing")
                 return True
             
             # Use intervals from can_schedule_sequentially if available
@@ -631,18 +633,18 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
             
             # Если времена не пересекаются, ограничения не нужны даже для одного преподавателя
             if end1 <= start2 or end2 <= start1:
-                print(f"      Same teacher but non-overlapping times [{minutes_to_time(start1)}-{minutes_to_time(end1)}] vs [{minutes_to_time(start2)}-{minutes_to_time(end2)}] - no constraint needed")
+                log.debug("      Same teacher but non-overlapping times [{}-{}] vs [{}-{}] - no constraint needed", minutes_to_time(start1), minutes_to_time(end1), minutes_to_time(start2), minutes_to_time(end2))
                 return False
             else:
-                print(f"      Same teacher with overlapping times - constraint needed")
+                log.debug("      Same teacher with overlapping times - constraint needed")
                 return True
         else:
             # Если время не фиксировано или переменные CP-SAT, нужны ограничения для одного преподавателя
-            print(f"      Same teacher with flexible times (CP-SAT variables) - constraint needed")
+            log.debug("      Same teacher with flexible times (CP-SAT variables) - constraint needed")
             return True
     
     # Классы с общими группами студентов нуждаются в ограничениях только если пересекаются по времени
-    shared_groups = set(c1.get_groups()) & set(c2.get_groups())
+    shared_groups = set(c1.group_set & c2.group_set)
     if shared_groups:
         # Получаем переменные времени для обоих классов
         start_var1, end_var1, start_min1, end_min1 = _get_class_time_variables(optimizer, idx_c1, c1)
@@ -650,11 +652,11 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
         
         if start_min1 is not None and start_min2 is not None:
             # Проверяем возможность последовательного размещения
-            can_schedule, info = can_schedule_sequentially(c1, c2, idx_c1, idx_c2, verbose=False)
+            can_schedule, info = can_schedule_sequentially(c1, c2, idx_c1, idx_c2, verbose=False, cache=optimizer.analysis_cache)
             
             # НОВОЕ: Специальная обработка для chain_and_resource_gap
             if can_schedule and info.get("reason") == "chain_and_resource_gap":
-                print(f"      Shared groups {shared_groups} with chain_and_resource_gap - constraint needed for proper sequencing")
+                log.debug("      Shared groups {} with chain_and_resource_gap - constraint needed for proper sequencing", shared_groups)
                 return True
             
             end1 = end_min1 + getattr(c1, 'pause_after', 0)
@@ -662,17 +664,17 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
             
             # Если времена не пересекаются, ограничения не нужны даже для общих групп
             if end1 <= start_min2 or end2 <= start_min1:
-                print(f"      Shared groups {shared_groups} but non-overlapping times - no constraint needed")
+                log.debug("      Shared groups {} but non-overlapping times - no constraint needed", shared_groups)
                 return False
             else:
-                print(f"      Shared groups {shared_groups} with overlapping times - constraint needed")
+                log.debug("      Shared groups {} with overlapping times - constraint needed", shared_groups)
                 return True
         else:
-            print(f"      Shared groups {shared_groups} with flexible times (CP-SAT variables) - constraint needed")
+            log.debug("      Shared groups {} with flexible times (CP-SAT variables) - constraint needed", shared_groups)
             return True
     
     # Классы с пересекающимися возможными аудиториями могут нуждаться в ограничениях
-    shared_rooms = set(c1.possible_rooms) & set(c2.possible_rooms)
+    shared_rooms = set(c1.room_set & c2.room_set)
     if shared_rooms:
         # Получаем переменные времени для обоих классов
         start_var1, end_var1, start_min1, end_min1 = _get_class_time_variables(optimizer, idx_c1, c1)
@@ -681,28 +683,28 @@ def _classes_need_separation_constraint(optimizer, idx_c1, c1, idx_c2, c2):
         # Проверяем пересечение времени выполнения
         if start_min1 is not None and start_min2 is not None:
             # Проверяем возможность последовательного размещения
-            can_schedule, info = can_schedule_sequentially(c1, c2, idx_c1, idx_c2, verbose=False)
+            can_schedule, info = can_schedule_sequentially(c1, c2, idx_c1, idx_c2, verbose=False, cache=optimizer.analysis_cache)
             
             # НОВОЕ: Специальная обработка для chain_and_resource_gap
             if can_schedule and info.get("reason") == "chain_and_resource_gap":
-                print(f"      Shared rooms {shared_rooms} with chain_and_resource_gap - constraint needed for proper sequencing")
+                log.debug("      Shared rooms {} with chain_and_resource_gap - constraint needed for proper sequencing", shared_rooms)
                 return True
             
             # Для аудиторий не учитываем паузы, только время самих занятий
             
             # Если времена не пересекаются, ограничения не нужны
             if end_min1 <= start_min2 or end_min2 <= start_min1:
-                print(f"      Shared rooms {shared_rooms} but non-overlapping times - no constraint needed")
+                log.debug("      Shared rooms {} but non-overlapping times - no constraint needed", shared_rooms)
                 return False
             else:
-                print(f"      Shared rooms {shared_rooms} with overlapping times - constraint needed")
+                log.debug("      Shared rooms {} with overlapping times - constraint needed", shared_rooms)
                 return True
         else:
-            print(f"      Shared rooms {shared_rooms} with flexible times (CP-SAT variables) - constraint needed")
+            log.debug("      Shared rooms {} with flexible times (CP-SAT variables) - constraint needed", shared_rooms)
             return True
     
     # По умолчанию не добавляем ограничения
-    print(f"      No resource conflicts detected - no constraint needed")
+    log.debug("      No resource conflicts detected - no constraint needed")
     return False
 
 
@@ -716,28 +718,31 @@ def _log_class_time_window_info(optimizer, idx, c, label):
         c: Объект класса
         label: Метка для логирования
     """
-    print(f"    {label} {idx}: {c.subject} - {c.group}")
+    if not log.is_enabled(DEBUG):
+        return
+    
+    log.debug("    {} {}: {} - {}", label, idx, c.subject, c.group)
     
     # Информация об effective bounds
     try:
         bounds = get_effective_bounds(optimizer, idx, c)
-        print(f"      Effective bounds: {bounds.min_time} - {bounds.max_time} (source: {bounds.source})")
-        print(f"      Type: {classify_bounds(bounds)}")
+        log.debug("      Effective bounds: {} - {} (source: {})", bounds.min_time, bounds.max_time, bounds.source)
+        log.debug("      Type: {}", classify_bounds(bounds))
         
         if bounds.applied_constraints:
-            print(f"      Applied constraints:")
+            log.debug("      Applied constraints:")
             for constraint in bounds.applied_constraints:
-                print(f"        - {constraint['type']}: {constraint['description']}")
+                log.debug("        - {}: {}", constraint['type'], constraint['description'])
     except Exception as e:
-        print(f"      Warning: Could not get effective bounds: {e}")
+        log.warning("      Warning: Could not get effective bounds: {}", e)
         
         # Fallback к оригинальным полям
         if c.start_time and c.end_time:
-            print(f"      Original time window: {c.start_time} - {c.end_time}")
+            log.debug("      Original time window: {} - {}", c.start_time, c.end_time)
         elif c.start_time:
-            print(f"      Fixed start time: {c.start_time}")
+            log.debug("      Fixed start time: {}", c.start_time)
         else:
-            print(f"      No fixed time")
+            log.debug("      No fixed time")
     
     # Информация о текущих ограничениях переменной
     if hasattr(optimizer, 'start_vars') and idx < len(optimizer.start_vars):
@@ -745,24 +750,24 @@ def _log_class_time_window_info(optimizer, idx, c, label):
         if isinstance(start_var, int):
             # Переменная уже зафиксирована
             time_slot = optimizer.time_slots[start_var] if start_var < len(optimizer.time_slots) else "INVALID"
-            print(f"      Variable FIXED to slot {start_var} (time: {time_slot})")
+            log.debug("      Variable FIXED to slot {} (time: {})", start_var, time_slot)
         else:
             # Переменная все еще является переменной CP-SAT
-            print(f"      Variable is flexible (CP-SAT variable)")
+            log.debug("      Variable is flexible (CP-SAT variable)")
             
             # Проверяем, есть ли уже применённые ограничения на эту переменную
             if hasattr(optimizer, 'model') and optimizer.model:
                 # Пытаемся получить информацию о доменах (это может не работать во всех версиях)
                 try:
-                    print(f"      Variable domain info not available during constraint building")
+                    log.debug("      Variable domain info not available during constraint building")
                 except:
                     pass
     else:
-        print(f"      Variable not yet created")
+        log.debug("      Variable not yet created")
     
     # Информация о цепочках
     chain_info = getattr(c, 'linked_to', None)
     if chain_info:
-        print(f"      Part of chain: linked to {chain_info}")
+        log.debug("      Part of chain: linked to {}", chain_info)
     else:
-        print(f"      Not part of any chain")
+        log.debug("      Not part of any chain")
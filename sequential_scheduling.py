@@ -4,25 +4,126 @@
 в одной аудитории или с одним преподавателем.
 """
 
+from collections import OrderedDict
+
 from time_utils import time_to_minutes, minutes_to_time
 from linked_chain_utils import (
-    find_chain_containing_classes, get_chain_window, 
-    are_classes_in_same_chain, get_original_time_bounds, clear_chain_windows_cache
+    are_classes_in_same_chain, get_original_time_bounds
 )
-from chain_helpers import collect_full_chain_from_any_member, invalidate_chain_window
+from chain_helpers import collect_full_chain_from_any_member
 from chain_scheduler import schedule_chain, chain_busy_intervals
 from effective_bounds_utils import get_effective_bounds, classify_bounds
+from schedule_logging import DEBUG, get_logger
+
+log = get_logger(__name__)
 
-# Глобальный кеш для результатов анализа пар
-_analysis_cache = {}
+# Ограничение кеша анализа пар по умолчанию (число пар занятий)
+DEFAULT_ANALYSIS_CACHE_SIZE = 200000
 
-def clear_analysis_cache():
-    """Очистить кеш анализа для новой оптимизации."""
-    global _analysis_cache
-    _analysis_cache = {}
-    # TODO: В будущем можно оптимизировать для селективной очистки кеша
-    clear_chain_windows_cache()  # Fallback: полная очистка кеша окон
-    print("Analysis cache and chain windows cache cleared for new optimization")
+# Результаты, не зависящие от порядка занятий в паре: проверяются до любой
+# логики, где важно, какое занятие первое (паузы c1.pause_after и
+# c2.pause_before, причины вида fixed_order_c1_then_c2, интервалы c1/c2)
+_ORDER_FREE_REASONS = frozenset({'different_days'})
+
+
+class PairAnalysisCache:
+    """
+    Кеш результатов can_schedule_sequentially одного оптимизатора.
+    
+    Ключ - неупорядоченная пара индексов занятий (min, max); в записи пары
+    хранятся результаты для обоих порядков, так как в общем случае анализ
+    несимметричен. Результаты из _ORDER_FREE_REASONS записываются сразу для
+    обоих порядков. Число пар ограничено maxsize: при переполнении удаляется
+    давно не использованная пара (LRU).
+    
+    Кеш принадлежит ScheduleOptimizer (optimizer.analysis_cache), поэтому
+    индексы разных оптимизаторов (дневные подзадачи, пакетные и
+    параллельные прогоны в одном процессе) не смешиваются.
+    """
+    
+    def __init__(self, maxsize=DEFAULT_ANALYSIS_CACHE_SIZE):
+        """
+        Args:
+            maxsize: Наибольшее число пар в кеше
+            
+        Raises:
+            ValueError: maxsize меньше 1
+        """
+        if maxsize < 1:
+            raise ValueError(f"Analysis cache size must be positive, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, idx1, idx2):
+        """
+        Результат анализа пары (idx1, idx2) в этом порядке.
+        
+        Returns:
+            tuple: (bool, dict) или None, если результата нет
+        """
+        key = (idx1, idx2) if idx1 <= idx2 else (idx2, idx1)
+        entry = self._entries.get(key)
+        result = None if entry is None else entry[idx1 > idx2]
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+    
+    def put(self, idx1, idx2, result):
+        """Запоминает результат анализа пары (idx1, idx2) в этом порядке."""
+        key = (idx1, idx2) if idx1 <= idx2 else (idx2, idx1)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [None, None]
+            self._entries[key] = entry
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._entries.move_to_end(key)
+        if result[1].get('reason') in _ORDER_FREE_REASONS:
+            entry[0] = entry[1] = result
+        else:
+            entry[idx1 > idx2] = result
+    
+    def clear(self):
+        """Очищает кеш и счетчики."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+    
+    def stats(self):
+        """Счетчики кеша: entries, maxsize, hits, misses, evictions, hit_rate."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def clear_analysis_cache(optimizer=None):
+    """
+    Очистить кеши анализа для новой оптимизации.
+    
+    Args:
+        optimizer: ScheduleOptimizer, кеш анализа пар и окна цепочек которого
+            очищаются (None - кешей вне оптимизатора нет, ничего не делает)
+    """
+    if optimizer is not None:
+        optimizer.analysis_cache.clear()
+        optimizer.chain_index.clear_windows()
+    log.debug("Analysis cache and chain windows cache cleared for new optimization")
 
 def is_class_in_linked_chain(schedule_class):
     """
@@ -47,7 +148,7 @@ def is_class_in_linked_chain(schedule_class):
     
     return False
 
-def analyze_same_chain_classes(optimizer, c1, c2, idx1, idx2, chain_indices, verbose=True):
+def analyze_same_chain_classes(optimizer, c1, c2, idx1, idx2, chain_id, verbose=True):
     """
     Анализирует возможность последовательного размещения двух занятий внутри одной цепочки.
     Использует общее окно цепочки вместо индивидуальных effective_bounds.
@@ -56,12 +157,14 @@ def analyze_same_chain_classes(optimizer, c1, c2, idx1, idx2, chain_indices, ver
         optimizer: Экземпляр ScheduleOptimizer
         c1, c2: Объекты занятий
         idx1, idx2: Индексы занятий
-        chain_indices: Список индексов цепочки
+        chain_id: Номер цепочки в optimizer.chain_index
         verbose: Включить детальное логгирование
         
     Returns:
         tuple: (bool, dict) - возможно ли размещение и дополнительная информация
     """
+    # Детальный анализ форматируется только при включенном уровне DEBUG
+    verbose = verbose and log.is_enabled(DEBUG)
     class1_label = f"Class {idx1}"
     class2_label = f"Class {idx2}"
     
@@ -76,27 +179,21 @@ def analyze_same_chain_classes(optimizer, c1, c2, idx1, idx2, chain_indices, ver
         'available_time': None
     }
     
-    # Инвалидируем кеш окна цепочки перед получением окна
-    # Это гарантирует, что мы получим актуальное окно после возможных изменений
-    for idx in chain_indices:
-        schedule_class = optimizer.classes[idx]
-        invalidate_chain_window(schedule_class)
-        break  # Достаточно инвалидировать один раз для всей цепочки
-    
-    # Получаем окно цепочки
-    chain_window = get_chain_window(optimizer, chain_indices)
+    # Получаем окно цепочки: оно зависит только от исходных границ занятий,
+    # которые после загрузки неизменны, поэтому берется из кеша chain_index
+    chain_window = optimizer.chain_index.window(optimizer, chain_id)
     
     if chain_window is None:
         info['reason'] = 'no_chain_window_intersection'
         if verbose:
-            print(f"  SAME CHAIN ANALYSIS: Cannot determine chain window for classes {idx1}, {idx2}")
-            print(f"  Original bounds do not intersect across chain members")
+            log.debug("  SAME CHAIN ANALYSIS: Cannot determine chain window for classes {}, {}", idx1, idx2)
+            log.debug("  Original bounds do not intersect across chain members")
         return False, info
     
     if verbose:
-        print(f"  SAME CHAIN ANALYSIS:")
-        print(f"    Chain indices: {chain_indices}")
-        print(f"    Chain window: {chain_window['min_time']}-{chain_window['max_time']}")
+        log.debug("  SAME CHAIN ANALYSIS:")
+        log.debug("    Chain indices: {}", optimizer.chain_index.members(chain_id))
+        log.debug("    Chain window: {}-{}", chain_window['min_time'], chain_window['max_time'])
     
     # Для занятий внутри одной цепочки используем окно цепочки
     window_start = chain_window['min_minutes']
@@ -120,11 +217,11 @@ def analyze_same_chain_classes(optimizer, c1, c2, idx1, idx2, chain_indices, ver
     info['available_time'] = available_time
     
     if verbose:
-        print(f"    Available time in chain window: {available_time} min")
-        print(f"    Required time for both classes: {required_time} min")
-        print(f"      {class1_label}: {c1.duration} min + pause_after: {getattr(c1, 'pause_after', 0)} min")
-        print(f"      Gap: {min_gap} min")
-        print(f"      {class2_label}: {c2.duration} min")
+        log.debug("    Available time in chain window: {} min", available_time)
+        log.debug("    Required time for both classes: {} min", required_time)
+        log.debug("      {}: {} min + pause_after: {} min", class1_label, c1.duration, getattr(c1, 'pause_after', 0))
+        log.debug("      Gap: {} min", min_gap)
+        log.debug("      {}: {} min", class2_label, c2.duration)
     
     if available_time >= required_time:
         # Для занятий внутри одной цепочки используем специальный код chain_and_resource_gap
@@ -137,12 +234,12 @@ def analyze_same_chain_classes(optimizer, c1, c2, idx1, idx2, chain_indices, ver
         info['gap'] = min_gap
         
         if verbose:
-            print(f"    RESULT: Can schedule sequentially within chain - {info['reason']}")
+            log.debug("    RESULT: Can schedule sequentially within chain - {}", info['reason'])
         return True, info
     else:
         info['reason'] = 'insufficient_time_in_chain_window'
         if verbose:
-            print(f"    RESULT: Cannot schedule sequentially within chain - {info['reason']}")
+            log.debug("    RESULT: Cannot schedule sequentially within chain - {}", info['reason'])
         return False, info
 
 def collect_full_chain_from_any_member(schedule_class):
@@ -159,7 +256,7 @@ def collect_full_chain_from_any_member(schedule_class):
     from chain_helpers import collect_full_chain_from_any_member as collect_full_chain_improved
     return collect_full_chain_improved(schedule_class)
 
-def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimizer=None):
+def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimizer=None, cache=None):
     """
     Проверяет, могут ли два занятия быть запланированы последовательно с учетом их временных ограничений.
     
@@ -170,39 +267,43 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
         idx2: Индекс второго занятия (для правильного логгирования)
         verbose: Включить детальное логгирование (по умолчанию True)
         optimizer: Экземпляр ScheduleOptimizer (для получения эффективных границ)
+        cache: PairAnalysisCache для результатов; None - optimizer.analysis_cache.
+            Без индексов занятий или кеша результат не кешируется
         
     Returns:
         tuple: (bool, dict) - возможно ли последовательное размещение и дополнительная информация
     """
-    global _analysis_cache
+    # Детальный анализ форматируется только при включенном уровне DEBUG
+    verbose = verbose and log.is_enabled(DEBUG)
     
     # Определяем метки классов сразу для использования везде
     class1_label = f"Class {idx1}" if idx1 is not None else "Class 1"
     class2_label = f"Class {idx2}" if idx2 is not None else "Class 2"
     
-    # Создаем ключ для кеширования на основе индексов (более надежно чем id объектов)
-    if idx1 is not None and idx2 is not None:
-        cache_key = (idx1, idx2)  # Сохраняем порядок, так как функция не симметрична
-    else:
-        cache_key = (id(c1), id(c2))  # Fallback для старых вызовов
+    # Кеш оптимизатора по индексам занятий (без индексов результат не кешируется)
+    if cache is None and optimizer is not None:
+        cache = getattr(optimizer, 'analysis_cache', None)
+    if idx1 is None or idx2 is None:
+        cache = None
     
     # Вспомогательная функция для кеширования результата
     def cache_and_return(can_schedule, info):
         result = (can_schedule, info)
-        _analysis_cache[cache_key] = result
+        if cache is not None:
+            cache.put(idx1, idx2, result)
         return result
     
     # Проверяем кеш
-    if cache_key in _analysis_cache:
-        result = _analysis_cache[cache_key]
+    result = cache.get(idx1, idx2) if cache is not None else None
+    if result is not None:
         if verbose:
-            print(f"[CACHED] {class1_label}: {c1.subject}({c1.group}) + {class2_label}: {c2.subject}({c2.group}) -> {result[1].get('reason', 'unknown')}")
+            log.debug("[CACHED] {}: {}({}) + {}: {}({}) -> {}", class1_label, c1.subject, c1.group, class2_label, c2.subject, c2.group, result[1].get('reason', 'unknown'))
         return result
     
     if verbose:
-        print(f"\n=== ANALYZING SEQUENTIAL SCHEDULING ===")
-        print(f"{class1_label}: {c1.subject} ({c1.group}) - Teacher: {c1.teacher}")
-        print(f"{class2_label}: {c2.subject} ({c2.group}) - Teacher: {c2.teacher}")
+        log.debug("\n=== ANALYZING SEQUENTIAL SCHEDULING ===")
+        log.debug("{}: {} ({}) - Teacher: {}", class1_label, c1.subject, c1.group, c1.teacher)
+        log.debug("{}: {} ({}) - Teacher: {}", class2_label, c2.subject, c2.group, c2.teacher)
     
     info = {
         'reason': '',
@@ -219,19 +320,20 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
     if c1.day != c2.day:
         info['reason'] = 'different_days'
         if verbose:
-            print(f"RESULT: Cannot schedule sequentially - {info['reason']}")
-            print(f"  {class1_label} day: {c1.day}, {class2_label} day: {c2.day}")
+            log.debug("RESULT: Cannot schedule sequentially - {}", info['reason'])
+            log.debug("  {} day: {}, {} day: {}", class1_label, c1.day, class2_label, c2.day)
         return cache_and_return(False, info)
     
     # НОВОЕ: Проверяем, принадлежат ли оба занятия одной цепочке
     if optimizer and idx1 is not None and idx2 is not None:
-        chain_indices = find_chain_containing_classes(optimizer, idx1, idx2)
-        if chain_indices is not None:
+        chain_id = optimizer.chain_index.find(idx1, idx2)
+        if chain_id is not None:
             if verbose:
-                print(f"Classes {idx1} and {idx2} are in the same chain: {chain_indices}")
+                log.debug("Classes {} and {} are in the same chain: {}",
+                          idx1, idx2, optimizer.chain_index.members(chain_id))
             # Используем специальную логику для занятий внутри одной цепочки
             return cache_and_return(*analyze_same_chain_classes(
-                optimizer, c1, c2, idx1, idx2, chain_indices, verbose
+                optimizer, c1, c2, idx1, idx2, chain_id, verbose
             ))
     
     # НОВОЕ: Используем эффективные границы, если доступен оптимизатор
@@ -241,9 +343,9 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
             bounds2 = get_effective_bounds(optimizer, idx2, c2)
             
             if verbose:
-                print(f"EFFECTIVE BOUNDS ANALYSIS:")
-                print(f"  {class1_label}: {bounds1}")
-                print(f"  {class2_label}: {bounds2}")
+                log.debug("EFFECTIVE BOUNDS ANALYSIS:")
+                log.debug("  {}: {}", class1_label, bounds1)
+                log.debug("  {}: {}", class2_label, bounds2)
             
             # Используем эффективные границы для более точного анализа
             window1_start = time_to_minutes(bounds1.min_time)
@@ -260,15 +362,15 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
             if window1_end <= window2_start:
                 info['reason'] = 'non_overlapping_effective_bounds_c1_before_c2'
                 if verbose:
-                    print(f"RESULT: Can schedule sequentially - {info['reason']}")
-                    print(f"  {class1_label} ends before {class2_label} starts (effective bounds)")
+                    log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
+                    log.debug("  {} ends before {} starts (effective bounds)", class1_label, class2_label)
                 return cache_and_return(True, info)
                     
             elif window2_end <= window1_start:
                 info['reason'] = 'non_overlapping_effective_bounds_c2_before_c1'
                 if verbose:
-                    print(f"RESULT: Can schedule sequentially - {info['reason']}")
-                    print(f"  {class2_label} ends before {class1_label} starts (effective bounds)")
+                    log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
+                    log.debug("  {} ends before {} starts (effective bounds)", class2_label, class1_label)
                 return cache_and_return(True, info)
             
             # Анализируем возможность размещения в пересекающихся эффективных границах
@@ -282,10 +384,10 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
             required_time = total_duration + min_gap
             
             if verbose:
-                print(f"  OVERLAP ANALYSIS:")
-                print(f"    Overlap: {minutes_to_time(overlap_start)}-{minutes_to_time(overlap_end)} ({overlap_duration} min)")
-                print(f"    Required time: {required_time} min (c1: {c1.duration}, gap: {min_gap}, c2: {c2.duration})")
-                print(f"    Available time: {overlap_duration} min")
+                log.debug("  OVERLAP ANALYSIS:")
+                log.debug("    Overlap: {}-{} ({} min)", minutes_to_time(overlap_start), minutes_to_time(overlap_end), overlap_duration)
+                log.debug("    Required time: {} min (c1: {}, gap: {}, c2: {})", required_time, c1.duration, min_gap, c2.duration)
+                log.debug("    Available time: {} min", overlap_duration)
             
             info['common_window'] = f"{minutes_to_time(overlap_start)}-{minutes_to_time(overlap_end)}"
             info['required_time'] = required_time
@@ -294,16 +396,16 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
             if overlap_duration >= required_time:
                 info['reason'] = 'sufficient_time_in_effective_overlap'
                 if verbose:
-                    print(f"RESULT: Can schedule sequentially - {info['reason']}")
+                    log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
                 return cache_and_return(True, info)
             else:
                 info['reason'] = 'insufficient_time_in_effective_overlap'
                 if verbose:
-                    print(f"RESULT: Cannot schedule sequentially - {info['reason']}")
+                    log.debug("RESULT: Cannot schedule sequentially - {}", info['reason'])
                 return cache_and_return(False, info)
         except Exception as e:
             if verbose:
-                print(f"  Warning: Could not use effective bounds ({e}), falling back to original logic")
+                log.warning("  Warning: Could not use effective bounds ({}), falling back to original logic", e)
     
     # Fallback к исходной логике для обратной совместимости
     # Проверка наличия эффективных границ через effective_bounds
@@ -319,28 +421,28 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
             if not has_time_constraints:
                 info['reason'] = 'no_time_constraints_in_bounds'
                 if verbose:
-                    print(f"RESULT: Can schedule sequentially - {info['reason']}")
-                    print(f"  {class1_label} bounds: {bounds1}")
-                    print(f"  {class2_label} bounds: {bounds2}")
+                    log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
+                    log.debug("  {} bounds: {}", class1_label, bounds1)
+                    log.debug("  {} bounds: {}", class2_label, bounds2)
                 return cache_and_return(True, info)
         except Exception as e:
             if verbose:
-                print(f"  Warning: Could not get effective bounds ({e}), checking original start_time")
+                log.warning("  Warning: Could not get effective bounds ({}), checking original start_time", e)
             
             # Fallback к проверке оригинальных полей
             if not c1.start_time or not c2.start_time:
                 info['reason'] = 'missing_time_info'
                 if verbose:
-                    print(f"RESULT: Can schedule sequentially - {info['reason']}")
-                    print(f"  {class1_label} start_time: {c1.start_time}, {class2_label} start_time: {c2.start_time}")
+                    log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
+                    log.debug("  {} start_time: {}, {} start_time: {}", class1_label, c1.start_time, class2_label, c2.start_time)
                 return cache_and_return(True, info)
     else:
         # Старая логика когда нет optimizer или индексов
         if not c1.start_time or not c2.start_time:
             info['reason'] = 'missing_time_info'
             if verbose:
-                print(f"RESULT: Can schedule sequentially - {info['reason']}")
-                print(f"  {class1_label} start_time: {c1.start_time}, {class2_label} start_time: {c2.start_time}")
+                log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
+                log.debug("  {} start_time: {}, {} start_time: {}", class1_label, c1.start_time, class2_label, c2.start_time)
             return cache_and_return(True, info)
     
     # НОВОЕ: Логгирование статуса цепочек
@@ -348,24 +450,24 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
     c2_has_linked = is_class_in_linked_chain(c2)
     
     if verbose:
-        print(f"CHAIN ANALYSIS:")
-        print(f"  {class1_label} in chain: {c1_has_linked}")
+        log.debug("CHAIN ANALYSIS:")
+        log.debug("  {} in chain: {}", class1_label, c1_has_linked)
         if c1_has_linked:
             try:
                 c1_chain = collect_full_chain_from_any_member(c1)
                 chain_subjects = [cls.subject for cls in c1_chain]
-                print(f"    Chain composition: {chain_subjects}")
+                log.debug("    Chain composition: {}", chain_subjects)
             except Exception as e:
-                print(f"    Failed to collect chain: {e}")
+                log.debug("    Failed to collect chain: {}", e)
         
-        print(f"  {class2_label} in chain: {c2_has_linked}")
+        log.debug("  {} in chain: {}", class2_label, c2_has_linked)
         if c2_has_linked:
             try:
                 c2_chain = collect_full_chain_from_any_member(c2)
                 chain_subjects = [cls.subject for cls in c2_chain]
-                print(f"    Chain composition: {chain_subjects}")
+                log.debug("    Chain composition: {}", chain_subjects)
             except Exception as e:
-                print(f"    Failed to collect chain: {e}")
+                log.debug("    Failed to collect chain: {}", e)
 
     # Используем effective_bounds для проверки случаев с фиксированным временем и временным окном
     if optimizer is not None and idx1 is not None and idx2 is not None:
@@ -384,9 +486,9 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
                 window_end = time_to_minutes(bounds2.max_time)
                 
                 if verbose:
-                    print(f"FIXED vs WINDOW ANALYSIS (using effective bounds):")
-                    print(f"  {class1_label} (fixed): {bounds1.min_time} duration {c1.duration} min + pause_after {getattr(c1, 'pause_after', 0)} min = ends at {minutes_to_time(fixed_end)}")
-                    print(f"  {class2_label} (window): {bounds2.min_time}-{bounds2.max_time} duration {c2.duration} min + pause_after {getattr(c2, 'pause_after', 0)} min")
+                    log.debug("FIXED vs WINDOW ANALYSIS (using effective bounds):")
+                    log.debug("  {} (fixed): {} duration {} min + pause_after {} min = ends at {}", class1_label, bounds1.min_time, c1.duration, getattr(c1, 'pause_after', 0), minutes_to_time(fixed_end))
+                    log.debug("  {} (window): {}-{} duration {} min + pause_after {} min", class2_label, bounds2.min_time, bounds2.max_time, c2.duration, getattr(c2, 'pause_after', 0))
                     
                 return _analyze_fixed_vs_window(fixed_start, fixed_end, window_start, window_end, 
                                               c2.duration, getattr(c2, 'pause_after', 0),
@@ -400,9 +502,9 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
                 window_end = time_to_minutes(bounds1.max_time)
                 
                 if verbose:
-                    print(f"WINDOW vs FIXED ANALYSIS (using effective bounds):")
-                    print(f"  {class1_label} (window): {bounds1.min_time}-{bounds1.max_time} duration {c1.duration} min + pause_after {getattr(c1, 'pause_after', 0)} min")
-                    print(f"  {class2_label} (fixed): {bounds2.min_time} duration {c2.duration} min + pause_after {getattr(c2, 'pause_after', 0)} min = ends at {minutes_to_time(fixed_end)}")
+                    log.debug("WINDOW vs FIXED ANALYSIS (using effective bounds):")
+                    log.debug("  {} (window): {}-{} duration {} min + pause_after {} min", class1_label, bounds1.min_time, bounds1.max_time, c1.duration, getattr(c1, 'pause_after', 0))
+                    log.debug("  {} (fixed): {} duration {} min + pause_after {} min = ends at {}", class2_label, bounds2.min_time, c2.duration, getattr(c2, 'pause_after', 0), minutes_to_time(fixed_end))
                     
                 return _analyze_window_vs_fixed(window_start, window_end, fixed_start, fixed_end,
                                               c1.duration, getattr(c1, 'pause_after', 0),
@@ -416,9 +518,9 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
                 window2_end = time_to_minutes(bounds2.max_time)
                 
                 if verbose:
-                    print(f"WINDOW vs WINDOW ANALYSIS (using effective bounds):")
-                    print(f"  {class1_label}: {bounds1.min_time} - {bounds1.max_time} ({window1_start}-{window1_end} min)")
-                    print(f"  {class2_label}: {bounds2.min_time} - {bounds2.max_time} ({window2_start}-{window2_end} min)")
+                    log.debug("WINDOW vs WINDOW ANALYSIS (using effective bounds):")
+                    log.debug("  {}: {} - {} ({}-{} min)", class1_label, bounds1.min_time, bounds1.max_time, window1_start, window1_end)
+                    log.debug("  {}: {} - {} ({}-{} min)", class2_label, bounds2.min_time, bounds2.max_time, window2_start, window2_end)
                     
                 # Используем новую логику для анализа двух окон
                 return _analyze_window_vs_window_bounds(bounds1, bounds2, c1, c2, 
@@ -432,30 +534,30 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
                 end2 = start2 + c2.duration + getattr(c2, 'pause_after', 0)
                 
                 if verbose:
-                    print(f"FIXED vs FIXED ANALYSIS (using effective bounds):")
-                    print(f"  {class1_label}: {bounds1.min_time} ({start1} min) duration {c1.duration} min + pause_after {getattr(c1, 'pause_after', 0)} min = ends at {minutes_to_time(end1)}")
-                    print(f"  {class2_label}: {bounds2.min_time} ({start2} min) duration {c2.duration} min + pause_after {getattr(c2, 'pause_after', 0)} min = ends at {minutes_to_time(end2)}")
+                    log.debug("FIXED vs FIXED ANALYSIS (using effective bounds):")
+                    log.debug("  {}: {} ({} min) duration {} min + pause_after {} min = ends at {}", class1_label, bounds1.min_time, start1, c1.duration, getattr(c1, 'pause_after', 0), minutes_to_time(end1))
+                    log.debug("  {}: {} ({} min) duration {} min + pause_after {} min = ends at {}", class2_label, bounds2.min_time, start2, c2.duration, getattr(c2, 'pause_after', 0), minutes_to_time(end2))
                     
                 return _analyze_fixed_vs_fixed(start1, end1, start2, end2, 
                                              class1_label, class2_label, verbose, info, cache_and_return)
                 
         except Exception as e:
             if verbose:
-                print(f"  Warning: Could not use effective bounds for analysis ({e}), falling back to original logic")
+                log.warning("  Warning: Could not use effective bounds for analysis ({}), falling back to original logic", e)
         
     # Fallback к оригинальной логике на основе start_time/end_time для обратной совместимости
     if c1.start_time and not c1.end_time and c2.start_time and c2.end_time:
         # c1 фиксировано, c2 с окном
-        fixed_start   = time_to_minutes(c1.start_time)
+        fixed_start   = c1.start_minutes
         fixed_end     = fixed_start + c1.duration + getattr(c1, 'pause_after', 0)
-        window_start  = time_to_minutes(c2.start_time)
-        window_end    = time_to_minutes(c2.end_time)
+        window_start  = c2.start_minutes
+        window_end    = c2.end_minutes
         
         if verbose:
-            print(f"FIXED vs WINDOW ANALYSIS (fallback):")
-            print(f"  {class1_label} (fixed): {c1.start_time} duration {c1.duration} min + pause_after {getattr(c1, 'pause_after', 0)} min = ends at {minutes_to_time(fixed_end)}")
-            print(f"  {class2_label} (window): {c2.start_time}-{c2.end_time} duration {c2.duration} min + pause_after {getattr(c2, 'pause_after', 0)} min")
-        print(f"                    needs pause_before {getattr(c2, 'pause_before', 0)} min")
+            log.debug("FIXED vs WINDOW ANALYSIS (fallback):")
+            log.debug("  {} (fixed): {} duration {} min + pause_after {} min = ends at {}", class1_label, c1.start_time, c1.duration, getattr(c1, 'pause_after', 0), minutes_to_time(fixed_end))
+            log.debug("  {} (window): {}-{} duration {} min + pause_after {} min", class2_label, c2.start_time, c2.end_time, c2.duration, getattr(c2, 'pause_after', 0))
+        log.debug("                    needs pause_before {} min", getattr(c2, 'pause_before', 0))
     
         # Проверяем оба направления
         required_before_fixed = c2.duration + getattr(c2, 'pause_after', 0)
@@ -466,32 +568,32 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
         available_after_fixed = window_end - fixed_end
         can_fit_after = available_after_fixed >= required_after_fixed
         
-        print(f"  CAN FIT BEFORE FIXED:")
-        print(f"    Available: {available_before_fixed} min (window_start to fixed_start - pause_before)")
-        print(f"    Required: {required_before_fixed} min (c2_duration + pause_after)")
-        print(f"    Result: {'✓' if can_fit_before else '✗'}")
-        print(f"  CAN FIT AFTER FIXED:")
-        print(f"    Available: {available_after_fixed} min (fixed_end to window_end)")
-        print(f"    Required: {required_after_fixed} min (c2_duration + pause_before)")
-        print(f"    Result: {'✓' if can_fit_after else '✗'}")
+        log.debug("  CAN FIT BEFORE FIXED:")
+        log.debug("    Available: {} min (window_start to fixed_start - pause_before)", available_before_fixed)
+        log.debug("    Required: {} min (c2_duration + pause_after)", required_before_fixed)
+        log.debug("    Result: {}", '✓' if can_fit_before else '✗')
+        log.debug("  CAN FIT AFTER FIXED:")
+        log.debug("    Available: {} min (fixed_end to window_end)", available_after_fixed)
+        log.debug("    Required: {} min (c2_duration + pause_before)", required_after_fixed)
+        log.debug("    Result: {}", '✓' if can_fit_after else '✗')
     
         if can_fit_before and can_fit_after:
             info['reason'] = 'both_orders_possible'
             info['available_time'] = f"before: {available_before_fixed} min, after: {available_after_fixed} min"
             info['required_time'] = f"before: {required_before_fixed} min, after: {required_after_fixed} min"
-            print(f"RESULT: Can schedule sequentially - {info['reason']}")
+            log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
             return cache_and_return(True, info)
         elif can_fit_before:
             info['reason'] = 'fits_before_fixed'
             info['available_time'] = f"before fixed: {available_before_fixed} min"
             info['required_time'] = required_before_fixed
-            print(f"RESULT: Can schedule sequentially - {info['reason']}")
+            log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
             return cache_and_return(True, info)
         elif can_fit_after:
             info['reason'] = 'fits_after_fixed'
             info['available_time'] = f"after fixed: {available_after_fixed} min"
             info['required_time'] = required_after_fixed
-            print(f"RESULT: Can schedule sequentially - {info['reason']}")
+            log.debug("RESULT: Can schedule sequentially - {}", info['reason'])
             return cache_and_return(True, info)
         else:
             info['reason'] = 'not_enough_time_around_fixed'
@@ -503,15 +605,15 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
             
     elif c2.start_time and not c2.end_time and c1.start_time and c1.end_time:
         # c2 фиксировано, c1 с окном (fallback)
-        fixed_start = time_to_minutes(c2.start_time)
+        fixed_start = c2.start_minutes
         fixed_end = fixed_start + c2.duration + getattr(c2, 'pause_after', 0)
-        window_start = time_to_minutes(c1.start_time)
-        window_end = time_to_minutes(c1.end_time)
+        window_start = c1.start_minutes
+        window_end = c1.end_minutes
         
         if verbose:
-            print(f"WINDOW vs FIXED ANALYSIS (fallback):")
-            print(f"  {class1_label} (window): {c1.start_time}-{c1.end_time} duration {c1.duration} min")
-            print(f"  {class2_label} (fixed): {c2.start_time} duration {c2.duration} min")
+            log.debug("WINDOW vs FIXED ANALYSIS (fallback):")
+            log.debug("  {} (window): {}-{} duration {} min", class1_label, c1.start_time, c1.end_time, c1.duration)
+            log.debug("  {} (fixed): {} duration {} min", class2_label, c2.start_time, c2.duration)
 
         return _analyze_window_vs_fixed(window_start, window_end, fixed_start, fixed_end,
                                        c1.duration, getattr(c1, 'pause_after', 0),
@@ -520,15 +622,15 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
     elif c1.start_time and c1.end_time and c2.start_time and c2.end_time:
         # Оба занятия с временными окнами (fallback)
         if verbose:
-            print(f"WINDOW vs WINDOW ANALYSIS (fallback):")
-            print(f"  {class1_label}: {c1.start_time} - {c1.end_time}")
-            print(f"  {class2_label}: {c2.start_time} - {c2.end_time}")
+            log.debug("WINDOW vs WINDOW ANALYSIS (fallback):")
+            log.debug("  {}: {} - {}", class1_label, c1.start_time, c1.end_time)
+            log.debug("  {}: {} - {}", class2_label, c2.start_time, c2.end_time)
         
         # Используем упрощенную версию анализа окон
-        window1_start = time_to_minutes(c1.start_time)
-        window1_end = time_to_minutes(c1.end_time)
-        window2_start = time_to_minutes(c2.start_time)
-        window2_end = time_to_minutes(c2.end_time)
+        window1_start = c1.start_minutes
+        window1_end = c1.end_minutes
+        window2_start = c2.start_minutes
+        window2_end = c2.end_minutes
         
         # Проверяем перекрытие
         overlap_start = max(window1_start, window2_start)
@@ -550,15 +652,15 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
     
     elif c1.start_time and not c1.end_time and c2.start_time and not c2.end_time:
         # Оба занятия с фиксированным временем (fallback)
-        start1 = time_to_minutes(c1.start_time)
+        start1 = c1.start_minutes
         end1 = start1 + c1.duration + getattr(c1, 'pause_after', 0)
-        start2 = time_to_minutes(c2.start_time)
+        start2 = c2.start_minutes
         end2 = start2 + c2.duration + getattr(c2, 'pause_after', 0)
         
         if verbose:
-            print(f"BOTH FIXED TIMES ANALYSIS (fallback):")
-            print(f"  {class1_label}: {c1.start_time} duration {c1.duration} min")
-            print(f"  {class2_label}: {c2.start_time} duration {c2.duration} min")
+            log.debug("BOTH FIXED TIMES ANALYSIS (fallback):")
+            log.debug("  {}: {} duration {} min", class1_label, c1.start_time, c1.duration)
+            log.debug("  {}: {} duration {} min", class2_label, c2.start_time, c2.duration)
             
         return _analyze_fixed_vs_fixed(start1, end1, start2, end2, 
                                      class1_label, class2_label, verbose, info, cache_and_return)
@@ -566,7 +668,7 @@ def can_schedule_sequentially(c1, c2, idx1=None, idx2=None, verbose=True, optimi
     # Если достигли этой точки, значит не все случаи обработаны
     info['reason'] = 'unknown_time_configuration'
     if verbose:
-        print(f"RESULT: Can schedule sequentially - {info['reason']} (default fallback)")
+        log.debug("RESULT: Can schedule sequentially - {} (default fallback)", info['reason'])
     return cache_and_return(True, info)  # По умолчанию разрешаем планирование
 
 def check_sequential_for_same_teacher(optimizer, teacher_name):
@@ -600,27 +702,26 @@ def check_sequential_for_same_teacher(optimizer, teacher_name):
                 continue
                 
             # Проверяем наличие общих групп
-            shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+            shared_groups = c_i.group_set & c_j.group_set
             if shared_groups:
                 continue  # Пропускаем, если есть общие группы
                 
             # Проверяем наличие общих аудиторий
-            shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
+            shared_rooms = c_i.room_set & c_j.room_set
             if not shared_rooms:
                 continue  # Пропускаем, если нет общих аудиторий
                 
             # Проверяем возможность последовательного планирования
-            can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=False)
+            can_schedule, info = can_schedule_sequentially(c_i, c_j, idx_i, idx_j, verbose=False,
+                                                           cache=optimizer.analysis_cache)
             
             # New logging for chain & resource gap
             if info.get("reason") == "chain_and_resource_gap":
                 start1, end1 = info["c1_interval"]
                 start2, end2 = info["c2_interval"]
                 gap = info["gap"]
-                print(f"SEQUENTIAL via chain & resource-gap: "
-                      f"{c_i.subject} {start1//60:02d}:{start1%60:02d}-{end1//60:02d}:{end1%60:02d}, "
-                      f"{c_j.subject} {start2//60:02d}:{start2%60:02d}-{end2//60:02d}:{end2%60:02d} "
-                      f"(gap {gap} min)")
+                log.debug("SEQUENTIAL via chain & resource-gap: {} {:02d}:{:02d}-{:02d}:{:02d}, {} {:02d}:{:02d}-{:02d}:{:02d} (gap {} min)",
+                          c_i.subject, start1//60, start1%60, end1//60, end1%60, c_j.subject, start2//60, start2%60, end2//60, end2%60, gap)
             
             if can_schedule:
                 sequential_pairs.append({
@@ -680,20 +781,6 @@ def subtract_intervals(window_start, window_end, busy):
     
     return free_intervals
 
-def _cache_and_return(cache_key, result, verbose=True):
-    """Helper function to cache result and return it with optional logging."""
-    global _analysis_cache
-    _analysis_cache[cache_key] = result
-    
-    if verbose and result[1].get('reason'):
-        can_schedule = result[0]
-        reason = result[1]['reason']
-        status = "Can" if can_schedule else "Cannot"
-        print(f"RESULT: {status} schedule sequentially - {reason}")
-    
-    return result
-
-
 def _analyze_fixed_vs_window(fixed_start, fixed_end, window_start, window_end, 
                            window_duration, window_pause_after, class1_label, class2_label, 
                            verbose, info, cache_and_return):
@@ -708,14 +795,14 @@ def _analyze_fixed_vs_window(fixed_start, fixed_end, window_start, window_end,
     can_fit_after = available_after_fixed >= required_after_fixed
     
     if verbose:
-        print(f"  CAN FIT BEFORE FIXED:")
-        print(f"    Available: {available_before_fixed} min (window_start to fixed_start)")
-        print(f"    Required: {required_before_fixed} min (window_duration + pause_after)")
-        print(f"    Result: {'✓' if can_fit_before else '✗'}")
-        print(f"  CAN FIT AFTER FIXED:")
-        print(f"    Available: {available_after_fixed} min (fixed_end to window_end)")
-        print(f"    Required: {required_after_fixed} min (window_duration)")
-        print(f"    Result: {'✓' if can_fit_after else '✗'}")
+        log.debug("  CAN FIT BEFORE FIXED:")
+        log.debug("    Available: {} min (window_start to fixed_start)", available_before_fixed)
+        log.debug("    Required: {} min (window_duration + pause_after)", required_before_fixed)
+        log.debug("    Result: {}", '✓' if can_fit_before else '✗')
+        log.debug("  CAN FIT AFTER FIXED:")
+        log.debug("    Available: {} min (fixed_end to window_end)", available_after_fixed)
+        log.debug("    Required: {} min (window_duration)", required_after_fixed)
+        log.debug("    Result: {}", '✓' if can_fit_after else '✗')
 
     if can_fit_before and can_fit_after:
         info['reason'] = 'both_orders_possible'
@@ -753,14 +840,14 @@ def _analyze_window_vs_fixed(window_start, window_end, fixed_start, fixed_end,
     can_fit_after = available_after_fixed >= required_after_fixed
     
     if verbose:
-        print(f"  CAN FIT BEFORE FIXED:")
-        print(f"    Available: {available_before_fixed} min (window_start to fixed_start)")
-        print(f"    Required: {required_before_fixed} min (window_duration + pause_after)")
-        print(f"    Result: {'✓' if can_fit_before else '✗'}")
-        print(f"  CAN FIT AFTER FIXED:")
-        print(f"    Available: {available_after_fixed} min (fixed_end to window_end)")
-        print(f"    Required: {required_after_fixed} min (window_duration)")
-        print(f"    Result: {'✓' if can_fit_after else '✗'}")
+        log.debug("  CAN FIT BEFORE FIXED:")
+        log.debug("    Available: {} min (window_start to fixed_start)", available_before_fixed)
+        log.debug("    Required: {} min (window_duration + pause_after)", required_before_fixed)
+        log.debug("    Result: {}", '✓' if can_fit_before else '✗')
+        log.debug("  CAN FIT AFTER FIXED:")
+        log.debug("    Available: {} min (fixed_end to window_end)", available_after_fixed)
+        log.debug("    Required: {} min (window_duration)", required_after_fixed)
+        log.debug("    Result: {}", '✓' if can_fit_after else '✗')
 
     if can_fit_before and can_fit_after:
         info['reason'] = 'both_orders_possible_window_first'
@@ -796,16 +883,16 @@ def _analyze_window_vs_window_bounds(bounds1, bounds2, c1, c2, class1_label, cla
     if overlap_start >= overlap_end:
         info['reason'] = 'no_time_overlap'
         if verbose:
-            print(f"    No time overlap between windows")
+            log.debug("    No time overlap between windows")
         return cache_and_return(True, info)  # Нет пересечения - можно планировать
     
     overlap_duration = overlap_end - overlap_start
     total_required = c1.duration + c2.duration + getattr(c1, 'pause_after', 0) + getattr(c2, 'pause_before', 0)
     
     if verbose:
-        print(f"    Overlap: {overlap_start}-{overlap_end} min ({overlap_duration} min)")
-        print(f"    Total required: {total_required} min")
-        print(f"    Overlap sufficient: {'✓' if overlap_duration >= total_required else '✗'}")
+        log.debug("    Overlap: {}-{} min ({} min)", overlap_start, overlap_end, overlap_duration)
+        log.debug("    Total required: {} min", total_required)
+        log.debug("    Overlap sufficient: {}", '✓' if overlap_duration >= total_required else '✗')
     
     if overlap_duration >= total_required:
         info['reason'] = 'sufficient_overlap_time'
@@ -823,9 +910,9 @@ def _analyze_fixed_vs_fixed(start1, end1, start2, end2, class1_label, class2_lab
                           verbose, info, cache_and_return):
     """Анализирует случай: оба занятия фиксированы по времени."""
     if verbose:
-        print(f"  Analyzing sequential placement:")
-        print(f"    {class1_label} ends at {minutes_to_time(end1)}")
-        print(f"    {class2_label} starts at {minutes_to_time(start2)}")
+        log.debug("  Analyzing sequential placement:")
+        log.debug("    {} ends at {}", class1_label, minutes_to_time(end1))
+        log.debug("    {} starts at {}", class2_label, minutes_to_time(start2))
     
     # Проверяем порядок c1 -> c2
     gap_1_to_2 = start2 - end1
@@ -836,8 +923,8 @@ def _analyze_fixed_vs_fixed(start1, end1, start2, end2, class1_label, class2_lab
     can_c2_then_c1 = gap_2_to_1 >= 0
     
     if verbose:
-        print(f"    Gap {class1_label} -> {class2_label}: {gap_1_to_2} min ({'✓' if can_c1_then_c2 else '✗'})")
-        print(f"    Gap {class2_label} -> {class1_label}: {gap_2_to_1} min ({'✓' if can_c2_then_c1 else '✗'})")
+        log.debug("    Gap {} -> {}: {} min ({})", class1_label, class2_label, gap_1_to_2, '✓' if can_c1_then_c2 else '✗')
+        log.debug("    Gap {} -> {}: {} min ({})", class2_label, class1_label, gap_2_to_1, '✓' if can_c2_then_c1 else '✗')
     
     if can_c1_then_c2 and can_c2_then_c1:
         info['reason'] = 'both_fixed_orders_possible'
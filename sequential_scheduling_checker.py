@@ -2,9 +2,11 @@
 Модуль для проверки возможности последовательного размещения занятий.
 """
 from time_utils import time_to_minutes, minutes_to_time
-from timewindow_utils import find_slot_for_time
 from constraint_registry import ConstraintType
 from effective_bounds_utils import get_effective_bounds, classify_bounds
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 def _check_sequential_scheduling(optimizer, fixed_idx, window_idx):
     """
@@ -27,7 +29,7 @@ def _check_sequential_scheduling(optimizer, fixed_idx, window_idx):
         window_type = classify_bounds(window_bounds)
         
         if fixed_type != 'fixed' or window_type != 'window':
-            print(f"Warning: Expected fixed vs window, got {fixed_type} vs {window_type}")
+            log.warning("Warning: Expected fixed vs window, got {} vs {}", fixed_type, window_type)
             return False
             
         fixed_start = time_to_minutes(fixed_bounds.min_time)
@@ -43,9 +45,7 @@ def _check_sequential_scheduling(optimizer, fixed_idx, window_idx):
         if can_fit_before:
             latest_start_slot = optimizer.minutes_to_slot(latest_end_before_fixed - window_duration)
             constraint_expr = optimizer.model.Add(optimizer.start_vars[window_idx] <= latest_start_slot)
-            print(f"SEQUENTIAL SCHEDULING: Window class {window_c.subject}"
-                  f" scheduled BEFORE fixed class {fixed_c.subject}"
-                  f" at {fixed_bounds.min_time}")
+            log.debug("SEQUENTIAL SCHEDULING: Window class {} scheduled BEFORE fixed class {} at {}", window_c.subject, fixed_c.subject, fixed_bounds.min_time)
             return True
 
         # Если «до» не подошло, пробуем «после»
@@ -54,24 +54,21 @@ def _check_sequential_scheduling(optimizer, fixed_idx, window_idx):
         if can_fit_after:
             earliest_start_slot = optimizer.minutes_to_slot(earliest_start_after_fixed)
             constraint_expr = optimizer.model.Add(optimizer.start_vars[window_idx] >= earliest_start_slot)
-            print(f"SEQUENTIAL SCHEDULING: Window class {window_c.subject}"
-                  f" scheduled AFTER fixed class {fixed_c.subject}"
-                  f" at {fixed_bounds.min_time}")
+            log.debug("SEQUENTIAL SCHEDULING: Window class {} scheduled AFTER fixed class {} at {}", window_c.subject, fixed_c.subject, fixed_bounds.min_time)
             return True
 
         # Ни туда, ни туда не влезает
-        print(f"NO SEQUENTIAL SCHEDULING POSSIBLE between {fixed_c.subject}"
-              f" and {window_c.subject}")
+        log.debug("NO SEQUENTIAL SCHEDULING POSSIBLE between {} and {}", fixed_c.subject, window_c.subject)
         return False
         
     except Exception as e:
-        print(f"Warning: Could not use effective bounds in _check_sequential_scheduling: {e}")
+        log.warning("Warning: Could not use effective bounds in _check_sequential_scheduling: {}", e)
         # Fallback к оригинальной логике
-        fixed_start = time_to_minutes(fixed_c.start_time)
+        fixed_start = fixed_c.start_minutes
         fixed_end = fixed_start + fixed_c.duration + getattr(fixed_c, 'pause_after', 0)
 
-        window_start = time_to_minutes(window_c.start_time)
-        window_end = time_to_minutes(window_c.end_time)
+        window_start = window_c.start_minutes
+        window_end = window_c.end_minutes
         window_duration = window_c.duration + getattr(window_c, 'pause_before', 0) + getattr(window_c, 'pause_after', 0)
 
         # Сначала пробуем разместить ДО фиксированного занятия
@@ -80,8 +77,7 @@ def _check_sequential_scheduling(optimizer, fixed_idx, window_idx):
         if can_fit_before:
             latest_start_slot = optimizer.minutes_to_slot(latest_end_before_fixed - window_duration)
             constraint_expr = optimizer.model.Add(optimizer.start_vars[window_idx] <= latest_start_slot)
-            print(f"SEQUENTIAL SCHEDULING (fallback): Window class {window_c.subject}"
-                  f" scheduled BEFORE fixed class {fixed_c.subject}")
+            log.debug("SEQUENTIAL SCHEDULING (fallback): Window class {} scheduled BEFORE fixed class {}", window_c.subject, fixed_c.subject)
             return True
 
         # Если «до» не подошло, пробуем «после»
@@ -90,11 +86,10 @@ def _check_sequential_scheduling(optimizer, fixed_idx, window_idx):
         if can_fit_after:
             earliest_start_slot = optimizer.minutes_to_slot(earliest_start_after_fixed)
             constraint_expr = optimizer.model.Add(optimizer.start_vars[window_idx] >= earliest_start_slot)
-            print(f"SEQUENTIAL SCHEDULING (fallback): Window class {window_c.subject}"
-                  f" scheduled AFTER fixed class {fixed_c.subject}")
+            log.debug("SEQUENTIAL SCHEDULING (fallback): Window class {} scheduled AFTER fixed class {}", window_c.subject, fixed_c.subject)
             return True
 
-        print(f"NO SEQUENTIAL SCHEDULING POSSIBLE between {fixed_c.subject} and {window_c.subject} (fallback)")
+        log.debug("NO SEQUENTIAL SCHEDULING POSSIBLE between {} and {} (fallback)", fixed_c.subject, window_c.subject)
         return False
 
 # Дополнительно: поддержка связанных оконных занятий в одной цепочке (linked_constraints-aware scheduling)
@@ -119,7 +114,7 @@ def enforce_window_chain_sequencing(optimizer):
     """
     # Проверяем, были ли уже применены улучшения по обработке временных окон
     if hasattr(optimizer, "timewindow_already_processed") and optimizer.timewindow_already_processed:
-        print("Skipping window chain sequencing - already processed by timewindow adapter")
+        log.debug("Skipping window chain sequencing - already processed by timewindow adapter")
         return
         
     # Отмечаем, что мы обработали эти ограничения
@@ -144,13 +139,13 @@ def enforce_window_chain_sequencing(optimizer):
             
             # Явно обозначаем, что это ограничение связанных окон
             constraint = optimizer.model.Add(optimizer.start_vars[idx_b] >= optimizer.start_vars[idx_a] + duration_a_slots + pause_after_slots + min_gap)
-            print(f"LINKED WINDOW SEQUENCING: {a.subject} → {b.subject} (constraint applied)")
+            log.debug("LINKED WINDOW SEQUENCING: {} → {} (constraint applied)", a.subject, b.subject)
 
             #---Debug---
-            print(f"DEBUG: Preparing chain constraint between {idx_a} -> {idx_b}:")
-            print(f"  - Class {idx_a} ({a.subject}): duration={duration_a_slots}, pause_after={pause_after_slots}")
-            print(f"  - Class {idx_b} ({b.subject}): pause_before={min_gap}")
-            print(f"  - Total gap required: {duration_a_slots + pause_after_slots + min_gap} slots")
+            log.debug("DEBUG: Preparing chain constraint between {} -> {}:", idx_a, idx_b)
+            log.debug("  - Class {} ({}): duration={}, pause_after={}", idx_a, a.subject, duration_a_slots, pause_after_slots)
+            log.debug("  - Class {} ({}): pause_before={}", idx_b, b.subject, min_gap)
+            log.debug("  - Total gap required: {} slots", duration_a_slots + pause_after_slots + min_gap)
             #-----------
             
             # Сохраняем примененные ограничения для будущей проверки
@@ -161,7 +156,7 @@ def enforce_window_chain_sequencing(optimizer):
             optimizer.applied_constraints[pair_key] = constraint
 
             #---Debug---
-            print(f"DEBUG: Added chain constraint {constraint}: start_vars[{idx_b}] >= start_vars[{idx_a}] + {duration_a_slots + pause_after_slots + min_gap}")
+            log.debug("DEBUG: Added chain constraint {}: start_vars[{}] >= start_vars[{}] + {}", constraint, idx_b, idx_a, duration_a_slots + pause_after_slots + min_gap)
             #-----------
 
 # Глобальный словарь для отслеживания уже обработанных проверок
@@ -193,7 +188,7 @@ def check_two_window_classes(optimizer, idx1, idx2, class1, class2):
         type2 = classify_bounds(bounds2)
         
         if type1 != 'window' or type2 != 'window':
-            print(f"Warning: Expected both window classes, got {type1} and {type2}")
+            log.warning("Warning: Expected both window classes, got {} and {}", type1, type2)
             # Fallback к оригинальной логике
             return _check_two_window_classes_fallback(optimizer, idx1, idx2, class1, class2)
             
@@ -234,7 +229,7 @@ def check_two_window_classes(optimizer, idx1, idx2, class1, class2):
         return can_1_before_2 or can_2_before_1 or can_1_adjacent_2
                 
     except Exception as e:
-        print(f"Warning: Could not use effective bounds in check_two_window_classes: {e}")
+        log.warning("Warning: Could not use effective bounds in check_two_window_classes: {}", e)
         # Fallback к оригинальной логике
         return _check_two_window_classes_fallback(optimizer, idx1, idx2, class1, class2)
 
@@ -244,14 +239,14 @@ def _check_two_window_classes_fallback(optimizer, idx1, idx2, class1, class2):
     Fallback версия check_two_window_classes используя оригинальные поля start_time/end_time.
     """
     # Конвертация времени в минуты
-    start1 = time_to_minutes(class1.start_time)
-    end1 = time_to_minutes(class1.end_time)
+    start1 = class1.start_minutes
+    end1 = class1.end_minutes
     duration1 = class1.duration
     pause1_before = getattr(class1, 'pause_before', 0)
     pause1_after = getattr(class1, 'pause_after', 0)
 
-    start2 = time_to_minutes(class2.start_time)
-    end2 = time_to_minutes(class2.end_time)
+    start2 = class2.start_minutes
+    end2 = class2.end_minutes
     duration2 = class2.duration
     pause2_before = getattr(class2, 'pause_before', 0)
     pause2_after = getattr(class2, 'pause_after', 0)
@@ -305,4 +300,4 @@ def reset_window_checks_cache():
     """
     global _processed_window_checks
     _processed_window_checks = set()
-    print("Window checks cache has been reset.")
\ No newline at end of file
+    log.debug("Window checks cache has been reset.")
\ No newline at end of file
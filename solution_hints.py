@@ -0,0 +1,252 @@
+"""
+Теплый старт: подсказки решателю (AddHint) из ранее выгруженного расписания.
+
+Строки листа "Schedule" прошлого optimized_schedule.xlsx (или плоской выгрузки
+.csv, .jsonl, .parquet - output_utils.export_schedule) сопоставляются
+занятиям по (subject, group, teacher, day); при повторах ключа строки
+раздаются занятиям по порядку. Занятие без фиксированного дня сопоставляется
+по (subject, group, teacher) первой оставшейся строке в любой день - в его
+строке прошлой выгрузки стоит день, выбранный решателем. Для сопоставленного
+занятия подсказываются:
+  - start_vars - слот времени начала прошлого расписания;
+  - room_vars и литералы присутствия room_assignment (режим nooverlap) - прошлая аудитория;
+  - day_vars, если день занятия - переменная.
+
+Подсказка отклоняется, если время не попадает в сетку слотов или в домен
+переменной, а аудитория не входит в возможные аудитории занятия. С repair
+такие подсказки исправляются (ближайший допустимый слот, основная аудитория),
+а решателю включается repair_hint, чтобы он чинил подсказку, ставшую
+недопустимой из-за новых ограничений, вместо того чтобы ее отбрасывать.
+"""
+
+import os
+from collections import deque
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['read_schedule_hints', 'class_key', 'match_schedule_rows', 'apply_solution_hints']
+
+_KEY_COLUMNS = ('subject', 'group', 'teacher', 'day')
+
+
+def _cell(value):
+    """Значение ячейки как строка ('' для пустых)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return str(value).strip()
+
+
+def _read_schedule_frame(path: str) -> pd.DataFrame:
+    """Плоское расписание из выгрузки: лист "Schedule" Excel-файла, CSV, JSON lines или Parquet."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return pd.read_csv(path, dtype=str)
+    if extension == '.jsonl':
+        return pd.read_json(path, lines=True, dtype=False, convert_dates=False)
+    if extension == '.parquet':
+        return pd.read_parquet(path)
+    return pd.read_excel(path, sheet_name="Schedule", dtype=str)
+
+
+def read_schedule_hints(path: str) -> List[Dict[str, str]]:
+    """
+    Читает плоское расписание прошлой выгрузки (output_utils.export_schedule):
+    лист "Schedule" Excel-файла или файл .csv, .jsonl, .parquet.
+
+    Args:
+        path: Путь к файлу прошлого расписания
+
+    Returns:
+        List[Dict[str, str]]: Строки расписания (subject, group, teacher, day,
+        room, start_time и duration, если столбец есть)
+
+    Raises:
+        ValueError: В файле нет нужных столбцов
+    """
+    df = _read_schedule_frame(path)
+    missing = [column for column in _KEY_COLUMNS + ('room', 'start_time') if column not in df.columns]
+    if missing:
+        raise ValueError(f"Hint file '{path}' has no columns {missing} in the schedule")
+    columns = _KEY_COLUMNS + ('room', 'start_time') + (('duration',) if 'duration' in df.columns else ())
+    return [{column: _cell(row[column]) for column in columns} for _, row in df.iterrows()]
+
+
+def class_key(c):
+    """
+    Ключ сопоставления занятия со строкой расписания.
+
+    Returns:
+        tuple: (subject, group, teacher, day); для занятия без фиксированного
+        дня - (subject, group, teacher)
+    """
+    key = (_cell(c.subject), _cell(c.group), _cell(c.teacher))
+    day = _cell(c.day)
+    return key + (day,) if day else key
+
+
+def match_schedule_rows(classes, rows: List[Dict[str, str]]):
+    """
+    Сопоставляет занятия строкам прошлого расписания.
+
+    Строки с одинаковым ключом (subject, group, teacher, day) раздаются
+    занятиям с этим ключом по порядку. Затем занятиям без фиксированного дня
+    раздаются оставшиеся строки с тем же (subject, group, teacher) в любой
+    день, тоже по порядку.
+
+    Args:
+        classes: Список ScheduleClass
+        rows: Строки read_schedule_hints
+
+    Returns:
+        tuple: ({индекс занятия: строка}, число неиспользованных строк)
+    """
+    by_key = {}
+    by_class = {}
+    for pos, row in enumerate(rows):
+        key = tuple(row[column] for column in _KEY_COLUMNS)
+        by_key.setdefault(key, deque()).append(pos)
+        by_class.setdefault(key[:-1], deque()).append(pos)
+
+    matches = {}
+    used = set()
+    free_day = []
+    for idx, c in enumerate(classes):
+        key = class_key(c)
+        if len(key) < len(_KEY_COLUMNS):
+            free_day.append((idx, key))
+            continue
+        candidates = by_key.get(key)
+        if candidates:
+            pos = candidates.popleft()
+            used.add(pos)
+            matches[idx] = rows[pos]
+
+    # Занятия без фиксированного дня - после занятий с днем, чтобы не забрать их строки
+    for idx, key in free_day:
+        candidates = by_class.get(key, ())
+        while candidates and candidates[0] in used:
+            candidates.popleft()
+        if candidates:
+            pos = candidates.popleft()
+            used.add(pos)
+            matches[idx] = rows[pos]
+    return dict(sorted(matches.items())), len(rows) - len(used)
+
+
+def _variable_domain(optimizer, var):
+    """Границы домена переменной модели (min, max)."""
+    domain = optimizer.model.Proto().variables[var.Index()].domain
+    return domain[0], domain[-1]
+
+
+def _hint_start(optimizer, idx, start_time, repair, stats):
+    """Подсказка времени начала; возвращает False, если она отклонена."""
+    var = optimizer.start_vars[idx]
+    if isinstance(var, int):
+        stats['fixed'] += 1
+        return True
+
+    low, high = _variable_domain(optimizer, var)
+    slot = optimizer.time_slot_indices.get(start_time)
+    if slot is None and repair and start_time:
+        # Время вне сетки (другой --time-interval): ближайший слот не позже
+        slot = optimizer.time_grid.time_to_slot(start_time, 'floor')
+    if slot is None:
+        stats['rejected']['start not on the time grid'] += 1
+        return False
+    if not low <= slot <= high:
+        if not repair:
+            stats['rejected']['start outside the allowed window'] += 1
+            return False
+        slot = min(max(slot, low), high)
+        stats['repaired'] += 1
+
+    optimizer.model.AddHint(var, slot)
+    return True
+
+
+def _hint_room(optimizer, idx, room, room_positions, repair, stats):
+    """Подсказка аудитории; возвращает False, если она отклонена."""
+    c = optimizer.classes[idx]
+    if room not in c.possible_rooms:
+        if not repair:
+            stats['rejected']['room not allowed for the class'] += 1
+            return False
+        if not c.possible_rooms:
+            stats['rejected']['class has no rooms'] += 1
+            return False
+        room = c.possible_rooms[0]
+        stats['repaired'] += 1
+
+    room_idx = room_positions.get(room)
+    if room_idx is None:
+        stats['rejected']['room not in the model'] += 1
+        return False
+    var = optimizer.room_vars[idx]
+    if not isinstance(var, int):
+        optimizer.model.AddHint(var, room_idx)
+    for option, literal in getattr(optimizer, 'room_presence', {}).get(idx, {}).items():
+        if literal is not None:
+            optimizer.model.AddHint(literal, option == room_idx)
+    return True
+
+
+def apply_solution_hints(optimizer, rows: List[Dict[str, str]], repair: bool = False) -> Dict[str, Any]:
+    """
+    Добавляет в построенную модель подсказки из строк прошлого расписания.
+
+    Args:
+        optimizer: Экземпляр ScheduleOptimizer с построенной моделью
+        rows: Строки read_schedule_hints
+        repair: Исправлять недопустимые подсказки вместо отклонения
+
+    Returns:
+        Dict[str, Any]: Статистика: matched, applied, fixed, repaired,
+        rejected ({причина: количество}), unmatched_classes, unused_rows
+    """
+    matches, unused_rows = match_schedule_rows(optimizer.classes, rows)
+    room_positions = {room: pos for pos, room in enumerate(optimizer.rooms)}
+
+    stats = {
+        'matched': 0,
+        'applied': 0,
+        'fixed': 0,
+        'repaired': 0,
+        'rejected': {
+            'start not on the time grid': 0,
+            'start outside the allowed window': 0,
+            'room not allowed for the class': 0,
+            'class has no rooms': 0,
+            'room not in the model': 0,
+        },
+        'unmatched_classes': len(optimizer.classes) - len(matches),
+        'unused_rows': unused_rows,
+    }
+
+    for idx, row in matches.items():
+        stats['matched'] += 1
+
+        day_var = optimizer.day_vars[idx]
+        if not isinstance(day_var, int) and row['day'] in optimizer.day_indices:
+            optimizer.model.AddHint(day_var, optimizer.day_indices[row['day']])
+
+        start_ok = _hint_start(optimizer, idx, row['start_time'], repair, stats)
+        room_ok = _hint_room(optimizer, idx, row['room'], room_positions, repair, stats)
+        if start_ok and room_ok:
+            stats['applied'] += 1
+
+    rejected = sum(stats['rejected'].values())
+
+    log.info("  💡 Solution hints: {} of {} classes matched, {} applied, {} rejected, {} repaired, "
+             "{} unmatched classes, {} unused rows", stats['matched'], len(optimizer.classes),
+             stats['applied'], rejected, stats['repaired'], stats['unmatched_classes'],
+             stats['unused_rows'], event="solution_hints", **stats)
+    for reason, count in stats['rejected'].items():
+        if count:
+            log.info("    rejected ({}): {}", reason, count)
+    return stats
@@ -0,0 +1,113 @@
+"""
+Потоковая выдача промежуточных решений CP-SAT.
+
+SolutionStream - CpSolverSolutionCallback, который на каждом улучшающем
+решении декодирует расписание тем же кодом, что и конец solve
+(ScheduleOptimizer.decode_solution), и:
+  - дописывает запись в JSON-lines файл (по строке на решение, сразу со
+    сбросом буфера - при аварийном завершении процесса последнее решение
+    остается на диске);
+  - передает запись пользовательскому callback; если callback вернул True,
+    поиск останавливается;
+  - останавливает поиск, когда относительный разрыв между целевой функцией
+    и нижней границей не больше stop_gap.
+
+Запись решения:
+    {"index": 1, "time": 0.42, "objective": 310.0, "best_bound": 250.0,
+     "gap": 0.19, "solution": [{"subject": ..., "day": ..., ...}, ...]}
+
+История (без расписаний, для графика целевой функции по времени) хранится
+в optimizer.solution_history.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+from ortools.sat.python import cp_model
+
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['SolutionStream', 'relative_gap']
+
+
+def relative_gap(objective: float, best_bound: float) -> float:
+    """Относительный разрыв |objective - bound| / max(1, |objective|)."""
+    return abs(objective - best_bound) / max(1.0, abs(objective))
+
+
+class SolutionStream(cp_model.CpSolverSolutionCallback):
+    """
+    Callback промежуточных решений для ScheduleOptimizer.solve.
+    """
+
+    def __init__(self, optimizer, output_path: Optional[str] = None,
+                 on_solution: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 stop_gap: Optional[float] = None):
+        """
+        Args:
+            optimizer: Экземпляр ScheduleOptimizer с построенной моделью
+            output_path: JSON-lines файл для записи решений (None - не писать)
+            on_solution: Функция, получающая запись решения; True - остановить поиск
+            stop_gap: Остановить поиск при относительном разрыве <= stop_gap
+        """
+        super().__init__()
+        self.optimizer = optimizer
+        self.output_path = output_path
+        self.on_solution = on_solution
+        self.stop_gap = stop_gap
+        self.history = []
+        self.last_solution = None
+        self.stopped_early = False
+        self._file = None
+
+    def __enter__(self):
+        if self.output_path:
+            self._file = open(self.output_path, 'w', encoding='utf-8')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return False
+
+    def on_solution_callback(self):
+        """Декодирует и публикует очередное решение."""
+        objective = self.ObjectiveValue()
+        best_bound = self.BestObjectiveBound()
+        gap = relative_gap(objective, best_bound)
+        solution = self.optimizer.decode_solution(self)
+
+        entry = {
+            'index': len(self.history) + 1,
+            'time': round(self.WallTime(), 3),
+            'objective': objective,
+            'best_bound': best_bound,
+            'gap': round(gap, 6),
+        }
+        self.history.append(entry)
+        self.last_solution = solution
+        log.info("  💡 Solution #{} at {:.2f}s: objective {} (bound {}, gap {:.1%})",
+                 entry['index'], entry['time'], objective, best_bound, gap,
+                 event="intermediate_solution", **entry)
+
+        # Строковое представление нужно только файлу и пользовательскому callback
+        if self._file is not None or self.on_solution is not None:
+            record = dict(entry, solution=solution.records())
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False))
+            self._file.write('\n')
+            self._file.flush()
+
+        stop = False
+        if self.on_solution is not None and self.on_solution(record):
+            log.info("  ⏹️  Search stopped by solution callback")
+            stop = True
+        if self.stop_gap is not None and gap <= self.stop_gap:
+            log.info("  ⏹️  Search stopped: gap {:.1%} <= {:.1%}", gap, self.stop_gap)
+            stop = True
+        if stop:
+            self.stopped_early = True
+            self.StopSearch()
@@ -0,0 +1,389 @@
+"""
+Решение расписания в колоночном виде.
+
+Назначения занятий хранятся целочисленными массивами numpy в порядке
+optimizer.classes: день (индекс в day_names), слот начала (индекс в сетке
+TimeGrid) и аудитория (индекс в rooms). Строки - только в таблицах имен и в
+самих занятиях. Значения переменных модели читаются из решателя одним
+пакетом (response_proto.solution) вместо вызова Value для каждой переменной.
+
+Строковые представления строятся лениво и кешируются:
+  records()      - список словарей в формате прежнего decode_solution
+                   (subject, group, teacher, room, building, day, start_time,
+                   end_time, duration, pause_before, pause_after);
+  to_dataframe() - pandas.DataFrame с теми же колонками.
+Таблица ведет себя как последовательность таких словарей (len, индексация,
+итерация, сравнение со списком), поэтому код, работавший со списком
+назначений, работает без изменений.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from time_utils import minutes_to_time
+
+__all__ = ['SolutionTable', 'COLUMNS']
+
+COLUMNS = ('subject', 'group', 'teacher', 'room', 'building', 'day',
+           'start_time', 'end_time', 'duration', 'pause_before', 'pause_after')
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+def _response_values(values) -> np.ndarray:
+    """Значения всех переменных решения (индекс - var.Index()) одним массивом."""
+    solution = values.response_proto.solution
+    return np.fromiter(solution, dtype=np.int64, count=len(solution))
+
+
+def _day_lookup(optimizer) -> List[Optional[str]]:
+    """Имя дня по индексу переменной дня (None - индекс без дня)."""
+    day_names = [None] * max([len(optimizer.day_indices)] + [idx + 1 for idx in optimizer.day_indices.values()])
+    for name, day_idx in optimizer.day_indices.items():
+        day_names[day_idx] = name
+    return day_names
+
+
+def _variable_indices(variables: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Индексы переменных в решении для пакетного чтения значений.
+
+    Args:
+        variables: Переменные модели, литералы (в том числе отрицания) или int
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (маска констант, индекс переменной или
+        значение константы) в порядке variables
+    """
+    constant = np.fromiter((isinstance(var, (int, np.integer)) for var in variables), dtype=bool,
+                           count=len(variables))
+    indices = np.fromiter((var if is_constant else var.Index() for var, is_constant in zip(variables, constant)),
+                          dtype=np.int64, count=len(variables))
+    return constant, indices
+
+
+def _gather(column: Tuple[np.ndarray, np.ndarray], solution: np.ndarray) -> np.ndarray:
+    """Значения колонки _variable_indices по пакету значений решения (int64)."""
+    constant, indices = column
+    result = indices.copy()
+    # Отрицание литерала b имеет индекс -b.Index() - 1
+    positive = ~constant & (indices >= 0)
+    negated = ~constant & (indices < 0)
+    result[positive] = solution[indices[positive]]
+    result[negated] = 1 - solution[-indices[negated] - 1]
+    return result
+
+
+class _DecodePlan:
+    """
+    Индексы переменных занятий модели: собираются один раз на модель и
+    используются для каждого решения (в том числе промежуточных).
+    """
+
+    def __init__(self, optimizer):
+        count = len(optimizer.classes)
+        self.model = optimizer.model
+        self.day = _variable_indices([optimizer.day_vars[idx] for idx in range(count)])
+        self.slot = _variable_indices([optimizer.start_vars[idx] for idx in range(count)])
+        self.room = _variable_indices([optimizer.room_vars[idx] for idx in range(count)])
+
+        # Литералы присутствия в аудиториях: строка на пару (занятие, аудитория)
+        # в порядке options; None (аудитория фиксирована) - всегда истина
+        rows = [(idx, room_idx, 1 if literal is None else literal)
+                for idx, options in getattr(optimizer, 'room_presence', {}).items()
+                for room_idx, literal in options.items()]
+        self.owners = np.fromiter((idx for idx, _, _ in rows), dtype=np.int64, count=len(rows))
+        self.candidates = np.fromiter((room_idx for _, room_idx, _ in rows), dtype=np.int64, count=len(rows))
+        self.presence = _variable_indices([literal for _, _, literal in rows])
+
+    @classmethod
+    def of(cls, optimizer) -> '_DecodePlan':
+        """План для текущей модели optimizer (кешируется, пока модель та же)."""
+        plan = getattr(optimizer, '_decode_plan', None)
+        if plan is None or plan.model is not optimizer.model:
+            plan = optimizer._decode_plan = cls(optimizer)
+        return plan
+
+
+def _format_times(minutes: np.ndarray) -> np.ndarray:
+    """Минуты -> строки "HH:MM" (форматируется только каждое уникальное значение)."""
+    values, inverse = np.unique(minutes % _MINUTES_PER_DAY, return_inverse=True)
+    labels = np.array([minutes_to_time(value) for value in values.tolist()], dtype=object)
+    return labels[inverse.reshape(-1)]
+
+
+def _take(lookup: Sequence, codes: np.ndarray) -> np.ndarray:
+    """Имена по индексам (объектный массив)."""
+    labels = np.empty(len(lookup), dtype=object)
+    labels[:] = lookup
+    return labels[codes]
+
+
+def _encode(names: Iterable[str], lookup: List[Optional[str]]) -> np.ndarray:
+    """Имена -> индексы в lookup; отсутствующие имена дописываются в lookup, None -> -1."""
+    codes = {name: code for code, name in enumerate(lookup) if name is not None}
+    codes[None] = -1
+    result = []
+    for name in names:
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(lookup)
+            lookup.append(name)
+        result.append(code)
+    return np.array(result, dtype=np.int64)
+
+
+class SolutionTable:
+    """
+    Назначения занятий: массивы day/slot/room и таблицы имен.
+    """
+
+    def __init__(self, classes: Sequence, day, slot, room, day_names: Sequence[Optional[str]],
+                 rooms: Sequence[str], grid):
+        """
+        Args:
+            classes: Занятия (ScheduleClass) в порядке назначений
+            day: Индексы дней в day_names
+            slot: Индексы слотов начала в grid
+            room: Индексы аудиторий в rooms
+            day_names: Имя дня по индексу (None - индекс без дня)
+            rooms: Имя аудитории по индексу
+            grid: TimeGrid, в которой заданы слоты
+        """
+        self.classes = list(classes)
+        self.day = np.asarray(day, dtype=np.int64)
+        self.slot = np.asarray(slot, dtype=np.int64)
+        self.room = np.asarray(room, dtype=np.int64)
+        self.day_names = list(day_names)
+        self.rooms = list(rooms)
+        self.grid = grid
+        if not len(self.classes) == len(self.day) == len(self.slot) == len(self.room):
+            raise ValueError(f"Solution columns differ in length: {len(self.classes)} classes, "
+                             f"{len(self.day)} days, {len(self.slot)} slots, {len(self.room)} rooms")
+        self._records = None
+        self._columns = None
+
+    @classmethod
+    def from_values(cls, optimizer, values) -> 'SolutionTable':
+        """
+        Назначения из найденного решения модели optimizer.
+
+        Аудитория берется из литералов присутствия (room_assignment, модель
+        режима nooverlap), если они есть у занятия: первая аудитория с
+        истинным литералом (или без литерала); иначе (режим pairwise) -
+        значение room_vars.
+
+        Args:
+            optimizer: ScheduleOptimizer с построенной моделью
+            values: CpSolver после решения или CpSolverSolutionCallback
+
+        Returns:
+            SolutionTable: Назначения в порядке optimizer.classes
+        """
+        plan = _DecodePlan.of(optimizer)
+        solution = _response_values(values)
+        day = _gather(plan.day, solution)
+        slot = _gather(plan.slot, solution)
+        room = _gather(plan.room, solution)
+        if len(plan.owners):
+            chosen = _gather(plan.presence, solution).astype(bool)
+            # Первый истинный литерал каждого занятия
+            owners, first = np.unique(plan.owners[chosen], return_index=True)
+            room[owners] = plan.candidates[chosen][first]
+
+        return cls(optimizer.classes, day, slot, room, _day_lookup(optimizer), optimizer.rooms, optimizer.time_grid)
+
+    @classmethod
+    def from_records(cls, optimizer, records: Sequence[Dict[str, Any]], classes: Optional[Sequence] = None
+                     ) -> 'SolutionTable':
+        """
+        Назначения из словарей формата records() (например, прошлое расписание).
+
+        Args:
+            optimizer: ScheduleOptimizer - источник сетки и таблиц имен
+            records: Назначения с ключами day, start_time, room
+            classes: Занятия назначений; по умолчанию optimizer.classes
+
+        Returns:
+            SolutionTable: Назначения в порядке records
+
+        Raises:
+            ValueError: Время начала не совпадает ни с одним слотом сетки
+        """
+        grid = optimizer.time_grid
+        day_names = _day_lookup(optimizer)
+        rooms = list(optimizer.rooms)
+        slots = []
+        for record in records:
+            slot = grid.slot_indices.get(record['start_time'])
+            if slot is None:
+                raise ValueError(f"Start time {record['start_time']} is not on the {grid.interval}-minute grid")
+            slots.append(slot)
+        return cls(optimizer.classes if classes is None else classes,
+                   _encode((record['day'] for record in records), day_names),
+                   slots,
+                   _encode((record['room'] for record in records), rooms),
+                   day_names, rooms, grid)
+
+    @classmethod
+    def combine(cls, optimizer, parts: Iterable[Tuple[Sequence[int], 'SolutionTable']]) -> 'SolutionTable':
+        """
+        Собирает решение optimizer из решений частей (декомпозиция, re-plan).
+
+        Индексы дней и аудиторий частей переводятся в таблицы имен optimizer
+        (имена, которых там нет, дописываются), слоты - через минуты, поэтому
+        сетки частей могут отличаться от сетки optimizer.
+
+        Args:
+            optimizer: ScheduleOptimizer, занятиям которого соответствует результат
+            parts: Пары (индексы занятий в optimizer.classes, решение части)
+
+        Returns:
+            SolutionTable: Назначения в порядке optimizer.classes
+
+        Raises:
+            ValueError: Части покрывают не все занятия
+        """
+        count = len(optimizer.classes)
+        grid = optimizer.time_grid
+        day_names = _day_lookup(optimizer)
+        rooms = list(optimizer.rooms)
+        day = np.full(count, -1, dtype=np.int64)
+        slot = np.zeros(count, dtype=np.int64)
+        room = np.zeros(count, dtype=np.int64)
+        for indices, part in parts:
+            if not len(part):
+                continue
+            indices = np.asarray(indices, dtype=np.int64)
+            day[indices] = _encode(part.day_names, day_names)[part.day]
+            room[indices] = _encode(part.rooms, rooms)[part.room]
+            slot[indices] = (part.slot if part.grid == grid
+                             else grid.minutes_to_slots(part.start_minutes, 'floor'))
+        missing = np.flatnonzero(day < 0)
+        if len(missing):
+            raise ValueError(f"{len(missing)} classes have no assignment, first index {missing[0]}")
+        return cls(optimizer.classes, day, slot, room, day_names, rooms, grid)
+
+    def __len__(self):
+        return len(self.classes)
+
+    def __getitem__(self, position):
+        return self.records()[position]
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __eq__(self, other):
+        if isinstance(other, (SolutionTable, list, tuple)):
+            return self.records() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SolutionTable({len(self)} classes, {len(self.rooms)} rooms, {self.grid!r})"
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_records'] = None
+        state['_columns'] = None
+        return state
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Длительности занятий, мин."""
+        return np.fromiter((c.duration for c in self.classes), dtype=np.int64, count=len(self.classes))
+
+    @property
+    def start_minutes(self) -> np.ndarray:
+        """Время начала занятий в минутах от полуночи."""
+        return self.grid.slots_to_minutes(self.slot)
+
+    @property
+    def end_minutes(self) -> np.ndarray:
+        """Время окончания занятий в минутах от полуночи."""
+        return self.start_minutes + self.durations
+
+    def counts(self, column: str) -> Dict[Any, int]:
+        """
+        Число занятий по значениям колонки (без построения строковых представлений).
+
+        Args:
+            column: 'day', 'room', 'hour' (час начала) или атрибут занятия
+                ('teacher', 'subject', ...); пустые значения (None) не считаются
+
+        Returns:
+            Dict[Any, int]: {значение: число занятий}
+        """
+        if column in ('day', 'room'):
+            codes, lookup = (self.day, self.day_names) if column == 'day' else (self.room, self.rooms)
+            # Значения в порядке первого появления, как у Counter ниже
+            present, first = np.unique(codes, return_index=True)
+            counts = np.bincount(codes, minlength=len(lookup))
+            return {lookup[code]: int(counts[code]) for code in present[np.argsort(first)].tolist()}
+        if column == 'hour':
+            hours, counts = np.unique(self.start_minutes // 60, return_counts=True)
+            return dict(zip(hours.tolist(), counts.tolist()))
+        values = (getattr(c, column) for c in self.classes)
+        return dict(Counter(value for value in values if value is not None))
+
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Назначения в виде словарей (строятся при первом обращении).
+
+        Returns:
+            List[Dict[str, Any]]: Назначения в порядке classes
+        """
+        if self._records is None:
+            columns = self._string_columns()
+            self._records = [
+                {
+                    "subject": c.subject,
+                    "group": c.group,
+                    "teacher": c.teacher,
+                    "room": room,
+                    "building": c.building,
+                    "day": day,
+                    "start_time": start,
+                    "end_time": end,
+                    "duration": c.duration,
+                    "pause_before": c.pause_before,
+                    "pause_after": c.pause_after
+                }
+                for c, day, room, start, end in zip(self.classes, *columns)
+            ]
+        return self._records
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Назначения в виде DataFrame с колонками COLUMNS.
+
+        Returns:
+            pd.DataFrame: Одна строка на занятие
+        """
+        day, room, start, end = self._string_columns()
+        data = {
+            'subject': [c.subject for c in self.classes],
+            'group': [c.group for c in self.classes],
+            'teacher': [c.teacher for c in self.classes],
+            'room': room,
+            'building': [c.building for c in self.classes],
+            'day': day,
+            'start_time': start,
+            'end_time': end,
+            'duration': self.durations,
+            'pause_before': [c.pause_before for c in self.classes],
+            'pause_after': [c.pause_after for c in self.classes],
+        }
+        return pd.DataFrame(data, columns=list(COLUMNS))
+
+    def _string_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Колонки day, room, start_time, end_time строками (объектные массивы, кешируются)."""
+        if self._columns is None:
+            start_minutes = self.start_minutes
+            self._columns = (_take(self.day_names, self.day), _take(self.rooms, self.room),
+                             _format_times(start_minutes), _format_times(start_minutes + self.durations))
+        return self._columns
@@ -0,0 +1,206 @@
+"""
+Конфигурация решателя CP-SAT: параметры поиска и именованные пресеты.
+
+Пресеты:
+    default       - как раньше: задается только ограничение времени
+    fast-feasible - все ядра, остановка на первом решении, без линеаризации
+                    и поиска симметрий (быстро получить допустимое расписание)
+    quality       - все ядра, полная линеаризация и симметрии (лучшая целевая функция)
+    deterministic - фиксированные seed и число потоков, interleave_search и
+                    ограничение детерминированного времени вместо реального:
+                    одинаковый результат при повторных запусках
+
+Итоговая конфигурация собирается по приоритету: пресет < файл конфигурации
+(JSON) < аргументы командной строки.
+
+Пример файла конфигурации:
+    {
+        "preset": "quality",
+        "num_search_workers": 32,
+        "random_seed": 7,
+        "parameters": {"cp_model_presolve": true}
+    }
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Any, Dict, Optional, Union
+
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
+
+__all__ = ['ALL_CORES', 'SolverConfig', 'PRESETS', 'build_solver_config', 'load_solver_config_file']
+
+# Значение num_search_workers "все ядра" (os.cpu_count() на момент решения)
+ALL_CORES = "all"
+
+PRESETS: Dict[str, Dict[str, Any]] = {
+    'default': {},
+    'fast-feasible': {
+        'num_search_workers': ALL_CORES,
+        'stop_after_first_solution': True,
+        'linearization_level': 0,
+        'symmetry_level': 0,
+    },
+    'quality': {
+        'num_search_workers': ALL_CORES,
+        'linearization_level': 2,
+        'symmetry_level': 2,
+    },
+    'deterministic': {
+        'num_search_workers': 8,
+        'random_seed': 0,
+        'interleave_search': True,
+        'deterministic_time': True,
+    },
+}
+
+
+@dataclass
+class SolverConfig:
+    """
+    Параметры решателя CP-SAT.
+
+    None в числовых полях означает значение CP-SAT по умолчанию.
+    """
+    preset: str = 'default'
+    num_search_workers: Union[int, str, None] = None
+    random_seed: Optional[int] = None
+    log_search_progress: bool = False
+    linearization_level: Optional[int] = None
+    symmetry_level: Optional[int] = None
+    stop_after_first_solution: bool = False
+    interleave_search: bool = False
+    # Ограничивать детерминированное время (max_deterministic_time) вместо реального
+    deterministic_time: bool = False
+    # Прочие поля SatParameters без отдельной опции
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+    def resolved_workers(self) -> Optional[int]:
+        """Число потоков поиска с подставленным числом ядер для "all"."""
+        if self.num_search_workers == ALL_CORES:
+            return os.cpu_count() or 1
+        return self.num_search_workers
+
+    def apply(self, solver, time_limit_seconds):
+        """
+        Переносит конфигурацию в параметры решателя.
+
+        Args:
+            solver: cp_model.CpSolver
+            time_limit_seconds: Ограничение времени решения
+
+        Raises:
+            ValueError: Неизвестное поле в parameters
+        """
+        params = solver.parameters
+        if self.deterministic_time:
+            params.max_deterministic_time = time_limit_seconds
+        else:
+            params.max_time_in_seconds = time_limit_seconds
+
+        workers = self.resolved_workers()
+        if workers is not None:
+            params.num_workers = workers
+        if self.random_seed is not None:
+            params.random_seed = self.random_seed
+        if self.linearization_level is not None:
+            params.linearization_level = self.linearization_level
+        if self.symmetry_level is not None:
+            params.symmetry_level = self.symmetry_level
+        if self.stop_after_first_solution:
+            params.stop_after_first_solution = True
+        if self.interleave_search:
+            params.interleave_search = True
+        if self.log_search_progress:
+            # Лог поиска идет через schedule_logging (консоль и JSON), а не напрямую в stdout
+            params.log_search_progress = True
+            params.log_to_stdout = False
+            solver.log_callback = _log_search_line
+
+        for name, value in self.parameters.items():
+            try:
+                setattr(params, name, value)
+            except (AttributeError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid CP-SAT parameter '{name}' = {value!r}: {e}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Словарь полей конфигурации (для отчетов и JSON-лога)."""
+        return asdict(self)
+
+    def describe(self) -> str:
+        """Краткое описание: пресет и отличающиеся от него поля."""
+        base = build_solver_config(self.preset)
+        changes = [f"{f.name}={getattr(self, f.name)!r}" for f in fields(self)
+                   if f.name != 'preset' and getattr(self, f.name) != getattr(base, f.name)]
+        workers = self.resolved_workers()
+        text = f"{self.preset} (workers: {workers if workers is not None else 'solver default'}"
+        if changes:
+            text += "; " + ", ".join(changes)
+        return text + ")"
+
+
+def _log_search_line(message):
+    """Передает строку лога поиска CP-SAT в schedule_logging."""
+    log.info("  [cp-sat] {}", message)
+
+
+def load_solver_config_file(path: str) -> Dict[str, Any]:
+    """
+    Читает файл конфигурации решателя (JSON-объект с полями SolverConfig).
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        Dict[str, Any]: Поля конфигурации
+
+    Raises:
+        ValueError: Файл не является JSON-объектом
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Solver config '{path}' is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"Solver config '{path}' must contain a JSON object")
+    return data
+
+
+def build_solver_config(preset: Optional[str] = None, config_file: Optional[str] = None,
+                        **overrides) -> SolverConfig:
+    """
+    Собирает конфигурацию решателя: пресет, затем файл, затем явные значения.
+
+    Args:
+        preset: Имя пресета (None - из файла или 'default')
+        config_file: Путь к JSON-файлу конфигурации
+        **overrides: Поля SolverConfig; значения None игнорируются
+
+    Returns:
+        SolverConfig: Итоговая конфигурация
+
+    Raises:
+        ValueError: Неизвестный пресет или поле конфигурации
+    """
+    file_values = load_solver_config_file(config_file) if config_file else {}
+    preset = preset or file_values.get('preset') or 'default'
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown solver preset '{preset}'. Expected one of: {', '.join(PRESETS)}")
+
+    known = {f.name for f in fields(SolverConfig)}
+    values = dict(PRESETS[preset])
+    for source, items in (('config file', file_values), ('arguments', overrides)):
+        for name, value in items.items():
+            if name not in known:
+                raise ValueError(f"Unknown solver option '{name}' in {source}")
+            if value is None or name == 'preset':
+                continue
+            if name == 'parameters':
+                values['parameters'] = {**values.get('parameters', {}), **value}
+            else:
+                values[name] = value
+    return replace(SolverConfig(preset=preset), **values)
@@ -0,0 +1,474 @@
+"""
+Генератор синтетических входных данных расписания для измерения
+масштабируемости.
+
+Строит занятия с заданным числом занятий, преподавателей, групп, аудиторий и
+дней, долями занятий с фиксированным временем, с окном и со свободным временем
+и долей занятий в цепочках (столбцы B/C/D одной секции). Результат - список
+ScheduleClass (как после ScheduleReader.read_excel: связи цепочек построены,
+занятия заморожены) или книга Excel с листом "Plannung" в формате входного
+файла.
+
+Сначала занятия раскладываются по сетке времени без конфликтов
+преподавателей, групп и аудиторий (скрытое допустимое расписание), затем
+ограничения выводятся из него: фиксированное время - время раскладки, окно -
+раскладка с запасом, свободное время - только день. Поэтому у сгенерированной
+задачи есть решение (с основными аудиториями занятий).
+
+Запуск из корня репозитория:
+    python synthetic_schedule.py synthetic_planning.xlsx --classes 1000 --days 5
+"""
+
+import argparse
+import random
+from dataclasses import asdict, dataclass
+from datetime import time as dt_time
+from typing import Any, Dict, List, Optional, Tuple
+
+import openpyxl
+
+from reader import ScheduleClass
+from schedule_logging import get_logger
+from time_grid import DEFAULT_DAY_END, DEFAULT_DAY_START
+from time_utils import minutes_to_time, time_to_minutes
+
+log = get_logger(__name__)
+
+__all__ = ['DAYS', 'SECTION_LABELS', 'GeneratorConfig', 'generate_sections',
+           'generate_classes', 'write_planning_workbook']
+
+DAYS = ('Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa')
+
+# Подписи строк секции в столбце A (как в xlsx_initial/schedule_planning.xlsx)
+SECTION_LABELS = (
+    'Дисциплнина', 'Группа', 'Преподаватель', 'Кабинет',
+    'Кабинет альтерн. 1', 'Кабинет альтерн. 2', 'Кабинет альтерн. 3',
+    'Здание', 'Продолжительность (мин)', 'День', 'Начало', 'Конец',
+    'Перерыв до (мин)', 'Перерыв после (мин)',
+)
+HEADERS = (None, 'Основная активность', 'Связанная активность 1', 'Связанная активность 2')
+COLUMNS = ('B', 'C', 'D')
+
+DURATIONS = (45, 60, 75, 90)
+# Пауза после занятия в цепочке (кроме последнего), мин
+CHAIN_PAUSE = 5
+# Попыток разложить секцию (день, группа и ресурсы; для каждой - все слоты начала)
+PLACEMENT_ATTEMPTS = 50
+
+
+@dataclass
+class GeneratorConfig:
+    """
+    Параметры синтетических данных.
+
+    None в числе преподавателей, групп и аудиторий - значение по числу занятий
+    (classes // 6, classes // 8, classes // 5). Доля свободных занятий -
+    1 - fixed_share - window_share.
+    """
+    classes: int = 200
+    teachers: Optional[int] = None
+    groups: Optional[int] = None
+    rooms: Optional[int] = None
+    days: int = 5
+    fixed_share: float = 0.3
+    window_share: float = 0.4
+    # Доля занятий, входящих в цепочки из 2-3 занятий
+    chain_share: float = 0.2
+    # Доля занятий с альтернативными аудиториями (1-3)
+    alternative_room_share: float = 0.3
+    # Наибольший запас окна до и после раскладки, мин
+    window_slack: int = 120
+    subjects: int = 20
+    day_start: str = DEFAULT_DAY_START
+    day_end: str = DEFAULT_DAY_END
+    time_interval: int = 15
+    seed: int = 42
+
+    def __post_init__(self):
+        if self.classes < 1:
+            raise ValueError(f"Number of classes must be positive, got {self.classes}")
+        if not 1 <= self.days <= len(DAYS):
+            raise ValueError(f"Number of days must be between 1 and {len(DAYS)}, got {self.days}")
+        for name in ('teachers', 'groups', 'rooms'):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(f"Number of {name} must be positive, got {value}")
+        for name in ('fixed_share', 'window_share', 'chain_share', 'alternative_room_share'):
+            value = getattr(self, name)
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        if self.fixed_share + self.window_share > 1:
+            raise ValueError(f"fixed_share + window_share must not exceed 1, "
+                             f"got {self.fixed_share + self.window_share}")
+        if time_to_minutes(self.day_end) - time_to_minutes(self.day_start) < max(DURATIONS) * 3 + 2 * self.time_interval:
+            raise ValueError(f"Day {self.day_start}-{self.day_end} is too short for a chain of three classes")
+
+    def resource_counts(self) -> Tuple[int, int, int]:
+        """Число (преподавателей, групп, аудиторий) с подставленными значениями по умолчанию."""
+        return (self.teachers or max(2, self.classes // 6),
+                self.groups or max(2, self.classes // 8),
+                self.rooms or max(2, self.classes // 5))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Словарь параметров (для файлов результатов бенчмарков)."""
+        return asdict(self)
+
+
+def _section_sizes(config: GeneratorConfig, rng: random.Random) -> List[int]:
+    """Размеры секций (1 - одно занятие, 2-3 - цепочка) на config.classes занятий."""
+    # Вероятность цепочки для секции, при которой доля занятий в цепочках
+    # (средняя длина 2.5) равна chain_share
+    share = config.chain_share
+    chain_probability = share / (2.5 - 1.5 * share)
+    sizes = []
+    remaining = config.classes
+    while remaining:
+        size = rng.choice((2, 3)) if rng.random() < chain_probability else 1
+        size = min(size, remaining)
+        sizes.append(size)
+        remaining -= size
+    return sizes
+
+
+class _Occupancy:
+    """
+    Скрытое расписание: занятые слоты ресурсов по дням и порядок занятий.
+
+    Кроме отсутствия пересечений, раскладка учитывает ограничения, которые
+    модель выводит эвристически (иначе скрытое расписание могло бы оказаться
+    недопустимым):
+      - objective.py считает окна преподавателя в порядке списка для занятий
+        без фиксированного времени, затем фиксированных, и окно не бывает
+        отрицательным: такие занятия преподавателя заканчиваются до его
+        фиксированных занятий этого дня и идут в порядке секций (секции
+        упорядочиваются по началу, преподаватель занят с начала секции);
+      - time_conflict_constraints ставит занятие вне цепочки до цепочки с
+        общим ресурсом: оно заканчивается до начала цепочки;
+      - window_scheduler привязывает занятия с окном к свободным слотам между
+        фиксированными занятиями того же ресурса без учета цепочек: у ресурса
+        в один день не бывает одновременно окон и фиксированного времени;
+      - separation_constraints разделяет занятия ресурса хотя бы одним слотом,
+        а ресурсные ограничения - все возможные аудитории занятия.
+    """
+
+    def __init__(self, num_slots: int):
+        self.num_slots = num_slots
+        self.busy: Dict[Tuple[str, str, str], bytearray] = {}
+        # {(преподаватель, день): конец последнего занятия без фиксированного времени}
+        self.variable_end: Dict[Tuple[str, str], int] = {}
+        # {(преподаватель, день): начало первого фиксированного занятия}
+        self.fixed_start: Dict[Tuple[str, str], int] = {}
+        # {ресурс: начало первой цепочки} и {ресурс: конец последнего занятия вне цепочки}
+        self.chain_start: Dict[Tuple[str, str, str], int] = {}
+        self.single_end: Dict[Tuple[str, str, str], int] = {}
+        # {ресурс: вид занятий 'fixed' или 'window'} - что из них уже есть у ресурса
+        self.timing: Dict[Tuple[str, str, str], str] = {}
+
+    def _slots(self, key):
+        slots = self.busy.get(key)
+        if slots is None:
+            slots = self.busy[key] = bytearray(self.num_slots)
+        return slots
+
+    def reservations(self, members, group, day, kind):
+        """Занимаемые секцией интервалы слотов: [(ресурс, первый, после последнего)]."""
+        section_start = members[0]['start']
+        teachers = {}
+        reserved = []
+        for m in members:
+            first, last = m['start'], m['start'] + m['slots']
+            teacher = ('teacher', m['teacher'], day)
+            if kind == 'fixed':
+                reserved.append((teacher, first, last))
+            else:
+                teachers[teacher] = max(teachers.get(teacher, last), last)
+            reserved.append((('group', group, day), first, last))
+            reserved.extend((('room', room, day), first, last)
+                            for room in [m['room']] + m['alternative_rooms'])
+        reserved.extend((teacher, section_start, last) for teacher, last in teachers.items())
+        return reserved
+
+    def fits(self, members, group, day, kind) -> bool:
+        for m in members:
+            key = (m['teacher'], day)
+            if kind == 'fixed' and m['start'] < self.variable_end.get(key, 0):
+                return False
+            if kind != 'fixed' and m['start'] + m['slots'] > self.fixed_start.get(key, self.num_slots):
+                return False
+        reserved = self.reservations(members, group, day, kind)
+        if kind != 'free' and any(self.timing.get(key, kind) != kind for key, _, _ in reserved):
+            return False
+        if len(members) > 1:
+            start = members[0]['start']
+            if any(start < self.single_end.get(key, 0) for key, _, _ in reserved):
+                return False
+        elif any(last > self.chain_start.get(key, self.num_slots) for key, _, last in reserved):
+            return False
+        return all(not any(self._slots(key)[first:last]) for key, first, last in reserved)
+
+    def take(self, members, group, day, kind):
+        for key, first, last in self.reservations(members, group, day, kind):
+            self._slots(key)[first:last] = b'\x01' * (last - first)
+            if kind != 'free':
+                self.timing[key] = kind
+            if len(members) > 1:
+                self.chain_start[key] = min(self.chain_start.get(key, self.num_slots), members[0]['start'])
+            else:
+                self.single_end[key] = max(self.single_end.get(key, 0), last)
+        for m in members:
+            key = (m['teacher'], day)
+            if kind == 'fixed':
+                self.fixed_start[key] = min(self.fixed_start.get(key, self.num_slots), m['start'])
+            else:
+                self.variable_end[key] = max(self.variable_end.get(key, 0), m['start'] + m['slots'])
+
+
+def _draw_member(config, rng, names, last):
+    """Ресурсы и длительность занятия секции (last - последнее занятие цепочки)."""
+    teachers, _, rooms, _ = names
+    duration = rng.choice(DURATIONS)
+    pause_after = 0 if last else CHAIN_PAUSE
+    room = rng.choice(rooms)
+    alternative_rooms = []
+    if rng.random() < config.alternative_room_share:
+        alternative_rooms = [r for r in rng.sample(rooms, min(len(rooms), rng.randint(1, 3))) if r != room]
+    return {
+        'teacher': rng.choice(teachers),
+        'room': room,
+        'alternative_rooms': alternative_rooms,
+        'duration': duration,
+        'pause_after': pause_after,
+        # Слоты занятия вместе с паузой после него и свободным слотом
+        'slots': -(-(duration + pause_after) // config.time_interval) + 1,
+    }
+
+
+def _place_section(config, rng, occupancy, size, names, day_slots, kind):
+    """
+    Раскладывает секцию (цепочку) без конфликтов ресурсов.
+
+    Returns:
+        Optional[dict]: День, группа и занятия секции (ресурсы, длительность,
+        слот начала) или None, если за PLACEMENT_ATTEMPTS попыток места нет
+    """
+    _, groups, _, days = names
+    for _ in range(PLACEMENT_ATTEMPTS):
+        day = rng.choice(days)
+        group = rng.choice(groups)
+        members = [_draw_member(config, rng, names, position == size - 1) for position in range(size)]
+        span = sum(m['slots'] for m in members)
+        if span > day_slots:
+            continue
+        starts = list(range(day_slots - span + 1))
+        rng.shuffle(starts)
+        for start in starts:
+            slot = start
+            for m in members:
+                m['start'] = slot
+                slot += m['slots']
+            if occupancy.fits(members, group, day, kind):
+                occupancy.take(members, group, day, kind)
+                return {'day': day, 'group': group, 'members': members}
+    return None
+
+
+def generate_sections(config: GeneratorConfig) -> List[List[Dict[str, Any]]]:
+    """
+    Генерирует секции листа "Plannung".
+
+    Args:
+        config: Параметры генерации
+
+    Returns:
+        List[List[Dict]]: Секции; секция - список из 1-3 словарей аргументов
+        ScheduleClass (столбцы B, C, D) без section_index и column
+    """
+    rng = random.Random(config.seed)
+    num_teachers, num_groups, num_rooms = config.resource_counts()
+    names = ([f"T{i}" for i in range(num_teachers)],
+             [f"G{i}" for i in range(num_groups)],
+             [f"R{i}" for i in range(num_rooms)],
+             DAYS[:config.days])
+    interval = config.time_interval
+    day_start = time_to_minutes(config.day_start)
+    day_end = time_to_minutes(config.day_end)
+    day_slots = (day_end - day_start) // interval
+    slack_slots = config.window_slack // interval
+    occupancy = _Occupancy(day_slots)
+
+    # (слот начала, секция) без фиксированного времени; фиксированные; не разложенные
+    variable, fixed, unplaced = [], [], []
+    # Цепочки раскладываются первыми: занятия вне цепочки должны успеть до них
+    for size in sorted(_section_sizes(config, rng), reverse=True):
+        kind_draw = rng.random()
+        kind = ('fixed' if kind_draw < config.fixed_share
+                else 'window' if kind_draw < config.fixed_share + config.window_share
+                else 'free')
+        placed = _place_section(config, rng, occupancy, size, names, day_slots, kind)
+        if placed is None:
+            # Места в сетке нет: секция без времени и без гарантии решения
+            placed = {'day': rng.choice(names[3]), 'group': rng.choice(names[1]),
+                      'members': [_draw_member(config, rng, names, position == size - 1)
+                                  for position in range(size)]}
+            kind = None
+
+        members = placed['members']
+        window = None
+        if kind == 'window':
+            # Общее окно цепочки вокруг ее раскладки
+            first = max(0, members[0]['start'] - rng.randrange(slack_slots + 1))
+            last_end = members[-1]['start'] + -(-members[-1]['duration'] // interval)
+            last = min(day_slots, last_end + rng.randrange(slack_slots + 1))
+            window = (day_start + first * interval, day_start + last * interval)
+
+        section = []
+        for m in members:
+            start_time = end_time = None
+            if kind == 'fixed':
+                start_time = minutes_to_time(day_start + m['start'] * interval)
+            elif kind == 'window':
+                start_time, end_time = (minutes_to_time(minutes) for minutes in window)
+            section.append({
+                'subject': f"S{rng.randrange(config.subjects)}",
+                'group': placed['group'],
+                'teacher': m['teacher'],
+                'main_room': m['room'],
+                'alternative_rooms': m['alternative_rooms'],
+                'building': "B1",
+                'duration': m['duration'],
+                'day': placed['day'],
+                'start_time': start_time,
+                'end_time': end_time,
+                'pause_before': None,
+                'pause_after': m['pause_after'] or None,
+            })
+        if kind is None:
+            unplaced.append(section)
+        elif kind == 'fixed':
+            fixed.append(section)
+        else:
+            variable.append((members[0]['start'], section))
+
+    if unplaced:
+        log.warning("Synthetic schedule: {} classes did not fit into the grid and have no time;"
+                    " the instance may be infeasible", sum(len(section) for section in unplaced))
+    # Секции без фиксированного времени идут первыми и по началу в скрытом расписании
+    # (порядок занятий преподавателя в objective.py); кроме того, create_variables ставит
+    # занятие с окном после фиксированных занятий того же преподавателя, стоящих раньше
+    variable.sort(key=lambda item: item[0])
+    return [section for _, section in variable] + fixed + unplaced
+
+
+def _build_classes(sections) -> List[ScheduleClass]:
+    """ScheduleClass из секций со связями цепочек, как в ScheduleReader."""
+    classes = []
+    for section_index, section in enumerate(sections):
+        chain = [ScheduleClass(**fields, section_index=section_index, column=column)
+                 for column, fields in zip(COLUMNS, section)]
+        main_class = chain[0]
+        for previous, current in zip(chain, chain[1:]):
+            current.previous_class = previous
+            previous.next_class = current
+            main_class.linked_classes.append(current)
+        classes.extend(chain)
+    for c in classes:
+        c.freeze()
+    return classes
+
+
+def generate_classes(config: Optional[GeneratorConfig] = None, **params) -> List[ScheduleClass]:
+    """
+    Генерирует синтетический список занятий.
+
+    Args:
+        config: Параметры генерации (None - GeneratorConfig(**params))
+        **params: Поля GeneratorConfig, если config не задан
+
+    Returns:
+        List[ScheduleClass]: Занятия в порядке секций, со связями цепочек, замороженные
+    """
+    if config is None:
+        config = GeneratorConfig(**params)
+    return _build_classes(generate_sections(config))
+
+
+def _time_cell(value: Optional[str]):
+    if value is None:
+        return None
+    hours, minutes = value.split(':')
+    return dt_time(int(hours), int(minutes))
+
+
+def write_planning_workbook(path: str, config: Optional[GeneratorConfig] = None, **params) -> int:
+    """
+    Записывает синтетические данные в книгу Excel с листом "Plannung".
+
+    Секции по 14 строк начиная со второй строки, подписи строк в столбце A,
+    занятия в столбцах B-D; время - ячейки времени, как во входном файле.
+
+    Args:
+        path: Путь к файлу .xlsx
+        config: Параметры генерации (None - GeneratorConfig(**params))
+        **params: Поля GeneratorConfig, если config не задан
+
+    Returns:
+        int: Число записанных занятий
+    """
+    if config is None:
+        config = GeneratorConfig(**params)
+    sections = generate_sections(config)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Plannung")
+    sheet.append(HEADERS)
+    count = 0
+    for section in sections:
+        count += len(section)
+        columns = []
+        for fields in section:
+            rooms = (list(fields['alternative_rooms']) + [None] * 3)[:3]
+            columns.append([
+                fields['subject'], fields['group'], fields['teacher'], fields['main_room'],
+                *rooms, fields['building'], fields['duration'], fields['day'],
+                _time_cell(fields['start_time']), _time_cell(fields['end_time']),
+                fields['pause_before'], fields['pause_after'],
+            ])
+        for row, label in enumerate(SECTION_LABELS):
+            sheet.append([label] + [column[row] for column in columns])
+    workbook.save(path)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic schedule planning workbook generator")
+    parser.add_argument("output", help="Path of the .xlsx workbook to write")
+    defaults = GeneratorConfig()
+    parser.add_argument("--classes", type=int, default=defaults.classes)
+    parser.add_argument("--teachers", type=int, default=None)
+    parser.add_argument("--groups", type=int, default=None)
+    parser.add_argument("--rooms", type=int, default=None)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--fixed-share", type=float, default=defaults.fixed_share)
+    parser.add_argument("--window-share", type=float, default=defaults.window_share)
+    parser.add_argument("--chain-share", type=float, default=defaults.chain_share)
+    parser.add_argument("--alternative-room-share", type=float, default=defaults.alternative_room_share)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    try:
+        config = GeneratorConfig(
+            classes=args.classes, teachers=args.teachers, groups=args.groups, rooms=args.rooms,
+            days=args.days, fixed_share=args.fixed_share, window_share=args.window_share,
+            chain_share=args.chain_share, alternative_room_share=args.alternative_room_share,
+            seed=args.seed)
+    except ValueError as e:
+        log.error("Invalid generator settings: {}", str(e))
+        return 1
+    count = write_planning_workbook(args.output, config)
+    log.info("Synthetic workbook with {} classes saved to: {}", count, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
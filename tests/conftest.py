@@ -0,0 +1,37 @@
+"""
+Общие настройки тестов: модули проекта импортируются из корня репозитория.
+
+Запуск из корня репозитория:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from schedule_logging import SILENT, configure
+
+
+@pytest.fixture(autouse=True)
+def silent_run(tmp_path, monkeypatch):
+    """Без логов; отчеты, которые могут писать модули, - во временный каталог."""
+    configure(level=SILENT)
+    monkeypatch.chdir(tmp_path)
+
+
+def make_class(subject, group, teacher, room, day, start_time=None, end_time=None, duration=45):
+    """Замороженное занятие, как после ScheduleReader.read_excel."""
+    from reader import ScheduleClass
+    c = ScheduleClass(subject, group, teacher, room, [], "B", duration, day, start_time, end_time)
+    c.freeze()
+    return c
+
+
+def schedule_row(subject, group, teacher, day, room, start_time, duration=45):
+    """Строка прошлого расписания, как из solution_hints.read_schedule_hints."""
+    return {"subject": subject, "group": group, "teacher": teacher, "day": day,
+            "room": room, "start_time": start_time, "duration": str(duration)}
@@ -0,0 +1,44 @@
+from conftest import make_class, schedule_row
+
+from incremental_replan import find_changed_classes
+from scheduler_base import ScheduleOptimizer
+
+
+def planning():
+    """Занятия и прошлое расписание: у Math изменилась длительность, Art - без фиксированного дня."""
+    classes = [
+        make_class("Math", "1A", "T1", "101", "Mo", "09:00", duration=90),
+        make_class("Art", "1A", "T2", "102", None),
+        make_class("Bio", "1B", "T3", "101", "Di", "10:00"),
+    ]
+    rows = [
+        schedule_row("Math", "1A", "T1", "Mo", "101", "09:00"),
+        schedule_row("Art", "1A", "T2", "Di", "102", "11:00"),
+        schedule_row("Bio", "1B", "T3", "Di", "101", "10:00"),
+    ]
+    return classes, rows
+
+
+def test_unchanged_free_day_class_is_not_changed():
+    classes, rows = planning()
+    optimizer = ScheduleOptimizer(classes, replan_baseline=rows)
+
+    matches, seeds, changes = find_changed_classes(optimizer, rows)
+
+    assert matches[1] is rows[1]
+    assert seeds == {0}
+    assert changes == {"added": 0, "changed": 1, "removed": 0, "affected_by_removal": 0}
+
+
+def test_unchanged_free_day_class_is_kept_on_its_previous_day():
+    classes, rows = planning()
+    optimizer = ScheduleOptimizer(classes, replan_baseline=rows)
+    optimizer.write_reports = False
+
+    assert optimizer.solve(time_limit_seconds=10)
+
+    replan = optimizer.solver_info["replan"]
+    assert replan["kept"] == 2
+    assert [entry["neighborhood"] for entry in replan["rounds"]] == [1]
+    art = optimizer.solution.records()[1]
+    assert (art["day"], art["start_time"], art["room"]) == ("Di", "11:00", "102")
@@ -0,0 +1,70 @@
+from conftest import make_class, schedule_row
+
+from scheduler_base import ScheduleOptimizer
+from solution_hints import apply_solution_hints, match_schedule_rows
+
+
+def hinted_values(optimizer):
+    """{индекс переменной: подсказанное значение} модели."""
+    hint = optimizer.model.Proto().solution_hint
+    return dict(zip(hint.vars, hint.values))
+
+
+def test_free_day_class_is_matched_and_its_day_hinted():
+    classes = [
+        make_class("Math", "1A", "T1", "101", "Mo", "09:00"),
+        make_class("Art", "1A", "T2", "102", None),
+        make_class("Bio", "1B", "T3", "101", "Di", "10:00"),
+    ]
+    rows = [
+        schedule_row("Math", "1A", "T1", "Mo", "101", "09:00"),
+        schedule_row("Art", "1A", "T2", "Di", "102", "11:00"),
+        schedule_row("Bio", "1B", "T3", "Di", "101", "10:00"),
+    ]
+    optimizer = ScheduleOptimizer(classes)
+    optimizer.write_reports = False
+    optimizer.build_model()
+
+    stats = apply_solution_hints(optimizer, rows)
+
+    assert stats["matched"] == 3
+    assert stats["unmatched_classes"] == 0
+    assert stats["unused_rows"] == 0
+    hints = hinted_values(optimizer)
+    assert hints[optimizer.day_vars[1].Index()] == optimizer.day_indices["Di"]
+    assert hints[optimizer.start_vars[1].Index()] == optimizer.time_slot_indices["11:00"]
+
+
+def test_fixed_day_classes_keep_their_rows():
+    classes = [
+        make_class("Art", "1A", "T2", "102", None),
+        make_class("Art", "1A", "T2", "102", "Mo", "09:00"),
+    ]
+    rows = [
+        schedule_row("Art", "1A", "T2", "Mo", "102", "09:00"),
+        schedule_row("Art", "1A", "T2", "Di", "102", "11:00"),
+    ]
+
+    matches, unused_rows = match_schedule_rows(classes, rows)
+
+    assert matches == {0: rows[1], 1: rows[0]}
+    assert unused_rows == 0
+
+
+def test_repair_rejects_room_hint_for_class_without_rooms():
+    classes = [
+        make_class("Math", "1A", "T1", "101", "Mo", "09:00"),
+        make_class("Art", "1B", "T2", None, "Mo", "10:00"),
+    ]
+    rows = [
+        schedule_row("Math", "1A", "T1", "Mo", "101", "09:00"),
+        schedule_row("Art", "1B", "T2", "Mo", "999", "10:00"),
+    ]
+    optimizer = ScheduleOptimizer(classes)
+    optimizer.build_model()
+
+    stats = apply_solution_hints(optimizer, rows, repair=True)
+
+    assert stats["matched"] == 2
+    assert stats["applied"] == 1
+    assert stats["rejected"]["class has no rooms"] == 1
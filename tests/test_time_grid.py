@@ -0,0 +1,29 @@
+from conftest import make_class
+
+from scheduler_base import ScheduleOptimizer
+from time_grid import TimeGrid
+from timewindow_adapter import add_objective_weights_for_timewindows
+
+
+def test_floor_on_interval_not_dividing_grid_start():
+    grid = TimeGrid(7)
+
+    slot = grid.time_to_slot("09:00", "floor")
+
+    assert slot == 8
+    assert grid.slot_to_time(slot) == "08:56"
+
+
+def test_early_start_bonus_uses_grid_floor_for_interval_7():
+    optimizer = ScheduleOptimizer([make_class("Math", "1A", "T1", "101", "Mo", "09:00", "11:00")],
+                                  time_interval=7)
+    optimizer.build_model()
+    first_new = len(optimizer.model.Proto().constraints)
+
+    bonuses = add_objective_weights_for_timewindows(optimizer)
+
+    assert [bonus.Name() for bonus in bonuses] == ["early_start_bonus_0"]
+    # early_start_bonus + start >= window_start_slot + 10, window_start_slot = 8 (08:56)
+    bound = optimizer.model.Proto().constraints[first_new].linear
+    assert sorted(bound.vars) == sorted([bonuses[0].Index(), optimizer.start_vars[0].Index()])
+    assert bound.domain[0] == 8 + 10
@@ -4,12 +4,14 @@
 from time_utils import time_to_minutes, minutes_to_time
 from time_constraint_utils import create_conflict_variables, add_time_overlap_constraints
 from sequential_scheduling_checker import _check_sequential_scheduling, check_two_window_classes
-from timewindow_utils import find_slot_for_time
 from sequential_scheduling import can_schedule_sequentially
 from constraint_registry import ConstraintType
 from effective_bounds_utils import get_effective_bounds, classify_bounds
 from linked_chain_utils import pick_best_anchor
 from chain_helpers import collect_full_chain_from_any_member
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 def add_anchor_based_constraint(optimizer, flex_class_idx, flex_class, target_class_idx, target_class):
     """
@@ -26,9 +28,9 @@ def add_anchor_based_constraint(optimizer, flex_class_idx, flex_class, target_cl
     Returns:
         bool: True если ограничение было добавлено, False если цепочка не найдена
     """
-    print(f"\n=== ANCHOR-BASED CONSTRAINT PROCESSING ===")
-    print(f"Flex class {flex_class_idx}: {flex_class.subject}")
-    print(f"Target class {target_class_idx}: {target_class.subject}")
+    log.debug("\n=== ANCHOR-BASED CONSTRAINT PROCESSING ===")
+    log.debug("Flex class {}: {}", flex_class_idx, flex_class.subject)
+    log.debug("Target class {}: {}", target_class_idx, target_class.subject)
     
     # ИСПРАВЛЕНО: Используем более надежную стратегию поиска цепочек
     chain_classes = []
@@ -38,7 +40,7 @@ def add_anchor_based_constraint(optimizer, flex_class_idx, flex_class, target_cl
         for chain_indices in optimizer.linked_chains:
             if target_class_idx in chain_indices:
                 chain_classes = [optimizer.classes[idx] for idx in chain_indices]
-                print(f"  Found chain via optimizer.linked_chains: {len(chain_classes)} classes")
+                log.debug("  Found chain via optimizer.linked_chains: {} classes", len(chain_classes))
                 break
     
     # Приоритет 2: Пытаемся найти цепочку через linked_classes
@@ -46,9 +48,9 @@ def add_anchor_based_constraint(optimizer, flex_class_idx, flex_class, target_cl
         # target_class - начало цепочки
         try:
             chain_classes = collect_full_chain_from_any_member(target_class)
-            print(f"  Found chain starting from target class: {len(chain_classes)} classes")
+            log.debug("  Found chain starting from target class: {} classes", len(chain_classes))
         except Exception as e:
-            print(f"  Warning: Failed to collect chain from target class: {e}")
+            log.warning("  Warning: Failed to collect chain from target class: {}", e)
     
     # Приоритет 3: target_class - продолжение цепочки, найдем начало
     if not chain_classes and hasattr(target_class, 'previous_class') and target_class.previous_class:
@@ -57,29 +59,29 @@ def add_anchor_based_constraint(optimizer, flex_class_idx, flex_class, target_cl
             while hasattr(root_class, 'previous_class') and root_class.previous_class:
                 root_class = root_class.previous_class
             chain_classes = collect_full_chain_from_any_member(root_class)
-            print(f"  Found chain from root class: {len(chain_classes)} classes")
+            log.debug("  Found chain from root class: {} classes", len(chain_classes))
         except Exception as e:
-            print(f"  Warning: Failed to collect chain from root class: {e}")
+            log.warning("  Warning: Failed to collect chain from root class: {}", e)
     
     if not chain_classes:
-        print(f"  No chain found for target class {target_class_idx}")
+        log.debug("  No chain found for target class {}", target_class_idx)
         return False
     
     # Выбираем лучший якорный урок
     anchor = pick_best_anchor(flex_class, chain_classes, direction="before", optimizer=optimizer)
     
     if anchor is None:
-        print(f"  No suitable anchor found in chain")
+        log.debug("  No suitable anchor found in chain")
         return False
     
     # Находим индекс якорного урока
     try:
         anchor_idx = optimizer.classes.index(anchor)
     except ValueError:
-        print(f"  Error: anchor class not found in optimizer.classes")
+        log.error("  Error: anchor class not found in optimizer.classes")
         return False
     
-    print(f"  Selected anchor: {anchor.subject} (index {anchor_idx})")
+    log.debug("  Selected anchor: {} (index {})", anchor.subject, anchor_idx)
     
     # Создаем ограничение: flex_class должен закончиться до начала anchor
     duration_slots = flex_class.duration // optimizer.time_interval
@@ -101,8 +103,8 @@ def add_anchor_based_constraint(optimizer, flex_class_idx, flex_class, target_cl
         variables_used=[f"start_var[{flex_class_idx}]", f"start_var[{anchor_idx}]"]
     )
     
-    print(f"  ✓ Added anchor-based constraint: class {flex_class_idx} + {duration_slots} + {pause_slots} <= class {anchor_idx}")
-    print("=" * 50)
+    log.debug("  ✓ Added anchor-based constraint: class {} + {} + {} <= class {}", flex_class_idx, duration_slots, pause_slots, anchor_idx)
+    log.debug("=" * 50)
     
     return True
 
@@ -112,8 +114,8 @@ def add_sequential_constraints(optimizer, i, j, c_i, c_j):
     Добавляет строгие ограничения для последовательного размещения занятий.
     Теперь с проверкой на цепочки и использованием якорных уроков.
     """
-    print(f"\n=== ADDING SEQUENTIAL CONSTRAINTS ===")
-    print(f"Classes {i} and {j}: {c_i.subject} vs {c_j.subject}")
+    log.debug("\n=== ADDING SEQUENTIAL CONSTRAINTS ===")
+    log.debug("Classes {} and {}: {} vs {}", i, j, c_i.subject, c_j.subject)
     
     # НОВОЕ: Проверяем, принадлежат ли занятия цепочкам
     from sequential_scheduling import is_class_in_linked_chain
@@ -121,27 +123,27 @@ def add_sequential_constraints(optimizer, i, j, c_i, c_j):
     c_i_in_chain = is_class_in_linked_chain(c_i)
     c_j_in_chain = is_class_in_linked_chain(c_j)
     
-    print(f"  Class {i} ({c_i.subject}) in chain: {c_i_in_chain}")
-    print(f"  Class {j} ({c_j.subject}) in chain: {c_j_in_chain}")
+    log.debug("  Class {} ({}) in chain: {}", i, c_i.subject, c_i_in_chain)
+    log.debug("  Class {} ({}) in chain: {}", j, c_j.subject, c_j_in_chain)
     
     # Якорная логика применяется только когда одно занятие в цепочке, а другое - нет
     if c_j_in_chain and not c_i_in_chain:
         # c_j в цепочке, c_i свободное - привязываем c_i к якорю в цепочке c_j
         if add_anchor_based_constraint(optimizer, i, c_i, j, c_j):
-            print(f"  ✓ Used anchor-based constraint: free class {i} anchored to chain containing class {j}")
+            log.debug("  ✓ Used anchor-based constraint: free class {} anchored to chain containing class {}", i, j)
             return
     elif c_i_in_chain and not c_j_in_chain:
         # c_i в цепочке, c_j свободное - привязываем c_j к якорю в цепочке c_i
         if add_anchor_based_constraint(optimizer, j, c_j, i, c_i):
-            print(f"  ✓ Used anchor-based constraint: free class {j} anchored to chain containing class {i}")
+            log.debug("  ✓ Used anchor-based constraint: free class {} anchored to chain containing class {}", j, i)
             return
     elif c_i_in_chain and c_j_in_chain:
-        print(f"  Both classes are in chains - using standard sequential constraints")
+        log.debug("  Both classes are in chains - using standard sequential constraints")
     else:
-        print(f"  Neither class is in a chain - using standard sequential constraints")
+        log.debug("  Neither class is in a chain - using standard sequential constraints")
     
     # Оригинальная логика для случаев без якорной привязки
-    print(f"  Applying direct sequential constraints")
+    log.debug("  Applying direct sequential constraints")
     
     # Создаем булеву переменную для определения порядка занятий
     i_before_j = optimizer.model.NewBoolVar(f"seq_strict_{i}_{j}")
@@ -209,7 +211,7 @@ def add_sequential_constraints(optimizer, i, j, c_i, c_j):
         variables_used=[str(end_j), f"start_var[{i}]", str(i_before_j)]
     )
     
-    print(f"  ✓ Added STRICT sequential constraints between classes {i} and {j} with min pause {min_pause} slots")
+    log.debug("  ✓ Added STRICT sequential constraints between classes {} and {} with min pause {} slots", i, j, min_pause)
 
 def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
     """
@@ -220,8 +222,8 @@ def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
         i, j: Индексы классов
         c_i, c_j: Экземпляры ScheduleClass
     """
-    print(f"\n=== ADDING TIME CONFLICT CONSTRAINTS ===")
-    print(f"Classes {i} and {j}: {c_i.subject} vs {c_j.subject}")
+    log.debug("\n=== ADDING TIME CONFLICT CONSTRAINTS ===")
+    log.debug("Classes {} and {}: {} vs {}", i, j, c_i.subject, c_j.subject)
     
     # Проверка: если занятия в разные дни — не анализируем конфликт
     if c_i.day != c_j.day:
@@ -236,19 +238,19 @@ def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
         return
     
     # Проверяем наличие общих аудиторий и групп
-    shared_rooms = set(c_i.possible_rooms) & set(c_j.possible_rooms)
-    shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+    shared_rooms = set(c_i.room_set & c_j.room_set)
+    shared_groups = set(c_i.group_set & c_j.group_set)
 
     # Флаг для обязательного добавления ограничений при общих группах
     must_add_constraints = (shared_groups and c_i.day == c_j.day) or (shared_rooms and c_i.day == c_j.day)
     
-    print(f"  Shared rooms: {shared_rooms}")
-    print(f"  Shared groups: {shared_groups}")
-    print(f"  Must add constraints: {must_add_constraints}")
+    log.debug("  Shared rooms: {}", shared_rooms)
+    log.debug("  Shared groups: {}", shared_groups)
+    log.debug("  Must add constraints: {}", must_add_constraints)
     
     # Если оба занятия имеют фиксированное время начала
     if c_i.fixed_start_time and c_j.fixed_start_time:
-        print(f"  Both classes have fixed start times")
+        log.debug("  Both classes have fixed start times")
         # Оба занятия фиксированные - проверяем реальное пересечение
         conflict, same_day, time_overlap = create_conflict_variables(optimizer, i, j, c_i, c_j)
         add_time_overlap_constraints(optimizer, i, j, c_i, c_j, time_overlap)
@@ -373,7 +375,7 @@ def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
                 variables_used=[str(room_conflict)]
             )
         
-        print(f"  ✓ Added fixed time conflict constraints for classes {i} and {j}")
+        log.debug("  ✓ Added fixed time conflict constraints for classes {} and {}", i, j)
         return  # Только после добавления всех проверок для общих аудиторий
 
     # Изменение логики проверки временного перекрытия
@@ -398,9 +400,9 @@ def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
                 return
             
             # Если оба занятия оконные и имеют общие группы, всегда добавляем строгие ограничения
-            shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+            shared_groups = set(c_i.group_set & c_j.group_set)
             if shared_groups:
-                print(f"  [WINDOW-WINDOW] Adding mandatory constraints for window classes with shared groups: {i},{j}")
+                log.debug("  [WINDOW-WINDOW] Adding mandatory constraints for window classes with shared groups: {},{}", i, j)
                 add_sequential_constraints(optimizer, i, j, c_i, c_j)
                 return
 
@@ -413,39 +415,39 @@ def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
                     has_alternatives_j = len(c_j.possible_rooms) > 1
                     
                     if has_alternatives_i or has_alternatives_j:
-                        print(f"  [ROOM CONFLICT] Classes {i},{j} have shared rooms {shared_rooms}, but alternatives exist - adding room conflict constraints")
+                        log.debug("  [ROOM CONFLICT] Classes {},{} have shared rooms {}, but alternatives exist - adding room conflict constraints", i, j, shared_rooms)
                         # Добавляем ограничения: если они в одной аудитории И в одно время, то конфликт
                         from resource_constraints import _add_room_conflict_constraints
                         _add_room_conflict_constraints(optimizer, i, j, c_i, c_j)
                         return
                     else:
-                        print(f"  [CRITICAL] Adding mandatory constraints for classes with no room alternatives: {i},{j}")
+                        log.debug("  [CRITICAL] Adding mandatory constraints for classes with no room alternatives: {},{}", i, j)
                         add_sequential_constraints(optimizer, i, j, c_i, c_j)
                         return
 
                 # НОВЫЙ КОД: Для занятий с общими группами всегда добавляем ограничения
                 if shared_groups:
-                    print(f"  [CRITICAL] Adding mandatory constraints for classes with shared groups: {i},{j}")
+                    log.debug("  [CRITICAL] Adding mandatory constraints for classes with shared groups: {},{}", i, j)
                     # Создаем временные ограничения и добавляем их
                     add_sequential_constraints(optimizer, i, j, c_i, c_j)
                     return
                 
                 # Не навязываем никаких конфликтных ограничений — solver сам расставит их в любом порядке
-                print(f"  [window-window teacher] no-conflict via common window for classes {i},{j}")
+                log.debug("  [window-window teacher] no-conflict via common window for classes {},{}", i, j)
                 return
                 
     except Exception as e:
-        print(f"  Warning: Could not use effective bounds for classes {i},{j}: {e}")
+        log.warning("  Warning: Could not use effective bounds for classes {},{}: {}", i, j, e)
         # Fallback к оригинальной логике
         if c_i.start_time and c_i.end_time and c_j.start_time and c_j.end_time and not must_add_constraints:
-            print(f"  [FALLBACK] Using original logic for window classes {i},{j}")
+            log.debug("  [FALLBACK] Using original logic for window classes {},{}", i, j)
             # Здесь можно добавить оригинальную логику если необходимо
             pass
 
     # ИСПРАВЛЕНО: Проверяем возможность последовательного размещения для любых конфликтующих ресурсов
     # Убираем ограничение только на общие группы - теперь обрабатываем любой общий ресурс
-    if c_i.teacher == c_j.teacher and c_i.teacher:
-        print(f"  Classes share teacher: {c_i.teacher}")
+    if c_i.teacher_id == c_j.teacher_id and c_i.teacher:
+        log.debug("  Classes share teacher: {}", c_i.teacher)
         
         # НОВОЕ: Всегда используем sequential_constraints для общего учителя
         # независимо от наличия общих групп
@@ -453,20 +455,20 @@ def _add_time_conflict_constraints(optimizer, i, j, c_i, c_j):
         return
         
     # Дополнительная проверка для общих ресурсов (группы, кабинеты)
-    shared_groups = set(c_i.get_groups()) & set(c_j.get_groups())
+    shared_groups = set(c_i.group_set & c_j.group_set)
     if shared_groups:
-        print(f"  Classes share groups: {shared_groups}")
+        log.debug("  Classes share groups: {}", shared_groups)
         add_sequential_constraints(optimizer, i, j, c_i, c_j)
         return
         
     # Проверяем общие комнаты - тоже требуют последовательного размещения
     if shared_rooms:
-        print(f"  Classes share rooms: {shared_rooms}")
+        log.debug("  Classes share rooms: {}", shared_rooms)
         add_sequential_constraints(optimizer, i, j, c_i, c_j)
         return
 
     # Если нет общих ресурсов, ограничения не нужны
-    print(f"  No shared resources detected - no constraints needed")
+    log.debug("  No shared resources detected - no constraints needed")
     return
 
 def times_overlap(class1, class2, optimizer=None, idx1=None, idx2=None):
@@ -537,7 +539,7 @@ def times_overlap(class1, class2, optimizer=None, idx1=None, idx2=None):
                 return (fixed_start < window_end) and (window_start < fixed_end)
                 
         except Exception as e:
-            print(f"Warning: Could not use effective bounds in times_overlap: {e}")
+            log.warning("Warning: Could not use effective bounds in times_overlap: {}", e)
             # Fallback к оригинальной логике
             pass
     
@@ -549,10 +551,10 @@ def times_overlap(class1, class2, optimizer=None, idx1=None, idx2=None):
     # Обрабатываем случай временных окон (когда есть end_time)
     if class1.start_time and class1.end_time and class2.start_time and class2.end_time:
         # Оба занятия с временными окнами
-        window1_start = time_to_minutes(class1.start_time)
-        window1_end = time_to_minutes(class1.end_time)
-        window2_start = time_to_minutes(class2.start_time)
-        window2_end = time_to_minutes(class2.end_time)
+        window1_start = class1.start_minutes
+        window1_end = class1.end_minutes
+        window2_start = class2.start_minutes
+        window2_end = class2.end_minutes
         
         # Находим общее окно
         common_start = max(window1_start, window2_start)
@@ -567,26 +569,26 @@ def times_overlap(class1, class2, optimizer=None, idx1=None, idx2=None):
         
     # Случай, когда первое занятие имеет фиксированное время, а второе - временное окно
     elif class1.start_time and not class1.end_time and class2.start_time and class2.end_time:
-        fixed_start = time_to_minutes(class1.start_time)
+        fixed_start = class1.start_minutes
         fixed_end = fixed_start + class1.duration
-        window_start = time_to_minutes(class2.start_time)
-        window_end = time_to_minutes(class2.end_time)
+        window_start = class2.start_minutes
+        window_end = class2.end_minutes
         
         return (fixed_start < window_end) and (window_start < fixed_end)
         
     # Случай, когда второе занятие имеет фиксированное время, а первое - временное окно
     elif class2.start_time and not class2.end_time and class1.start_time and class1.end_time:
-        fixed_start = time_to_minutes(class2.start_time)
+        fixed_start = class2.start_minutes
         fixed_end = fixed_start + class2.duration
-        window_start = time_to_minutes(class1.start_time)
-        window_end = time_to_minutes(class1.end_time)
+        window_start = class1.start_minutes
+        window_end = class1.end_minutes
         
         return (fixed_start < window_end) and (window_start < fixed_end)
     
     # Оба занятия имеют фиксированное время
     else:
-        start1 = time_to_minutes(class1.start_time)
+        start1 = class1.start_minutes
         end1 = start1 + class1.duration
-        start2 = time_to_minutes(class2.start_time)
+        start2 = class2.start_minutes
         end2 = start2 + class2.duration
         return (start1 < end2) and (start2 < end1)
\ No newline at end of file
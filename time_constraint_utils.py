@@ -3,6 +3,9 @@
 """
 from time_utils import time_to_minutes, minutes_to_time
 from constraint_registry import ConstraintType
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 def create_conflict_variables(optimizer, i, j, c_i, c_j):
     """
@@ -81,7 +84,7 @@ def add_time_overlap_constraints(optimizer, i, j, c_i, c_j, time_overlap):
         
         # Присваиваем значение переменной time_overlap в зависимости от результата проверки
         if overlap_check:
-            print(f"  Fixed time conflict: {c_i.subject} ({start_i}-{end_i}) and {c_j.subject} ({start_j}-{end_j})")
+            log.debug("  Fixed time conflict: {} ({}-{}) and {} ({}-{})", c_i.subject, start_i, end_i, c_j.subject, start_j, end_j)
             constraint_expr = optimizer.model.Add(time_overlap == 1)
         else:
             constraint_expr = optimizer.model.Add(time_overlap == 0)
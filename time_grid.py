@@ -0,0 +1,214 @@
+"""
+Сетка временных слотов расписания.
+
+Слот i начинается в start_minutes + i * interval; последний слот - не позже
+конца сетки (по умолчанию 08:00-20:00, конец включительно). Преобразования
+минуты <-> слот арифметические (O(1)), без перебора строк time_slots;
+для массивов есть векторные варианты (numpy).
+
+Округление времени, не попадающего на сетку:
+  'ceil'    - первый слот не раньше времени (границы окон, effective_bounds);
+  'floor'   - последний слот не позже времени (размещение в window_scheduler);
+  'nearest' - ближайший слот, при равенстве более ранний (фиксированное
+              время и окна в model_variables).
+Результат всегда в пределах сетки.
+
+Границы дня можно задать отдельно для дней (day_bounds, например суббота
+08:00-14:00). Сетка одна для всех дней (индекс слота не зависит от дня) и
+покрывает все границы; day_range возвращает слоты, допустимые в конкретный
+день.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from time_utils import time_to_minutes, minutes_to_time
+
+__all__ = ['TimeGrid', 'DEFAULT_DAY_START', 'DEFAULT_DAY_END', 'parse_day_bounds']
+
+DEFAULT_DAY_START = "08:00"
+DEFAULT_DAY_END = "20:00"
+
+
+def _minutes(value) -> int:
+    """Время "HH:MM" или минуты -> минуты от полуночи."""
+    return value if isinstance(value, int) else time_to_minutes(value)
+
+
+def parse_day_bounds(specs: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Разбирает границы дней вида "Sa=08:00-14:00".
+
+    Args:
+        specs: Строки DAY=HH:MM-HH:MM
+
+    Returns:
+        Dict[str, Tuple[str, str]]: {день: (начало, конец)}
+
+    Raises:
+        ValueError: Строка не в формате DAY=HH:MM-HH:MM
+    """
+    bounds = {}
+    for spec in specs:
+        day, sep, span = spec.partition('=')
+        start, dash, end = span.partition('-')
+        if not (sep and dash and day.strip() and start.strip() and end.strip()):
+            raise ValueError(f"Invalid day bounds '{spec}', expected DAY=HH:MM-HH:MM")
+        bounds[day.strip()] = (start.strip(), end.strip())
+    return bounds
+
+
+class TimeGrid:
+    """
+    Сетка слотов с шагом interval минут.
+    """
+
+    ROUNDING = ('ceil', 'floor', 'nearest')
+
+    def __init__(self, interval: int = 15, day_start=DEFAULT_DAY_START, day_end=DEFAULT_DAY_END,
+                 day_bounds: Optional[Dict[str, Tuple]] = None):
+        """
+        Args:
+            interval: Шаг сетки в минутах
+            day_start: Начало дня ("HH:MM" или минуты) для дней без своих границ
+            day_end: Конец дня (включительно)
+            day_bounds: {день: (начало, конец)} для дней с другими границами
+
+        Raises:
+            ValueError: Шаг не положительный или начало дня позже конца
+        """
+        if interval <= 0:
+            raise ValueError(f"Time interval must be positive, got {interval}")
+        self.interval = interval
+        self.day_start = _minutes(day_start)
+        self.day_end = _minutes(day_end)
+        self.day_bounds = {day: (_minutes(start), _minutes(end))
+                           for day, (start, end) in (day_bounds or {}).items()}
+        for day, (start, end) in [(None, (self.day_start, self.day_end))] + list(self.day_bounds.items()):
+            if start > end:
+                raise ValueError(f"Day start {minutes_to_time(start)} is after day end "
+                                 f"{minutes_to_time(end)}" + (f" for '{day}'" if day else ""))
+
+        # Сетка покрывает границы всех дней
+        self.start_minutes = min([self.day_start] + [start for start, _ in self.day_bounds.values()])
+        end_minutes = max([self.day_end] + [end for _, end in self.day_bounds.values()])
+        self.num_slots = (end_minutes - self.start_minutes) // interval + 1
+        self.end_minutes = self.slot_to_minutes(self.num_slots - 1)
+
+        self.slots = [minutes_to_time(self.start_minutes + slot * interval) for slot in range(self.num_slots)]
+        self.slot_indices = {time_str: slot for slot, time_str in enumerate(self.slots)}
+
+        self._default_range = self._span_slots(self.day_start, self.day_end)
+        self._day_ranges = {day: self._span_slots(start, end) for day, (start, end) in self.day_bounds.items()}
+
+    def __len__(self):
+        return self.num_slots
+
+    def __eq__(self, other):
+        return isinstance(other, TimeGrid) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f"TimeGrid({self.interval} min, {self.slots[0]}-{self.slots[-1]}, "
+                f"{self.num_slots} slots)")
+
+    def __getstate__(self):
+        return {'interval': self.interval, 'day_start': self.day_start, 'day_end': self.day_end,
+                'day_bounds': self.day_bounds}
+
+    def __setstate__(self, state):
+        self.__init__(state['interval'], state['day_start'], state['day_end'], state['day_bounds'])
+
+    def key(self) -> tuple:
+        """Параметры сетки (для сравнения и ключа кеша модели)."""
+        return (self.interval, self.day_start, self.day_end, tuple(sorted(self.day_bounds.items())))
+
+    def _span_slots(self, start: int, end: int) -> Tuple[int, int]:
+        """Слоты внутри [start, end]: первый не раньше start, последний не позже end."""
+        return self.minutes_to_slot(start, 'ceil'), self.minutes_to_slot(end, 'floor')
+
+    def minutes_to_slot(self, minutes: int, rounding: str = 'ceil') -> int:
+        """
+        Минуты от полуночи -> индекс слота.
+
+        Args:
+            minutes: Время в минутах
+            rounding: 'ceil', 'floor' или 'nearest' для времени вне сетки
+
+        Returns:
+            int: Индекс слота в пределах [0, num_slots - 1]
+        """
+        offset = minutes - self.start_minutes
+        if rounding == 'ceil':
+            slot = -(-offset // self.interval)
+        elif rounding == 'floor':
+            slot = offset // self.interval
+        elif rounding == 'nearest':
+            slot, remainder = divmod(offset, self.interval)
+            if 2 * remainder > self.interval:
+                slot += 1
+        else:
+            raise ValueError(f"Unknown rounding '{rounding}', expected one of {self.ROUNDING}")
+        return min(max(slot, 0), self.num_slots - 1)
+
+    def time_to_slot(self, time_str: str, rounding: str = 'ceil') -> int:
+        """Время "HH:MM" -> индекс слота (см. minutes_to_slot)."""
+        slot = self.slot_indices.get(time_str)
+        if slot is not None:
+            return slot
+        return self.minutes_to_slot(time_to_minutes(time_str), rounding)
+
+    def slot_to_minutes(self, slot: int) -> int:
+        """Начало слота в минутах от полуночи (слот может быть вне сетки)."""
+        return self.start_minutes + slot * self.interval
+
+    def slot_to_time(self, slot: int) -> str:
+        """Начало слота "HH:MM"; индекс ограничивается пределами сетки."""
+        return self.slots[min(max(slot, 0), self.num_slots - 1)]
+
+    def minutes_to_slots(self, minutes, rounding: str = 'ceil') -> np.ndarray:
+        """
+        Векторный minutes_to_slot.
+
+        Args:
+            minutes: Массив (или последовательность) минут
+            rounding: 'ceil', 'floor' или 'nearest'
+
+        Returns:
+            np.ndarray: Индексы слотов (int64)
+        """
+        offset = np.asarray(minutes, dtype=np.int64) - self.start_minutes
+        if rounding == 'ceil':
+            slots = -(-offset // self.interval)
+        elif rounding == 'floor':
+            slots = offset // self.interval
+        elif rounding == 'nearest':
+            slots, remainder = np.divmod(offset, self.interval)
+            slots = slots + (2 * remainder > self.interval)
+        else:
+            raise ValueError(f"Unknown rounding '{rounding}', expected one of {self.ROUNDING}")
+        return np.clip(slots, 0, self.num_slots - 1)
+
+    def slots_to_minutes(self, slots) -> np.ndarray:
+        """Векторный slot_to_minutes."""
+        return self.start_minutes + np.asarray(slots, dtype=np.int64) * self.interval
+
+    def day_range(self, day: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Слоты начала, допустимые в день.
+
+        Args:
+            day: День (None или день без своих границ - общие границы)
+
+        Returns:
+            Tuple[int, int]: (первый слот, последний слот)
+        """
+        return self._day_ranges.get(day, self._default_range)
+
+    @property
+    def has_day_bounds(self) -> bool:
+        """Границы хотя бы одного дня отличаются от общих."""
+        return any(span != self._default_range for span in self._day_ranges.values())
@@ -7,7 +7,7 @@
 """
 
 from time_utils import time_to_minutes, minutes_to_time
-from timewindow_utils import find_slot_for_time
+from time_grid import DEFAULT_DAY_START, DEFAULT_DAY_END
 
 
 class Timeline:
@@ -25,8 +25,8 @@ class Timeline:
         self.day = day
         self.anchors = []  # Список фиксированных занятий как "якорей"
         self.free_slots = []  # Список свободных временных слотов
-        self.common_window_start = common_window_start or 8 * 60  # 8:00 по умолчанию
-        self.common_window_end = common_window_end or 20 * 60  # 20:00 по умолчанию
+        self.common_window_start = common_window_start or time_to_minutes(DEFAULT_DAY_START)
+        self.common_window_end = common_window_end or time_to_minutes(DEFAULT_DAY_END)
     
     def add_anchor(self, idx, class_obj):
         """
@@ -39,7 +39,7 @@ class Timeline:
         if not class_obj.start_time or class_obj.end_time:
             raise ValueError(f"Class {idx} is not a fixed-time class")
         
-        start_min = time_to_minutes(class_obj.start_time)
+        start_min = class_obj.start_minutes
         end_min = start_min + class_obj.duration + class_obj.pause_after
         
         self.anchors.append({
@@ -115,8 +115,8 @@ class Timeline:
         if not class_obj.start_time or not class_obj.end_time:
             raise ValueError("Class must have a time window")
         
-        window_start = time_to_minutes(class_obj.start_time)
-        window_end = time_to_minutes(class_obj.end_time)
+        window_start = class_obj.start_minutes
+        window_end = class_obj.end_minutes
         
         best_slot = None
         best_fit = 0
@@ -220,13 +220,14 @@ def create_timeline(optimizer, day, class_list=None):
     fixed_classes = [(idx, c) for idx, c in class_list if c.start_time and not c.end_time]
     window_classes = [(idx, c) for idx, c in class_list if c.start_time and c.end_time]
     
-    # Определяем общее временное окно для всех оконных занятий
-    common_window_start = 8 * 60  # 8:00 по умолчанию
-    common_window_end = 20 * 60   # 20:00 по умолчанию
+    # Определяем общее временное окно для всех оконных занятий (по умолчанию - границы дня)
+    first_slot, last_slot = optimizer.time_grid.day_range(day)
+    common_window_start = optimizer.time_grid.slot_to_minutes(first_slot)
+    common_window_end = optimizer.time_grid.slot_to_minutes(last_slot)
     
     if window_classes:
-        common_window_start = max(time_to_minutes(c.start_time) for _, c in window_classes)
-        common_window_end = min(time_to_minutes(c.end_time) for _, c in window_classes)
+        common_window_start = max(c.start_minutes for _, c in window_classes)
+        common_window_end = min(c.end_minutes for _, c in window_classes)
     
     # Создаем временную шкалу
     timeline = Timeline(day, common_window_start, common_window_end)
@@ -289,8 +290,7 @@ def check_slot_conflicts(optimizer, timeline, start_slot, duration_slots):
     if start_slot + duration_slots > len(optimizer.time_slots):
         return False
     
-    start_time = optimizer.time_slots[start_slot]
-    start_minutes = time_to_minutes(start_time)
+    start_minutes = optimizer.time_grid.slot_to_minutes(start_slot)
     end_minutes = start_minutes + (duration_slots * optimizer.time_interval)
     
     # Проверяем конфликты с фиксированными занятиями (якорями)
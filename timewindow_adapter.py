@@ -6,13 +6,15 @@
 """
 
 from time_utils import time_to_minutes, minutes_to_time
-from timewindow_utils import find_slot_for_time
 from separation_constraints import analyze_related_classes
 from constraint_registry import ConstraintType
 from effective_bounds_utils import (
     initialize_effective_bounds, set_effective_bounds, get_effective_bounds,
     update_bounds_from_constraint, print_bounds_report
 )
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 __all__ = ['apply_timewindow_improvements', 'add_objective_weights_for_timewindows']
 
@@ -27,11 +29,11 @@ def apply_timewindow_improvements(optimizer):
     Returns:
         bool: True, если улучшения применены успешно
     """
-    print("\nApplying timewindow scheduling improvements...")
+    log.info("\nApplying timewindow scheduling improvements...")
 
     # ЗАЩИТА: Проверяем, не применялись ли уже улучшения временных окон
     if hasattr(optimizer, 'timewindow_already_processed') and optimizer.timewindow_already_processed:
-        print("WARNING: Timewindow improvements already applied, skipping to prevent constraint conflicts")
+        log.warning("WARNING: Timewindow improvements already applied, skipping to prevent constraint conflicts")
         return True
 
     # Инициализируем систему эффективных границ
@@ -44,14 +46,14 @@ def apply_timewindow_improvements(optimizer):
         from sequential_scheduling_checker import reset_window_checks_cache
         reset_window_checks_cache()
     except ImportError:
-        print("Warning: Could not reset window checks cache.")
+        log.warning("Warning: Could not reset window checks cache.")
     
     # Словарь для отслеживания уже обработанных пар занятий
     processed_pairs = set()
 
     # Проверяем, инициализированы ли уже переменные оптимизатора
     if not hasattr(optimizer, 'start_vars') or not optimizer.start_vars:
-        print("Warning: Optimizer variables not initialized yet. Call optimizer.build_model() before applying timewindow improvements.")
+        log.warning("Warning: Optimizer variables not initialized yet. Call optimizer.build_model() before applying timewindow improvements.")
         return False
                     
     # Общий анализ занятий с временными окнами
@@ -60,13 +62,13 @@ def apply_timewindow_improvements(optimizer):
         if c.start_time and c.end_time:
             window_classes.append((idx, c))
     
-    print(f"\nFound {len(window_classes)} classes with time windows.")
+    log.info("\nFound {} classes with time windows.", len(window_classes))
     
     # Для каждого занятия с временным окном добавляем ограничения на временное окно
     for idx_i, c_i in window_classes:
         # ЗАЩИТА: Проверяем, не применены ли уже ограничения цепочки для этого класса
         if hasattr(optimizer, 'chain_constraints_applied') and idx_i in optimizer.chain_constraints_applied:
-            print(f"  Skipping window constraints for class {idx_i} - chain constraints already applied")
+            log.debug("  Skipping window constraints for class {} - chain constraints already applied", idx_i)
             continue
             
         # Проверяем имеется ли уже фиксированное ограничение для этого занятия
@@ -75,11 +77,9 @@ def apply_timewindow_improvements(optimizer):
             window_start_time = c_i.start_time
             window_end_time = c_i.end_time
             
-            # Используем функции из effective_bounds_utils
-            from effective_bounds_utils import time_to_slot
-            
-            window_start_slot = time_to_slot(optimizer, window_start_time)
-            window_end_slot = time_to_slot(optimizer, window_end_time)
+            # Слоты окна, вычисленные при создании оптимизатора
+            window_start_slot = optimizer.class_start_slots[idx_i]
+            window_end_slot = optimizer.class_end_slots[idx_i]
             
             if window_start_slot is not None and window_end_slot is not None:
                 # Рассчитываем максимальное время начала, чтобы уложиться в окно
@@ -94,7 +94,7 @@ def apply_timewindow_improvements(optimizer):
                 set_effective_bounds(optimizer, idx_i, window_start_slot, max_start_slot,
                                    "timewindow_adapter", f"Window: {window_start_time}-{window_end_time}")
                 
-                print(f"  Added window constraints for class {idx_i}: start between slots {window_start_slot} and {max_start_slot}")
+                log.debug("  Added window constraints for class {}: start between slots {} and {}", idx_i, window_start_slot, max_start_slot)
     
     # Применяем новый алгоритм комплексного анализа связанных занятий
     processed_pairs = analyze_related_classes(optimizer)
@@ -108,7 +108,7 @@ def apply_timewindow_improvements(optimizer):
     # Выводим отчет по эффективным границам
     print_bounds_report(optimizer)
     
-    print(f"Timewindow improvements applied successfully. Processed {len(processed_pairs)} class pairs.")
+    log.info("Timewindow improvements applied successfully. Processed {} class pairs.", len(processed_pairs))
     return True
 
 
@@ -119,7 +119,7 @@ def add_objective_weights_for_timewindows(optimizer):
     Args:
         optimizer: Экземпляр ScheduleOptimizer
     """
-    print("\nAdding objective weights for timewindow optimization...")
+    log.info("\nAdding objective weights for timewindow optimization...")
     
     # Получаем предпочтения для позднего старта
     prefer_late_start = getattr(optimizer, 'prefer_late_start', set())
@@ -134,8 +134,10 @@ def add_objective_weights_for_timewindows(optimizer):
                 # Создаем переменную для "раннего" начала
                 early_start_bonus = optimizer.model.NewIntVar(0, 1000, f"early_start_bonus_{idx}")
                 
-                # Рассчитываем слоты для временного окна
-                window_start_slot = find_slot_for_time(optimizer.time_slots, c.start_time, optimizer.time_interval)
+                # Рассчитываем слоты для временного окна: последний слот сетки не позже
+                # начала окна при любом --time-interval (прежний поиск кратных интервалу
+                # от полуночи слотов не находил, если шаг не делит 08:00, и бонус пропадал)
+                window_start_slot = optimizer.time_grid.time_to_slot(c.start_time, 'floor')
                 if window_start_slot is not None:
                     # Бонус за начало ближе к началу окна
                     constraint_expr = optimizer.model.Add(early_start_bonus >= (window_start_slot + 10) - optimizer.start_vars[idx])
@@ -148,7 +150,7 @@ def add_objective_weights_for_timewindows(optimizer):
                 late_start_bonus = optimizer.model.NewIntVar(0, 1000, f"late_start_bonus_{idx}")
                 
                 # Рассчитываем слоты для временного окна
-                window_end_slot = find_slot_for_time(optimizer.time_slots, c.end_time, optimizer.time_interval)
+                window_end_slot = optimizer.time_grid.time_to_slot(c.end_time, 'floor')
                 if window_end_slot is not None:
                     # Бонус за начало ближе к концу окна
                     duration_slots = c.duration // optimizer.time_interval
@@ -165,7 +167,7 @@ def add_objective_weights_for_timewindows(optimizer):
     
     optimizer.additional_objectives.extend(timewindow_objectives)
     
-    print(f"Added {len(timewindow_objectives)} timewindow objectives to the model.")
+    log.info("Added {} timewindow objectives to the model.", len(timewindow_objectives))
     
     # Возвращаем список целей для использования в objective.py
     return timewindow_objectives
@@ -1,57 +1,12 @@
 """
 Утилиты для работы с временными окнами в планировании расписания.
 
-Этот модуль содержит чистые функции-помощники для работы с временными слотами,
-построения транзитивных связей и других базовых операций с временными окнами.
+Этот модуль содержит чистые функции-помощники для построения транзитивных
+связей и других базовых операций с временными окнами (слоты времени -
+time_grid.TimeGrid).
 """
 
-from time_utils import time_to_minutes, minutes_to_time
-
-__all__ = ['find_slot_for_time', 'build_transitive_links', 'are_classes_transitively_linked']
-
-
-def find_slot_for_time(time_slots, time_str, time_interval=15):
-    """
-    Находит индекс слота времени для заданной строки времени.
-    
-    Args:
-        time_slots: Список строк времени (HH:MM)
-        time_str: Строка времени для поиска
-        time_interval: Интервал времени в минутах
-        
-    Returns:
-        int: Индекс слота или None, если не найден
-    """
-    target_minutes = time_to_minutes(time_str)
-    
-    # Округляем к ближайшему действительному интервалу
-    remainder = target_minutes % time_interval
-    if remainder == 0:
-        rounded_minutes = target_minutes
-    else:
-        rounded_minutes = target_minutes - remainder
-    
-    rounded_time = minutes_to_time(rounded_minutes)
-    
-    # Ищем точное совпадение с округленным временем
-    for slot_idx, slot_time in enumerate(time_slots):
-        if slot_time == rounded_time:
-            return slot_idx
-    
-    # Если точного совпадения нет, ищем ближайший допустимый слот
-    best_slot = None
-    min_diff = float('inf')
-    
-    for slot_idx, slot_time in enumerate(time_slots):
-        slot_minutes = time_to_minutes(slot_time)
-        # Проверяем, является ли слот допустимым по интервалу
-        if slot_minutes % time_interval == 0:
-            diff = abs(slot_minutes - target_minutes)
-            if diff < min_diff:
-                min_diff = diff
-                best_slot = slot_idx
-    
-    return best_slot
+__all__ = ['build_transitive_links', 'are_classes_transitively_linked']
 
 
 def build_transitive_links(optimizer):
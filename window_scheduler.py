@@ -5,9 +5,11 @@
 размещения занятий с учетом временных окон, связанных цепочек и пауз.
 """
 
-from time_utils import time_to_minutes, minutes_to_time
-from timewindow_utils import find_slot_for_time
+from time_utils import minutes_to_time
 from timeline_manager import Timeline
+from schedule_logging import get_logger
+
+log = get_logger(__name__)
 
 
 class PlacementPlan:
@@ -82,7 +84,7 @@ def calculate_sequential_placement(class_list, common_window):
     Returns:
         dict: Информация о последовательном размещении
     """
-    print(f"Calculating sequential placement for {len(class_list)} classes")
+    log.debug("Calculating sequential placement for {} classes", len(class_list))
     
     if not class_list:
         return {'success': False, 'reason': 'No classes to place'}
@@ -103,8 +105,8 @@ def calculate_sequential_placement(class_list, common_window):
     
     total_required_time = total_duration + total_pauses
     
-    print(f"  Available time: {available_time} min")
-    print(f"  Required time: {total_required_time} min (classes: {total_duration}, pauses: {total_pauses})")
+    log.debug("  Available time: {} min", available_time)
+    log.debug("  Required time: {} min (classes: {}, pauses: {})", total_required_time, total_duration, total_pauses)
     
     if total_required_time > available_time:
         return {
@@ -130,7 +132,7 @@ def calculate_sequential_placement(class_list, common_window):
         }
         placements.append(placement)
         
-        print(f"    Class {idx}: {placement['start_time_str']}-{placement['end_time_str']}")
+        log.debug("    Class {}: {}-{}", idx, placement['start_time_str'], placement['end_time_str'])
         
         # Обновляем текущее время для следующего занятия
         current_time += c.duration
@@ -159,7 +161,7 @@ def place_linked_chain_in_window(optimizer, chain_classes, window_bounds):
     Returns:
         dict: Информация о размещении цепочки
     """
-    print(f"Placing linked chain of {len(chain_classes)} classes")
+    log.debug("Placing linked chain of {} classes", len(chain_classes))
     
     # Проверяем, что все классы действительно связаны в цепочку
     chain_indices = [idx for idx, _ in chain_classes]
@@ -173,7 +175,7 @@ def place_linked_chain_in_window(optimizer, chain_classes, window_bounds):
                 ordered_chain = chain_intersection
     
     if not ordered_chain:
-        print("  WARNING: No linked chain found, using original order")
+        log.warning("  WARNING: No linked chain found, using original order")
         ordered_chain = chain_indices
     
     # Упорядочиваем классы согласно цепочке
@@ -189,7 +191,7 @@ def place_linked_chain_in_window(optimizer, chain_classes, window_bounds):
         if idx not in ordered_chain:
             ordered_classes.append((idx, c))
     
-    print(f"  Chain order: {[idx for idx, _ in ordered_classes]}")
+    log.debug("  Chain order: {}", [idx for idx, _ in ordered_classes])
     
     # Рассчитываем последовательное размещение
     sequential_result = calculate_sequential_placement(ordered_classes, window_bounds)
@@ -225,13 +227,13 @@ def place_classes_with_anchors(optimizer, window_classes, timeline):
     Returns:
         dict: Информация о размещении с якорями
     """
-    print(f"Placing {len(window_classes)} window classes with {len(timeline.anchors)} anchors")
+    log.debug("Placing {} window classes with {} anchors", len(window_classes), len(timeline.anchors))
     
     placements = []
     used_slots = []
     
     for idx, c in window_classes:
-        print(f"  Placing class {idx} ({c.duration} min)")
+        log.debug("  Placing class {} ({} min)", idx, c.duration)
         
         # Проверяем, связан ли класс с фиксированными занятиями
         linked_to_anchor = _find_linked_anchor(optimizer, idx, timeline.anchors)
@@ -246,7 +248,7 @@ def place_classes_with_anchors(optimizer, window_classes, timeline):
             if 'reserved_slot' in placement:
                 timeline.reserve_slot(placement['reserved_slot'], c)
         else:
-            print(f"    WARNING: Could not place class {idx}")
+            log.warning("    WARNING: Could not place class {}", idx)
     
     return {
         'success': len(placements) == len(window_classes),
@@ -283,7 +285,7 @@ def _place_relative_to_anchor(optimizer, class_idx, class_obj, anchor, timeline)
     anchor_start = anchor['start_min']
     anchor_end = anchor['end_min']
     
-    print(f"    Placing relative to anchor {anchor['idx']} at {minutes_to_time(anchor_start)}")
+    log.debug("    Placing relative to anchor {} at {}", anchor['idx'], minutes_to_time(anchor_start))
     
     # Класс должен предшествовать якорному
     adjusted_end = anchor_start - anchor['class'].pause_before
@@ -305,14 +307,8 @@ def _place_relative_to_anchor(optimizer, class_idx, class_obj, anchor, timeline)
     if not best_slot:
         return None
     
-    placement_start_slot = find_slot_for_time(
-        optimizer.time_slots, 
-        minutes_to_time(best_slot['placement_start'])
-    )
-    placement_end_slot = find_slot_for_time(
-        optimizer.time_slots,
-        minutes_to_time(best_slot['placement_end'])
-    )
+    placement_start_slot = optimizer.time_grid.minutes_to_slot(best_slot['placement_start'], 'floor')
+    placement_end_slot = optimizer.time_grid.minutes_to_slot(best_slot['placement_end'], 'floor')
     
     return {
         'class_idx': class_idx,
@@ -328,22 +324,16 @@ def _place_relative_to_anchor(optimizer, class_idx, class_obj, anchor, timeline)
 
 def _place_in_best_free_slot(optimizer, class_idx, class_obj, timeline):
     """Размещает класс в лучшем доступном свободном слоте."""
-    window_start = time_to_minutes(class_obj.start_time)
-    window_end = time_to_minutes(class_obj.end_time)
+    window_start = class_obj.start_minutes
+    window_end = class_obj.end_minutes
     
     best_slot = timeline.find_best_slot(class_obj, prefer_early=True)
     
     if not best_slot:
         return None
     
-    placement_start_slot = find_slot_for_time(
-        optimizer.time_slots,
-        minutes_to_time(best_slot['placement_start'])
-    )
-    placement_end_slot = find_slot_for_time(
-        optimizer.time_slots,
-        minutes_to_time(best_slot['placement_end'])
-    )
+    placement_start_slot = optimizer.time_grid.minutes_to_slot(best_slot['placement_start'], 'floor')
+    placement_end_slot = optimizer.time_grid.minutes_to_slot(best_slot['placement_end'], 'floor')
     
     return {
         'class_idx': class_idx,
@@ -387,7 +377,7 @@ def validate_placement(optimizer, placement_plan):
             
             # Проверяем пересечение
             if start1 < end2 and start2 < end1:
-                print(f"Validation error: Time conflict between classes {placement1.get('class_idx')} and {placement2.get('class_idx')}")
+                log.debug("Validation error: Time conflict between classes {} and {}", placement1.get('class_idx'), placement2.get('class_idx'))
                 return False
     
     # Проверяем соответствие временным окнам
@@ -397,13 +387,13 @@ def validate_placement(optimizer, placement_plan):
             c = optimizer.classes[class_idx]
             
             if c.start_time and c.end_time:
-                window_start = time_to_minutes(c.start_time)
-                window_end = time_to_minutes(c.end_time)
+                window_start = c.start_minutes
+                window_end = c.end_minutes
                 placement_start = placement.get('start_time_minutes', 0)
                 placement_end = placement.get('end_time_minutes', 0)
                 
                 if placement_start < window_start or placement_end > window_end:
-                    print(f"Validation error: Class {class_idx} placed outside its time window")
+                    log.debug("Validation error: Class {} placed outside its time window", class_idx)
                     return False
     
     return True
@@ -421,7 +411,7 @@ def create_placement_plan(optimizer, class_group, timeline=None):
     Returns:
         PlacementPlan: Объект плана размещения
     """
-    print(f"Creating placement plan for {class_group.group_key} on {class_group.day}")
+    log.debug("Creating placement plan for {} on {}", class_group.group_key, class_group.day)
     
     # Определяем тип плана размещения
     if class_group.fixed_classes and class_group.window_classes:
@@ -443,7 +433,7 @@ def create_placement_plan(optimizer, class_group, timeline=None):
     
     plan = PlacementPlan(plan_type, class_group, timeline)
     
-    print(f"  Plan type: {plan_type}")
+    log.debug("  Plan type: {}", plan_type)
     
     # Выполняем размещение в зависимости от типа плана
     if plan_type == 'sequential':